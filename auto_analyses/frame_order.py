@@ -386,7 +386,7 @@ class Frame_order_analysis:
     # Debugging and test suite variables.
     _final_state = True
 
-    def __init__(self, data_pipe_full=None, data_pipe_subset=None, pipe_bundle=None, results_dir=None, pre_run_dir=None, opt_rigid=None, opt_subset=None, opt_full=None, opt_mc=None, mc_sim_num=500, models=MODEL_LIST_NONREDUNDANT, brownian_step_size=2.0, brownian_snapshot=10, brownian_total=1000, dist_total=1000, dist_max_rotations=1000000, results_compress_type=1, rigid_grid_split=False, store_intermediate=True, nested_params_ave_dom_pos=True):
+    def __init__(self, data_pipe_full=None, data_pipe_subset=None, pipe_bundle=None, results_dir=None, pre_run_dir=None, opt_rigid=None, opt_subset=None, opt_full=None, opt_mc=None, mc_sim_num=500, models=MODEL_LIST_NONREDUNDANT, brownian_step_size=2.0, brownian_snapshot=10, brownian_total=1000, dist_total=1000, dist_max_rotations=1000000, results_compress_type=1, rigid_grid_split=False, store_intermediate=True, nested_params_ave_dom_pos=True, sobol_cache_dir=None):
         """Perform the full frame order analysis.
 
         @param data_pipe_full:              The name of the data pipe containing all of the RDC and PCS data.
@@ -429,6 +429,8 @@ class Frame_order_analysis:
         @type store_intermediate:           bool
         @keyword nested_params_ave_dom_pos: A flag which if True will cause the average domain position parameters to be taken from the rigid or free-rotor models.  If False, then these parameters will be set to zero.
         @type nested_params_ave_dom_pos:    bool
+        @keyword sobol_cache_dir:           The optional directory for the persistent on-disk cache of the Sobol' angles and rotation matrices used in the numerical PCS integration.  This allows the data to be shared between the optimisation stages, the multi-processor slaves, and between different runs of the auto-analysis.  See the frame_order.sobol_setup user function for details.
+        @type sobol_cache_dir:              None or str
         """
 
         # Execution lock.
@@ -457,6 +459,7 @@ class Frame_order_analysis:
             self.rigid_grid_split = rigid_grid_split
             self.store_intermediate = store_intermediate
             self.flag_nested_params_ave_dom_pos = nested_params_ave_dom_pos
+            self.sobol_cache_dir = sobol_cache_dir
 
             # Re-order the models to enable the parameter nesting protocol.
             self.models = self.reorder_models(models)
@@ -1451,11 +1454,11 @@ class Frame_order_analysis:
 
         # No oversampling specified.
         if oversample == None:
-            self.interpreter.frame_order.sobol_setup(max_num=max_num)
+            self.interpreter.frame_order.sobol_setup(max_num=max_num, cache_dir=self.sobol_cache_dir)
 
         # Full setup.
         else:
-            self.interpreter.frame_order.sobol_setup(max_num=max_num, oversample=oversample)
+            self.interpreter.frame_order.sobol_setup(max_num=max_num, oversample=oversample, cache_dir=self.sobol_cache_dir)
 
 
 
@@ -25,24 +25,30 @@
 
 
 # Python module imports.
+from json import dump, load
+from os.path import dirname
 from re import search
 from sys import stderr
 from time import asctime
 import xml.dom.minidom
+import xml.dom.pulldom
 
 # relax module imports.
+from data_store.columns import BINARY_INDEX_FILE, BINARY_XML_FILE, attach_columns, extract_columns, pipe_containers, read_columns, restore_columns, write_columns
 from data_store.gui import Gui
 from data_store.pipe_container import PipeContainer
 from data_store.seq_align import Sequence_alignments
 import pipe_control
 from lib.compat import builtins
 from lib.errors import RelaxError, RelaxPipeError, RelaxNoPipeError
-from lib.xml import fill_object_contents, xml_to_object
+from lib.io import delete, mkdir_nofail, open_read_file, open_write_file
+from lib.xml import Xml_element_stream, fill_object_contents, write_element_end, write_element_start, xml_to_object
 from status import Status; status = Status()
 import version
 
 
 __all__ = [ 'align_tensor',
+            'columns',
             'data_classes',
             'diff_tensor',
             'exp_info',
@@ -189,6 +195,34 @@ class Relax_data_store(dict):
         status.observers.pipe_alteration.notify()
 
 
+    def _attach_columns(self, dir=None, index=None, pipes=None):
+        """Lazily attach the binary format column data to the spin and interatomic containers of the new data pipes.
+
+        @keyword dir:       The binary format directory.
+        @type dir:          str
+        @keyword index:     The column index of the binary format directory.
+        @type index:        dict
+        @keyword pipes:     The list of new pipe names, in the order of the column index.
+        @type pipes:        list of str
+        @raises RelaxError: If the number of containers does not match the column data.
+        """
+
+        # Loop over the data pipes.
+        for i in range(len(pipes)):
+            # Loop over the container lists.
+            for list_type, containers in pipe_containers(self[pipes[i]]):
+                # The column info.
+                info = index['pipes'][i]['lists'][list_type]
+
+                # Check the container numbers.
+                if info['count'] != len(containers):
+                    raise RelaxError("The number of %s containers %s of the data pipe '%s' does not match the %s containers of the binary column data." % (list_type, len(containers), pipes[i], info['count']))
+
+                # Lazily attach the columns.
+                columns = read_columns(dir=dir, prefix="pipe%i_%s" % (i, list_type), names=info['names'], kinds=info['kinds'])
+                attach_columns(containers=containers, columns=columns)
+
+
     def _back_compat_hook(self, file_version=None, pipes=None):
         """Method for converting the old data structures to the new ones.
 
@@ -469,9 +503,37 @@ class Relax_data_store(dict):
         return True
 
 
-    def from_xml(self, file, dir=None, pipe_to=None, verbosity=1):
+    def from_binary(self, dir, pipe_to=None, verbosity=1):
+        """Load the binary columnar format data pipes into the relax data store.
+
+        The XML file of the directory is loaded by the from_xml() method, and the float data of the spin and interatomic containers is then lazily attached from the memory-mapped column files.
+
+
+        @param dir:                 The binary format directory.
+        @type dir:                  str
+        @keyword pipe_to:           The data pipe to load the data pipe into (the directory must only contain one data pipe).
+        @type pipe_to:              str
+        @keyword verbosity:         A flag specifying the amount of information to print.  The higher the value, the greater the verbosity.
+        @type verbosity:            int
+        """
+
+        # Read the column index.
+        file = open_read_file(file_name=BINARY_INDEX_FILE, dir=dir, verbosity=verbosity)
+        index = load(file)
+        file.close()
+
+        # Load the XML, attaching the columns.
+        file = open_read_file(file_name=BINARY_XML_FILE, dir=dir, verbosity=verbosity)
+        self.from_xml(file, dir=dirname(dir), pipe_to=pipe_to, verbosity=verbosity, columns=[dir, index])
+        file.close()
+
+
+    def from_xml(self, file, dir=None, pipe_to=None, verbosity=1, columns=None):
         """Parse a XML document representation of a data pipe, and load it into the relax data store.
 
+        The XML file is streamed, and only one molecule, residue, spin, or interatomic element of the data pipes, or one other top level element, is expanded into a DOM tree at any time.
+
+
         @param file:                The open file object.
         @type file:                 file
         @keyword dir:               The name of the directory containing the results file (needed for loading external files).
@@ -480,127 +542,219 @@ class Relax_data_store(dict):
         @type pipe_to:              str
         @keyword verbosity:         A flag specifying the amount of information to print.  The higher the value, the greater the verbosity.
         @type verbosity:            int
+        @keyword columns:           The binary format directory and its column index, for lazily attaching the column data prior to the backwards compatibility transformations.
+        @type columns:              list of str and dict
         @raises RelaxError:         If pipe_to is given and the file contains multiple pipe elements;  or if the data pipes in the XML file already exist in the relax data store;  or if the data pipe type is invalid;  or if the target data pipe is not empty.
         @raises RelaxNoPipeError:   If pipe_to is given but the data pipe does not exist.
         @raises RelaxError:         If the data pipes in the XML file already exist in the relax data store, or if the data pipe type is invalid.
         @raises RelaxPipeError:     If the data pipes of the XML file are already present in the relax data store.
         """
 
-        # Create the XML document from the file.
-        doc = xml.dom.minidom.parse(file)
-
-        # Get the relax node.
-        relax_node = doc.childNodes[0]
+        # Stream the XML document from the file, expanding only one top level element, or one molecule, residue, spin, or interatomic element of the data pipes, at a time.
+        stream = Xml_element_stream(xml.dom.pulldom.parse(file))
 
-        # Get the relax version of the XML file.
-        file_version = relax_node.getAttribute('file_version')
+        # The relax node - get the relax version of the XML file.
+        file_version = stream.next_child().getAttribute('file_version')
         if file_version == '':
             file_version = 1
         else:
             file_version = int(file_version)
 
-        # Get the pipe nodes.
-        pipe_nodes = relax_node.getElementsByTagName('pipe')
-
-        # Structure for the names of the new pipes.
+        # Initialise.
         pipes = []
 
-        # Target loading to a specific pipe (for pipe results reading).
-        if pipe_to:
-            # Check if there are multiple pipes in the XML file.
-            if len(pipe_nodes) > 1:
-                raise RelaxError("The pipe_to target pipe argument '%s' cannot be given as the file contains multiple pipe elements." % pipe_to)
-
-            # The pipe type.
-            pipe_type = pipe_nodes[0].getAttribute('type')
-
-            # Check that the pipe already exists.
-            if not pipe_to in self:
-                raise RelaxNoPipeError(pipe_to)
-
-            # Check if the pipe type matches.
-            if pipe_type != self[pipe_to].pipe_type:
-                raise RelaxError("The XML file pipe type '%s' does not match the pipe type '%s'" % (pipe_type, self[pipe_to].pipe_type))
-
-            # Check if the pipe is empty.
-            if not self[pipe_to].is_empty():
-                raise RelaxError("The data pipe '%s' is not empty." % pipe_to)
-
-            # Load the data.
-            self[pipe_to].from_xml(pipe_nodes[0], dir=dir, file_version=file_version)
-
-            # Store the pipe name.
-            pipes.append(pipe_to)
-
-        # Load the state.
-        else:
-            # Get the GUI nodes.
-            gui_nodes = relax_node.getElementsByTagName('relax_gui')
-            if gui_nodes:
-                self.relax_gui.from_xml(gui_nodes[0], file_version=file_version)
-
-            # Get the sequence alignment nodes.
-            seq_align_nodes = relax_node.getElementsByTagName('sequence_alignments')
-            if seq_align_nodes:
-                # Initialise the object.
-                self.sequence_alignments = Sequence_alignments()
-
-                # Populate it.
-                self.sequence_alignments.from_xml(seq_align_nodes[0], file_version=file_version)
-
-            # Recreate all the data store data structures.
-            xml_to_object(relax_node, self, file_version=file_version, blacklist=['pipe', 'relax_gui', 'sequence_alignments'])
-
-            # Checks.
-            for pipe_node in pipe_nodes:
+        # Loop over the top level elements.
+        while True:
+            # The next element.
+            node = stream.next_child()
+            if node == None:
+                break
+
+            # Target loading to a specific pipe (for pipe results reading), skipping all other elements.
+            if pipe_to:
+                if node.tagName == 'pipe':
+                    # Check if there are multiple pipes in the XML file, emptying the target data pipe.
+                    if pipes:
+                        container = PipeContainer()
+                        container.pipe_type = self[pipe_to].pipe_type
+                        self[pipe_to] = container
+                        if self.current_pipe == pipe_to:
+                            builtins.cdp = container
+                        raise RelaxError("The pipe_to target pipe argument '%s' cannot be given as the file contains multiple pipe elements." % pipe_to)
+
+                    # The pipe type.
+                    pipe_type = node.getAttribute('type')
+
+                    # Check that the pipe already exists.
+                    if not pipe_to in self:
+                        raise RelaxNoPipeError(pipe_to)
+
+                    # Check if the pipe type matches.
+                    if pipe_type != self[pipe_to].pipe_type:
+                        raise RelaxError("The XML file pipe type '%s' does not match the pipe type '%s'" % (pipe_type, self[pipe_to].pipe_type))
+
+                    # Check if the pipe is empty.
+                    if not self[pipe_to].is_empty():
+                        raise RelaxError("The data pipe '%s' is not empty." % pipe_to)
+
+                    # Load the data.
+                    self[pipe_to].from_xml(node, dir=dir, file_version=file_version, stream=stream)
+
+                    # Store the pipe name.
+                    pipes.append(pipe_to)
+
+                # Skip the element.
+                else:
+                    stream.expand(node)
+
+            # Load the data pipe.
+            elif node.tagName == 'pipe':
                 # The pipe name and type.
-                pipe_name = str(pipe_node.getAttribute('name'))
-                pipe_type = pipe_node.getAttribute('type')
-
-                # Existence check.
-                if pipe_name in self:
-                    raise RelaxPipeError(pipe_name)
-
-                # Valid type check.
-                if not pipe_type in pipe_control.pipes.VALID_TYPES:
+                pipe_name = str(node.getAttribute('name'))
+                pipe_type = node.getAttribute('type')
+
+                # Checks, removing all data pipes already loaded from the file on failure.
+                exists = pipe_name in self
+                if exists or not pipe_type in pipe_control.pipes.VALID_TYPES:
+                    for pipe in pipes:
+                        del self[pipe]
+                    if self.current_pipe in pipes:
+                        self.instance.current_pipe = None
+                        builtins.cdp = None
+
+                    # Existence check.
+                    if exists:
+                        raise RelaxPipeError(pipe_name)
+
+                    # Valid type check.
                     raise RelaxError("The data pipe type '%s' is invalid and must be one of the strings in the list %s." % (pipe_type, pipe_control.pipes.VALID_TYPES))
 
-            # Load the data pipes.
-            for pipe_node in pipe_nodes:
-                # The pipe name and type.
-                pipe_name = str(pipe_node.getAttribute('name'))
-                pipe_type = pipe_node.getAttribute('type')
-
                 # Add the data pipe.
                 switch = False
                 if self.current_pipe == None:
                     switch = True
                 self.add(pipe_name, pipe_type, switch=switch)
 
-                # Fill the pipe.
-                self[pipe_name].from_xml(pipe_node, file_version=file_version, dir=dir)
+                # Fill the pipe, reading its contents from the stream.
+                self[pipe_name].from_xml(node, file_version=file_version, dir=dir, stream=stream)
 
                 # Store the pipe name.
                 pipes.append(pipe_name)
 
-            # Set the current pipe.
-            if self.current_pipe in self:
-                builtins.cdp = self[self.current_pipe]
+            # The GUI.
+            elif node.tagName == 'relax_gui':
+                self.relax_gui.from_xml(stream.expand(node), file_version=file_version)
+
+            # The sequence alignments.
+            elif node.tagName == 'sequence_alignments':
+                # Initialise the object.
+                self.sequence_alignments = Sequence_alignments()
+
+                # Populate it.
+                self.sequence_alignments.from_xml(stream.expand(node), file_version=file_version)
+
+            # Recreate all the other data store data structures.
+            else:
+                holder = node.ownerDocument.createElement('relax')
+                holder.appendChild(stream.expand(node))
+                xml_to_object(holder, self, file_version=file_version)
+                holder.unlink()
+
+            # Free the DOM tree.
+            node.unlink()
+
+        # No target data pipe.
+        if pipe_to and not pipes:
+            raise RelaxError("The XML file contains no data pipes.")
+
+        # Set the current pipe.
+        if not pipe_to and self.current_pipe in self:
+            builtins.cdp = self[self.current_pipe]
 
         # Finally update the molecule, residue, and spin metadata for each data pipe.
         for pipe in pipes:
             pipe_control.mol_res_spin.metadata_update(pipe=pipe)
 
+        # Attach the binary format column data, in the order of the column index.
+        if columns:
+            if pipe_to:
+                names = [pipe_to]
+            else:
+                names = [pipe['name'] for pipe in columns[1]['pipes']]
+            self._attach_columns(dir=columns[0], index=columns[1], pipes=names)
+
         # Backwards compatibility transformations.
         self._back_compat_hook(file_version, pipes=pipes)
 
 
+    def to_binary(self, dir, pipes=None, compress_type=1, verbosity=1):
+        """Save the data pipes in the binary columnar format.
+
+        All float, float list, and float dictionary objects of the spin and interatomic containers are stored as numpy .npy column files in the directory, together with an index of the columns, and all other data is saved in an XML file via the to_xml() method.
+
+
+        @param dir:             The binary format directory.
+        @type dir:              str
+        @keyword pipes:         The name of the pipe, or list of pipes to save.
+        @type pipes:            str or list of str
+        @keyword compress_type: The compression type of the XML file.  The integer values correspond to the compression type: 0, no compression; 1, Bzip2 compression; 2, Gzip compression.
+        @type compress_type:    int
+        @keyword verbosity:     The verbosity level.
+        @type verbosity:        int
+        """
+
+        # The pipes to include.
+        if not pipes:
+            pipe_names = sorted(self.keys())
+        elif isinstance(pipes, str):
+            pipe_names = [pipes]
+        else:
+            pipe_names = sorted(pipes)
+
+        # Create the directory, and remove the column index and all XML files of a previous save.
+        mkdir_nofail(dir, verbosity=0)
+        delete(BINARY_INDEX_FILE, dir=dir, fail=False)
+        for ext in ['', '.bz2', '.gz']:
+            delete(BINARY_XML_FILE + ext, dir=dir, fail=False)
+
+        # Remove the float data from the containers.
+        index = {'file_version': 1, 'pipes': []}
+        extracted = []
+        try:
+            for i in range(len(pipe_names)):
+                index['pipes'].append({'name': pipe_names[i], 'lists': {}})
+                for list_type, containers in pipe_containers(self[pipe_names[i]]):
+                    columns, removed = extract_columns(containers=containers)
+                    extracted.append([containers, removed])
+                    index['pipes'][-1]['lists'][list_type] = {'count': len(containers), 'names': columns.names, 'kinds': columns.kinds}
+
+                    # Save the columns.
+                    write_columns(dir=dir, prefix="pipe%i_%s" % (i, list_type), columns=columns)
+
+            # Save all other data as XML.
+            file = open_write_file(file_name=BINARY_XML_FILE, dir=dir, force=True, compress_type=compress_type, verbosity=verbosity)
+            self.to_xml(file, pipes=pipes)
+            file.close()
+
+        # Restore the float data.
+        finally:
+            for containers, removed in extracted:
+                restore_columns(containers=containers, removed=removed)
+
+        # Save the column index last, as this identifies the directory as complete.
+        file = open_write_file(file_name=BINARY_INDEX_FILE, dir=dir, force=True, verbosity=verbosity)
+        dump(index, file, indent=4)
+        file.close()
+
+
     def to_xml(self, file, pipes=None):
         """Create a XML document representation of the current data pipe.
 
         This method creates the top level XML document including all the information needed
-        about relax, calls the PipeContainer.xml_write() method to fill in the document contents,
-        and writes the XML into the file object.
+        about relax, calls the PipeContainer.to_xml() method to fill in the document contents,
+        and writes the XML into the file object.  The data pipes are written out directly, one
+        molecule, residue, spin, or interatomic element at a time, so that the full XML tree of
+        a data pipe never exists in memory.
 
         @param file:        The open file object.
         @type file:         file
@@ -662,19 +816,34 @@ class Relax_data_store(dict):
             # Add all simple python objects within the store.
             fill_object_contents(xmldoc, top_element, object=self, blacklist=blacklist)
 
-        # Loop over the pipes.
+        # No data pipes.
+        if not pipes:
+            file.write(xmldoc.toprettyxml(indent='    '))
+            return
+
+        # Write out the XML file header and all non-pipe elements, leaving the top level element open.
+        header = xmldoc.toprettyxml(indent='    ')
+        if header.endswith('/>\n'):
+            header = header[:-3] + '>\n'
+        else:
+            header = header[:header.rindex('</relax>')]
+        file.write(header)
+
+        # Loop over the pipes, writing each out directly to the file so that only a single spin or interatomic XML tree exists at any time.
         for pipe in pipes:
-            # Create the pipe XML element and add it to the top level XML element.
+            # Create the pipe XML element.
             pipe_element = xmldoc.createElement('pipe')
-            top_element.appendChild(pipe_element)
 
             # Set the data pipe attributes.
             pipe_element.setAttribute('desc', 'The contents of a relax data pipe')
             pipe_element.setAttribute('name', pipe)
             pipe_element.setAttribute('type', self[pipe].pipe_type)
 
-            # Fill the data pipe XML element.
-            self[pipe].to_xml(xmldoc, pipe_element, pipe_type=self[pipe].pipe_type)
+            # Write out the element, filling its contents directly into the file.
+            write_element_start(file, pipe_element, indent='    ')
+            self[pipe].to_xml(xmldoc, pipe_element, pipe_type=self[pipe].pipe_type, file=file, indent='        ')
+            write_element_end(file, pipe_element, indent='    ')
+            pipe_element.unlink()
 
-        # Write out the XML file.
-        file.write(xmldoc.toprettyxml(indent='    '))
+        # Close the top level element.
+        file.write('</relax>\n')
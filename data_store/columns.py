@@ -0,0 +1,433 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""The binary columnar storage of the spin and interatomic data of the relax data store.
+
+In the binary state and results format, all float objects, lists of floats, and dictionaries of floats of the spin and interatomic data containers are stored as one typed numpy column per object name over all containers of a data pipe.  The columns are saved as .npy files next to the XML file holding all other data.  On loading, the column files are memory-mapped and the values are only attached to the containers on the first access of the object.
+"""
+
+# Python module imports.
+from numpy import array, float64, load, nan, save, uint8, zeros
+from os import F_OK, access, sep, unlink
+from os.path import isdir
+from re import search
+
+# relax module imports.
+from data_store.prototype import attach_source, materialise
+
+
+# The file names of the binary format directory.
+BINARY_INDEX_FILE = 'columns.json'
+BINARY_XML_FILE = 'data.xml'
+
+# The flags for the state of the object in each container.
+FLAG_MISSING = 0
+FLAG_NONE = 1
+FLAG_VALUE = 2
+
+
+class Columns(object):
+    """The columns of the float data for one list of containers."""
+
+    def __init__(self, names=None, kinds=None, values=None, flags=None):
+        """Set up the column data structure.
+
+        @keyword names:     The object names for each column.
+        @type names:        list of str
+        @keyword kinds:     The type of each column, either 'float', 'list', or the list of dictionary keys.
+        @type kinds:        list of str or list of str lists
+        @keyword values:    The float values for each column, with NaN for the missing values.
+        @type values:       list of numpy rank-1 or rank-2 float64 arrays
+        @keyword flags:     The FLAG_* state of the object in each container, for each column.
+        @type flags:        numpy rank-2 uint8 array
+        """
+
+        # Store the data.
+        self.names = names
+        self.kinds = kinds
+        self.values = values
+        self.flags = flags
+
+        # The column index of each object name.
+        self.index = {}
+        for i in range(len(names)):
+            self.index[names[i]] = i
+
+
+    def has(self, i, name):
+        """Determine if the object exists for the given container.
+
+        @param i:       The index of the container.
+        @type i:        int
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        True if the column data is set for the container.
+        @rtype:         bool
+        """
+
+        # Check the flag.
+        return name in self.index and self.flags[self.index[name], i] != FLAG_MISSING
+
+
+    def names_at(self, i):
+        """Return the names of all objects of the given container.
+
+        @param i:   The index of the container.
+        @type i:    int
+        @return:    The object names.
+        @rtype:     list of str
+        """
+
+        # The names with set flags.
+        return [self.names[j] for j in self.flags[:, i].nonzero()[0]]
+
+
+    def value(self, i, name):
+        """Return the Python object for the given container.
+
+        @param i:       The index of the container.
+        @type i:        int
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        The float, list of floats, or dictionary of floats.
+        @rtype:         float, list of float, or dict of float
+        """
+
+        # The column.
+        j = self.index[name]
+
+        # None.
+        if self.flags[j, i] == FLAG_NONE:
+            return None
+
+        # Floats.
+        if self.kinds[j] == 'float':
+            return float(self.values[j][i])
+
+        # Lists of floats.
+        if self.kinds[j] == 'list':
+            return self.values[j][i].tolist()
+
+        # Dictionaries of floats.
+        return dict(zip(self.kinds[j], self.values[j][i].tolist()))
+
+
+
+class ContainerColumns(object):
+    """The data source of the column data for a single data container (see the data_store.prototype module)."""
+
+    def __init__(self, columns=None, i=None):
+        """Set up the data source.
+
+        @keyword columns:   The column data.
+        @type columns:      Columns instance
+        @keyword i:         The index of the container.
+        @type i:            int
+        """
+
+        # Store the data.
+        self.columns = columns
+        self.i = i
+
+
+    def __contains__(self, name):
+        """Determine if the object is in the column data of the container.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        True if the object exists.
+        @rtype:         bool
+        """
+
+        # Check the columns.
+        return self.columns.has(self.i, name)
+
+
+    def discard(self, name):
+        """The column data is read only, so there is nothing to release.
+
+        @param name:    The name of the object.
+        @type name:     str
+        """
+
+
+    def names(self):
+        """Return the names of all objects of the container.
+
+        @return:    The object names.
+        @rtype:     list of str
+        """
+
+        # The names.
+        return self.columns.names_at(self.i)
+
+
+    def peek(self, name):
+        """Return the object.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        A new Python object.
+        @rtype:         float, list of float, or dict of float
+        """
+
+        # A new object.
+        return self.columns.value(self.i, name)
+
+
+    def share(self):
+        """The column data is read only, so it can be shared by any number of containers."""
+
+
+    def take(self, name):
+        """Return the object.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        A new Python object.
+        @rtype:         float, list of float, or dict of float
+        """
+
+        # A new object.
+        return self.columns.value(self.i, name)
+
+
+
+def attach_columns(containers=None, columns=None):
+    """Lazily attach the column data to each container.
+
+    @keyword containers:    The list of data containers.
+    @type containers:       list of Prototype instances
+    @keyword columns:       The column data.
+    @type columns:          Columns instance
+    """
+
+    # Loop over the containers.
+    for i in range(len(containers)):
+        attach_source(containers[i], ContainerColumns(columns=columns, i=i))
+
+
+def extract_columns(containers=None):
+    """Remove all float objects from the containers, returning them as columns.
+
+    The float, list of float and dictionary of float objects are converted to columns, with None values allowed.  All lists of a column must be of the same length, and all dictionaries must have the same keys in the same order, otherwise the object is left in the containers.
+
+
+    @keyword containers:    The list of data containers.
+    @type containers:       list of Prototype instances
+    @return:                The column data and, for restoring the containers after the other data has been saved, the removed objects of each container.
+    @rtype:                 Columns instance, list of dict
+    """
+
+    # Attach all pending data.
+    for container in containers:
+        materialise(container)
+
+    # Classify the objects of all containers.
+    kinds = {}
+    invalid = set()
+    for container in containers:
+        for name in container.__dict__:
+            # Skip private and invalid objects.
+            if name in invalid or search('^_', name):
+                continue
+
+            # The type.
+            value = container.__dict__[name]
+            if value is None:
+                continue
+            elif type(value) == float:
+                kind = 'float'
+            elif type(value) == list and len(value) and not [x for x in value if type(x) != float]:
+                kind = len(value)
+            elif isinstance(value, dict) and len(value) and not [key for key in value if type(key) != str or type(value[key]) != float]:
+                kind = list(value.keys())
+            else:
+                invalid.add(name)
+                continue
+
+            # The same type is required for all containers.
+            if name in kinds and kinds[name] != kind:
+                invalid.add(name)
+                continue
+            kinds[name] = kind
+
+    # The column names.
+    names = sorted([name for name in kinds if name not in invalid])
+
+    # Initialise the data structures.
+    n = len(containers)
+    values = []
+    flags = zeros((len(names), n), uint8)
+    removed = [{} for i in range(n)]
+
+    # Loop over the columns.
+    for j in range(len(names)):
+        name = names[j]
+        kind = kinds[name]
+
+        # The float values.
+        if kind == 'float':
+            column = zeros(n, float64)
+        elif type(kind) == int:
+            column = zeros((n, kind), float64)
+        else:
+            column = zeros((n, len(kind)), float64)
+        column[:] = nan
+
+        # Loop over the containers.
+        for i in range(n):
+            # Missing.
+            if name not in containers[i].__dict__:
+                continue
+
+            # Remove the object.
+            value = containers[i].__dict__.pop(name)
+            removed[i][name] = value
+
+            # None.
+            if value is None:
+                flags[j, i] = FLAG_NONE
+                continue
+
+            # Store the value.
+            flags[j, i] = FLAG_VALUE
+            if kind == 'float':
+                column[i] = value
+            elif type(kind) == list:
+                column[i] = [value[key] for key in kind]
+            else:
+                column[i] = value
+
+        # Store the column.
+        values.append(column)
+
+    # The final kinds.
+    kinds = [kinds[name] for name in names]
+    for j in range(len(kinds)):
+        if type(kinds[j]) == int:
+            kinds[j] = 'list'
+
+    # Return the data.
+    return Columns(names=names, kinds=kinds, values=values, flags=flags), removed
+
+
+def is_binary_dir(path):
+    """Determine if the path is a binary format directory.
+
+    @param path:    The full path.
+    @type path:     str
+    @return:        True if the path is a directory containing the column index file.
+    @rtype:         bool
+    """
+
+    # Check for the index.
+    return isdir(path) and access(path + sep + BINARY_INDEX_FILE, F_OK)
+
+
+def pipe_containers(pipe):
+    """Return the lists of containers of the data pipe with column data.
+
+    @param pipe:    The data pipe.
+    @type pipe:     PipeContainer instance
+    @return:        The list type ('spin' or 'interatom') and the list of containers, for each list.
+    @rtype:         list of [str, list of Prototype instances]
+    """
+
+    # The spins, in the molecule-residue-spin order.
+    spins = []
+    for mol in pipe.mol:
+        for res in mol.res:
+            spins += res.spin
+
+    # Return the lists.
+    return [['spin', spins], ['interatom', list(pipe.interatomic)]]
+
+
+def read_columns(dir=None, prefix=None, names=None, kinds=None):
+    """Memory-map the column data from the .npy files.
+
+    @keyword dir:       The directory containing the files.
+    @type dir:          str
+    @keyword prefix:    The file name prefix for the list of containers.
+    @type prefix:       str
+    @keyword names:     The object names for each column.
+    @type names:        list of str
+    @keyword kinds:     The type of each column, either 'float', 'list', or the list of dictionary keys.
+    @type kinds:        list of str or list of str lists
+    @return:            The column data.
+    @rtype:             Columns instance
+    """
+
+    # The flags, in memory as these are modified.
+    flags = array(load(dir + sep + prefix + '_flags.npy'))
+
+    # Memory-map the values.
+    values = []
+    for name in names:
+        values.append(load(dir + sep + prefix + '_' + name + '.npy', mmap_mode='r'))
+
+    # Return the data.
+    return Columns(names=names, kinds=kinds, values=values, flags=flags)
+
+
+def restore_columns(containers=None, removed=None):
+    """Return the objects removed by extract_columns() to the containers.
+
+    @keyword containers:    The list of data containers.
+    @type containers:       list of Prototype instances
+    @keyword removed:       The removed objects of each container.
+    @type removed:          list of dict
+    """
+
+    # Loop over the containers.
+    for i in range(len(containers)):
+        containers[i].__dict__.update(removed[i])
+
+
+def write_columns(dir=None, prefix=None, columns=None):
+    """Save the column data as .npy files.
+
+    Existing files are first deleted rather than overwritten, as the old files may still be memory-mapped.
+
+
+    @keyword dir:       The directory to save the files in.
+    @type dir:          str
+    @keyword prefix:    The file name prefix for the list of containers.
+    @type prefix:       str
+    @keyword columns:   The column data.
+    @type columns:      Columns instance
+    """
+
+    # The files.
+    files = [dir + sep + prefix + '_flags.npy']
+    for name in columns.names:
+        files.append(dir + sep + prefix + '_' + name + '.npy')
+
+    # Save the data.
+    for i in range(len(files)):
+        if access(files[i], F_OK):
+            unlink(files[i])
+        if i == 0:
+            save(files[i], columns.flags)
+        else:
+            save(files[i], columns.values[i-1])
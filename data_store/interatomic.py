@@ -32,7 +32,7 @@ from re import match
 from data_store.prototype import Prototype
 from lib.errors import RelaxFromXMLNotEmptyError, RelaxImplementError
 from lib.text.table import format_table
-from lib.xml import fill_object_contents, object_to_xml, xml_to_object
+from lib.xml import fill_object_contents, object_to_xml, write_elements, xml_to_object
 import specific_analyses
 
 
@@ -135,6 +135,14 @@ class InteratomContainer(Prototype):
 class InteratomList(list):
     """List type data container for interatomic specific data."""
 
+    def __init__(self):
+        """Set up the interatomic data container list."""
+
+        # Create special private lookup tables of the container indices for fast spin hash and spin hash pair accesses.
+        self._spin_hash_lookup = {}
+        self._spin_hash_pair_lookup = {}
+
+
     def __repr__(self):
         """The string representation of the object.
 
@@ -172,10 +180,96 @@ class InteratomList(list):
         cont = InteratomContainer(spin_id1, spin_id2, spin_hash1, spin_hash2)
         self.append(cont)
 
+        # Update the lookup tables.
+        self.lookup_add(len(self) - 1)
+
         # Return the container.
         return cont
 
 
+    def hash_pair(self, spin_hash1, spin_hash2):
+        """Return the key of the spin hash pair lookup table, independent of the spin order.
+
+        @param spin_hash1:  The unique spin hash for the first atom.
+        @type spin_hash1:   str
+        @param spin_hash2:  The unique spin hash for the second atom.
+        @type spin_hash2:   str
+        @return:            The key.
+        @rtype:             tuple of str
+        """
+
+        # Sort the hashes.
+        if spin_hash2 < spin_hash1:
+            return spin_hash2, spin_hash1
+        return spin_hash1, spin_hash2
+
+
+    def lookup_add(self, index):
+        """Add the container to the lookup tables, using its current spin hashes.
+
+        The table entries are replaced rather than modified, so that the tables can be shared by the copy-on-write clones of the list.
+
+
+        @param index:   The index of the container.
+        @type index:    int
+        """
+
+        # Alias.
+        cont = self[index]
+
+        # The spin hashes.
+        for spin_hash in set([cont._spin_hash1, cont._spin_hash2]):
+            if spin_hash != None:
+                self._spin_hash_lookup[spin_hash] = self._spin_hash_lookup.get(spin_hash, ()) + (index,)
+
+        # The spin hash pair, with the first container taking precedence.
+        if cont._spin_hash1 != None and cont._spin_hash2 != None and cont._spin_hash1 != cont._spin_hash2:
+            key = self.hash_pair(cont._spin_hash1, cont._spin_hash2)
+            if key not in self._spin_hash_pair_lookup or index < self._spin_hash_pair_lookup[key]:
+                self._spin_hash_pair_lookup[key] = index
+
+
+    def lookup_remove(self, index):
+        """Remove the container from the lookup tables, using its current spin hashes.
+
+        @param index:   The index of the container.
+        @type index:    int
+        """
+
+        # Alias.
+        cont = self[index]
+
+        # The spin hashes.
+        for spin_hash in set([cont._spin_hash1, cont._spin_hash2]):
+            if spin_hash in self._spin_hash_lookup:
+                indices = tuple([i for i in self._spin_hash_lookup[spin_hash] if i != index])
+                if indices:
+                    self._spin_hash_lookup[spin_hash] = indices
+                else:
+                    self._spin_hash_lookup.pop(spin_hash)
+
+        # The spin hash pair, falling back to any other container of the pair.
+        if cont._spin_hash1 != None and cont._spin_hash2 != None:
+            key = self.hash_pair(cont._spin_hash1, cont._spin_hash2)
+            if self._spin_hash_pair_lookup.get(key) == index:
+                self._spin_hash_pair_lookup.pop(key)
+                others = [i for i in self._spin_hash_lookup.get(cont._spin_hash1, ()) if set([self[i]._spin_hash1, self[i]._spin_hash2]) == set(key)]
+                if others:
+                    self._spin_hash_pair_lookup[key] = min(others)
+
+
+    def lookup_reset(self):
+        """Rebuild the lookup tables from the spin hashes of all containers."""
+
+        # Reset the tables.
+        self._spin_hash_lookup = {}
+        self._spin_hash_pair_lookup = {}
+
+        # Add all containers.
+        for i in range(len(self)):
+            self.lookup_add(i)
+
+
     def is_empty(self):
         """Method for testing if this InteratomList object is empty.
 
@@ -195,7 +289,7 @@ class InteratomList(list):
         """Recreate an interatomic list data structure from the XML spin nodes.
 
         @param interatom_nodes: The spin XML nodes.
-        @type interatom_nodes:  xml.dom.minicompat.NodeList instance
+        @type interatom_nodes:  xml.dom.minicompat.NodeList instance or iterable
         @keyword file_version:  The relax XML version of the XML file.
         @type file_version:     int
         """
@@ -215,15 +309,22 @@ class InteratomList(list):
             xml_to_object(interatom_node, self[-1], file_version=file_version)
 
 
-    def to_xml(self, doc, element, pipe_type=None):
+    def to_xml(self, doc, element, pipe_type=None, file=None, indent=''):
         """Create XML elements for each spin.
 
+        If the file is supplied, each element is written out and freed once created.
+
+
         @param doc:         The XML document object.
         @type doc:          xml.dom.minidom.Document instance
         @param element:     The element to add the spin XML elements to.
         @type element:      XML element object
         @keyword pipe_type: The type of the pipe being converted to XML.
         @type pipe_type:    str
+        @keyword file:      The open file object to directly write the elements to.
+        @type file:         file
+        @keyword indent:    The indentation of the elements in the file.
+        @type indent:       str
         """
 
         # The specific analysis API object.
@@ -281,3 +382,7 @@ class InteratomList(list):
 
             # Add all simple python objects within the InteratomContainer to the XML element.
             fill_object_contents(doc, interatom_element, object=self[i], blacklist=['spin_id1', 'spin_id2'] + blacklist + list(self[i].__class__.__dict__.keys()))
+
+            # Write out and free the element.
+            if file:
+                write_elements(file, element, indent=indent)
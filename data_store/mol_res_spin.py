@@ -31,7 +31,7 @@ from re import match
 # relax module imports.
 from data_store.prototype import Prototype
 from lib.errors import RelaxError, RelaxFromXMLNotEmptyError, RelaxImplementError
-from lib.xml import fill_object_contents, object_to_xml, xml_to_object
+from lib.xml import XML_INDENT, fill_object_contents, object_to_xml, str_to_python, write_element_end, write_element_start, write_elements, xml_to_object
 import specific_analyses
 
 
@@ -303,7 +303,7 @@ class SpinList(list):
         """Recreate a spin list data structure from the XML spin nodes.
 
         @param spin_nodes:      The spin XML nodes.
-        @type spin_nodes:       xml.dom.minicompat.NodeList instance
+        @type spin_nodes:       xml.dom.minicompat.NodeList instance or iterable
         @keyword file_version:  The relax XML version of the XML file.
         @type file_version:     int
         """
@@ -318,7 +318,7 @@ class SpinList(list):
             name = str(spin_node.getAttribute('name'))
             if name == 'None':
                 name = None
-            num = eval(spin_node.getAttribute('num'))
+            num = str_to_python(spin_node.getAttribute('num'))
 
             # Get the spin details and add the spin to the SpinList structure.
             self.add_item(spin_name=name, spin_num=num)
@@ -330,15 +330,22 @@ class SpinList(list):
             self[-1]._back_compat_hook(file_version)
 
 
-    def to_xml(self, doc, element, pipe_type=None):
+    def to_xml(self, doc, element, pipe_type=None, file=None, indent=''):
         """Create XML elements for each spin.
 
+        If the file is supplied, each element is written out and freed once created.
+
+
         @param doc:         The XML document object.
         @type doc:          xml.dom.minidom.Document instance
         @param element:     The element to add the spin XML elements to.
         @type element:      XML element object
         @keyword pipe_type: The type of the pipe being converted to XML.
         @type pipe_type:    str
+        @keyword file:      The open file object to directly write the elements to.
+        @type file:         file
+        @keyword indent:    The indentation of the elements in the file.
+        @type indent:       str
         """
 
         # The specific analysis API object.
@@ -397,6 +404,10 @@ class SpinList(list):
             # Add all simple python objects within the SpinContainer to the XML element.
             fill_object_contents(doc, spin_element, object=self[i], blacklist=['name', 'num', 'spin'] + blacklist + list(self[i].__class__.__dict__.keys()))
 
+            # Write out and free the element.
+            if file:
+                write_elements(file, element, indent=indent)
+
 
 
 # The residue data.
@@ -562,13 +573,18 @@ class ResidueList(list):
         return False
 
 
-    def from_xml(self, res_nodes, file_version=None):
+    def from_xml(self, res_nodes, file_version=None, stream=None):
         """Recreate a residue list data structure from the XML residue nodes.
 
+        If the XML element stream is supplied, the residue nodes are not expanded and the spin nodes are read from the stream one at a time.
+
+
         @param res_nodes:       The residue XML nodes.
-        @type res_nodes:        xml.dom.minicompat.NodeList instance
+        @type res_nodes:        xml.dom.minicompat.NodeList instance or iterable
         @keyword file_version:  The relax XML version of the XML file.
         @type file_version:     int
+        @keyword stream:        The XML element stream.
+        @type stream:           lib.xml.Xml_element_stream instance
         """
 
         # Test if empty.
@@ -581,32 +597,43 @@ class ResidueList(list):
             name = str(res_node.getAttribute('name'))
             if name == 'None':
                 name = None
-            num = eval(res_node.getAttribute('num'))
+            num = str_to_python(res_node.getAttribute('num'))
             self.add_item(res_name=name, res_num=num)
 
             # Get the spin nodes.
-            spin_nodes = res_node.getElementsByTagName('spin')
+            if stream:
+                spin_nodes = stream.child_elements('spin', expand=True)
+            else:
+                spin_nodes = res_node.getElementsByTagName('spin')
 
             # Recreate the spin data structures for the current residue.
             self[-1].spin.from_xml(spin_nodes, file_version=file_version)
 
 
-    def to_xml(self, doc, element, pipe_type=None):
+    def to_xml(self, doc, element, pipe_type=None, file=None, indent=''):
         """Create XML elements for each residue.
 
+        If the file is supplied, each element is written out and freed once created.
+
+
         @param doc:         The XML document object.
         @type doc:          xml.dom.minidom.Document instance
         @param element:     The element to add the residue XML elements to.
         @type element:      XML element object
         @keyword pipe_type: The type of the pipe being converted to XML.
         @type pipe_type:    str
+        @keyword file:      The open file object to directly write the elements to.
+        @type file:         file
+        @keyword indent:    The indentation of the elements in the file.
+        @type indent:       str
         """
 
         # Loop over the residues.
         for i in range(len(self)):
-            # Create an XML element for this residue and add it to the higher level element.
+            # Create an XML element for this residue and add it to the higher level element (the element is written out directly if the file is supplied).
             res_element = doc.createElement('res')
-            element.appendChild(res_element)
+            if not file:
+                element.appendChild(res_element)
 
             # Set the residue attributes.
             res_element.setAttribute('desc', 'Residue container')
@@ -616,8 +643,17 @@ class ResidueList(list):
             # Add all simple python objects within the ResidueContainer to the XML element.
             fill_object_contents(doc, res_element, object=self[i], blacklist=['name', 'num', 'spin'] + list(self[i].__class__.__dict__.keys()))
 
+            # Write out the start of the element.
+            if file:
+                write_element_start(file, res_element, indent=indent)
+
             # Add the residue data.
-            self[i].spin.to_xml(doc, res_element, pipe_type=pipe_type)
+            self[i].spin.to_xml(doc, res_element, pipe_type=pipe_type, file=file, indent=indent+XML_INDENT)
+
+            # Write out the end of the element, and free it.
+            if file:
+                write_element_end(file, res_element, indent=indent)
+                res_element.unlink()
 
 
 
@@ -726,6 +762,11 @@ class MoleculeList(list):
         self._spin_id_lookup = {}
         self._spin_hash_lookup = {}
 
+        # Create the special private lookup tables of the compiled spin selections and unique spin IDs, and the plain name flag (reset by the metadata updates).
+        self._selection_lookup = {}
+        self._spin_unique_id_lookup = {}
+        self._plain_names = None
+
 
     def __repr__(self):
         """The string representation of the object.
@@ -777,13 +818,18 @@ class MoleculeList(list):
         return False
 
 
-    def from_xml(self, mol_nodes, file_version=None):
+    def from_xml(self, mol_nodes, file_version=None, stream=None):
         """Recreate a molecule list data structure from the XML molecule nodes.
 
+        If the XML element stream is supplied, the molecule nodes are not expanded and the residue and spin nodes are read from the stream one at a time.
+
+
         @param mol_nodes:       The molecule XML nodes.
-        @type mol_nodes:        xml.dom.minicompat.NodeList instance
+        @type mol_nodes:        xml.dom.minicompat.NodeList instance or iterable
         @keyword file_version:  The relax XML version of the XML file.
         @type file_version:     int
+        @keyword stream:        The XML element stream.
+        @type stream:           lib.xml.Xml_element_stream instance
         """
 
         # Test if empty.
@@ -802,28 +848,39 @@ class MoleculeList(list):
             self.add_item(mol_name=name, mol_type=type)
 
             # Get the residue nodes.
-            res_nodes = mol_node.getElementsByTagName('res')
+            if stream:
+                res_nodes = stream.child_elements('res')
+            else:
+                res_nodes = mol_node.getElementsByTagName('res')
 
             # Recreate the residue data structures for the current molecule.
-            self[-1].res.from_xml(res_nodes, file_version=file_version)
+            self[-1].res.from_xml(res_nodes, file_version=file_version, stream=stream)
 
 
-    def to_xml(self, doc, element, pipe_type=None):
+    def to_xml(self, doc, element, pipe_type=None, file=None, indent=''):
         """Create XML elements for each molecule.
 
+        If the file is supplied, each element is written out and freed once created.
+
+
         @param doc:         The XML document object.
         @type doc:          Xml.dom.minidom.Document instance
         @param element:     The element to add the molecule XML elements to.
         @type element:      XML element object
         @keyword pipe_type: The type of the pipe being converted to XML.
         @type pipe_type:    str
+        @keyword file:      The open file object to directly write the elements to.
+        @type file:         file
+        @keyword indent:    The indentation of the elements in the file.
+        @type indent:       str
         """
 
         # Loop over the molecules.
         for i in range(len(self)):
-            # Create an XML element for this molecule and add it to the higher level element.
+            # Create an XML element for this molecule and add it to the higher level element (the element is written out directly if the file is supplied).
             mol_element = doc.createElement('mol')
-            element.appendChild(mol_element)
+            if not file:
+                element.appendChild(mol_element)
 
             # Set the molecule attributes.
             mol_element.setAttribute('desc', 'Molecule container')
@@ -833,5 +890,14 @@ class MoleculeList(list):
             # Add all simple python objects within the MoleculeContainer to the XML element.
             fill_object_contents(doc, mol_element, object=self[i], blacklist=['name', 'res', 'type'] + list(self[i].__class__.__dict__.keys()))
 
+            # Write out the start of the element.
+            if file:
+                write_element_start(file, mol_element, indent=indent)
+
             # Add the residue data.
-            self[i].res.to_xml(doc, mol_element, pipe_type=pipe_type)
+            self[i].res.to_xml(doc, mol_element, pipe_type=pipe_type, file=file, indent=indent+XML_INDENT)
+
+            # Write out the end of the element, and free it.
+            if file:
+                write_element_end(file, mol_element, indent=indent)
+                mol_element.unlink()
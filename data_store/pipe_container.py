@@ -32,10 +32,10 @@ from data_store.diff_tensor import DiffTensorData
 from data_store.exp_info import ExpInfo
 from data_store.interatomic import InteratomList
 from data_store.mol_res_spin import MoleculeList
-from data_store.prototype import Prototype
+from data_store.prototype import Prototype, cow_clone
 from lib.errors import RelaxFromXMLNotEmptyError
 from lib.structure.internal.object import Internal
-from lib.xml import fill_object_contents, node_value_to_python, xml_to_object
+from lib.xml import fill_object_contents, node_value_to_python, write_elements, xml_to_object
 
 
 class PipeContainer(Prototype):
@@ -57,6 +57,20 @@ class PipeContainer(Prototype):
         self.hybrid_pipes = []
 
 
+    def __clone__(self):
+        """Return a copy-on-write clone of the data pipe.
+
+        The molecule, residue, spin and interatomic data containers are duplicated, but all of their data and all of the data of the pipe itself is shared with the original data pipe until first accessed.  Unmodified immutable objects are never copied.  The container hashes and the spin ID look up tables are reused rather than regenerated.
+
+
+        @return:    The clone of the data pipe.
+        @rtype:     PipeContainer instance
+        """
+
+        # The clone.
+        return cow_clone(self)
+
+
     def __repr__(self):
         """The string representation of the object.
 
@@ -171,21 +185,15 @@ class PipeContainer(Prototype):
         cdp.frq = frq
 
 
-    def from_xml(self, pipe_node, file_version=None, dir=None):
-        """Read a pipe container XML element and place the contents into this pipe.
+    def _from_xml_header(self, pipe_node, file_version=None):
+        """Read the global, hybrid, experimental information, and tensor XML elements of the data pipe.
 
         @param pipe_node:       The data pipe XML node.
         @type pipe_node:        xml.dom.minidom.Element instance
         @keyword file_version:  The relax XML version of the XML file.
         @type file_version:     int
-        @keyword dir:           The name of the directory containing the results file (needed for loading external files).
-        @type dir:              str
         """
 
-        # Test if empty.
-        if not self.is_empty():
-            raise RelaxFromXMLNotEmptyError(self.__class__.__name__)
-
         # Get the global data node, and fill the contents of the pipe.
         global_node = pipe_node.getElementsByTagName('global')[0]
         xml_to_object(global_node, self, file_version=file_version)
@@ -225,13 +233,90 @@ class PipeContainer(Prototype):
             # Fill its contents.
             self.align_tensors.from_xml(align_tensor_nodes[0], file_version=file_version)
 
-        # Recreate the interatomic data structure (this needs to be before the 'mol' structure as the backward compatibility hooks can create interatomic data containers!).
-        interatom_nodes = pipe_node.getElementsByTagName('interatomic')
-        self.interatomic.from_xml(interatom_nodes, file_version=file_version)
 
-        # Recreate the molecule, residue, and spin data structure.
-        mol_nodes = pipe_node.getElementsByTagName('mol')
-        self.mol.from_xml(mol_nodes, file_version=file_version)
+    def _from_xml_stream(self, pipe_node, stream, file_version=None):
+        """Read the child elements of the data pipe XML element from the stream.
+
+        The molecule, residue, spin, and interatomic elements are read one at a time.  All other elements are expanded into the pipe node.
+
+
+        @param pipe_node:       The data pipe XML node, without its child elements.
+        @type pipe_node:        xml.dom.minidom.Element instance
+        @param stream:          The XML element stream, positioned at the start of the data pipe contents.
+        @type stream:           lib.xml.Xml_element_stream instance
+        @keyword file_version:  The relax XML version of the XML file.
+        @type file_version:     int
+        """
+
+        # Loop over the child elements.
+        header = True
+        while True:
+            # The next element.
+            node = stream.peek()
+
+            # The end of the data pipe.
+            if node == None:
+                stream.next_child()
+                break
+
+            # The global data is required prior to the molecule, residue, spin, and interatomic data.
+            if header and node.tagName in ['mol', 'interatomic']:
+                self._from_xml_header(pipe_node, file_version=file_version)
+                header = False
+
+            # Recreate the molecule, residue, and spin data structure, one spin at a time.
+            if node.tagName == 'mol':
+                self.mol.from_xml(stream.children('mol'), file_version=file_version, stream=stream)
+
+            # Recreate the interatomic data structure, one container at a time.
+            elif node.tagName == 'interatomic':
+                self.interatomic.from_xml(stream.children('interatomic', expand=True), file_version=file_version)
+
+            # Store all other elements.
+            else:
+                pipe_node.appendChild(stream.expand(stream.next_child()))
+
+        # The header elements, if not already read.
+        if header:
+            self._from_xml_header(pipe_node, file_version=file_version)
+
+
+    def from_xml(self, pipe_node, file_version=None, dir=None, stream=None):
+        """Read a pipe container XML element and place the contents into this pipe.
+
+        If the XML element stream is supplied, the pipe node is not expanded and its contents are read from the stream, so that only a single spin or interatomic XML element exists at any time.
+
+
+        @param pipe_node:       The data pipe XML node.
+        @type pipe_node:        xml.dom.minidom.Element instance
+        @keyword file_version:  The relax XML version of the XML file.
+        @type file_version:     int
+        @keyword dir:           The name of the directory containing the results file (needed for loading external files).
+        @type dir:              str
+        @keyword stream:        The XML element stream, positioned at the start of the data pipe contents.
+        @type stream:           lib.xml.Xml_element_stream instance
+        """
+
+        # Test if empty.
+        if not self.is_empty():
+            raise RelaxFromXMLNotEmptyError(self.__class__.__name__)
+
+        # Read the contents from the stream.
+        if stream:
+            self._from_xml_stream(pipe_node, stream, file_version=file_version)
+
+        # Read the contents from the full DOM tree.
+        else:
+            # The header elements.
+            self._from_xml_header(pipe_node, file_version=file_version)
+
+            # Recreate the interatomic data structure (this needs to be before the 'mol' structure as the backward compatibility hooks can create interatomic data containers!).
+            interatom_nodes = pipe_node.getElementsByTagName('interatomic')
+            self.interatomic.from_xml(interatom_nodes, file_version=file_version)
+
+            # Recreate the molecule, residue, and spin data structure.
+            mol_nodes = pipe_node.getElementsByTagName('mol')
+            self.mol.from_xml(mol_nodes, file_version=file_version)
 
         # Get the structural object nodes and, if they exist, fill the contents.
         str_nodes = pipe_node.getElementsByTagName('structure')
@@ -289,15 +374,22 @@ class PipeContainer(Prototype):
         return True
 
 
-    def to_xml(self, doc, element, pipe_type=None):
+    def to_xml(self, doc, element, pipe_type=None, file=None, indent=''):
         """Create a XML element for the current data pipe.
 
+        If the file is supplied, the child elements are written out and freed as they are created, so that only a single spin or interatomic XML element exists at any time.  The start and end tags of the pipe element itself are not written.
+
+
         @param doc:         The XML document object.
         @type doc:          xml.dom.minidom.Document instance
         @param element:     The XML element to add the pipe XML element to.
         @type element:      XML element object
         @keyword pipe_type: The type of the pipe being converted to XML.
         @type pipe_type:    str
+        @keyword file:      The open file object to directly write the child elements to.
+        @type file:         file
+        @keyword indent:    The indentation of the child elements in the file.
+        @type indent:       str
         """
 
         # Add all simple python objects within the PipeContainer to the global element.
@@ -321,16 +413,24 @@ class PipeContainer(Prototype):
         if hasattr(self, 'align_tensors'):
             self.align_tensors.to_xml(doc, element)
 
+        # Write out the elements.
+        if file:
+            write_elements(file, element, indent=indent)
+
         # Add the molecule-residue-spin data.
-        self.mol.to_xml(doc, element, pipe_type=pipe_type)
+        self.mol.to_xml(doc, element, pipe_type=pipe_type, file=file, indent=indent)
 
         # Add the interatomic data.
-        self.interatomic.to_xml(doc, element, pipe_type=pipe_type)
+        self.interatomic.to_xml(doc, element, pipe_type=pipe_type, file=file, indent=indent)
 
         # Add the structural data, if it exists.
         if hasattr(self, 'structure'):
             self.structure.to_xml(doc, element)
 
+        # Write out the elements.
+        if file:
+            write_elements(file, element, indent=indent)
+
 
     def xml_create_hybrid_element(self, doc, element):
         """Create an XML element for the data pipe hybridisation information.
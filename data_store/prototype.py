@@ -20,13 +20,28 @@
 ###############################################################################
 
 # Module docstring.
-"""Module containing the Prototype base class for the molecule-residue-spin containers."""
+"""Module containing the Prototype base class for the molecule-residue-spin containers.
+
+The data containers support the lazy attachment of objects from external data sources.  These are the copy-on-write snapshots shared between the clones of a data container, and the binary format column data (see the data_store.columns module).  The objects of a source are only attached to the container when first accessed.  The dictionaries of a snapshot are attached as CowDict proxies sharing the snapshot dictionary, so that reading does not copy anything.  Setting a container object shadows the source object of the same name, and deleting it hides the source object.  The data sources of a container are stored as a list of [source, consumed names] pairs in the private '_lazy' object.
+"""
 
 
 # Python module imports.
-from copy import deepcopy
+from copy import copy, deepcopy
+from numpy import generic
 from re import search
 
+# relax module imports.
+from lib.compat import unicode
+from lib.errors import RelaxError
+
+
+# The types of objects which can be shared between clones rather than copied.
+IMMUTABLE_TYPES = (bool, bytes, complex, float, generic, int, str, type(None), unicode)
+
+# The consumed names of a data source from which nothing has been consumed.
+NONE_CONSUMED = frozenset()
+
 
 class Prototype(object):
     """Base class implementing the prototype design pattern."""
@@ -47,8 +62,8 @@ class Prototype(object):
             if name in self.__class__.__dict__:
                 continue
 
-            # Get the object.
-            value = getattr(self, name)
+            # Get the object, without attaching it from the data sources.
+            value = peek(self, name)
 
             # Replace the object with a deepcopy of it.
             setattr(new_obj, name, deepcopy(value, memo))
@@ -73,3 +88,610 @@ class Prototype(object):
 
         # Return the new object.
         return new_obj
+
+
+    def __delattr__(self, name):
+        """Delete the object, hiding it in all data sources.
+
+        @param name:    The name of the object.
+        @type name:     str
+        """
+
+        # Hide the pending object.
+        pending = discard(self, name)
+
+        # Normal deletion.
+        if name in self.__dict__ or not pending:
+            object.__delattr__(self, name)
+
+
+    def __dir__(self):
+        """Return all object names, including the pending objects of the data sources but excluding the data source list.
+
+        @return:    The list of names.
+        @rtype:     list of str
+        """
+
+        # The normal names.
+        names = set(dir(self.__class__))
+        names.update(self.__dict__)
+        names.discard('_lazy')
+
+        # The pending names.
+        for source, consumed in self.__dict__.get('_lazy', []):
+            for name in source.names():
+                if name not in consumed:
+                    names.add(name)
+
+        # Return the names.
+        return sorted(names)
+
+
+    def __getattr__(self, name):
+        """Attach the object from the data sources on the first access.
+
+        This is only called if the object does not exist.
+
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        The object.
+        @rtype:         anything
+        """
+
+        # Loop over the data sources (using the dictionary to avoid recursion).
+        for entry in self.__dict__.get('_lazy', ()):
+            # Not pending.
+            if name in entry[1] or name not in entry[0]:
+                continue
+
+            # Attach the object, hiding it in all other data sources.
+            consume(entry, name)
+            value = entry[0].take(name)
+            discard(self, name)
+            self.__dict__[name] = value
+
+            # Return the object.
+            return value
+
+        # No such object.
+        raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+
+
+    def __getstate__(self):
+        """Attach all pending objects for pickling, dropping the data sources.
+
+        @return:    The object dictionary.
+        @rtype:     dict
+        """
+
+        # Attach everything.
+        materialise(self)
+
+        # The dictionary.
+        return self.__dict__.copy()
+
+
+
+class CowDict(dict):
+    """A copy-on-write dictionary sharing the dictionary of a snapshot until first modified.
+
+    All reads are passed to the shared dictionary, which is never modified.  The first modification copies the shared dictionary into the proxy itself, from which point the proxy behaves as a normal dictionary.  Copies, deepcopies and pickles of the proxy are normal dictionaries.
+    """
+
+    __slots__ = ['_shared']
+
+    def __init__(self, shared):
+        """Set up the proxy.
+
+        @param shared:  The shared dictionary, or another proxy of it.
+        @type shared:   dict
+        """
+
+        # Initialise the empty dictionary.
+        dict.__init__(self)
+
+        # Share the dictionary of another proxy.
+        if isinstance(shared, CowDict) and shared._shared is not None:
+            shared = shared._shared
+
+        # Store the shared dictionary.
+        self._shared = shared
+
+
+    def __copy__(self):
+        """Return a normal dictionary copy.
+
+        @return:    The copy.
+        @rtype:     dict
+        """
+
+        # The copy.
+        return self.copy()
+
+
+    def __deepcopy__(self, memo):
+        """Return a normal dictionary deepcopy.
+
+        @param memo:    The deepcopy memo.
+        @type memo:     dict
+        @return:        The deepcopy.
+        @rtype:         dict
+        """
+
+        # The deepcopy.
+        return deepcopy(self.copy(), memo)
+
+
+    def __reduce_ex__(self, protocol):
+        """Pickle the proxy as a normal dictionary.
+
+        @param protocol:    The pickle protocol.
+        @type protocol:     int
+        @return:            The dictionary class and arguments.
+        @rtype:             tuple
+        """
+
+        # A normal dictionary.
+        return dict, (self.copy(),)
+
+
+    def own(self):
+        """Copy the shared dictionary into the proxy, prior to modification."""
+
+        # Already copied.
+        if self._shared is None:
+            return
+
+        # Copy.
+        dict.update(self, self._shared)
+        self._shared = None
+
+
+    def shared(self):
+        """Return the shared dictionary.
+
+        @return:    The shared dictionary, or None if the proxy has been modified.
+        @rtype:     dict or None
+        """
+
+        # The dictionary.
+        return self._shared
+
+
+
+def cow_dict_read(name):
+    """Create a CowDict method reading from the shared dictionary, if not yet modified.
+
+    @param name:    The name of the dictionary method.
+    @type name:     str
+    @return:        The proxy method.
+    @rtype:         function
+    """
+
+    # The dictionary method.
+    method = getattr(dict, name)
+
+    # The proxy method, replacing proxy arguments with the shared dictionaries.
+    def read(self, *args):
+        args = [arg._shared if isinstance(arg, CowDict) and arg._shared is not None else arg for arg in args]
+        if self._shared is None:
+            return method(self, *args)
+        return method(self._shared, *args)
+
+    # Return the method.
+    read.__name__ = name
+    read.__doc__ = method.__doc__
+    return read
+
+
+def cow_dict_write(name):
+    """Create a CowDict method which copies the shared dictionary before modification.
+
+    @param name:    The name of the dictionary method.
+    @type name:     str
+    @return:        The proxy method.
+    @rtype:         function
+    """
+
+    # The dictionary method.
+    method = getattr(dict, name)
+
+    # The proxy method.
+    def write(self, *args, **kwargs):
+        self.own()
+        return method(self, *args, **kwargs)
+
+    # Return the method.
+    write.__name__ = name
+    write.__doc__ = method.__doc__
+    return write
+
+
+# Add the reading and modifying methods to the copy-on-write dictionary.
+for name in ['__contains__', '__eq__', '__getitem__', '__iter__', '__len__', '__ne__', '__or__', '__repr__', '__reversed__', '__ror__', 'copy', 'get', 'items', 'keys', 'values']:
+    if hasattr(dict, name):
+        setattr(CowDict, name, cow_dict_read(name))
+for name in ['__delitem__', '__ior__', '__setitem__', 'clear', 'pop', 'popitem', 'setdefault', 'update']:
+    if hasattr(dict, name):
+        setattr(CowDict, name, cow_dict_write(name))
+del name
+
+
+
+class Snapshot(object):
+    """The frozen objects of a data container, shared by all of its copy-on-write clones.
+
+    The objects are never modified.  Dictionaries of immutable objects are shared by all containers through CowDict proxies, so that they are only copied when modified.  Each container sharing the snapshot receives its own copy of any other mutable object on first access, except for the last container requiring the object which receives the original.
+    """
+
+    def __init__(self, values=None):
+        """Set up the snapshot.
+
+        @keyword values:    The objects of the data container.
+        @type values:       dict
+        """
+
+        # Store the objects.
+        self.values = values
+
+        # The number of containers sharing the snapshot, and the number of containers which no longer require each object.
+        self.views = 0
+        self.taken = {}
+
+        # The names of the dictionaries shared through proxies.
+        self.proxied = set()
+
+
+    def __contains__(self, name):
+        """Determine if the object is in the snapshot.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        True if the object exists.
+        @rtype:         bool
+        """
+
+        # Check the objects.
+        return name in self.values
+
+
+    def discard(self, name):
+        """Flag that one of the containers no longer requires the object, releasing it once no container requires it.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        True if the object has been released.
+        @rtype:         bool
+        """
+
+        # Count the container.
+        count = self.taken.get(name, 0) + 1
+
+        # The last container.
+        if count >= self.views:
+            self.taken.pop(name, None)
+            self.values.pop(name)
+            self.proxied.discard(name)
+            return True
+
+        # Store the count.
+        self.taken[name] = count
+        return False
+
+
+    def names(self):
+        """Return the names of all objects of the snapshot.
+
+        @return:    The object names.
+        @rtype:     list of str
+        """
+
+        # The names.
+        return list(self.values.keys())
+
+
+    def peek(self, name):
+        """Return the object, without flagging it as taken.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        The original object.
+        @rtype:         anything
+        """
+
+        # Return the object.
+        return self.values[name]
+
+
+    def share(self):
+        """Add a container to the containers sharing the snapshot."""
+
+        # Increment the count.
+        self.views += 1
+
+
+    def take(self, name):
+        """Return a private copy of the object for one of the containers.
+
+        @param name:    The name of the object.
+        @type name:     str
+        @return:        The object, which is the original for immutable objects and for the last container requiring the object if not shared through proxies, a proxy for the dictionaries of immutable objects, or otherwise a copy.
+        @rtype:         anything
+        """
+
+        # The object.
+        value = self.values[name]
+        proxied = name in self.proxied
+
+        # The last container receives the original, if not already shared.
+        last = self.discard(name)
+        if last and not proxied:
+            return value
+
+        # Share dictionaries through proxies.
+        if is_cow_dict(value):
+            if not last:
+                self.proxied.add(name)
+            return CowDict(value)
+
+        # Return a copy.
+        return cow_copy(value)
+
+
+
+def attach_source(obj, source, first=False):
+    """Add a data source to the data container.
+
+    @param obj:     The data container.
+    @type obj:      Prototype instance
+    @param source:  The data source.
+    @type source:   Snapshot or data_store.columns.ContainerColumns instance
+    @keyword first: A flag which if True will cause the source to take precedence over all other data sources.
+    @type first:    bool
+    """
+
+    # The data source list.
+    lazy = obj.__dict__.setdefault('_lazy', [])
+
+    # Add the source, with no objects consumed (the set of consumed names is only created when needed).
+    source.share()
+    if first:
+        lazy.insert(0, [source, NONE_CONSUMED])
+    else:
+        lazy.append([source, NONE_CONSUMED])
+
+
+def consume(entry, name):
+    """Flag the object of the data source as consumed by the data container.
+
+    @param entry:   The [source, consumed names] data source entry of the container.
+    @type entry:    list
+    @param name:    The name of the object.
+    @type name:     str
+    """
+
+    # Create the set of names on demand.
+    if entry[1] is NONE_CONSUMED:
+        entry[1] = set()
+
+    # Add the name.
+    entry[1].add(name)
+
+
+def cow_clone(obj):
+    """Return a copy-on-write clone of the data container.
+
+    All objects of the data container are moved into a snapshot shared by both the original and the clone, and any existing data sources of the original are shared with the clone.  Lists of data containers, such as the molecule, residue, spin, and interatomic lists, are cloned immediately with all of the data containers themselves being copy-on-write clones.  The hashes and private metadata are hence identical in the clone.
+
+
+    @param obj: The data container.
+    @type obj:  Prototype instance
+    @return:    The clone.
+    @rtype:     Prototype instance
+    """
+
+    # Move all objects of the original into a snapshot.
+    values = {}
+    for name in list(obj.__dict__.keys()):
+        if name != '_lazy' and not is_container_list(obj.__dict__[name]):
+            values[name] = obj.__dict__.pop(name)
+    if values:
+        attach_source(obj, Snapshot(values), first=True)
+
+    # Make a new object.
+    new_obj = obj.__class__.__new__(obj.__class__)
+
+    # Clone the lists of data containers.
+    for name in obj.__dict__:
+        if name != '_lazy':
+            new_obj.__dict__[name] = cow_clone_list(obj.__dict__[name])
+
+    # Share all data sources, flagging the objects already consumed by the original as consumed.
+    for source, consumed in obj.__dict__.get('_lazy', []):
+        attach_source(new_obj, source)
+        for name in consumed:
+            if name in source:
+                source.discard(name)
+        if consumed:
+            new_obj.__dict__['_lazy'][-1][1] = set(consumed)
+
+    # Return the clone.
+    return new_obj
+
+
+def cow_clone_list(obj):
+    """Return a clone of the list of data containers, with each container being a copy-on-write clone.
+
+    @param obj: The list of data containers.
+    @type obj:  list of Prototype instances
+    @return:    The clone.
+    @rtype:     list of Prototype instances
+    """
+
+    # Make a new list, with shallow copies of the look up tables of the list (the table entries are replaced rather than modified).
+    new_obj = obj.__class__.__new__(obj.__class__)
+    for name in obj.__dict__:
+        new_obj.__dict__[name] = copy(obj.__dict__[name])
+
+    # Clone the containers.
+    list.extend(new_obj, [cow_clone(cont) for cont in obj])
+
+    # Return the clone.
+    return new_obj
+
+
+def cow_copy(value):
+    """Return a copy of the object, or the object itself if it is immutable.
+
+    @param value:   The object.
+    @type value:    anything
+    @return:        The copy.
+    @rtype:         anything
+    """
+
+    # Immutable objects.
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+
+    # Lists of data containers.
+    if is_container_list(value):
+        return cow_clone_list(value)
+
+    # Deepcopy.
+    return deepcopy(value)
+
+
+def cow_share(source=None, target=None, names=None):
+    """Copy the named objects of one data container into another, sharing them until first modified.
+
+    @keyword source:    The data container to copy from.
+    @type source:       Prototype instance
+    @keyword target:    The data container to copy into.
+    @type target:       Prototype instance
+    @keyword names:     The names of the objects to copy.
+    @type names:        list of str
+    @raises RelaxError: If one of the objects is a list of data containers.
+    """
+
+    # Move the objects of the source into a snapshot.
+    values = {}
+    for name in names:
+        value = getattr(source, name)
+        if is_container_list(value):
+            raise RelaxError("The list of data containers '%s' cannot be shared." % name)
+        values[name] = value
+        del source.__dict__[name]
+    snapshot = Snapshot(values)
+    attach_source(source, snapshot, first=True)
+
+    # Remove the objects from the target.
+    for name in names:
+        if hasattr(target, name):
+            delattr(target, name)
+
+    # Share the snapshot with the target.
+    attach_source(target, snapshot, first=True)
+
+
+def discard(obj, name):
+    """Hide the pending object in all data sources of the data container.
+
+    @param obj:     The data container.
+    @type obj:      Prototype instance
+    @param name:    The name of the object.
+    @type name:     str
+    @return:        True if the object was pending in one of the data sources.
+    @rtype:         bool
+    """
+
+    # Loop over the data sources.
+    pending = False
+    for entry in obj.__dict__.get('_lazy', []):
+        if name not in entry[1] and name in entry[0]:
+            consume(entry, name)
+            entry[0].discard(name)
+            pending = True
+
+    # Return the flag.
+    return pending
+
+
+def is_cow_dict(value):
+    """Determine if the object is a dictionary which can be shared through CowDict proxies.
+
+    @param value:   The object.
+    @type value:    anything
+    @return:        True if the object is a dictionary of immutable objects.
+    @rtype:         bool
+    """
+
+    # Proxies of the same dictionary.
+    if isinstance(value, CowDict) and value.shared() is not None:
+        return True
+
+    # Check the values.
+    if not isinstance(value, dict):
+        return False
+    for element in value.values():
+        if not isinstance(element, IMMUTABLE_TYPES):
+            return False
+    return True
+
+
+def is_container_list(value):
+    """Determine if the object is a non-empty list of data containers.
+
+    @param value:   The object.
+    @type value:    anything
+    @return:        True if the object is a list of Prototype instances.
+    @rtype:         bool
+    """
+
+    # Check the first element.
+    return isinstance(value, list) and len(value) > 0 and isinstance(value[0], Prototype)
+
+
+def materialise(obj):
+    """Attach all pending objects to the data container and remove the data sources.
+
+    @param obj: The data container.
+    @type obj:  Prototype instance
+    """
+
+    # No data sources.
+    if '_lazy' not in obj.__dict__:
+        return
+
+    # Attach.
+    for source, consumed in obj.__dict__['_lazy']:
+        for name in source.names():
+            if name not in consumed:
+                getattr(obj, name)
+
+    # Remove the data sources.
+    del obj.__dict__['_lazy']
+
+
+def peek(obj, name):
+    """Return the object of the data container without attaching it from the data sources.
+
+    @param obj:     The data container.
+    @type obj:      Prototype instance
+    @param name:    The name of the object.
+    @type name:     str
+    @return:        The object, which must not be modified.
+    @rtype:         anything
+    """
+
+    # The container object.
+    if name in obj.__dict__:
+        return obj.__dict__[name]
+
+    # The pending object.
+    for source, consumed in obj.__dict__.get('_lazy', []):
+        if name not in consumed and name in source:
+            return source.peek(name)
+
+    # Class objects.
+    return getattr(obj, name)
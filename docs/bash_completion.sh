@@ -64,7 +64,7 @@ _relax() {
     # Multi-processor option values.
     case "${prev}" in
         --multi)
-            COMPREPLY=( $(compgen -W "mpi4py" -- ${cur}) )
+            COMPREPLY=( $(compgen -W "mpi4py multiprocessing" -- ${cur}) )
             return 0
             ;;
         --processors)
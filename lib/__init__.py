@@ -42,6 +42,7 @@ __all__ = [
     'linear_algebra',
     'list',
     'mathematics',
+    'minimise',
     'model_selection',
     'nmr',
     'order',
@@ -20,6 +20,9 @@
 ###############################################################################
 
 
+# Python module imports.
+from numpy import ndarray, where
+
 # relax module imports.
 from lib.auto_relaxation.ri_comps import r1_comps, dr1_comps, d2r1_comps
 from lib.auto_relaxation.ri_prime import func_ri_prime
@@ -37,13 +40,20 @@ def calc_noe(data, i, frq_num, get_r1, params):
     # Get the r1 value either from data.ri_prime or by calculation if the value is not in data.ri_prime
     data.r1[i] = get_r1[i](data, i, frq_num, params)
 
-    # Calculate the NOE.
-    if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
-        data.ri[i] = 1.0
-    elif data.r1[i] == 0.0:
-        data.ri[i] = 1e99
+    # Calculate the NOE of a single spin.
+    if not isinstance(data.r1[i], ndarray):
+        if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
+            data.ri[i] = 1.0
+        elif data.r1[i] == 0.0:
+            data.ri[i] = 1e99
+        else:
+            data.ri[i] = 1.0 + data.g_ratio*(data.ri_prime[i] / data.r1[i])
+
+    # Calculate the NOE of the spin blocks, catching zero R1 values element-wise.
     else:
-        data.ri[i] = 1.0 + data.g_ratio*(data.ri_prime[i] / data.r1[i])
+        zero = (data.r1[i] == 0.0)
+        r1 = where(zero, 1.0, data.r1[i])
+        data.ri[i] = where(zero, where(data.ri_prime[i] == 0.0, 1.0, 1e99), 1.0 + data.g_ratio*(data.ri_prime[i] / r1))
 
 
 def calc_dnoe(data, i, frq_num, get_dr1, params, j):
@@ -54,12 +64,21 @@ def calc_dnoe(data, i, frq_num, get_dr1, params, j):
 
     # Calculate the NOE derivative.
     data.dr1[j, i] = get_dr1[i](data, i, frq_num, params, j)
-    if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
-        data.dri[j, i] = 0.0
-    elif data.r1[i] == 0.0:
-        data.dri[j, i] = 1e99
+
+    # A single spin.
+    if not isinstance(data.r1[i], ndarray):
+        if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
+            data.dri[j, i] = 0.0
+        elif data.r1[i] == 0.0:
+            data.dri[j, i] = 1e99
+        else:
+            data.dri[j, i] = data.g_ratio * (1.0 / data.r1[i]**2) * (data.r1[i] * data.dri_prime[j, i] - data.ri_prime[i] * data.dr1[j, i])
+
+    # The spin blocks, catching zero R1 values element-wise.
     else:
-        data.dri[j, i] = data.g_ratio * (1.0 / data.r1[i]**2) * (data.r1[i] * data.dri_prime[j, i] - data.ri_prime[i] * data.dr1[j, i])
+        zero = (data.r1[i] == 0.0)
+        r1 = where(zero, 1.0, data.r1[i])
+        data.dri[j, i] = where(zero, where(data.ri_prime[i] == 0.0, 0.0, 1e99), data.g_ratio * (1.0 / r1**2) * (r1 * data.dri_prime[j, i] - data.ri_prime[i] * data.dr1[j, i]))
 
 
 def calc_d2noe(data, i, frq_num, get_d2r1, params, j, k):
@@ -70,14 +89,25 @@ def calc_d2noe(data, i, frq_num, get_d2r1, params, j, k):
 
     # Calculate the NOE second derivative.
     data.d2r1[j, k, i] = get_d2r1[i](data, i, frq_num, params, j, k)
-    if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
-        data.d2ri[j, k, i] = 0.0
-    elif data.r1[i] == 0.0:
-        data.d2ri[j, k, i] = 1e99
+
+    # A single spin.
+    if not isinstance(data.r1[i], ndarray):
+        if data.r1[i] == 0.0 and data.ri_prime[i] == 0.0:
+            data.d2ri[j, k, i] = 0.0
+        elif data.r1[i] == 0.0:
+            data.d2ri[j, k, i] = 1e99
+        else:
+            a = data.ri_prime[i] * (2.0 * data.dr1[j, i] * data.dr1[k, i] - data.r1[i] * data.d2r1[j, k, i])
+            b = data.r1[i] * (data.dri_prime[j, i] * data.dr1[k, i] + data.dr1[j, i] * data.dri_prime[k, i] - data.r1[i] * data.d2ri_prime[j, k, i])
+            data.d2ri[j, k, i] = data.g_ratio * (1.0 / data.r1[i]**3) * (a - b)
+
+    # The spin blocks, catching zero R1 values element-wise.
     else:
-        a = data.ri_prime[i] * (2.0 * data.dr1[j, i] * data.dr1[k, i] - data.r1[i] * data.d2r1[j, k, i])
-        b = data.r1[i] * (data.dri_prime[j, i] * data.dr1[k, i] + data.dr1[j, i] * data.dri_prime[k, i] - data.r1[i] * data.d2ri_prime[j, k, i])
-        data.d2ri[j, k, i] = data.g_ratio * (1.0 / data.r1[i]**3) * (a - b)
+        zero = (data.r1[i] == 0.0)
+        r1 = where(zero, 1.0, data.r1[i])
+        a = data.ri_prime[i] * (2.0 * data.dr1[j, i] * data.dr1[k, i] - r1 * data.d2r1[j, k, i])
+        b = r1 * (data.dri_prime[j, i] * data.dr1[k, i] + data.dr1[j, i] * data.dri_prime[k, i] - r1 * data.d2ri_prime[j, k, i])
+        data.d2ri[j, k, i] = where(zero, where(data.ri_prime[i] == 0.0, 0.0, 1e99), data.g_ratio * (1.0 / r1**3) * (a - b))
 
 
 
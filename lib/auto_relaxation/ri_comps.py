@@ -247,6 +247,7 @@
 
 # Python module imports.
 from math import pi
+from numpy import ndarray, where
 
 
 # The main functions for the calculation of the Ri components.
@@ -1042,10 +1043,17 @@ def comp_dip_const_func(data, bond_length):
                            4   \ 4.pi /         <r**6>
     """
 
-    if bond_length == 0.0:
-        data.dip_const_func = 1e99
+    # A single bond length.
+    if not isinstance(bond_length, ndarray):
+        if bond_length == 0.0:
+            data.dip_const_func = 1e99
+        else:
+            data.dip_const_func = 0.25 * data.dip_const_fixed * bond_length**-6
+
+    # Arrays of bond lengths, catching zero bond lengths element-wise.
     else:
-        data.dip_const_func = 0.25 * data.dip_const_fixed * bond_length**-6
+        zero = (bond_length == 0.0)
+        data.dip_const_func = where(zero, 1e99, 0.25 * data.dip_const_fixed * where(zero, 1.0, bond_length)**-6)
 
 
 # Gradient.
@@ -1062,10 +1070,17 @@ def comp_dip_const_grad(data, bond_length):
                              2   \ 4.pi /         <r**7>
     """
 
-    if bond_length == 0.0:
-        data.dip_const_grad = 1e99
+    # A single bond length.
+    if not isinstance(bond_length, ndarray):
+        if bond_length == 0.0:
+            data.dip_const_grad = 1e99
+        else:
+            data.dip_const_grad = -1.5 * data.dip_const_fixed * bond_length**-7
+
+    # Arrays of bond lengths, catching zero bond lengths element-wise.
     else:
-        data.dip_const_grad = -1.5 * data.dip_const_fixed * bond_length**-7
+        zero = (bond_length == 0.0)
+        data.dip_const_grad = where(zero, 1e99, -1.5 * data.dip_const_fixed * where(zero, 1.0, bond_length)**-7)
 
 
 # Hessian.
@@ -1082,10 +1097,17 @@ def comp_dip_const_hess(data, bond_length):
                            2    \ 4.pi /         <r**8>
     """
 
-    if bond_length == 0.0:
-        data.dip_const_hess = 1e99
+    # A single bond length.
+    if not isinstance(bond_length, ndarray):
+        if bond_length == 0.0:
+            data.dip_const_hess = 1e99
+        else:
+            data.dip_const_hess = 10.5 * data.dip_const_fixed * bond_length**-8
+
+    # Arrays of bond lengths, catching zero bond lengths element-wise.
     else:
-        data.dip_const_hess = 10.5 * data.dip_const_fixed * bond_length**-8
+        zero = (bond_length == 0.0)
+        data.dip_const_hess = where(zero, 1e99, 10.5 * data.dip_const_fixed * where(zero, 1.0, bond_length)**-8)
 
 
 
@@ -111,6 +111,12 @@ if PY_VERSION == 2:
 else:
     import pickle
 
+# The string interning function.
+if PY_VERSION == 2:
+    intern = builtins.intern
+else:
+    intern = sys.intern
+
 # Numpy.
 import numpy
 try:
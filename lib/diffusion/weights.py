@@ -22,7 +22,24 @@
 
 # Python module imports.
 from math import sqrt
-from numpy import outer
+
+
+def outer_product(a, b):
+    """The outer product of the first dimension of two direction cosine gradients.
+
+    Any trailing dimensions, such as the spin dimension of the spin blocks of the model-free target function, are broadcast rather than flattened as in numpy.outer().
+
+
+    @param a:   The first direction cosine gradient.
+    @type a:    numpy array
+    @param b:   The second direction cosine gradient.
+    @type b:    numpy array
+    @return:    The outer product.
+    @rtype:     numpy array
+    """
+
+    return a[:, None] * b[None, :]
+
 
 
 ##########
@@ -137,7 +154,7 @@ def calc_spheroid_d2ci(data, diff_data):
     """
 
     # Outer product.
-    op = outer(data.ddz_dO, data.ddz_dO)
+    op = outer_product(data.ddz_dO, data.ddz_dO)
 
     # Hessian.
     data.d2ci[2:, 2:, 0] = 3.0 * ((9.0 * data.dz**2 - 1.0) * op  +  data.dz * data.three_dz2_one * data.d2dz_dO2)
@@ -788,18 +805,18 @@ def calc_ellipsoid_d2ci(data, diff_data):
     ###############################
 
     # Outer products.
-    op_xx = outer(data.ddx_dO, data.ddx_dO)
-    op_yy = outer(data.ddy_dO, data.ddy_dO)
-    op_zz = outer(data.ddz_dO, data.ddz_dO)
+    op_xx = outer_product(data.ddx_dO, data.ddx_dO)
+    op_yy = outer_product(data.ddy_dO, data.ddy_dO)
+    op_zz = outer_product(data.ddz_dO, data.ddz_dO)
 
-    op_xy = outer(data.ddx_dO, data.ddy_dO)
-    op_yx = outer(data.ddy_dO, data.ddx_dO)
+    op_xy = outer_product(data.ddx_dO, data.ddy_dO)
+    op_yx = outer_product(data.ddy_dO, data.ddx_dO)
 
-    op_xz = outer(data.ddx_dO, data.ddz_dO)
-    op_zx = outer(data.ddz_dO, data.ddx_dO)
+    op_xz = outer_product(data.ddx_dO, data.ddz_dO)
+    op_zx = outer_product(data.ddz_dO, data.ddx_dO)
 
-    op_yz = outer(data.ddy_dO, data.ddz_dO)
-    op_zy = outer(data.ddz_dO, data.ddy_dO)
+    op_yz = outer_product(data.ddy_dO, data.ddz_dO)
+    op_zy = outer_product(data.ddz_dO, data.ddy_dO)
 
     # Components.
     x_comp = data.dx * data.d2dx_dO2 + op_xx
@@ -24,11 +24,89 @@
 """Module for the calculation of the matrix exponential, for higher dimensional data."""
 
 # Python module imports.
+from collections import OrderedDict
 from numpy import array, any, complex128, dot, einsum, eye, exp, iscomplex, int16, newaxis, multiply, tile, sqrt, version, zeros
 from numpy.lib.stride_tricks import as_strided
 from numpy.linalg import eig, inv
 
 
+class Matrix_exponential_cache:
+    """A bounded least recently used (LRU) cache of matrix exponentials.
+
+    This is used by the numeric Bloch-McConnell models to avoid the eigenvalue decomposition of the full exchange matrix stack when only the R20 parameters have changed.  For the models with R20A = R20B, the R20 contribution to the exchange matrix is a constant diagonal offset on the transverse magnetisation subspace which commutes with the rest of the matrix.  The matrix exponential of the R20-free exchange matrix can therefore be cached, keyed on the exchange parameters, and the R20 contribution applied analytically as an exp(-R20.tcp) factor.
+    """
+
+    def __init__(self, size=10):
+        """Set up the empty cache.
+
+        @keyword size:  The maximum number of matrix exponential stacks to store.  Once this is reached, the least recently used stack is discarded.
+        @type size:     int
+        """
+
+        # Store the arguments.
+        self.size = size
+
+        # The cache, with the most recently used entries last.
+        self._cache = OrderedDict()
+
+        # Statistics.
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self):
+        """The number of stored matrix exponential stacks.
+
+        @return:    The cache length.
+        @rtype:     int
+        """
+
+        return len(self._cache)
+
+
+    def clear(self):
+        """Empty the cache."""
+
+        self._cache.clear()
+
+
+    def matrix_exponential(self, A, key, dtype=None):
+        """Return the matrix exponential of A, calculating it only if it is not already cached.
+
+        @param A:       The square matrix to calculate the matrix exponential of.
+        @type A:        numpy float array of rank [NE][NS][NM][NO][ND][X][X]
+        @param key:     The hashable key uniquely identifying the matrix A, for example a tuple of the exchange parameters and the bytes of the dw and tcp arrays.
+        @type key:      tuple
+        @keyword dtype: If provided, forces the calculation to use the data type specified.
+        @type dtype:    data-type, optional
+        @return:        The matrix exponential.  This will have the same dimensionality as the A matrix.  It must not be modified in place by the caller.
+        @rtype:         numpy float array of rank [NE][NS][NM][NO][ND][X][X]
+        """
+
+        # The data type is part of the key.
+        key = (key, dtype)
+
+        # A cache hit, so mark the entry as most recently used.
+        if key in self._cache:
+            self.hits += 1
+            eA = self._cache.pop(key)
+            self._cache[key] = eA
+            return eA
+
+        # Calculate and store the exponential.
+        self.misses += 1
+        eA = matrix_exponential(A, dtype=dtype)
+        self._cache[key] = eA
+
+        # Evict the least recently used entries.
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+        # Return the exponential.
+        return eA
+
+
+
 def create_index(NE=None, NS=None, NM=None, NO=None, ND=None):
     """Method to create the helper index numpy array, to help figuring out the indices to store in the exchange data matrix.
 
@@ -55,13 +55,12 @@ More information on the NS CPMG 2-site 3D full model can be found in the:
 """
 
 # Python module imports.
-from numpy import array, dot, fabs, float64, einsum, isfinite, log, min, multiply, rollaxis, sum
-from numpy.linalg import matrix_power
+from numpy import arange, array, array_equal, exp, fabs, float64, einsum, isfinite, log, min, multiply, ones, rollaxis, sum
 from numpy.ma import fix_invalid, masked_where
 
 # relax module imports.
-from lib.float import isNaN
 from lib.dispersion.matrix_exponential import matrix_exponential
+from lib.linear_algebra.matrix_power import matrix_power_rankN
 
 # Repetitive calculations (to speed up calculations).
 m_r10a = array([
@@ -154,6 +153,9 @@ m_wB = array([
     [0,  0,  0,  0,  1,  0,  0],
     [0,  0,  0,  0,  0,  0,  0]], float64)
 
+# The indices of the transverse magnetisation components {Ax, Ay, Bx, By}.
+m_transverse = array([1, 2, 4, 5])
+
 
 def rcpmg_3d_rankN(R1A=None, R1B=None, R2A=None, R2B=None, pA=None, pB=None, dw=None, k_AB=None, k_BA=None, tcp=None):
     """Definition of the 3D exchange matrix, for rank [NE][NS][NM][NO][ND][7][7].
@@ -225,7 +227,7 @@ def rcpmg_3d_rankN(R1A=None, R1B=None, R2A=None, R2B=None, pA=None, pB=None, dw=
     return c_mat
 
 
-def r2eff_ns_cpmg_2site_3D(r180x=None, M0=None, M0_T=None, r10a=0.0, r10b=0.0, r20a=None, r20b=None, pA=None, dw=None, dw_orig=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None):
+def r2eff_ns_cpmg_2site_3D(r180x=None, M0=None, M0_T=None, r10a=0.0, r10b=0.0, r20a=None, r20b=None, pA=None, dw=None, dw_orig=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None, exp_cache=None):
     """The 2-site numerical solution to the Bloch-McConnell equation.
 
     This function calculates and stores the R2eff values.
@@ -263,6 +265,8 @@ def r2eff_ns_cpmg_2site_3D(r180x=None, M0=None, M0_T=None, r10a=0.0, r10b=0.0, r
     @type num_points:       numpy int array of rank [NE][NS][NM][NO]
     @keyword power:         The matrix exponential power array.
     @type power:            numpy int array of rank [NE][NS][NM][NO][ND]
+    @keyword exp_cache:     The optional cache of the R20-free matrix exponentials.  This is only used when r20a and r20b are identical, as the R20 contribution is then applied analytically.
+    @type exp_cache:        None or lib.dispersion.matrix_exponential.Matrix_exponential_cache instance
     """
 
     # Flag to tell if values should be replaced if math function is violated.
@@ -292,11 +296,26 @@ def r2eff_ns_cpmg_2site_3D(r180x=None, M0=None, M0_T=None, r10a=0.0, r10b=0.0, r
     # Extract the total numbers of experiments, number of spins, number of magnetic field strength, number of offsets, maximum number of dispersion point.
     NE, NS, NM, NO, ND = back_calc.shape
 
-    # The matrix R that contains all the contributions to the evolution, i.e. relaxation, exchange and chemical shift evolution.
-    R_mat = rcpmg_3d_rankN(R1A=r10a, R1B=r10b, R2A=r20a, R2B=r20b, pA=pA, pB=pB, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+    # With R20A = R20B, the R20 relaxation is a constant diagonal offset on the invariant transverse subspace, commuting with the rest of the matrix, so the R20-free matrix exponential is cached and the R20 decay applied afterwards.
+    if exp_cache != None and array_equal(r20a, r20b):
+        # The matrix R without the R20 relaxation.
+        R_mat = rcpmg_3d_rankN(R1A=r10a, R1B=r10b, R2A=0.0, R2B=0.0, pA=pA, pB=pB, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+
+        # The propagator, from the cache if the exchange parameters are unchanged.
+        key = ('3D', float(pA), float(kex), array(r10a).tobytes(), array(r10b).tobytes(), dw.tobytes(), tcp.tobytes())
+        Rexpo_mat = exp_cache.matrix_exponential(R_mat, key)
+
+        # The R20 decay of the transverse magnetisation components for a delay tcp.
+        r20_decay = ones(R_mat.shape[:-1])
+        r20_decay[..., m_transverse] = exp(-r20a * tcp)[..., None]
+        Rexpo_mat = Rexpo_mat * r20_decay[..., None, :]
 
-    # This matrix is a propagator that will evolve the magnetization with the matrix R for a delay tcp.
-    Rexpo_mat = matrix_exponential(R_mat)
+    else:
+        # The matrix R that contains all the contributions to the evolution, i.e. relaxation, exchange and chemical shift evolution.
+        R_mat = rcpmg_3d_rankN(R1A=r10a, R1B=r10b, R2A=r20a, R2B=r20b, pA=pA, pB=pB, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+
+        # This matrix is a propagator that will evolve the magnetization with the matrix R for a delay tcp.
+        Rexpo_mat = matrix_exponential(R_mat)
 
     # The the essential evolution matrix.
     # This is a dot product of the outer [7][7] matrix of the Rexpo_mat and r180x matrixes, which
@@ -312,41 +331,28 @@ def r2eff_ns_cpmg_2site_3D(r180x=None, M0=None, M0_T=None, r10a=0.0, r10b=0.0, r
     # Preform the initial magnetisation.
     evolution_matrix_T_M0_mat = einsum('...ij,...jk', M0_T, evolution_matrix_T_mat)
 
-    # Loop over the spins
-    for si in range(NS):
-        # Loop over the spectrometer frequencies.
-        for mi in range(NM):
-            # Extract number of points.
-            num_points_si_mi = int(num_points[0, si, mi, 0])
-
-            # Loop over the time points, back calculating the R2eff values.
-            for di in range(num_points_si_mi):
-                # Extract the values from the higher dimensional arrays.
-                inv_tcpmg_si_mi_di = inv_tcpmg[0, si, mi, 0, di]
-                power_si_mi_di = int(power[0, si, mi, 0, di])
-                r20a_si_mi_di = r20a[0, si, mi, 0, di]
-
-                # Initial magnetisation.
-                Mint_T_i = evolution_matrix_T_M0_mat[0, si, mi, 0, di]
-
-                # This matrix is a propagator that will evolve the magnetization with the matrix R for a delay tcp.
-                evolution_matrix_T_i = evolution_matrix_T_mat[0, si, mi, 0, di]
-
-                # Get which power to raise the matrix to.
-                l = int(power_si_mi_di-1)
-
-                # Raise the square evolution matrix to the power l.
-                evolution_matrix_T_power_i = matrix_power(evolution_matrix_T_i, l)
-
-                # Evolve the magnetisation.
-                Mint_T_i = dot(Mint_T_i, evolution_matrix_T_power_i)
-
-                # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
-                Mx = Mint_T_i[0][1] / pA
-                if Mx <= 0.0 or isNaN(Mx):
-                    back_calc[0, si, mi, 0, di] = r20a_si_mi_di
-                else:
-                    back_calc[0, si, mi, 0, di] = - inv_tcpmg_si_mi_di * log(Mx)
+    # The powers to raise the evolution matrices to (the padding points have a power of zero).
+    power_l = power - 1
+    power_l[power_l < 0] = 0
+
+    # Raise the evolution matrices for all dispersion points to their powers.
+    evolution_matrix_T_power_mat = matrix_power_rankN(evolution_matrix_T_mat, power_l)
+
+    # Evolve the magnetisation.
+    Mint_T = einsum('...ij,...jk', evolution_matrix_T_M0_mat, evolution_matrix_T_power_mat)
+
+    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
+    Mx = Mint_T[:, :, :, :, :, 0, 1] / pA
+
+    # Catch negative and NaN values, replacing these with R20.
+    mask_invalid = ~(Mx > 0.0)
+    Mx[mask_invalid] = 1.0
+    r2eff = - inv_tcpmg * log(Mx)
+    r2eff[mask_invalid] = r20a[mask_invalid]
+
+    # Store the values for the real dispersion points.
+    mask_points = arange(ND) < num_points[:, :, :, :, None]
+    back_calc[mask_points] = r2eff[mask_points]
 
     # Replace data in array.
     # If dw is zero.
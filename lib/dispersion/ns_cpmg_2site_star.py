@@ -57,13 +57,12 @@ More information on the NS CPMG 2-site star full model can be found in the:
 """
 
 # Python module imports.
-from numpy import add, array, conj, dot, einsum, fabs, float64, isfinite, log, min, multiply, sum
+from numpy import add, arange, array, array_equal, conj, einsum, exp, fabs, float64, isfinite, log, min, multiply, sum
 from numpy.ma import fix_invalid, masked_where
-from numpy.linalg import matrix_power
 
 # relax module imports.
-from lib.float import isNaN
 from lib.dispersion.matrix_exponential import matrix_exponential
+from lib.linear_algebra.matrix_power import matrix_power_rankN
 
 # Repetitive calculations (to speed up calculations).
 m_r20a = array([
@@ -161,7 +160,7 @@ def rcpmg_star_rankN(R2A=None, R2B=None, dw=None, k_AB=None, k_BA=None, tcp=None
     return R_mat, cR2_mat, Rr_mat, Rex_mat, RCS_mat
 
 
-def r2eff_ns_cpmg_2site_star(M0=None, r20a=None, r20b=None, pA=None, dw=None, dw_orig=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None):
+def r2eff_ns_cpmg_2site_star(M0=None, r20a=None, r20b=None, pA=None, dw=None, dw_orig=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None, exp_cache=None):
     """The 2-site numerical solution to the Bloch-McConnell equation using complex conjugate matrices.
 
     This function calculates and stores the R2eff values.
@@ -191,6 +190,8 @@ def r2eff_ns_cpmg_2site_star(M0=None, r20a=None, r20b=None, pA=None, dw=None, dw
     @type num_points:       numpy int array of rank [NE][NS][NM][NO]
     @keyword power:         The matrix exponential power array.
     @type power:            numpy int array of rank [NE][NS][NM][NO][ND]
+    @keyword exp_cache:     The optional cache of the R20-free matrix exponentials.  This is only used when r20a and r20b are identical, as the R20 contribution is then applied analytically.
+    @type exp_cache:        None or lib.dispersion.matrix_exponential.Matrix_exponential_cache instance
     """
 
     # Flag to tell if values should be replaced if math function is violated.
@@ -218,46 +219,53 @@ def r2eff_ns_cpmg_2site_star(M0=None, r20a=None, r20b=None, pA=None, dw=None, dw
     # Extract the total numbers of experiments, number of spins, number of magnetic field strength, number of offsets, maximum number of dispersion point.
     NE, NS, NM, NO, ND = back_calc.shape
 
-    # The matrix R that contains all the contributions to the evolution, i.e. relaxation, exchange and chemical shift evolution.
-    R_mat, cR2_mat, Rr_mat, Rex_mat, RCS_mat = rcpmg_star_rankN(R2A=r20a, R2B=r20b, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+    # With R20A = R20B, the R20 relaxation is a scalar diagonal offset which commutes with the exchange matrix, so the R20-free matrix exponentials are cached and the R20 decay applied afterwards.
+    if exp_cache != None and array_equal(r20a, r20b):
+        # The matrix R without the R20 relaxation.
+        R_mat, cR2_mat, Rr_mat, Rex_mat, RCS_mat = rcpmg_star_rankN(R2A=0.0, R2B=0.0, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+
+        # The propagators, from the cache if the exchange parameters are unchanged.
+        key = ('star', float(pA), float(kex), dw.tobytes(), tcp.tobytes())
+        eR_mat = exp_cache.matrix_exponential(R_mat, key)
+        ecR2_mat = exp_cache.matrix_exponential(cR2_mat, key + ('conj',))
+
+        # The R20 decay for a delay tcp (the conjugate matrix contains the factor of 2).
+        r20_decay = exp(-r20a * tcp)[..., None, None]
+        eR_mat = eR_mat * r20_decay
+        ecR2_mat = ecR2_mat * r20_decay**2
+
+    else:
+        # The matrix R that contains all the contributions to the evolution, i.e. relaxation, exchange and chemical shift evolution.
+        R_mat, cR2_mat, Rr_mat, Rex_mat, RCS_mat = rcpmg_star_rankN(R2A=r20a, R2B=r20b, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
 
-    # The the essential evolution matrix.
-    # This matrix is a propagator that will evolve the magnetization with the matrix R for a delay tcp.
-    eR_mat = matrix_exponential(R_mat)
-    ecR2_mat = matrix_exponential(cR2_mat)
+        # The the essential evolution matrix.
+        # This matrix is a propagator that will evolve the magnetization with the matrix R for a delay tcp.
+        eR_mat = matrix_exponential(R_mat)
+        ecR2_mat = matrix_exponential(cR2_mat)
 
     # Preform the matrix.
     # This is the propagator for an element of [delay tcp; 180 deg pulse; 2 times delay tcp; 180 deg pulse; delay tau], i.e. for 2 times tau-180-tau.
     prop_2_mat = evolution_matrix_mat = einsum('...ij, ...jk', eR_mat, ecR2_mat)
     prop_2_mat = evolution_matrix_mat = einsum('...ij, ...jk', prop_2_mat, eR_mat)
 
-    # Loop over the spins
-    for si in range(NS):
-        # Loop over the spectrometer frequencies.
-        for mi in range(NM):
-            # Extract the values from the higher dimensional arrays.
-            num_points_si_mi = int(num_points[0, si, mi, 0])
-
-            # Loop over the time points, back calculating the R2eff values.
-            for di in range(num_points_si_mi):
-                # Extract the values from the higher dimensional arrays.
-                power_si_mi_di = int(power[0, si, mi, 0, di])
-
-                # This is the propagator for an element of [delay tcp; 180 deg pulse; 2 times delay tcp; 180 deg pulse; delay tau], i.e. for 2 times tau-180-tau.
-                prop_2_i = prop_2_mat[0, si, mi, 0, di]
-
-                # Now create the total propagator that will evolve the magnetization under the CPMG train, i.e. it applies the above tau-180-tau-tau-180-tau so many times as required for the CPMG frequency under consideration.
-                prop_total = matrix_power(prop_2_i, power_si_mi_di)
-
-                # Now we apply the above propagator to the initial magnetization vector - resulting in the magnetization that remains after the full CPMG pulse train.  It is called M of t (t is the time after the CPMG train).
-                Moft = dot(prop_total, M0)
-
-                # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
-                Mx = Moft[0].real / M0[0]
-                if Mx <= 0.0 or isNaN(Mx):
-                    back_calc[0, si, mi, 0, di] = 1e99
-                else:
-                    back_calc[0, si, mi, 0, di]= -inv_tcpmg[0, si, mi, 0, di] * log(Mx)
+    # Now create the total propagators that will evolve the magnetization under the CPMG train, i.e. it applies the above tau-180-tau-tau-180-tau so many times as required for the CPMG frequency under consideration.
+    prop_total_mat = matrix_power_rankN(prop_2_mat, power)
+
+    # Now we apply the above propagator to the initial magnetization vector - resulting in the magnetization that remains after the full CPMG pulse train.  It is called M of t (t is the time after the CPMG train).
+    Moft = einsum('...ij, j', prop_total_mat, M0)
+
+    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
+    Mx = Moft[:, :, :, :, :, 0].real / M0[0]
+
+    # Catch negative and NaN values.
+    mask_invalid = ~(Mx > 0.0)
+    Mx[mask_invalid] = 1.0
+    r2eff = -inv_tcpmg * log(Mx)
+    r2eff[mask_invalid] = 1e99
+
+    # Store the values for the real dispersion points.
+    mask_points = arange(ND) < num_points[:, :, :, :, None]
+    back_calc[mask_points] = r2eff[mask_points]
 
     # Replace data in array.
     # If dw is zero.
@@ -50,13 +50,11 @@ More information on the NS MMQ 2-site model can be found in the:
 """
 
 # Python module imports.
-from math import floor
-from numpy import array, conj, complex128, dot, einsum, float64, log, multiply
-from numpy.linalg import matrix_power
+from numpy import arange, array, array_equal, conj, complex128, einsum, exp, float64, log, multiply, where
 
 # relax module imports.
-from lib.float import isNaN
 from lib.dispersion.matrix_exponential import matrix_exponential
+from lib.linear_algebra.matrix_power import matrix_power_rankN
 
 # Repetitive calculations (to speed up calculations).
 m_r20a = array([
@@ -130,7 +128,40 @@ def rmmq_2site_rankN(R20A=None, R20B=None, dw=None, k_AB=None, k_BA=None, tcp=No
     return matrix
 
 
-def r2eff_ns_mmq_2site_mq(M0=None, F_vector=array([1, 0], float64), R20A=None, R20B=None, pA=None, dw=None, dwH=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None):
+def mmq_2site_propagator(R20A=None, R20B=None, dw=None, k_AB=None, k_BA=None, tcp=None, exp_cache=None):
+    """The propagator for the 2-site Bloch-McConnell matrix for a delay tcp, for rank [NE][NS][NM][NO][ND][2][2].
+
+    @keyword R20A:          The transverse, spin-spin relaxation rate for state A.
+    @type R20A:             numpy float array of rank [NE][NS][NM][NO][ND]
+    @keyword R20B:          The transverse, spin-spin relaxation rate for state B.
+    @type R20B:             numpy float array of rank [NE][NS][NM][NO][ND]
+    @keyword dw:            The combined chemical exchange difference parameters between states A and B in rad/s.  This can be any combination of dw and dwH.
+    @type dw:               numpy float array of rank [NE][NS][NM][NO][ND]
+    @keyword k_AB:          The rate of exchange from site A to B (rad/s).
+    @type k_AB:             float
+    @keyword k_BA:          The rate of exchange from site B to A (rad/s).
+    @type k_BA:             float
+    @keyword tcp:           The tau_CPMG times (1 / 4.nu1).
+    @type tcp:              numpy float array of rank [NE][NS][NM][NO][ND]
+    @keyword exp_cache:     The optional cache of the R20-free matrix exponentials.  This is only used when R20A and R20B are identical.
+    @type exp_cache:        None or lib.dispersion.matrix_exponential.Matrix_exponential_cache instance
+    @return:                The complex propagator.
+    @rtype:                 numpy complex array of rank [NE][NS][NM][NO][ND][2][2]
+    """
+
+    # No caching.
+    if exp_cache == None or not array_equal(R20A, R20B):
+        return matrix_exponential(rmmq_2site_rankN(R20A=R20A, R20B=R20B, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp), dtype=complex128)
+
+    # The R20-free propagator, from the cache if the exchange parameters are unchanged.
+    key = ('MMQ', float(k_AB), float(k_BA), dw.tobytes(), tcp.tobytes())
+    prop = exp_cache.matrix_exponential(rmmq_2site_rankN(R20A=0.0, R20B=0.0, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp), key, dtype=complex128)
+
+    # The R20 relaxation is a scalar diagonal offset, so it is applied analytically.
+    return prop * exp(-R20A * tcp)[..., None, None]
+
+
+def r2eff_ns_mmq_2site_mq(M0=None, F_vector=array([1, 0], float64), R20A=None, R20B=None, pA=None, dw=None, dwH=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None, exp_cache=None):
     """The 2-site numerical solution to the Bloch-McConnell equation for MQ data.
 
     The notation used here comes from:
@@ -170,6 +201,8 @@ def r2eff_ns_mmq_2site_mq(M0=None, F_vector=array([1, 0], float64), R20A=None, R
     @type num_points:       numpy int array of rank [NS][NM][NO]
     @keyword power:         The matrix exponential power array.
     @type power:            numpy int array of rank [NS][NM][NO][ND]
+    @keyword exp_cache:     The optional cache of the R20-free matrix exponentials.  This is only used when R20A and R20B are identical, as the R20 contribution is then applied analytically.
+    @type exp_cache:        None or lib.dispersion.matrix_exponential.Matrix_exponential_cache instance
     """
 
     # Once off parameter conversions.
@@ -181,20 +214,11 @@ def r2eff_ns_mmq_2site_mq(M0=None, F_vector=array([1, 0], float64), R20A=None, R
     M0[0] = pA
     M0[1] = pB
 
-    # Extract shape of experiment.
-    NS, NM, NO = num_points.shape
-
-    # Populate the m1 and m2 matrices (only once per function call for speed).
-    # D+ matrix component.
-    m1_mat = rmmq_2site_rankN(R20A=R20A, R20B=R20B, dw=-dw - dwH, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
-    # Z- matrix component.
-    m2_mat = rmmq_2site_rankN(R20A=R20A, R20B=R20B, dw=dw - dwH, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
-
     # The M1 and M2 matrices.
     # Equivalent to D+.
-    M1_mat = matrix_exponential(m1_mat, dtype=complex128)
+    M1_mat = mmq_2site_propagator(R20A=R20A, R20B=R20B, dw=-dw - dwH, k_AB=k_AB, k_BA=k_BA, tcp=tcp, exp_cache=exp_cache)
     # Equivalent to Z-.
-    M2_mat = matrix_exponential(m2_mat, dtype=complex128)
+    M2_mat = mmq_2site_propagator(R20A=R20A, R20B=R20B, dw=dw - dwH, k_AB=k_AB, k_BA=k_BA, tcp=tcp, exp_cache=exp_cache)
 
     # The complex conjugates M1* and M2*
     # Equivalent to D+*.
@@ -212,91 +236,43 @@ def r2eff_ns_mmq_2site_mq(M0=None, F_vector=array([1, 0], float64), R20A=None, R
     M1_M2_M2_M1_star_mat = einsum('...ij, ...jk', M1_M2_star_mat, M2_M1_star_mat)
     M2_M1_M1_M2_star_mat = einsum('...ij, ...jk', M2_M1_star_mat, M1_M2_star_mat)
 
-    # Loop over spins.
-    for si in range(NS):
-        # Loop over the spectrometer frequencies.
-        for mi in range(NM):
-            # Loop over offsets:
-            for oi in range(NO):
-                num_points_i = num_points[si, mi, oi]
-
-                # Loop over the time points, back calculating the R2eff values.
-                for i in range(num_points_i):
-                    # Extract data from array.
-                    power_i = int(power[si, mi, oi, i])
-                    M1_M2_i = M1_M2_mat[si, mi, oi, i]
-                    M1_M2_star_i = M1_M2_star_mat[si, mi, oi, i]
-                    M2_M1_i = M2_M1_mat[si, mi, oi, i]
-                    M2_M1_star_i = M2_M1_star_mat[si, mi, oi, i]
-                    M1_M2_M2_M1_i = M1_M2_M2_M1_mat[si, mi, oi, i]
-                    M2_M1_M1_M2_star_i = M2_M1_M1_M2_star_mat[si, mi, oi, i]
-                    M2_M1_M1_M2_i = M2_M1_M1_M2_mat[si, mi, oi, i]
-                    M1_M2_M2_M1_star_i = M1_M2_M2_M1_star_mat[si, mi, oi, i]
-
-                    # Special case of 1 CPMG block - the power is zero.
-                    if power_i == 1:
-                        # M1.M2.
-                        A = M1_M2_i
-
-                        # M1*.M2*.
-                        B = M1_M2_star_i
-
-                        # M2.M1.
-                        C = M2_M1_i
-
-                        # M2*.M1*.
-                        D = M2_M1_star_i
-
-                    # Matrices for even number of CPMG blocks.
-                    elif power_i % 2 == 0:
-                        # The power factor (only calculate once).
-                        fact = int(floor(power_i / 2))
-
-                        # (M1.M2.M2.M1)^(n/2).
-                        A = matrix_power(M1_M2_M2_M1_i, fact)
-
-                        # (M2*.M1*.M1*.M2*)^(n/2).
-                        B = matrix_power(M2_M1_M1_M2_star_i, fact)
-
-                        # (M2.M1.M1.M2)^(n/2).
-                        C = matrix_power(M2_M1_M1_M2_i, fact)
-
-                        # (M1*.M2*.M2*.M1*)^(n/2).
-                        D = matrix_power(M1_M2_M2_M1_star_i, fact)
-
-                    # Matrices for odd number of CPMG blocks.
-                    else:
-                        # The power factor (only calculate once).
-                        fact = int(floor((power_i - 1) / 2))
-
-                        # (M1.M2.M2.M1)^((n-1)/2).M1.M2.
-                        A = matrix_power(M1_M2_M2_M1_i, fact)
-                        A = dot(A, M1_M2_i)
-
-                        # (M1*.M2*.M2*.M1*)^((n-1)/2).M1*.M2*.
-                        B = matrix_power(M1_M2_M2_M1_star_i, fact)
-                        B = dot(B, M1_M2_star_i)
-
-                        # (M2.M1.M1.M2)^((n-1)/2).M2.M1.
-                        C = matrix_power(M2_M1_M1_M2_i, fact)
-                        C = dot(C, M2_M1_i)
-
-                        # (M2*.M1*.M1*.M2*)^((n-1)/2).M2*.M1*.
-                        D = matrix_power(M2_M1_M1_M2_star_i, fact)
-                        D = dot(D, M2_M1_star_i)
-
-                    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
-                    A_B = dot(A, B)
-                    C_D = dot(C, D)
-                    Mx = dot(dot(F_vector, (A_B + C_D)), M0)
-                    Mx = Mx.real / 2.0
-                    if Mx <= 0.0 or isNaN(Mx):
-                        back_calc[si, mi, oi, i] = 1e99
-                    else:
-                        back_calc[si, mi, oi, i]= -inv_tcpmg[si, mi, oi, i] * log(Mx / pA)
-
-
-def r2eff_ns_mmq_2site_sq_dq_zq(M0=None, F_vector=array([1, 0], float64), R20A=None, R20B=None, pA=None, dw=None, dwH=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None):
+    # The power factors, (n-1)/2 for odd and n/2 for even numbers of CPMG blocks.
+    fact = power // 2
+    mask_odd = (power % 2 == 1)[:, :, :, :, None, None]
+
+    # The matrix powers for all dispersion points.
+    M1_M2_M2_M1_power = matrix_power_rankN(M1_M2_M2_M1_mat, fact)
+    M1_M2_M2_M1_star_power = matrix_power_rankN(M1_M2_M2_M1_star_mat, fact)
+    M2_M1_M1_M2_power = matrix_power_rankN(M2_M1_M1_M2_mat, fact)
+    M2_M1_M1_M2_star_power = matrix_power_rankN(M2_M1_M1_M2_star_mat, fact)
+
+    # Matrices for even number of CPMG blocks.
+    # (M1.M2.M2.M1)^(n/2), (M2*.M1*.M1*.M2*)^(n/2), (M2.M1.M1.M2)^(n/2), and (M1*.M2*.M2*.M1*)^(n/2).
+    # Matrices for odd number of CPMG blocks (including the special case of 1 CPMG block where the power is zero).
+    # (M1.M2.M2.M1)^((n-1)/2).M1.M2, (M1*.M2*.M2*.M1*)^((n-1)/2).M1*.M2*, (M2.M1.M1.M2)^((n-1)/2).M2.M1, and (M2*.M1*.M1*.M2*)^((n-1)/2).M2*.M1*.
+    A = where(mask_odd, einsum('...ij, ...jk', M1_M2_M2_M1_power, M1_M2_mat), M1_M2_M2_M1_power)
+    B = where(mask_odd, einsum('...ij, ...jk', M1_M2_M2_M1_star_power, M1_M2_star_mat), M2_M1_M1_M2_star_power)
+    C = where(mask_odd, einsum('...ij, ...jk', M2_M1_M1_M2_power, M2_M1_mat), M2_M1_M1_M2_power)
+    D = where(mask_odd, einsum('...ij, ...jk', M2_M1_M1_M2_star_power, M2_M1_star_mat), M1_M2_M2_M1_star_power)
+
+    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
+    A_B = einsum('...ij, ...jk', A, B)
+    C_D = einsum('...ij, ...jk', C, D)
+    Mx = einsum('i, ...ij, j', F_vector, A_B + C_D, M0)
+    Mx = Mx.real / 2.0
+
+    # Catch negative and NaN values.
+    mask_invalid = ~(Mx > 0.0)
+    Mx[mask_invalid] = pA
+    r2eff = -inv_tcpmg * log(Mx / pA)
+    r2eff[mask_invalid] = 1e99
+
+    # Store the values for the real dispersion points.
+    mask_points = arange(back_calc.shape[-1]) < num_points[:, :, :, None]
+    back_calc[mask_points] = r2eff[mask_points]
+
+
+def r2eff_ns_mmq_2site_sq_dq_zq(M0=None, F_vector=array([1, 0], float64), R20A=None, R20B=None, pA=None, dw=None, dwH=None, kex=None, inv_tcpmg=None, tcp=None, back_calc=None, num_points=None, power=None, exp_cache=None):
     """The 2-site numerical solution to the Bloch-McConnell equation for SQ, ZQ, and DQ data.
 
     The notation used here comes from:
@@ -332,6 +308,8 @@ def r2eff_ns_mmq_2site_sq_dq_zq(M0=None, F_vector=array([1, 0], float64), R20A=N
     @type num_points:       numpy int array of rank [NS][NM][NO]
     @keyword power:         The matrix exponential power array.
     @type power:            numpy int array of rank [NS][NM][NO][ND]
+    @keyword exp_cache:     The optional cache of the R20-free matrix exponentials.  This is only used when R20A and R20B are identical, as the R20 contribution is then applied analytically.
+    @type exp_cache:        None or lib.dispersion.matrix_exponential.Matrix_exponential_cache instance
     """
 
     # Once off parameter conversions.
@@ -343,44 +321,28 @@ def r2eff_ns_mmq_2site_sq_dq_zq(M0=None, F_vector=array([1, 0], float64), R20A=N
     M0[0] = pA
     M0[1] = pB
 
-    # Extract shape of experiment.
-    NS, NM, NO = num_points.shape
-
-    # Populate the m1 and m2 matrices (only once per function call for speed).
-    m1_mat = rmmq_2site_rankN(R20A=R20A, R20B=R20B, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
-    m2_mat = rmmq_2site_rankN(R20A=R20A, R20B=R20B, dw=-dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
-
     # The A+/- matrices.
-    A_pos_mat = matrix_exponential(m1_mat, dtype=complex128)
-    A_neg_mat = matrix_exponential(m2_mat, dtype=complex128)
+    A_pos_mat = mmq_2site_propagator(R20A=R20A, R20B=R20B, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp, exp_cache=exp_cache)
+    A_neg_mat = mmq_2site_propagator(R20A=R20A, R20B=R20B, dw=-dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp, exp_cache=exp_cache)
 
     # The evolution for one n.
     evol_block_mat = einsum('...ij, ...jk', A_neg_mat, A_pos_mat)
     evol_block_mat = einsum('...ij, ...jk', A_neg_mat, evol_block_mat)
     evol_block_mat = einsum('...ij, ...jk', A_pos_mat, evol_block_mat)
 
-    # Loop over spins.
-    for si in range(NS):
-        # Loop over the spectrometer frequencies.
-        for mi in range(NM):
-            # Loop over offsets:
-            for oi in range(NO):
-                # Extract number of points.
-                num_points_i = num_points[si, mi, oi]
-
-                # Loop over the time points, back calculating the R2eff values.
-                for i in range(num_points_i):
-                    # Extract data from array.
-                    power_i = int(power[si, mi, oi, i])
-                    evol_block_i = evol_block_mat[si, mi, oi, i]
-
-                    # The full evolution.
-                    evol = matrix_power(evol_block_i, power_i)
-
-                    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
-                    Mx = dot(F_vector, dot(evol, M0))
-                    Mx = Mx.real
-                    if Mx <= 0.0 or isNaN(Mx):
-                        back_calc[si, mi, oi, i] = 1e99
-                    else:
-                        back_calc[si, mi, oi, i] = -inv_tcpmg[si, mi, oi, i] * log(Mx / pA)
+    # The full evolution for all dispersion points.
+    evol = matrix_power_rankN(evol_block_mat, power)
+
+    # The next lines calculate the R2eff using a two-point approximation, i.e. assuming that the decay is mono-exponential.
+    Mx = einsum('i, ...ij, j', F_vector, evol, M0)
+    Mx = Mx.real
+
+    # Catch negative and NaN values.
+    mask_invalid = ~(Mx > 0.0)
+    Mx[mask_invalid] = pA
+    r2eff = -inv_tcpmg * log(Mx / pA)
+    r2eff[mask_invalid] = 1e99
+
+    # Store the values for the real dispersion points.
+    mask_points = arange(back_calc.shape[-1]) < num_points[:, :, :, None]
+    back_calc[mask_points] = r2eff[mask_points]
@@ -36,5 +36,6 @@ __all__ = [
     'pseudo_ellipse_torsionless',
     'rotor',
     'simulation',
+    'sobol',
     'variables'
 ]
@@ -31,7 +31,7 @@ except ImportError:
     pass
 
 # relax module imports.
-from lib.frame_order.matrix_ops import pcs_pivot_motion_full_qr_int, pcs_pivot_motion_full_quad_int, rotate_daeg
+from lib.frame_order.matrix_ops import pcs_pivot_motion_full_qr_int, pcs_pivot_motion_full_quad_int, pcs_qr_int_blocks, rotate_daeg
 
 
 def compile_1st_matrix_iso_cone(matrix, R_eigen, cone_theta, sigma_max):
@@ -158,31 +158,23 @@ def pcs_numeric_qr_int_iso_cone(points=None, max_points=None, theta_max=None, si
     pcs_theta[:] = 0.0
     pcs_theta_err[:] = 0.0
 
-    # Fast frame shift.
-    Ri = dot(R_eigen, tensordot(Ri_prime, RT_eigen, axes=1))
-    Ri = swapaxes(Ri, 0, 1)
-
     # Unpack the points.
     theta, phi, sigma = points
 
-    # Loop over the samples.
-    num = 0
-    for i in range(len(points[0])):
-        # The maximum number of points has been reached (well, surpassed by one so exit the loop before it is used).
-        if num == max_points:
-            break
+    # The in-distribution points.
+    mask = (theta <= theta_max) & (abs(sigma) <= sigma_max)
 
-        # Outside of the distribution, so skip the point.
-        if theta[i] > theta_max:
-            continue
-        if abs(sigma[i]) > sigma_max:
-            continue
+    # The first in-distribution points up to the maximum number, in memory-bounded blocks.
+    num, blocks = pcs_qr_int_blocks(mask=mask, max_points=max_points, num_atoms=len(r_pivot_atom))
 
-        # Calculate the PCSs for this state.
-        pcs_pivot_motion_full_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri[i], pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
+    # Loop over the blocks of samples.
+    for block in blocks:
+        # Fast frame shift.
+        Ri = dot(R_eigen, tensordot(Ri_prime[block], RT_eigen, axes=1))
+        Ri = swapaxes(Ri, 0, 1)
 
-        # Increment the number of points.
-        num += 1
+        # Calculate the PCSs for all states of the block.
+        pcs_pivot_motion_full_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri, pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
 
     # Default to the rigid state if no points lie in the distribution.
     if num == 0:
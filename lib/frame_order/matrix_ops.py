@@ -24,13 +24,16 @@
 
 # Python module imports.
 from math import cos, sin
-from numpy import dot, transpose
+from numpy import add, dot, einsum, newaxis, nonzero, transpose, where
 from numpy.linalg import norm
 
 # relax module imports.
 from lib.compat import norm
 from lib.linear_algebra.kronecker_product import transpose_23
 
+# The maximum number of rotated atomic position vectors (Sobol' points times atoms) to hold in memory at once in the quasi-random numerical integration.
+QR_INT_BLOCK_VECTORS = 1000000
+
 
 def daeg_to_rotational_superoperator(daeg, Rsuper):
     """Convert the frame order matrix (daeg) to the rotational superoperator.
@@ -91,7 +94,7 @@ def daeg_to_rotational_superoperator(daeg, Rsuper):
 
 
 def pcs_pivot_motion_full_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_pivot_atom_rev=None, r_ln_pivot=None, A=None, Ri=None, pcs_theta=None, pcs_theta_err=None, missing_pcs=None):
-    """Calculate the PCS value after a pivoted motion for the isotropic cone model.
+    """Calculate the PCS value after a pivoted motion for the isotropic cone model, summed over all states i.
 
     @keyword full_in_ref_frame: An array of flags specifying if the tensor in the reference frame is the full or reduced tensor.
     @type full_in_ref_frame:    numpy rank-1 array
@@ -103,8 +106,8 @@ def pcs_pivot_motion_full_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_pi
     @type r_ln_pivot:           numpy rank-2, 3D array
     @keyword A:                 The full alignment tensor of the non-moving domain.
     @type A:                    numpy rank-2, 3D array
-    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i.
-    @type Ri:                   numpy rank-2, 3D array
+    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i, or the array of these matrices for a block of states i.
+    @type Ri:                   numpy rank-2, 3D array or numpy rank-3, array of 3D arrays
     @keyword pcs_theta:         The storage structure for the back-calculated PCS values.
     @type pcs_theta:            numpy rank-2 array
     @keyword pcs_theta_err:     The storage structure for the back-calculated PCS errors.
@@ -113,35 +116,22 @@ def pcs_pivot_motion_full_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_pi
     @type missing_pcs:          numpy rank-2 array
     """
 
-    # Pre-calculate all the new vectors.
-    rot_vect = dot(r_pivot_atom, Ri) + r_ln_pivot
+    # Convert a single rotation matrix into a stack of one state.
+    if len(Ri.shape) == 2:
+        Ri = Ri[newaxis]
 
-    # The vector length (to the 5th power).
-    length = 1.0 / norm(rot_vect, axis=1)**5
+    # Pre-calculate all the new vectors for all states.
+    rot_vect = einsum('jk,ikl->ijl', r_pivot_atom, Ri)
+    add(rot_vect, r_ln_pivot, rot_vect)
 
-    # The reverse vectors and lengths.
+    # The reverse vectors.
+    rot_vect_rev = None
     if min(full_in_ref_frame) == 0:
-        rot_vect_rev = dot(r_pivot_atom_rev, Ri) + r_ln_pivot
-        length_rev = 1.0 / norm(rot_vect_rev, axis=1)**5
-
-    # Loop over the atoms.
-    for j in range(len(r_pivot_atom[:, 0])):
-        # Loop over the alignments.
-        for i in range(len(pcs_theta)):
-            # Skip missing data.
-            if missing_pcs[i, j]:
-                continue
-
-            # The projection.
-            if full_in_ref_frame[i]:
-                proj = dot(rot_vect[j], dot(A[i], rot_vect[j]))
-                length_i = length[j]
-            else:
-                proj = dot(rot_vect_rev[j], dot(A[i], rot_vect_rev[j]))
-                length_i = length_rev[j]
+        rot_vect_rev = einsum('jk,ikl->ijl', r_pivot_atom_rev, Ri)
+        add(rot_vect_rev, r_ln_pivot, rot_vect_rev)
 
-            # The PCS.
-            pcs_theta[i, j] += proj * length_i
+    # Sum the PCS values over all states.
+    pcs_qr_int_sum(full_in_ref_frame=full_in_ref_frame, rot_vect=rot_vect, rot_vect_rev=rot_vect_rev, A=A, pcs_theta=pcs_theta, missing_pcs=missing_pcs)
 
 
 def pcs_pivot_motion_full_quad_int(theta_i, phi_i, sigma_i, r_pivot_atom, r_ln_pivot, A, R_eigen, RT_eigen, Ri_prime):
@@ -208,7 +198,7 @@ def pcs_pivot_motion_full_quad_int(theta_i, phi_i, sigma_i, r_pivot_atom, r_ln_p
 
 
 def pcs_pivot_motion_torsionless_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_pivot_atom_rev=None, r_ln_pivot=None, A=None, Ri=None, pcs_theta=None, pcs_theta_err=None, missing_pcs=None):
-    """Calculate the PCS value after a pivoted motion for the isotropic cone model.
+    """Calculate the PCS value after a pivoted motion for the isotropic cone model, summed over all states i.
 
     @keyword full_in_ref_frame: An array of flags specifying if the tensor in the reference frame is the full or reduced tensor.
     @type full_in_ref_frame:    numpy rank-1 array
@@ -220,8 +210,8 @@ def pcs_pivot_motion_torsionless_qr_int(full_in_ref_frame=None, r_pivot_atom=Non
     @type r_ln_pivot:           numpy rank-2, 3D array
     @keyword A:                 The full alignment tensor of the non-moving domain.
     @type A:                    numpy rank-2, 3D array
-    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i.
-    @type Ri:                   numpy rank-2, 3D array
+    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i, or the array of these matrices for a block of states i.
+    @type Ri:                   numpy rank-2, 3D array or numpy rank-3, array of 3D arrays
     @keyword pcs_theta:         The storage structure for the back-calculated PCS values.
     @type pcs_theta:            numpy rank-2 array
     @keyword pcs_theta_err:     The storage structure for the back-calculated PCS errors.
@@ -230,35 +220,22 @@ def pcs_pivot_motion_torsionless_qr_int(full_in_ref_frame=None, r_pivot_atom=Non
     @type missing_pcs:          numpy rank-2 array
     """
 
-    # Pre-calculate all the new vectors.
-    rot_vect = dot(r_pivot_atom, Ri) + r_ln_pivot
+    # Convert a single rotation matrix into a stack of one state.
+    if len(Ri.shape) == 2:
+        Ri = Ri[newaxis]
 
-    # The vector length (to the 5th power).
-    length = 1.0 / norm(rot_vect, axis=1)**5
+    # Pre-calculate all the new vectors for all states.
+    rot_vect = einsum('jk,ikl->ijl', r_pivot_atom, Ri)
+    add(rot_vect, r_ln_pivot, rot_vect)
 
-    # The reverse vectors and lengths.
+    # The reverse vectors.
+    rot_vect_rev = None
     if min(full_in_ref_frame) == 0:
-        rot_vect_rev = dot(r_pivot_atom_rev, Ri) + r_ln_pivot
-        length_rev = 1.0 / norm(rot_vect_rev, axis=1)**5
-
-    # Loop over the atoms.
-    for j in range(len(r_pivot_atom[:, 0])):
-        # Loop over the alignments.
-        for i in range(len(pcs_theta)):
-            # Skip missing data.
-            if missing_pcs[i, j]:
-                continue
+        rot_vect_rev = einsum('jk,ikl->ijl', r_pivot_atom_rev, Ri)
+        add(rot_vect_rev, r_ln_pivot, rot_vect_rev)
 
-            # The projection.
-            if full_in_ref_frame[i]:
-                proj = dot(rot_vect[j], dot(A[i], rot_vect[j]))
-                length_i = length[j]
-            else:
-                proj = dot(rot_vect_rev[j], dot(A[i], rot_vect_rev[j]))
-                length_i = length_rev[j]
-
-            # The PCS.
-            pcs_theta[i, j] += proj * length_i
+    # Sum the PCS values over all states.
+    pcs_qr_int_sum(full_in_ref_frame=full_in_ref_frame, rot_vect=rot_vect, rot_vect_rev=rot_vect_rev, A=A, pcs_theta=pcs_theta, missing_pcs=missing_pcs)
 
 
 def pcs_pivot_motion_torsionless_quad_int(theta_i, phi_i, r_pivot_atom, r_ln_pivot, A, R_eigen, RT_eigen, Ri_prime):
@@ -320,6 +297,71 @@ def pcs_pivot_motion_torsionless_quad_int(theta_i, phi_i, r_pivot_atom, r_ln_piv
     return pcs
 
 
+def pcs_qr_int_blocks(mask=None, max_points=None, num_atoms=None):
+    """Select the Sobol' points for the quasi-random numerical integration, split into memory-bounded blocks.
+
+    @keyword mask:          The array of flags specifying which Sobol' points lie inside the distribution.
+    @type mask:             numpy rank-1 bool array
+    @keyword max_points:    The maximum number of Sobol' points to use.  Only the first in-distribution points up to this number are selected.
+    @type max_points:       int
+    @keyword num_atoms:     The number of atoms, used to limit the size of the blocks.
+    @type num_atoms:        int
+    @return:                The number of selected points and the list of index arrays for each block of points.
+    @rtype:                 int, list of numpy rank-1 int arrays
+    """
+
+    # The indices of the first in-distribution points.
+    indices = nonzero(mask)[0][:max_points]
+    num = len(indices)
+
+    # The block size.
+    size = max(1, QR_INT_BLOCK_VECTORS // max(1, num_atoms))
+
+    # Return the number of points and the blocks.
+    return num, [indices[i:i+size] for i in range(0, num, size)]
+
+
+def pcs_qr_int_sum(full_in_ref_frame=None, rot_vect=None, rot_vect_rev=None, A=None, pcs_theta=None, missing_pcs=None):
+    """Add the PCS values for a block of states to the PCS sums.
+
+    The projections are not calculated state by state.  Instead the outer products of the rotated vectors, weighted by the inverse 5th power of the vector length, are first summed over all states, and then projected onto each alignment tensor.
+
+
+    @keyword full_in_ref_frame: An array of flags specifying if the tensor in the reference frame is the full or reduced tensor.
+    @type full_in_ref_frame:    numpy rank-1 array
+    @keyword rot_vect:          The rotated lanthanide to atom vectors for all states of the block.
+    @type rot_vect:             numpy rank-3 array with dimensions {states, atoms, 3}
+    @keyword rot_vect_rev:      The reversed rotated vectors, if a reduced tensor is present in the reference frame.
+    @type rot_vect_rev:         None or numpy rank-3 array with dimensions {states, atoms, 3}
+    @keyword A:                 The full alignment tensor of the non-moving domain.
+    @type A:                    numpy rank-3 array of 3D, rank-2 arrays
+    @keyword pcs_theta:         The storage structure for the back-calculated PCS values.
+    @type pcs_theta:            numpy rank-2 array
+    @keyword missing_pcs:       A structure used to indicate which PCS values are missing.
+    @type missing_pcs:          numpy rank-2 array
+    """
+
+    # The length weighted outer products, summed over all states.
+    length = 1.0 / norm(rot_vect, axis=2)**5
+    outer_sum = einsum('ij,ijk,ijl->jkl', length, rot_vect, rot_vect)
+
+    # The projections.
+    pcs = einsum('akl,jkl->aj', A, outer_sum)
+
+    # The reverse projections.
+    if rot_vect_rev is not None:
+        length_rev = 1.0 / norm(rot_vect_rev, axis=2)**5
+        outer_sum_rev = einsum('ij,ijk,ijl->jkl', length_rev, rot_vect_rev, rot_vect_rev)
+        pcs_rev = einsum('akl,jkl->aj', A, outer_sum_rev)
+        pcs = where(full_in_ref_frame[:, newaxis] != 0, pcs, pcs_rev)
+
+    # Skip missing data.
+    pcs[missing_pcs != 0] = 0.0
+
+    # Add to the PCS sums.
+    add(pcs_theta, pcs, pcs_theta)
+
+
 def reduce_alignment_tensor(D, A, red_tensor):
     """Calculate the reduction in the alignment tensor caused by the Frame Order matrix.
 
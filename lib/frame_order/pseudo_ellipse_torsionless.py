@@ -32,7 +32,7 @@ except ImportError:
 
 # relax module imports.
 from lib.geometry.pec import pec
-from lib.frame_order.matrix_ops import pcs_pivot_motion_torsionless_qr_int, pcs_pivot_motion_torsionless_quad_int, rotate_daeg
+from lib.frame_order.matrix_ops import pcs_pivot_motion_torsionless_qr_int, pcs_pivot_motion_torsionless_quad_int, pcs_qr_int_blocks, rotate_daeg
 from lib.frame_order.pseudo_ellipse import tmax_pseudo_ellipse, tmax_pseudo_ellipse_array
 
 
@@ -408,36 +408,26 @@ def pcs_numeric_qr_int_pseudo_ellipse_torsionless(points=None, max_points=None,
     pcs_theta[:] = 0.0
     pcs_theta_err[:] = 0.0
 
-    # Fast frame shift.
-    Ri = dot(R_eigen, tensordot(Ri_prime, RT_eigen, axes=1))
-    Ri = swapaxes(Ri, 0, 1)
-
     # Unpack the points.
     theta, phi = points
 
     # Calculate theta_max.
     theta_max = tmax_pseudo_ellipse_array(phi, theta_x, theta_y)
 
-    # Loop over the samples.
-    num = 0
-    for i in range(len(points[0])):
-        # The maximum number of points has been reached (well, surpassed by one so exit the loop before it is used).
-        if num == max_points:
-            break
-
-        # As theta_x <= theta_y, check if theta is outside of the isotropic cone defined by theta_y to minimise calculations for speed.
-        if theta[i] > theta_y:
-            continue
+    # The in-distribution points.
+    mask = theta <= theta_max
 
-        # Outside of the distribution, so skip the point.
-        if theta[i] > theta_max[i]:
-            continue
+    # The first in-distribution points up to the maximum number, in memory-bounded blocks.
+    num, blocks = pcs_qr_int_blocks(mask=mask, max_points=max_points, num_atoms=len(r_pivot_atom))
 
-        # Calculate the PCSs for this state.
-        pcs_pivot_motion_torsionless_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri[i], pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
+    # Loop over the blocks of samples.
+    for block in blocks:
+        # Fast frame shift.
+        Ri = dot(R_eigen, tensordot(Ri_prime[block], RT_eigen, axes=1))
+        Ri = swapaxes(Ri, 0, 1)
 
-        # Increment the number of points.
-        num += 1
+        # Calculate the PCSs for all states of the block.
+        pcs_pivot_motion_torsionless_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri, pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
 
     # Default to the rigid state if no points lie in the distribution.
     if num == 0:
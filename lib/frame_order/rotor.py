@@ -24,7 +24,7 @@
 
 # Python module imports.
 from math import cos, pi, sin
-from numpy import divide, dot, eye, float64, multiply, sinc, swapaxes, tensordot
+from numpy import add, divide, dot, einsum, eye, float64, multiply, newaxis, sinc, swapaxes, tensordot
 try:
     from scipy.integrate import quad
 except ImportError:
@@ -32,7 +32,7 @@ except ImportError:
 
 # relax module imports.
 from lib.compat import norm
-from lib.frame_order.matrix_ops import rotate_daeg
+from lib.frame_order.matrix_ops import pcs_qr_int_blocks, pcs_qr_int_sum, rotate_daeg
 
 
 def compile_1st_matrix_rotor(matrix, R_eigen, sigma_max):
@@ -142,29 +142,23 @@ def pcs_numeric_qr_int_rotor(points=None, max_points=None, sigma_max=None, c=Non
     pcs_theta[:] = 0.0
     pcs_theta_err[:] = 0.0
 
-    # Fast frame shift.
-    Ri = dot(R_eigen, tensordot(Ri_prime, RT_eigen, axes=1))
-    Ri = swapaxes(Ri, 0, 1)
-
     # Unpack the points (in this case, just an alias).
     sigma = points[0]
 
-    # Loop over the samples.
-    num = 0
-    for i in range(len(points[0])):
-        # The maximum number of points has been reached (well, surpassed by one so exit the loop before it is used).
-        if num == max_points:
-            break
+    # The in-distribution points.
+    mask = abs(sigma) <= sigma_max
 
-        # Outside of the distribution, so skip the point.
-        if abs(sigma[i]) > sigma_max:
-            continue
+    # The first in-distribution points up to the maximum number, in memory-bounded blocks.
+    num, blocks = pcs_qr_int_blocks(mask=mask, max_points=max_points, num_atoms=len(r_pivot_atom))
 
-        # Calculate the PCSs for this state.
-        pcs_pivot_motion_rotor_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri[i], pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
+    # Loop over the blocks of samples.
+    for block in blocks:
+        # Fast frame shift.
+        Ri = dot(R_eigen, tensordot(Ri_prime[block], RT_eigen, axes=1))
+        Ri = swapaxes(Ri, 0, 1)
 
-        # Increment the number of points.
-        num += 1
+        # Calculate the PCSs for all states of the block.
+        pcs_pivot_motion_rotor_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri, pcs_theta=pcs_theta, pcs_theta_err=pcs_theta_err, missing_pcs=missing_pcs)
 
     # Default to the rigid state if no points lie in the distribution.
     if num == 0:
@@ -226,7 +220,7 @@ def pcs_numeric_quad_int_rotor(sigma_max=None, c=None, r_pivot_atom=None, r_ln_p
 
 
 def pcs_pivot_motion_rotor_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_pivot_atom_rev=None, r_ln_pivot=None, A=None, Ri=None, pcs_theta=None, pcs_theta_err=None, missing_pcs=None):
-    """Calculate the PCS value after a pivoted motion for the rotor model.
+    """Calculate the PCS value after a pivoted motion for the rotor model, summed over all states i.
 
     @keyword full_in_ref_frame: An array of flags specifying if the tensor in the reference frame is the full or reduced tensor.
     @type full_in_ref_frame:    numpy rank-1 array
@@ -238,8 +232,8 @@ def pcs_pivot_motion_rotor_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_p
     @type r_ln_pivot:           numpy rank-2, 3D array
     @keyword A:                 The full alignment tensor of the non-moving domain.
     @type A:                    numpy rank-2, 3D array
-    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i.
-    @type Ri:                   numpy rank-2, 3D array
+    @keyword Ri:                The frame-shifted, pre-calculated rotation matrix for state i, or the array of these matrices for a block of states i.
+    @type Ri:                   numpy rank-2, 3D array or numpy rank-3, array of 3D arrays
     @keyword pcs_theta:         The storage structure for the back-calculated PCS values.
     @type pcs_theta:            numpy rank-2 array
     @keyword pcs_theta_err:     The storage structure for the back-calculated PCS errors.
@@ -248,35 +242,22 @@ def pcs_pivot_motion_rotor_qr_int(full_in_ref_frame=None, r_pivot_atom=None, r_p
     @type missing_pcs:          numpy rank-2 array
     """
 
-    # Pre-calculate all the new vectors.
-    rot_vect = dot(r_pivot_atom, Ri) + r_ln_pivot
+    # Convert a single rotation matrix into a stack of one state.
+    if len(Ri.shape) == 2:
+        Ri = Ri[newaxis]
 
-    # The vector length (to the 5th power).
-    length = 1.0 / norm(rot_vect, axis=1)**5
+    # Pre-calculate all the new vectors for all states.
+    rot_vect = einsum('jk,ikl->ijl', r_pivot_atom, Ri)
+    add(rot_vect, r_ln_pivot, rot_vect)
 
-    # The reverse vectors and lengths.
+    # The reverse vectors.
+    rot_vect_rev = None
     if min(full_in_ref_frame) == 0:
-        rot_vect_rev = dot(r_pivot_atom_rev, Ri) + r_ln_pivot
-        length_rev = 1.0 / norm(rot_vect_rev, axis=1)**5
-
-    # Loop over the atoms.
-    for j in range(len(r_pivot_atom[:, 0])):
-        # Loop over the alignments.
-        for i in range(len(pcs_theta)):
-            # Skip missing data.
-            if missing_pcs[i, j]:
-                continue
-
-            # The projection.
-            if full_in_ref_frame[i]:
-                proj = dot(rot_vect[j], dot(A[i], rot_vect[j]))
-                length_i = length[j]
-            else:
-                proj = dot(rot_vect_rev[j], dot(A[i], rot_vect_rev[j]))
-                length_i = length_rev[j]
-
-            # The PCS.
-            pcs_theta[i, j] += proj * length_i
+        rot_vect_rev = einsum('jk,ikl->ijl', r_pivot_atom_rev, Ri)
+        add(rot_vect_rev, r_ln_pivot, rot_vect_rev)
+
+    # Sum the PCS values over all states.
+    pcs_qr_int_sum(full_in_ref_frame=full_in_ref_frame, rot_vect=rot_vect, rot_vect_rev=rot_vect_rev, A=A, pcs_theta=pcs_theta, missing_pcs=missing_pcs)
 
 
 def pcs_pivot_motion_rotor_quad_int(sigma_i, r_pivot_atom, r_ln_pivot, A, R_eigen, RT_eigen, Ri_prime):
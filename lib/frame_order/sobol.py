@@ -0,0 +1,309 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""The quasi-random Sobol' sequence torsion-tilt angles and rotation matrices for the numerical PCS integration.
+
+The Sobol' points are identical to those of the extern.sobol.sobol_lib.i4_sobol_generate() function, but are generated for all points at once using the Gray code form of the Antonov and Saleev algorithm.  The direction numbers must be supplied by the caller.  The resultant angles and rotation matrices can optionally be stored in a directory of memory-mapped numpy .npy files so that they can be shared between relax instances, multi-processor slaves and repeated analyses.
+"""
+
+# Python module imports.
+from numpy import arange, arccos, array, cos, float32, int64, load, pi, save, sin, zeros
+from os import F_OK, access, fdopen, makedirs, rename, sep, unlink
+from tempfile import mkstemp
+
+# relax module imports.
+from lib.errors import RelaxError
+
+
+def sobol_points(v=None, recipd=None, n=None, skip=1000):
+    """Generate the Sobol' quasi-random points.
+
+    With the direction numbers of the extern.sobol.sobol_lib module, this reproduces i4_sobol_generate(m, n, skip).  The point for the Sobol' seed i is the bitwise XOR of the direction numbers selected by the bits of the Gray code i ^ (i >> 1).
+
+
+    @keyword v:         The direction numbers for each dimension, already multiplied by the appropriate power of 2.
+    @type v:            numpy rank-2 array of shape [m, log_max]
+    @keyword recipd:    The reciprocal of the common denominator of the direction numbers.
+    @type recipd:       float
+    @keyword n:         The number of points to generate.
+    @type n:            int
+    @keyword skip:      The number of initial points to skip.
+    @type skip:         int
+    @return:            The Sobol' points.
+    @rtype:             numpy rank-2, float64 array of shape [m, n]
+    """
+
+    # The integer direction numbers.
+    v = array(v, int64)
+    m = len(v)
+
+    # The seeds and their Gray code.
+    seeds = arange(skip-1, skip+n-1, dtype=int64)
+    seeds[seeds < 0] = 0
+    gray = seeds ^ (seeds >> 1)
+
+    # Checks.
+    if n and int(seeds[-1]).bit_length() > v.shape[1]:
+        raise RelaxError("Too many Sobol' points, the maximum seed is %s." % (2**v.shape[1] - 1))
+
+    # Loop over the dimensions, XOR combining the direction numbers for each bit.
+    points = zeros((m, n))
+    for i in range(m):
+        quasi = zeros(n, int64)
+        for bit in range(int(gray.max()).bit_length() if n else 0):
+            quasi ^= ((gray >> bit) & 1) * v[i, bit]
+        points[i] = quasi * recipd
+
+    # Return the points.
+    return points
+
+
+def sobol_angles(dims=None, points=None):
+    """Convert the Sobol' points to the torsion-tilt angles.
+
+    @keyword dims:      The list of parameters.
+    @type dims:         list of str
+    @keyword points:    The Sobol' points.
+    @type points:       numpy rank-2, float64 array of shape [m, n]
+    @return:            The angles.
+    @rtype:             numpy rank-2, float64 array of shape [m, n]
+    """
+
+    # Initialise.
+    angles = zeros(points.shape)
+
+    # Loop over the dimensions.
+    for j in range(len(dims)):
+        # The tilt angle - the angle of rotation about the x-y plane rotation axis.
+        if dims[j] == 'theta':
+            angles[j] = arccos(2.0*points[j] - 1.0)
+
+        # The angle defining the x-y plane rotation axis.
+        elif dims[j] == 'phi':
+            angles[j] = 2.0 * pi * points[j]
+
+        # The torsion angles - the angles of rotation about the z' axis (or y' and x' for the double motion models).
+        elif dims[j] in ['sigma', 'sigma2']:
+            angles[j] = 2.0 * pi * (points[j] - 0.5)
+
+        # Unknown.
+        else:
+            raise RelaxError("The Sobol' dimension '%s' is unknown." % dims[j])
+
+    # Return the angles.
+    return angles
+
+
+def sobol_rotations(dims=None, angles=None):
+    """Pre-calculate the rotation matrices for each Sobol' point.
+
+    @keyword dims:      The list of parameters.
+    @type dims:         list of str
+    @keyword angles:    The torsion-tilt angles.
+    @type angles:       numpy rank-2, float64 array of shape [m, n]
+    @return:            The rotation matrices Ri_prime and, for the double motion models, the second rotation matrices Ri2_prime (otherwise None).
+    @rtype:             numpy rank-3, float32 array of shape [n, 3, 3], numpy rank-3, float32 array of shape [n, 3, 3] or None
+    """
+
+    # Unpack the angles.
+    theta, phi, sigma, sigma2 = None, None, None, None
+    for j in range(len(dims)):
+        if dims[j] == 'theta':
+            theta = angles[j]
+        elif dims[j] == 'phi':
+            phi = angles[j]
+        elif dims[j] == 'sigma':
+            sigma = angles[j]
+        elif dims[j] == 'sigma2':
+            sigma2 = angles[j]
+
+    # Initialise.
+    n = angles.shape[1]
+    Ri_prime = zeros((n, 3, 3), float32)
+    Ri2_prime = None
+
+    # The rotation matrices for the double motion models.
+    if sigma2 is not None:
+        # The 1st rotation about the y-axis.
+        c_sigma = cos(sigma)
+        s_sigma = sin(sigma)
+        Ri_prime[:, 0, 0] =  c_sigma
+        Ri_prime[:, 0, 2] =  s_sigma
+        Ri_prime[:, 1, 1] = 1.0
+        Ri_prime[:, 2, 0] = -s_sigma
+        Ri_prime[:, 2, 2] =  c_sigma
+
+        # The 2nd rotation about the x-axis.
+        Ri2_prime = zeros((n, 3, 3), float32)
+        c_sigma2 = cos(sigma2)
+        s_sigma2 = sin(sigma2)
+        Ri2_prime[:, 0, 0] = 1.0
+        Ri2_prime[:, 1, 1] =  c_sigma2
+        Ri2_prime[:, 1, 2] = -s_sigma2
+        Ri2_prime[:, 2, 1] =  s_sigma2
+        Ri2_prime[:, 2, 2] =  c_sigma2
+
+    # The rotation matrix for the full tilt-torsion, as the zyz Euler angles (sigma - phi, theta, phi).
+    elif theta is not None and phi is not None and sigma is not None:
+        sin_a = sin(sigma - phi)
+        cos_a = cos(sigma - phi)
+        sin_b = sin(theta)
+        cos_b = cos(theta)
+        sin_g = sin(phi)
+        cos_g = cos(phi)
+        Ri_prime[:, 0, 0] = -sin_a * sin_g  +  cos_a * cos_b * cos_g
+        Ri_prime[:, 1, 0] =  sin_a * cos_g  +  cos_a * cos_b * sin_g
+        Ri_prime[:, 2, 0] = -cos_a * sin_b
+        Ri_prime[:, 0, 1] = -cos_a * sin_g  -  sin_a * cos_b * cos_g
+        Ri_prime[:, 1, 1] =  cos_a * cos_g  -  sin_a * cos_b * sin_g
+        Ri_prime[:, 2, 1] =  sin_a * sin_b
+        Ri_prime[:, 0, 2] =  sin_b * cos_g
+        Ri_prime[:, 1, 2] =  sin_b * sin_g
+        Ri_prime[:, 2, 2] =  cos_b
+
+    # The rotation matrix for the torsionless models.
+    elif sigma is None:
+        c_theta = cos(theta)
+        s_theta = sin(theta)
+        c_phi = cos(phi)
+        s_phi = sin(phi)
+        c_phi_c_theta = c_phi * c_theta
+        s_phi_c_theta = s_phi * c_theta
+        Ri_prime[:, 0, 0] =  c_phi_c_theta*c_phi + s_phi**2
+        Ri_prime[:, 0, 1] =  c_phi_c_theta*s_phi - c_phi*s_phi
+        Ri_prime[:, 0, 2] =  c_phi*s_theta
+        Ri_prime[:, 1, 0] =  s_phi_c_theta*c_phi - c_phi*s_phi
+        Ri_prime[:, 1, 1] =  s_phi_c_theta*s_phi + c_phi**2
+        Ri_prime[:, 1, 2] =  s_phi*s_theta
+        Ri_prime[:, 2, 0] = -s_theta*c_phi
+        Ri_prime[:, 2, 1] = -s_theta*s_phi
+        Ri_prime[:, 2, 2] =  c_theta
+
+    # The rotation matrix for the rotor models.
+    else:
+        c_sigma = cos(sigma)
+        s_sigma = sin(sigma)
+        Ri_prime[:, 0, 0] =  c_sigma
+        Ri_prime[:, 0, 1] = -s_sigma
+        Ri_prime[:, 1, 0] =  s_sigma
+        Ri_prime[:, 1, 1] =  c_sigma
+        Ri_prime[:, 2, 2] = 1.0
+
+    # Return the matrices.
+    return Ri_prime, Ri2_prime
+
+
+def sobol_cache_file(cache_dir=None, model=None, dims=None, total_num=None, name=None):
+    """Return the file path for one of the cached Sobol' data arrays.
+
+    @keyword cache_dir:     The directory holding the cache.
+    @type cache_dir:        str
+    @keyword model:         The frame order model.
+    @type model:            str
+    @keyword dims:          The list of parameters.
+    @type dims:             list of str
+    @keyword total_num:     The total number of Sobol' points.
+    @type total_num:        int
+    @keyword name:          The name of the array, one of 'angles', 'Ri_prime' or 'Ri2_prime'.
+    @type name:             str
+    @return:                The file path.
+    @rtype:                 str
+    """
+
+    # The model name, without spaces or punctuation.
+    model_name = model.replace(',', '').replace(' ', '_')
+
+    # The file path.
+    return cache_dir + sep + "sobol_%s_%s_%s_%s.npy" % (model_name, '_'.join(dims), total_num, name)
+
+
+def load_sobol_cache(files=None, m=None, total_num=None):
+    """Load the memory-mapped Sobol' data arrays, returning None if the cache is missing or invalid.
+
+    @keyword files:     The .npy file paths for the angles and rotation matrices.
+    @type files:        list of str
+    @keyword m:         The number of dimensions.
+    @type m:            int
+    @keyword total_num: The total number of Sobol' points.
+    @type total_num:    int
+    @return:            The read-only memory-mapped arrays.
+    @rtype:             list of numpy arrays or None
+    """
+
+    # Missing files.
+    for file in files:
+        if not access(file, F_OK):
+            return None
+
+    # Load the memory-mapped arrays.
+    try:
+        data = [load(file, mmap_mode='r') for file in files]
+    except (IOError, ValueError):
+        return None
+
+    # Check the shapes.
+    if data[0].shape != (m, total_num):
+        return None
+    for i in range(1, len(data)):
+        if data[i].shape != (total_num, 3, 3):
+            return None
+
+    # Return the arrays.
+    return data
+
+
+def save_sobol_cache(files=None, data=None):
+    """Save the Sobol' data arrays into the cache directory.
+
+    Each array is first written to a temporary file in the cache directory and then renamed, so that concurrent relax instances never see partially written files.  The angles, as the first array, are only written once the rotation matrices are in place.
+
+
+    @keyword files: The .npy file paths for the angles and rotation matrices.
+    @type files:    list of str
+    @keyword data:  The angles and rotation matrices.
+    @type data:     list of numpy arrays
+    """
+
+    # Create the directory, if needed.
+    dir = files[0][:files[0].rfind(sep)]
+    if not access(dir, F_OK):
+        try:
+            makedirs(dir)
+        except OSError:
+            if not access(dir, F_OK):
+                raise
+
+    # Save the rotation matrices before the angles.
+    for i in list(range(1, len(files))) + [0]:
+        fd, tmp_file = mkstemp(suffix='.npy', dir=dir)
+        try:
+            file = fdopen(fd, 'wb')
+            save(file, data[i])
+            file.close()
+            rename(tmp_file, files[i])
+
+        # Another relax instance may have won the race (on MS Windows renaming onto an existing file fails).
+        except OSError:
+            if access(tmp_file, F_OK):
+                unlink(tmp_file)
+            if not access(files[i], F_OK):
+                raise
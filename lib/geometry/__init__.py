@@ -26,6 +26,7 @@ __all__ = [
     'angles',
     'coord_transform',
     'lines',
+    'neighbours',
     'pec',
     'rotations',
     'vectors'
@@ -0,0 +1,129 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Functions for finding the neighbouring points in 3D space."""
+
+# Python module imports.
+from numpy import arange, argsort, asarray, concatenate, cumsum, float64, floor, int64, repeat, searchsorted, sqrt, zeros
+
+
+def neighbour_pairs(pos=None, radius=None):
+    """Find all pairs of points closer than the given radius using a cell list.
+
+    The points are sorted into cubic cells with sides equal to the radius, so that the neighbours of each point can only be found in the 27 surrounding cells.  The search is therefore linear in the number of points rather than quadratic, and all cells are processed simultaneously for each of the 27 cell offsets.
+
+
+    @keyword pos:       The Cartesian coordinates of the points.
+    @type pos:          numpy rank-2 array of shape [N, 3]
+    @keyword radius:    The neighbour cutoff distance.
+    @type radius:       float
+    @return:            The index of the first point, the index of the second point, and the distance between the two points, for each pair with the first index less than the second.
+    @rtype:             numpy rank-1 int64 array, numpy rank-1 int64 array, numpy rank-1 float64 array
+    """
+
+    # The points.
+    pos = asarray(pos, float64)
+    n = len(pos)
+
+    # Nothing to do.
+    if n < 2:
+        return zeros(0, int64), zeros(0, int64), zeros(0, float64)
+
+    # The cell of each point, padded by one cell on each side so that the neighbouring cell keys are unique.
+    cells = floor((pos - pos.min(axis=0)) / radius).astype(int64) + 1
+    dims = cells.max(axis=0) + 2
+
+    # The points sorted by cell key.
+    keys = (cells[:, 0]*dims[1] + cells[:, 1])*dims[2] + cells[:, 2]
+    order = argsort(keys, kind='mergesort')
+    sorted_keys = keys[order]
+
+    # Loop over the 27 cell offsets.
+    index1 = []
+    index2 = []
+    dist = []
+    points = arange(n)
+    for dx in [-1, 0, 1]:
+        for dy in [-1, 0, 1]:
+            for dz in [-1, 0, 1]:
+                # The range of the sorted points in the neighbouring cell of each point.
+                neighbour_keys = keys + (dx*dims[1] + dy)*dims[2] + dz
+                start = searchsorted(sorted_keys, neighbour_keys, 'left')
+                counts = searchsorted(sorted_keys, neighbour_keys, 'right') - start
+                total = counts.sum()
+                if not total:
+                    continue
+
+                # All candidate pairs.
+                i = repeat(points, counts)
+                j = order[repeat(start, counts) + arange(total) - repeat(cumsum(counts) - counts, counts)]
+
+                # Each pair only once.
+                mask = i < j
+                i = i[mask]
+                j = j[mask]
+
+                # The distances.
+                vect = pos[j] - pos[i]
+                d = sqrt((vect**2).sum(axis=1))
+
+                # Store the pairs within the radius.
+                mask = d < radius
+                index1.append(i[mask])
+                index2.append(j[mask])
+                dist.append(d[mask])
+
+    # Return the pairs.
+    return concatenate(index1), concatenate(index2), concatenate(dist)
+
+
+def point_neighbours(pos=None, index=None, radius=None):
+    """Find all points closer than the given radius to a single central point.
+
+    The points are binned into the same cubic cells as in neighbour_pairs(), and only the points in the 27 cells around the cell of the central point have their distances calculated.
+
+
+    @keyword pos:       The Cartesian coordinates of the points.
+    @type pos:          numpy rank-2 array of shape [N, 3]
+    @keyword index:     The index of the central point.
+    @type index:        int
+    @keyword radius:    The neighbour cutoff distance.
+    @type radius:       float
+    @return:            The indices of the neighbouring points, excluding the central point, and their distances to the central point, in order of increasing index.
+    @rtype:             numpy rank-1 int64 array, numpy rank-1 float64 array
+    """
+
+    # The points.
+    pos = asarray(pos, float64)
+
+    # The candidates in the neighbouring cells.
+    cells = floor(pos / radius)
+    candidates = (abs(cells - cells[index]).max(axis=1) <= 1).nonzero()[0]
+    candidates = candidates[candidates != index]
+
+    # The distances.
+    vect = pos[candidates] - pos[index]
+    d = sqrt((vect**2).sum(axis=1))
+
+    # Return the points within the radius.
+    mask = d < radius
+    return candidates[mask].astype(int64), d[mask]
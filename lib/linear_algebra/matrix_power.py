@@ -23,7 +23,7 @@
 """Module for matrix power operations."""
 
 # Python module imports.
-from numpy import diag, dot, eye
+from numpy import array, diag, dot, einsum, eye, int64, where, zeros
 from numpy.linalg import eig, inv
 
 # relax module imports.
@@ -57,3 +57,49 @@ def square_matrix_power(x, y):
     # Return the matrix power.
     return dot(dot(v, d**y), inv(v))
 
+
+
+def matrix_power_rankN(x, power):
+    """Raise a stack of square matrices to individual, non-negative integer powers.
+
+    The binary exponentiation algorithm of numpy.linalg.matrix_power() is used, but the squaring steps are shared by the whole stack.  Hence the cost is that of log2(max(power)) batched matrix products rather than one Python call per matrix.
+
+
+    @param x:       The stack of square matrices.
+    @type x:        numpy array of rank [...][X][X]
+    @param power:   The integer powers to raise each matrix to.
+    @type power:    numpy int or float array of rank [...], matching the outer dimensions of x
+    @return:        The matrix powers of x.
+    @rtype:         numpy array of rank [...][X][X]
+    """
+
+    # Sanity checks.
+    s = x.shape
+    if len(s) < 2 or s[-1] != s[-2]:
+        raise RelaxError("The outer matrices of the %s dimensional array must be square." % list(s))
+    power = array(power, int64)
+    if power.shape != s[:-2]:
+        raise RelaxError("The shape of the power array %s does not match the %s dimensional matrix stack." % (list(power.shape), list(s)))
+    if (power < 0).any():
+        raise RelaxError("The matrix powers must be non-negative.")
+
+    # Start from the identity matrices.
+    result = zeros(s, x.dtype)
+    result[:] = eye(s[-1])
+
+    # Loop over the binary digits of the powers, squaring the base matrices each time.
+    base = x
+    while True:
+        # Multiply in the base matrices for the powers with this binary digit set.
+        bit = power % 2 == 1
+        if bit.any():
+            result = where(bit[..., None, None], einsum('...ij,...jk', result, base), result)
+
+        # The next binary digit.
+        power = power // 2
+        if not power.any():
+            break
+        base = einsum('...ij,...jk', base, base)
+
+    # Return the matrix powers.
+    return result
@@ -0,0 +1,243 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Batched optimisation using target functions evaluated for many parameter vectors at once.
+
+The target functions take a stack of parameter vectors, one row per vector, and return the stack of function values (and gradients and Hessians).  This allows, for example, all Monte Carlo simulations of a model to be optimised simultaneously, or a grid search to evaluate whole blocks of grid points in single calls.
+"""
+
+# Python module imports.
+from numpy import absolute, arange, argmin, array, diagonal, dot, einsum, eye, float64, inf, isfinite, isnan, linspace, nonzero, ones, prod, sqrt, unravel_index, where, zeros
+from numpy.linalg import LinAlgError, pinv, solve
+
+# relax module imports.
+from lib.errors import RelaxError
+
+
+# The number of grid points evaluated per target function call, bounding the memory usage.
+GRID_BLOCK_SIZE = 10000
+
+
+def grid_batch(func_batch=None, num_incs=None, lower=None, upper=None, A=None, b=None, block_size=GRID_BLOCK_SIZE, verbosity=0):
+    """Grid search evaluating the target function for blocks of grid points.
+
+    The grid consists of num_incs evenly spaced values between the lower and upper bounds of each dimension, the first parameter being incremented fastest.  The grid points violating the linear constraints A.x >= b are skipped.  The points are generated and evaluated in blocks so that the full grid is never held in memory.
+
+
+    @keyword func_batch:    The target function, taking the rank-2 array of grid points, one row per point, and returning the rank-1 array of function values.
+    @type func_batch:       function
+    @keyword num_incs:      The number of increments of each dimension.
+    @type num_incs:         list of int
+    @keyword lower:         The lower bounds of the grid.
+    @type lower:            list of float
+    @keyword upper:         The upper bounds of the grid.
+    @type upper:            list of float
+    @keyword A:             The linear constraint matrix.
+    @type A:                numpy rank-2 array or None
+    @keyword b:             The linear constraint scalar vector.
+    @type b:                numpy rank-1 array or None
+    @keyword block_size:    The maximum number of grid points per target function call.
+    @type block_size:       int
+    @keyword verbosity:     The amount of information to print.  The higher the value, the greater the verbosity.
+    @type verbosity:        int
+    @raises RelaxError:     If all grid points violate the constraints.
+    @return:                The parameter vector and function value of the grid point with the lowest function value, the number of function evaluations, and the warning (always None).
+    @rtype:                 numpy rank-1 float64 array, float, int, None
+    """
+
+    # The grid increments of each dimension.
+    n = len(num_incs)
+    incs = [linspace(lower[i], upper[i], num_incs[i]) for i in range(n)]
+    total = int(prod(num_incs))
+
+    # Printout.
+    if verbosity:
+        print("Grid search")
+        print("~~~~~~~~~~~\n")
+        print("Searching through %s grid nodes in blocks of %s." % (total, block_size))
+
+    # Loop over the blocks of grid points.
+    min_params = None
+    min_f = None
+    f_count = 0
+    for start in range(0, total, block_size):
+        # The grid points of the block, the first dimension varying fastest.
+        indices = unravel_index(arange(start, min(start+block_size, total)), num_incs, order='F')
+        points = array([incs[i][indices[i]] for i in range(n)], float64).T
+
+        # Remove the points violating the constraints.
+        if A is not None:
+            points = points[(dot(points, A.T) >= b).all(axis=1)]
+            if not len(points):
+                continue
+
+        # Evaluate the target function.
+        f = func_batch(points)
+        f_count += len(points)
+
+        # The lowest value, the first of equal values being kept and NaN values being skipped.
+        f = where(isnan(f), inf, f)
+        index = argmin(f)
+        if min_f is None or f[index] < min_f:
+            min_f = f[index]
+            min_params = points[index]
+
+    # All points are outside of the constraints.
+    if min_params is None:
+        raise RelaxError("All grid points violate the linear constraints.")
+
+    # Printout.
+    if verbosity:
+        print("Minimum found at %s with a function value of %s." % (min_params.tolist(), min_f))
+
+    # Return the results.
+    return min_params, float(min_f), f_count, None
+
+
+def newton_batch(func=None, dfunc=None, d2func=None, x0=None, A=None, b=None, func_tol=1e-25, grad_tol=None, maxiter=1e6, lambda_init=1e-3, lambda_max=1e16):
+    """Batched Newton optimisation with Levenberg-Marquardt damping.
+
+    Each problem takes the Newton step of its Hessian with a diagonal damping term (Marquardt's scaling by the Hessian diagonal).  Steps which do not decrease the function value, which are not descent directions, or which violate the linear constraints A.x >= b are rejected and the damping increased tenfold, shifting the step towards the steepest descent direction and shortening it.  Accepted steps decrease the damping tenfold.  The problems are independent, so each one terminates individually.  Problems for which the damping exceeds lambda_max are terminated with the "Damping limit reached" warning, with the constraint violation being reported if the last step was infeasible (for example at a constraint boundary).
+
+
+    @keyword func:          The target function, taking the rank-2 array of parameter vectors and returning the rank-1 array of function values.  The index keyword argument is the array of problem indices of the parameter vectors, or None for all problems.
+    @type func:             function
+    @keyword dfunc:         The gradient function, returning a rank-2 array.
+    @type dfunc:            function
+    @keyword d2func:        The Hessian function, returning a rank-3 array.
+    @type d2func:           function
+    @keyword x0:            The initial parameter vectors, one row per problem.
+    @type x0:               numpy rank-2 array
+    @keyword A:             The linear constraint matrix shared by all problems.
+    @type A:                numpy rank-2 array or None
+    @keyword b:             The linear constraint scalar vector.
+    @type b:                numpy rank-1 array or None
+    @keyword func_tol:      The function tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+    @type func_tol:         None or float
+    @keyword grad_tol:      The gradient tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+    @type grad_tol:         None or float
+    @keyword maxiter:       The maximum number of iterations.
+    @type maxiter:          int
+    @keyword lambda_init:   The initial damping factor.
+    @type lambda_init:      float
+    @keyword lambda_max:    The damping factor at which the step is too small to improve the function value, terminating optimisation of the problem with a warning.
+    @type lambda_max:       float
+    @return:                The parameter vectors, function values, iteration counts, function counts, gradient counts, Hessian counts, and warnings of all problems.
+    @rtype:                 numpy rank-2 float64 array, numpy rank-1 float64 array, numpy rank-1 int array, numpy rank-1 int array, numpy rank-1 int array, numpy rank-1 int array, list of str or None
+    """
+
+    # Initialisation.
+    x = array(x0, float64)
+    num = len(x)
+    n = x.shape[1]
+    f = func(x, index=None)
+    g = dfunc(x, index=None)
+    h = d2func(x, index=None)
+    damping = lambda_init * ones(num, float64)
+    active = ones(num, bool)
+    iter_count = zeros(num, int)
+    f_count = ones(num, int)
+    g_count = ones(num, int)
+    h_count = ones(num, int)
+    warning = [None] * num
+    identity = eye(n)
+
+    # The gradient tolerance of the starting position.
+    if grad_tol is not None:
+        active &= sqrt((g**2).sum(axis=1)) > grad_tol
+
+    # Iterate.
+    k = 0
+    while active.any():
+        # The maximum number of iterations.
+        if k >= maxiter:
+            for i in nonzero(active)[0]:
+                warning[i] = "Maximum number of iterations reached"
+            break
+        k += 1
+
+        # The active problems.
+        index = nonzero(active)[0]
+        x_a = x[index]
+        g_a = g[index]
+        h_a = h[index]
+
+        # The damped Hessians, with a floor on the diagonal scaling so that zero curvature parameters are still damped.
+        scale = absolute(diagonal(h_a, axis1=1, axis2=2))
+        scale = scale + 1e-12 * (scale.max(axis=1)[:, None] + 1.0)
+        h_damped = h_a + damping[index, None, None] * scale[:, :, None] * identity
+
+        # The Newton steps.
+        try:
+            step = -solve(h_damped, g_a[:, :, None])[:, :, 0]
+        except LinAlgError:
+            step = -einsum('spq,sq->sp', pinv(h_damped), g_a)
+
+        # The new positions.
+        x_new = x_a + step
+        f_new = func(x_new, index=index)
+        f_count[index] += 1
+        iter_count[index] += 1
+
+        # Acceptance.
+        accept = isfinite(f_new) & (f_new <= f[index]) & ((step * g_a).sum(axis=1) <= 0.0)
+        feasible = ones(len(index), bool)
+        if A is not None:
+            feasible = (dot(x_new, A.T) >= b).all(axis=1)
+            accept &= feasible
+
+        # Rejected steps.
+        reject = index[~accept]
+        damping[reject] *= 10.0
+
+        # Terminate the problems reaching the damping limit.
+        limit = damping[reject] > lambda_max
+        active[reject[limit]] = False
+        for i, flag in zip(reject[limit], feasible[~accept][limit]):
+            if flag:
+                warning[i] = "Damping limit reached"
+            else:
+                warning[i] = "Damping limit reached, the steps violate the linear constraints"
+
+        # Accepted steps.
+        if not accept.any():
+            continue
+        index = index[accept]
+        x_new = x_new[accept]
+        f_new = f_new[accept]
+        diff = f[index] - f_new
+        x[index] = x_new
+        f[index] = f_new
+        g[index] = dfunc(x_new, index=index)
+        h[index] = d2func(x_new, index=index)
+        g_count[index] += 1
+        h_count[index] += 1
+        damping[index] = (damping[index] / 10.0).clip(1e-12)
+
+        # Convergence.
+        if func_tol is not None:
+            active[index[diff <= func_tol]] = False
+        if grad_tol is not None:
+            active[index[sqrt((g[index]**2).sum(axis=1)) <= grad_tol]] = False
+
+    # Return the results.
+    return x, f, iter_count, f_count, g_count, h_count, warning
@@ -21,14 +21,15 @@
 ###############################################################################
 
 # Module docstring.
-"""Module containing functions for handling NMRPipe SeriesTab files."""
+"""Module containing functions for handling NMRPipe SeriesTab files and NMRPipe spectra."""
 
 
 # Python module imports.
 import re
 from glob import glob
+from numpy import absolute, arange, clip, concatenate, dtype, float64, fromfile, isnan, median, memmap, nan, rint, zeros
 from os import sep
-from os.path import abspath
+from os.path import abspath, getsize
 subprocess_module = False
 try:
     import subprocess
@@ -43,6 +44,221 @@ from lib.io import file_root, get_file_path, open_write_file, sort_filenames, wr
 from lib.warnings import RelaxWarning
 
 
+# The NMRPipe header, 512 float32 values (2048 bytes).
+HEADER_SIZE = 512
+
+# The header indices, as defined in the NMRPipe fdatap.h header file.
+FDFLTORDER = 2
+FDDIMORDER = [24, 25, 26, 27]
+FDSIZE = 99
+FDSPECNUM = 219
+FDQUADFLAG = 106
+
+# The sweep width, observed frequency, and origin header indices of the F1 to F4 frequency dimensions.
+FDSW = {1: 229, 2: 100, 3: 11, 4: 29}
+FDOBS = {1: 218, 2: 119, 3: 10, 4: 28}
+FDORIG = {1: 249, 2: 101, 3: 12, 4: 30}
+
+# The scaling factor converting the median absolute deviation into the standard deviation of normally distributed noise.
+MAD_SCALE = 1.4826
+
+
+class Spectrum:
+    """A memory-mapped NMRPipe spectrum.
+
+    The data is mapped as a rank-3 array of planes, rows (the Y-axis), and columns (the X-axis).  2D spectra consist of a single plane, whereas the planes of a 3D data stream (for example the .ft3 file of a pseudo-3D relaxation series) are each treated as a separate spectrum.
+    """
+
+    def __init__(self, file_name=None, dir=None):
+        """Map the NMRPipe spectrum.
+
+        @keyword file_name: The name of the NMRPipe .ft2 or .ft3 file.
+        @type file_name:    str
+        @keyword dir:       The directory where the file is located.
+        @type dir:          str
+        @raises RelaxError: If the file is not a real valued NMRPipe spectrum.
+        """
+
+        # The file path.
+        self.file_path = get_file_path(file_name=file_name, dir=dir)
+
+        # Read the header, determining the byte order from the floating point order constant.
+        for byte_order in ['<', '>']:
+            self.dtype = dtype(byte_order + 'f4')
+            self.header = fromfile(self.file_path, dtype=self.dtype, count=HEADER_SIZE).astype(float64)
+            if len(self.header) == HEADER_SIZE and absolute(self.header[FDFLTORDER] - 2.345) < 1e-5:
+                break
+        else:
+            raise RelaxError("The file '%s' is not a NMRPipe spectrum." % self.file_path)
+
+        # Only real data is supported.
+        if self.header[FDQUADFLAG] != 1.0:
+            raise RelaxError("The NMRPipe spectrum '%s' is not real valued, the imaginary data must first be deleted." % self.file_path)
+
+        # The frequency dimensions of the X and Y axes.
+        self.dims = [int(self.header[FDDIMORDER[0]]), int(self.header[FDDIMORDER[1]])]
+
+        # The data shape, with the number of planes determined from the file size.
+        nx = int(self.header[FDSIZE])
+        ny = int(self.header[FDSPECNUM])
+        points = (getsize(self.file_path) - 4*HEADER_SIZE) // 4
+        if nx * ny == 0 or points % (nx * ny):
+            raise RelaxError("The size of the NMRPipe spectrum '%s' does not match the %s by %s points of the header." % (self.file_path, ny, nx))
+        self.shape = (points // (nx * ny), ny, nx)
+
+        # Map the data.
+        self.data = memmap(self.file_path, dtype=self.dtype, mode='r', offset=4*HEADER_SIZE, shape=self.shape)
+
+
+    def heights(self, x_ppm=None, y_ppm=None):
+        """Extract the peak heights at the given positions from all planes.
+
+        @keyword x_ppm: The chemical shifts of the peaks in the X-axis (the direct dimension).
+        @type x_ppm:    numpy rank-1 array
+        @keyword y_ppm: The chemical shifts of the peaks in the Y-axis.
+        @type y_ppm:    numpy rank-1 array
+        @return:        The peak heights, with one row per plane and one column per peak.  Peaks outside of the spectrum are set to NaN.
+        @rtype:         numpy rank-2 float64 array
+        """
+
+        # The height is the volume of a single point box.
+        return self.volumes(x_ppm=x_ppm, y_ppm=y_ppm, box=0)
+
+
+    def noise_rmsd(self):
+        """Estimate the baseplane RMSD of all planes.
+
+        The noise is estimated from the median absolute deviation of all points of the plane, scaled to the standard deviation of normally distributed noise.  This is insensitive to the signals as long as most of the spectrum consists of baseplane.
+
+
+        @return:    The baseplane RMSD of each plane.
+        @rtype:     numpy rank-1 float64 array
+        """
+
+        # The planes as rows.
+        planes = self.data.reshape((self.shape[0], -1)).astype(float64)
+
+        # The median absolute deviation.
+        centre = median(planes, axis=1)
+        return MAD_SCALE * median(absolute(planes - centre[:, None]), axis=1)
+
+
+    def ppm_to_points(self, ppm=None, axis=0):
+        """Convert chemical shifts into the fractional point positions of a spectral axis.
+
+        The origin of a NMRPipe frequency dimension is the frequency of the last point.
+
+
+        @keyword ppm:   The chemical shifts in ppm.
+        @type ppm:      numpy rank-1 array
+        @keyword axis:  The spectral axis, 0 for X and 1 for Y.
+        @type axis:     int
+        @return:        The zero based point positions.
+        @rtype:         numpy rank-1 float64 array
+        """
+
+        # The frequency dimension parameters.
+        dim = self.dims[axis]
+        size = self.shape[2-axis]
+        sw = self.header[FDSW[dim]]
+        obs = self.header[FDOBS[dim]]
+        orig = self.header[FDORIG[dim]]
+
+        # Convert.
+        return (orig + sw - ppm*obs) * size / sw - 1.0
+
+
+    def volumes(self, x_ppm=None, y_ppm=None, box=1):
+        """Integrate the peaks at the given positions by box summation in all planes.
+
+        @keyword x_ppm: The chemical shifts of the peaks in the X-axis (the direct dimension).
+        @type x_ppm:    numpy rank-1 array
+        @keyword y_ppm: The chemical shifts of the peaks in the Y-axis.
+        @type y_ppm:    numpy rank-1 array
+        @keyword box:   The half width of the summation box in points, the box covering +/- box points around the closest point to the peak position.
+        @type box:      int
+        @return:        The peak volumes, with one row per plane and one column per peak.  Peaks outside of the spectrum are set to NaN.
+        @rtype:         numpy rank-2 float64 array
+        """
+
+        # The closest points.
+        x = rint(self.ppm_to_points(ppm=x_ppm, axis=0)).astype(int)
+        y = rint(self.ppm_to_points(ppm=y_ppm, axis=1)).astype(int)
+
+        # The peaks within the spectrum.
+        inside = (x >= 0) & (x < self.shape[2]) & (y >= 0) & (y < self.shape[1])
+
+        # Box summation over all planes, clipping the box at the spectrum edges.
+        volumes = zeros((self.shape[0], len(x)), float64)
+        for dy in arange(-box, box+1):
+            for dx in arange(-box, box+1):
+                volumes += self.data[:, clip(y+dy, 0, self.shape[1]-1), clip(x+dx, 0, self.shape[2]-1)]
+
+        # Remove the peaks outside of the spectrum.
+        volumes[:, ~inside] = nan
+
+        # Return the volumes.
+        return volumes
+
+
+
+def read_intensities(peak_list=None, file_name=None, dir=None, volume=False, box=1):
+    """Extract the peak intensities of a peak list from NMRPipe spectra.
+
+    The peak positions are taken from the chemical shifts of the last two dimensions of the peak list, the last being the direct dimension.  The intensities of all planes of all spectra are stored in the peak list, named Z_A{i} for automatic spectrum ID generation.
+
+
+    @keyword peak_list: The peak list object to place the intensities into.
+    @type peak_list:    lib.spectrum.objects.Peak_list instance
+    @keyword file_name: The name of the NMRPipe spectrum or the list of spectra.
+    @type file_name:    str or list of str
+    @keyword dir:       The directory where the files are located.
+    @type dir:          str
+    @keyword volume:    A flag which if True will cause the peaks to be integrated by box summation rather than taking the peak height.
+    @type volume:       bool
+    @keyword box:       The half width of the summation box in points.
+    @type box:          int
+    @raises RelaxError: If the peak list has no chemical shifts.
+    """
+
+    # The peak positions.
+    x_ppm = zeros(len(peak_list), float64)
+    y_ppm = zeros(len(peak_list), float64)
+    for i in range(len(peak_list)):
+        if len(peak_list[i].shifts) < 2 or None in peak_list[i].shifts[-2:]:
+            raise RelaxError("The peak list does not contain the chemical shifts required for extracting the peak intensities from the spectra.")
+        y_ppm[i], x_ppm[i] = peak_list[i].shifts[-2:]
+
+    # Convert the file argument to a list if necessary.
+    if not isinstance(file_name, list):
+        file_name = [file_name]
+
+    # Extract the intensities from all planes of all spectra.
+    intensities = []
+    for file in file_name:
+        spectrum = Spectrum(file_name=file, dir=dir)
+        if volume:
+            intensities.append(spectrum.volumes(x_ppm=x_ppm, y_ppm=y_ppm, box=box))
+        else:
+            intensities.append(spectrum.heights(x_ppm=x_ppm, y_ppm=y_ppm))
+    intensities = concatenate(intensities)
+
+    # The automatic spectrum IDs.
+    names = ["Z_A%i" % i for i in range(intensities.shape[0])]
+
+    # Store the data, one peak at a time.
+    outside = isnan(intensities).all(axis=0)
+    intensities = intensities.T.tolist()
+    for i in range(len(peak_list)):
+        # Warn about the peaks outside of the spectra.
+        if outside[i]:
+            warn(RelaxWarning("The peak at %s ppm is outside of the spectrum, its intensities will be skipped." % peak_list[i].shifts[-2:]))
+
+        # Store.
+        peak_list[i].intensity = intensities[i]
+        peak_list[i].intensity_name = names
+
+
 def read_seriestab(peak_list=None, file_data=None, int_col=None):
     """Extract the intensity information from the NMRPipe SeriesTab peak intensity file.
 
@@ -382,3 +598,27 @@ def show_apod_rmsd_dir_to_files(file_ext='.ft2', dir=None, path_to_command='show
         rmsd_files.append(rmsd_file)
 
     return rmsd_files
+
+
+def spectrum_rmsd(file_name=None, dir=None):
+    """Estimate the baseplane RMSD of all planes of NMRPipe spectra, without calling showApod.
+
+    @keyword file_name: The name of the NMRPipe spectrum or the list of spectra.
+    @type file_name:    str or list of str
+    @keyword dir:       The directory where the files are located.
+    @type dir:          str
+    @return:            The baseplane RMSD of all planes of all spectra.
+    @rtype:             list of float
+    """
+
+    # Convert the file argument to a list if necessary.
+    if not isinstance(file_name, list):
+        file_name = [file_name]
+
+    # Loop over the spectra.
+    rmsd = []
+    for file in file_name:
+        rmsd += Spectrum(file_name=file, dir=dir).noise_rmsd().tolist()
+
+    # Return the values.
+    return rmsd
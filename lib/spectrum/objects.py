@@ -25,6 +25,9 @@
 These objects are only temporary.  In the future, they may be made permanent by shifting them into the relax data storage object.
 """
 
+# Python module imports.
+from numpy import array, float64, nan, zeros
+
 # relax module imports.
 from lib.errors import RelaxError
 
@@ -48,6 +51,50 @@ class Peak_list(list):
         self.dimensionality = dim
 
 
+    def columns(self, dim=1):
+        """Convert the peak list into column arrays for bulk processing.
+
+        The peak intensities of all assignments are packed into a single matrix with one row per peak and one column per spectrum, so that multi-spectra peak lists such as the NMRPipe seriesTab format can be handled in one operation.  Missing intensity values are set to NaN.
+
+
+        @keyword dim:   The dimension of the peak list to take the assignments from.
+        @type dim:      int
+        @return:        The residue numbers, the spin names, and the peak intensity matrix.
+        @rtype:         list of int, list of str, numpy rank-2 float64 array
+        """
+
+        # The assignment columns.
+        res_nums = [assign.res_nums[dim-1] for assign in self]
+        spin_names = [assign.spin_names[dim-1] for assign in self]
+
+        # Convert the intensities to lists.
+        intensities = []
+        for assign in self:
+            intensity = assign.intensity
+            if intensity is None:
+                intensity = []
+            elif not isinstance(intensity, list):
+                intensity = [intensity]
+            intensities.append(intensity)
+
+        # The intensity matrix (None values are converted to NaN by numpy).
+        num = 0
+        if intensities:
+            num = max(len(intensity) for intensity in intensities)
+        if all(len(intensity) == num for intensity in intensities):
+            matrix = array(intensities, float64).reshape((len(self), num))
+
+        # Pad the ragged rows with NaN.
+        else:
+            matrix = zeros((len(self), num), float64)
+            matrix[:] = nan
+            for i in range(len(intensities)):
+                matrix[i, :len(intensities[i])] = array(intensities[i], float64)
+
+        # Return the columns.
+        return res_nums, spin_names, matrix
+
+
     def add(self, mol_names=None, res_nums=None, res_names=None, spin_nums=None, spin_names=None, shifts=None, intensity=None, intensity_name=None):
         """Add a peak list element.
 
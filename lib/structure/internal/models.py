@@ -28,7 +28,7 @@ from re import match
 # relax module import.
 from lib.errors import RelaxError, RelaxFromXMLNotEmptyError
 from lib.structure.internal.molecules import MolList
-from lib.xml import fill_object_contents
+from lib.xml import fill_object_contents, str_to_python
 
 
 class ModelList(list):
@@ -143,7 +143,7 @@ class ModelList(list):
         # Loop over the models.
         for model_node in model_nodes:
             # Get the model details and add the model to the ModelList structure.
-            num = eval(model_node.getAttribute('num'))
+            num = str_to_python(model_node.getAttribute('num'))
             if num == 'None':
                 num = None
             self.add_item(model_num=num)
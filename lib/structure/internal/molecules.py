@@ -23,16 +23,35 @@
 """The objects representing molecules in the internal structural object."""
 
 # Python module imports.
+from numpy import array, delete, float64, nan, zeros
 from re import search
 from string import digits
 from warnings import warn
 
 # relax module import.
+from lib.compat import intern
 from lib.errors import RelaxError, RelaxFromXMLNotEmptyError
 from lib.periodic_table import periodic_table
 from lib.structure import pdb_read
 from lib.warnings import RelaxWarning
-from lib.xml import fill_object_contents, xml_to_object
+from lib.xml import fill_object_contents, object_to_xml, xml_to_object
+
+
+def intern_str(text):
+    """Intern the string, so that the atom and residue names of all atoms and models share the same string objects.
+
+    @param text:    The text to intern.
+    @type text:     str or anything
+    @return:        The interned string, or the unmodified object if it is not a str instance.
+    @rtype:         str or anything
+    """
+
+    # Only intern real strings.
+    if isinstance(text, str):
+        return intern(text)
+
+    # Anything else.
+    return text
 
 
 class MolContainer:
@@ -50,12 +69,18 @@ class MolContainer:
         - res_name:  The residue name.
         - res_num:  The residue number.
         - seg_id:  The segment ID.
-        - x:  The x coordinate of the atom.
-        - y:  The y coordinate of the atom.
-        - z:  The z coordinate of the atom.
+        - pos:  The atomic coordinates as a numpy rank-2 array of shape [N, 3].
+        - x:  The x coordinate of the atom (a view of the first column of pos).
+        - y:  The y coordinate of the atom (a view of the second column of pos).
+        - z:  The z coordinate of the atom (a view of the third column of pos).
 
     All arrays should be of equal length so that an atom index can retrieve all the corresponding
     data.  Only the atom identification string is compulsory, all other arrays can contain None.
+    Missing coordinates are stored as NaN.
+
+    The coordinates of all atoms are stored in a single contiguous float64 array, so that the
+    structural operations can work in place on numpy views rather than building new arrays from
+    Python lists.  The x, y, z, and pos attributes can be modified in place or replaced.
     """
 
 
@@ -89,14 +114,135 @@ class MolContainer:
         # The segment ID (array of int).
         self.seg_id = []
 
-        # The x coordinate (array of float).
-        self.x = []
+        # The atomic coordinate storage, with spare rows for fast appending, and the number of atoms used.
+        self._pos = zeros((0, 3), float64)
+        self._pos_num = 0
+
+
+    def __setstate__(self, state):
+        """Restore the object from a pickle, converting the coordinate lists of old pickles.
+
+        @param state:   The object dictionary.
+        @type state:    dict
+        """
+
+        # Old pickles with coordinate lists.
+        coords = []
+        if '_pos' not in state:
+            coords = [state.pop('x', []), state.pop('y', []), state.pop('z', [])]
+            state['_pos'] = zeros((0, 3), float64)
+            state['_pos_num'] = 0
+
+        # Restore the dictionary.
+        self.__dict__.update(state)
+
+        # Convert the coordinates.
+        for i in range(len(coords)):
+            self._set_coord(i, coords[i])
+
+
+    def _get_pos(self):
+        """Return the atomic coordinates.
+
+        @return:    A view of the atomic coordinates.
+        @rtype:     numpy rank-2 float64 array
+        """
+
+        # The used part of the storage.
+        return self._pos[:self._pos_num]
+
+
+    def _set_pos(self, pos):
+        """Replace all atomic coordinates.
+
+        @param pos: The atomic coordinates.
+        @type pos:  numpy rank-2 array or list of lists of float
+        """
+
+        # Convert, replacing None with NaN.
+        pos = array(pos, float64).reshape((-1, 3))
+
+        # Store.
+        self._pos = pos
+        self._pos_num = len(pos)
+
+
+    def _get_coord(self, dim):
+        """Return a view of the given atomic coordinate.
+
+        @param dim:     The coordinate index, 0 for x, 1 for y and 2 for z.
+        @type dim:      int
+        @return:        A view of the coordinate of all atoms.
+        @rtype:         numpy rank-1 float64 array
+        """
+
+        # The view.
+        return self._pos[:self._pos_num, dim]
+
 
-        # The y coordinate (array of float).
-        self.y = []
+    def _set_coord(self, dim, values):
+        """Replace the given atomic coordinate for all atoms.
 
-        # The z coordinate (array of float).
-        self.z = []
+        If the number of values differs from the current number of atoms, the coordinate storage is resized and the other coordinates are set to NaN or truncated.
+
+
+        @param dim:     The coordinate index, 0 for x, 1 for y and 2 for z.
+        @type dim:      int
+        @param values:  The coordinate of all atoms.
+        @type values:   list of float or numpy rank-1 array
+        """
+
+        # Convert, replacing None with NaN.
+        values = array([nan if val is None else val for val in values], float64)
+
+        # Resize the storage.
+        if len(values) != self._pos_num:
+            pos = zeros((len(values), 3), float64)
+            pos[:] = nan
+            num = min(len(values), self._pos_num)
+            pos[:num] = self._pos[:num]
+            self._pos = pos
+            self._pos_num = len(values)
+
+        # Store.
+        self._pos[:self._pos_num, dim] = values
+
+
+    def _pos_append(self, pos):
+        """Append the atomic coordinates, growing the storage if needed.
+
+        @param pos: The coordinates of the new atoms.
+        @type pos:  numpy rank-2 array of shape [M, 3]
+        """
+
+        # Grow the storage geometrically, so that appending is amortised constant time.
+        num = self._pos_num + len(pos)
+        if num > len(self._pos):
+            store = zeros((max(num, 2*len(self._pos), 16), 3), float64)
+            store[:self._pos_num] = self._pos[:self._pos_num]
+            self._pos = store
+
+        # Store.
+        self._pos[self._pos_num:num] = pos
+        self._pos_num = num
+
+
+    def _pos_delete(self, indices):
+        """Remove the atomic coordinates of the given atoms.
+
+        @param indices: The indices of the atoms to remove.
+        @type indices:  list of int
+        """
+
+        # Remove the rows.
+        self.pos = delete(self.pos, indices, axis=0)
+
+
+    # The coordinate attributes.
+    pos = property(_get_pos, _set_pos, doc="The atomic coordinates as a numpy rank-2 array of shape [N, 3].")
+    x = property(lambda self: self._get_coord(0), lambda self, values: self._set_coord(0, values), doc="The x coordinates of all atoms.")
+    y = property(lambda self: self._get_coord(1), lambda self, values: self._set_coord(1, values), doc="The y coordinates of all atoms.")
+    z = property(lambda self: self._get_coord(2), lambda self, values: self._set_coord(2, values), doc="The z coordinates of all atoms.")
 
 
     def _atom_index(self, atom_num):
@@ -275,9 +421,7 @@ class MolContainer:
         self.res_name = [self.res_name[i] for i in indices]
         self.res_num = [self.res_num[i] for i in indices]
         self.seg_id = [self.seg_id[i] for i in indices]
-        self.x = [self.x[i] for i in indices]
-        self.y = [self.y[i] for i in indices]
-        self.z = [self.z[i] for i in indices]
+        self.pos = self.pos[indices]
 
         # Change the bonded numbers, as the indices are now different.
         for i in range(len(self.bonded)):
@@ -326,22 +470,72 @@ class MolContainer:
 
         # Append to all the arrays.
         self.atom_num.append(atom_num)
-        self.atom_name.append(atom_name)
+        self.atom_name.append(intern_str(atom_name))
         self.bonded.append([])
-        self.chain_id.append(chain_id)
-        self.element.append(element)
-        self.pdb_record.append(pdb_record)
-        self.res_name.append(res_name)
+        self.chain_id.append(intern_str(chain_id))
+        self.element.append(intern_str(element))
+        self.pdb_record.append(intern_str(pdb_record))
+        self.res_name.append(intern_str(res_name))
         self.res_num.append(res_num)
-        self.seg_id.append(segment_id)
-        self.x.append(pos[0])
-        self.y.append(pos[1])
-        self.z.append(pos[2])
+        self.seg_id.append(intern_str(segment_id))
+        self._pos_append(array([[nan if val is None else val for val in pos]], float64))
 
         # Return the index.
         return len(self.atom_num) - 1
 
 
+    def atom_add_batch(self, atom_names=None, res_names=None, res_nums=None, pos=None, elements=None, atom_nums=None, chain_ids=None, segment_ids=None, pdb_records=None):
+        """Method for adding a set of atoms to the structural data object in one operation.
+
+        All arguments other than the coordinates are optional lists with one element per atom.
+
+
+        @keyword atom_names:    The atom names.
+        @type atom_names:       list of str or None
+        @keyword res_names:     The residue names.
+        @type res_names:        list of str or None
+        @keyword res_nums:      The residue numbers.
+        @type res_nums:         list of int or None
+        @keyword pos:           The atomic coordinates.
+        @type pos:              numpy rank-2 array of shape [N, 3] or list of lists of float
+        @keyword elements:      The element symbols.
+        @type elements:         list of str or None
+        @keyword atom_nums:     The atom numbers.
+        @type atom_nums:        list of int or None
+        @keyword chain_ids:     The chain identifiers.
+        @type chain_ids:        list of str or None
+        @keyword segment_ids:   The segment identifiers.
+        @type segment_ids:      list of str or None
+        @keyword pdb_records:   The optional PDB record names, e.g. 'ATOM' or 'HETATM'.
+        @type pdb_records:      list of str or None
+        @return:                The indices of the added atoms.
+        @rtype:                 list of int
+        """
+
+        # The coordinates.
+        pos = array(pos, float64).reshape((-1, 3))
+        num = len(pos)
+        start = len(self.atom_num)
+
+        # Default to None.
+        none = [None] * num
+
+        # Extend all the arrays.
+        self.atom_num.extend(atom_nums if atom_nums is not None else none)
+        self.atom_name.extend([intern_str(name) for name in (atom_names if atom_names is not None else none)])
+        self.bonded.extend([[] for i in range(num)])
+        self.chain_id.extend([intern_str(id) for id in (chain_ids if chain_ids is not None else none)])
+        self.element.extend([intern_str(element) for element in (elements if elements is not None else none)])
+        self.pdb_record.extend([intern_str(record) for record in (pdb_records if pdb_records is not None else none)])
+        self.res_name.extend([intern_str(name) for name in (res_names if res_names is not None else none)])
+        self.res_num.extend(res_nums if res_nums is not None else none)
+        self.seg_id.extend([intern_str(id) for id in (segment_ids if segment_ids is not None else none)])
+        self._pos_append(pos)
+
+        # Return the indices.
+        return list(range(start, start+num))
+
+
     def atom_connect(self, index1=None, index2=None):
         """Method for connecting two atoms within the data structure object.
 
@@ -553,9 +747,7 @@ class MolContainer:
         if not self.res_name == []: return False
         if not self.res_num == []: return False
         if not self.seg_id == []: return False
-        if not self.x == []: return False
-        if not self.y == []: return False
-        if not self.z == []: return False
+        if self._pos_num: return False
 
         # Ok, now this thing must be empty.
         return True
@@ -602,11 +794,12 @@ class MolContainer:
         # The current index.
         curr_index = len(self.atom_num)
 
-        # Loop over all data.
-        for i in range(len(mol_cont.atom_num)):
-            # Add the atom.
-            self.atom_add(atom_num=curr_index+i+1, atom_name=mol_cont.atom_name[i], res_name=mol_cont.res_name[i], res_num=mol_cont.res_num[i], pos=[mol_cont.x[i], mol_cont.y[i], mol_cont.z[i]], element=mol_cont.element[i], chain_id=mol_cont.chain_id[i], pdb_record=mol_cont.pdb_record[i])
+        # Add all atoms.
+        num = len(mol_cont.atom_num)
+        self.atom_add_batch(atom_nums=list(range(curr_index+1, curr_index+num+1)), atom_names=mol_cont.atom_name, res_names=mol_cont.res_name, res_nums=mol_cont.res_num, pos=mol_cont.pos, elements=mol_cont.element, chain_ids=mol_cont.chain_id, pdb_records=mol_cont.pdb_record)
 
+        # Loop over all data.
+        for i in range(num):
             # Connect the atoms.
             for j in range(len(mol_cont.bonded[i])):
                 self.atom_connect(index1=i+curr_index+1, index2=mol_cont.bonded[i][j]+curr_index+1)
@@ -632,6 +825,12 @@ class MolContainer:
         # Add all simple python objects within the MolContainer to the XML element.
         fill_object_contents(doc, mol_element, object=self, blacklist=list(self.__class__.__dict__.keys()))
 
+        # Add the coordinates as lists, as these are not simple python objects.
+        for name in ['x', 'y', 'z']:
+            sub_elem = doc.createElement(name)
+            mol_element.appendChild(sub_elem)
+            object_to_xml(doc, sub_elem, value=getattr(self, name).tolist())
+
 
 
 class MolList(list):
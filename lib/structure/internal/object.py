@@ -27,7 +27,7 @@
 
 # Python module imports.
 from copy import deepcopy
-from numpy import array, dot, float64, linalg, zeros
+from numpy import arange, argsort, array, concatenate, dot, float64, lexsort, searchsorted, zeros
 import os
 from os import F_OK, access, curdir, sep
 from os.path import abspath
@@ -40,6 +40,7 @@ from warnings import warn
 from lib import regex
 from lib.check_types import is_float
 from lib.errors import RelaxError, RelaxFault, RelaxNoneIntError, RelaxNoPdbError
+from lib.geometry.neighbours import neighbour_pairs, point_neighbours
 from lib.io import file_root, open_read_file
 from lib.selection import Selection, tokenise
 from lib.sequence import aa_codes_three_to_one
@@ -133,64 +134,84 @@ class Internal:
         return bonded_num, bonded_name, element, pos, attached_name, None
 
 
-    def _find_bonded_atoms(self, index, mol, radius=1.2):
-        """Find all atoms within a sphere and say that they are attached to the central atom.
+    def _find_all_bonded_atoms(self, mol, radius=1.2):
+        """Find the bonded atoms for all atoms of the molecule lacking connectivities.
 
-        The found atoms will be added to the 'bonded' data structure.
+        This is equivalent to calling the _find_bonded_atoms() method for each atom, in order, which has no connectivities.  All atom pairs within the radius are however found in a single pass using a cell list, rather than searching for the neighbours of each atom separately.
 
 
-        @param index:           The index of the central atom.
-        @type index:            int
         @param mol:             The molecule container.
         @type mol:              MolContainer instance
+        @keyword radius:        The radius of the sphere.
+        @type radius:           float
         """
 
-        # Central atom info.
-        centre = array([mol.x[index], mol.y[index], mol.z[index]], float64)
-
-        # Atom loop.
-        dist_list = []
-        connect_list = {}
-        element_list = {}
-        for i in range(len(mol.atom_num)):
-            # Skip proton to proton bonds!
-            if mol.element[index] == 'H' and mol.element[i] == 'H':
+        # The atomic positions.
+        num = len(mol.atom_num)
+        pos = mol.pos
+
+        # All atom pairs within the radius, in both directions, together with the atoms themselves.
+        index1, index2, dist = neighbour_pairs(pos=pos, radius=radius)
+        atoms = arange(num)
+        centres = concatenate([index1, index2, atoms])
+        partners = concatenate([index2, index1, atoms])
+        dist = concatenate([dist, dist, zeros(num, float64)])
+
+        # Skip proton to proton bonds!
+        protons = array([element == 'H' for element in mol.element], bool)
+        mask = ~(protons[centres] & protons[partners])
+        centres = centres[mask]
+        partners = partners[mask]
+        dist = dist[mask]
+
+        # Sort by central atom, and then by distance.
+        order = lexsort((dist, centres))
+        centres = centres[order]
+        partners = partners[order]
+        start = searchsorted(centres, atoms, 'left')
+        end = searchsorted(centres, atoms, 'right')
+
+        # Loop over the atoms without connectivities.
+        for index in range(num):
+            if mol.bonded[index]:
                 continue
 
-            # The atom's position.
-            pos = array([mol.x[i], mol.y[i], mol.z[i]], float64)
+            # Loop over the max number of connections (or the number of connected atoms, if less).
+            for i in partners[start[index]:min(end[index], start[index]+self._max_connections(mol.element[index]))]:
+                mol.atom_connect(index, int(i))
 
-            # The distance from the centre.
-            dist = linalg.norm(centre-pos)
 
-            # The atom is within the radius.
-            if dist < radius:
-                # Store the distance.
-                dist_list.append(dist)
+    def _find_bonded_atoms(self, index, mol, radius=1.2):
+        """Find all atoms within a sphere and say that they are attached to the central atom.
 
-                # Store the atom index.
-                connect_list[dist] = i
+        The found atoms will be added to the 'bonded' data structure.  Only the connectivities of the central atom and the atoms found are modified.
+
+
+        @param index:           The index of the central atom.
+        @type index:            int
+        @param mol:             The molecule container.
+        @type mol:              MolContainer instance
+        @keyword radius:        The radius of the sphere.
+        @type radius:           float
+        """
 
-                # Store the element type.
-                element_list[dist] = mol.element[i]
+        # The atoms within the radius, together with the central atom itself.
+        atoms, dist = point_neighbours(pos=mol.pos, index=index, radius=radius)
+        atoms = concatenate([[index], atoms])
+        dist = concatenate([[0.0], dist])
 
-        # The maximum number of allowed covalent bonds.
-        max_conn = 1000   # Ridiculous default!
+        # Skip proton to proton bonds!
         if mol.element[index] == 'H':
-            max_conn = 1
-        elif mol.element[index] == 'O':
-            max_conn = 2
-        elif mol.element[index] == 'N':
-            max_conn = 3
-        elif mol.element[index] == 'C':
-            max_conn = 4
+            mask = array([mol.element[i] != 'H' for i in atoms], bool)
+            atoms = atoms[mask]
+            dist = dist[mask]
 
-        # Sort.
-        dist_list.sort()
+        # Sort by distance.
+        atoms = atoms[argsort(dist, kind='mergesort')]
 
         # Loop over the max number of connections (or the number of connected atoms, if less).
-        for i in range(min(max_conn, len(dist_list))):
-            mol.atom_connect(index, connect_list[dist_list[i]])
+        for i in atoms[:self._max_connections(mol.element[index])]:
+            mol.atom_connect(index, int(i))
 
 
     def _get_chemical_name(self, hetID):
@@ -846,6 +867,29 @@ class Internal:
         return lines
 
 
+    def _max_connections(self, element):
+        """Return the maximum number of allowed covalent bonds for the element.
+
+        @param element: The element name.
+        @type element:  str
+        @return:        The maximum number of connections.
+        @rtype:         int
+        """
+
+        # The known elements.
+        if element == 'H':
+            return 1
+        elif element == 'O':
+            return 2
+        elif element == 'N':
+            return 3
+        elif element == 'C':
+            return 4
+
+        # Ridiculous default!
+        return 1000
+
+
     def _mol_type(self, mol):
         """Determine the type of molecule.
 
@@ -1201,8 +1245,7 @@ class Internal:
         mol = MolContainer()
 
         # Add the data.
-        for i in range(len(coord)):
-            mol.atom_add(atom_name=atom_names[i], res_name=res_names[i], res_num=res_nums[i], pos=coord[i], element=elements[i])
+        mol.atom_add_batch(atom_names=atom_names, res_names=res_names, res_nums=res_nums, pos=coord, elements=elements)
 
         # Create the structural data data structures.
         self.pack_structs([[mol]], orig_model_num=[None], set_model_num=[set_model_num], orig_mol_num=[[None]], set_mol_name=[set_mol_name])
@@ -1246,20 +1289,17 @@ class Internal:
             mol = model.mol[mol_index]
             mol_from = model_from.mol[mol_index]
 
-            # Loop over the atomic data.
-            for i in range(len(mol_from.atom_num)):
-                mol.atom_num.append(mol_from.atom_num[i])
-                mol.atom_name.append(mol_from.atom_name[i])
-                mol.bonded.append(mol_from.bonded[i])
-                mol.chain_id.append(mol_from.chain_id[i])
-                mol.element.append(mol_from.element[i])
-                mol.pdb_record.append(mol_from.pdb_record[i])
-                mol.res_name.append(mol_from.res_name[i])
-                mol.res_num.append(mol_from.res_num[i])
-                mol.seg_id.append(mol_from.seg_id[i])
-                mol.x.append(mol_from.x[i])
-                mol.y.append(mol_from.y[i])
-                mol.z.append(mol_from.z[i])
+            # Copy the atomic data.
+            mol.atom_num = list(mol_from.atom_num)
+            mol.atom_name = list(mol_from.atom_name)
+            mol.bonded = list(mol_from.bonded)
+            mol.chain_id = list(mol_from.chain_id)
+            mol.element = list(mol_from.element)
+            mol.pdb_record = list(mol_from.pdb_record)
+            mol.res_name = list(mol_from.res_name)
+            mol.res_num = list(mol_from.res_num)
+            mol.seg_id = list(mol_from.seg_id)
+            mol.pos = mol_from.pos
 
         # Return the model.
         return self.structural_data[-1]
@@ -1300,9 +1340,7 @@ class Internal:
 
         # Build the connectivities if needed.
         for mol in self.structural_data[0].mol:
-            for i in range(len(mol.atom_num)):
-                if not len(mol.bonded[i]):
-                    self._find_bonded_atoms(i, mol, radius=2)
+            self._find_all_bonded_atoms(mol, radius=2)
 
         # Loop over the molecules.
         for mol in self.structural_data[0].mol:
@@ -1449,7 +1487,7 @@ class Internal:
                             raise RelaxError("The loaded structures do not contain the same atoms.  The average structural properties can not be calculated.")
 
                         # Sum the atom positions.
-                        pos = pos + array([mol2.x[i], mol2.y[i], mol2.z[i]], float64)
+                        pos = pos + mol2.pos[i]
 
                     # Average the position array (divide by the number of models).
                     pos = pos / len(self.structural_data)
@@ -1703,9 +1741,6 @@ class Internal:
                         mol.res_name.pop(i)
                         res_num = mol.res_num.pop(i)
                         mol.seg_id.pop(i)
-                        mol.x.pop(i)
-                        mol.y.pop(i)
-                        mol.z.pop(i)
 
                         # The residue no longer exists.
                         if res_num not in mol.res_num and res_num not in del_res_nums:
@@ -1721,6 +1756,9 @@ class Internal:
                             for k in range(len(mol.bonded[j])):
                                 mol.bonded[j][k] -= 1
 
+                    # Remove the atomic coordinates all at once.
+                    mol._pos_delete(indices[mol_index])
+
                     # Reset the metadata if nothing remains.
                     if mol.atom_num == []:
                         if hasattr(mol, 'file_name'):
@@ -2267,24 +2305,21 @@ class Internal:
         # The selection object.
         selection = self.selection()
 
-        # Loop over the molecules and atoms.
-        for mol_index, i in selection.loop():
-            # Set the mean structure coordinate to zero.
-            mean_model.mol[mol_index].x[i] = 0.0
-            mean_model.mol[mol_index].y[i] = 0.0
-            mean_model.mol[mol_index].z[i] = 0.0
+        # Loop over the molecules.
+        for mol_index in selection.mol_loop():
+            # The selected atoms.
+            indices = selection.atom_indices(mol_index)
+
+            # Set the mean structure coordinates to zero.
+            pos = mean_model.mol[mol_index].pos
+            pos[indices] = 0.0
 
             # Loop over the models and sum the coordinates.
             for model_index in range(num):
-                model_cont = self.structural_data[model_index]
-                mean_model.mol[mol_index].x[i] += model_cont.mol[mol_index].x[i]
-                mean_model.mol[mol_index].y[i] += model_cont.mol[mol_index].y[i]
-                mean_model.mol[mol_index].z[i] += model_cont.mol[mol_index].z[i]
+                pos[indices] += self.structural_data[model_index].mol[mol_index].pos[indices]
 
             # Averages.
-            mean_model.mol[mol_index].x[i] /= num
-            mean_model.mol[mol_index].y[i] /= num
-            mean_model.mol[mol_index].z[i] /= num
+            pos[indices] /= num
 
         # Delete all models but the mean.
         for model_index in reversed(list(range(num))):
@@ -2632,21 +2667,16 @@ class Internal:
 
         # Loop over the models.
         for model_cont in self.model_loop(model):
-            # Loop over all molecules and atoms in the selection.
-            for mol_index, i in selection.loop():
+            # Loop over all molecules in the selection.
+            for mol_index in selection.mol_loop():
                 mol = model_cont.mol[mol_index]
+                indices = selection.atom_indices(mol_index)
 
-                # The origin to atom vector.
-                vect = array([mol.x[i], mol.y[i], mol.z[i]], float64) - origin
-
-                # Rotation.
-                rot_vect = dot(R, vect)
+                # The origin to atom vectors.
+                vect = mol.pos[indices] - origin
 
-                # The new position.
-                pos = rot_vect + origin
-                mol.x[i] = pos[0]
-                mol.y[i] = pos[1]
-                mol.z[i] = pos[2]
+                # Rotation, and the new positions.
+                mol.pos[indices] = dot(vect, R.T) + origin
 
 
     def selection(self, atom_id=None, inv=False):
@@ -2775,14 +2805,12 @@ class Internal:
 
         # Loop over the models.
         for model_cont in self.model_loop(model):
-            # Loop over all molecules and atoms in the selection.
-            for mol_index, i in selection.loop():
+            # Loop over all molecules in the selection.
+            for mol_index in selection.mol_loop():
                 mol = model_cont.mol[mol_index]
 
                 # Translate.
-                mol.x[i] = mol.x[i] + T[0]
-                mol.y[i] = mol.y[i] + T[1]
-                mol.z[i] = mol.z[i] + T[2]
+                mol.pos[selection.atom_indices(mol_index)] += T
 
 
     def to_xml(self, doc, element):
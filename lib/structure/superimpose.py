@@ -23,15 +23,17 @@
 """Module for handling all types of structural superimpositions."""
 
 # Python module imports.
-from copy import deepcopy
 from math import pi
-from numpy import diag, dot, eye, float64, outer, sign, transpose, zeros
+from numpy import arctan2, array, diag, dot, einsum, eye, float64, sign, sqrt, transpose, zeros
 from numpy.linalg import det, norm, svd
+from warnings import warn
 
 # relax module import.
+from lib.errors import RelaxError
+from lib.periodic_table import periodic_table
 from lib.structure.mass import centre_of_mass
-from lib.structure.statistics import calc_mean_structure
 from lib.geometry.rotations import R_to_axis_angle, R_to_euler_zyz
+from lib.warnings import RelaxWarning
 
 
 def find_centroid(coords):
@@ -112,17 +114,10 @@ def fit_to_mean(models=None, coord=None, centre_type="centroid", elements=None,
     if verbosity:
         print("\nSuperimposition of structural models %s using the 'fit to mean' algorithm." % models)
 
-    # Duplicate the coordinates.
-    orig_coord = deepcopy(coord)
-
-    # Initialise the displacement lists.
-    T_list = []
-    R_list = []
-    pivot_list = []
-
-    # Initialise the mean structure.
-    N = len(coord[0])
-    mean = zeros((N, 3), float64)
+    # All coordinates as a single array, and a copy for the superimposition.
+    orig_coord = array(coord, float64)
+    new_coord = orig_coord.copy()
+    M = len(new_coord)
 
     # Iterative fitting to mean.
     converged = False
@@ -134,51 +129,34 @@ def fit_to_mean(models=None, coord=None, centre_type="centroid", elements=None,
             print("%-10s%-25s%-25s" % ("Model", "Translation (Angstrom)", "Rotation (deg)"))
 
         # Calculate the mean structure.
-        calc_mean_structure(coord, mean)
-
-        # Fit each model to the mean.
-        converged = True
-        for i in range(len(models)):
-            # Calculate the displacements (Kabsch algorithm).
-            trans_vect, trans_dist, R, axis, angle, pivot = kabsch(name_from='model %s'%models[0], name_to='mean', coord_from=coord[i], coord_to=mean, centre_type=centre_type, elements=elements, centroid=centroid, verbosity=0)
+        mean = new_coord.sum(axis=0) / M
 
-            # Table printout.
-            if verbosity:
-                print("%-10i%25.3g%25.3g" % (i, trans_dist, (angle / 2.0 / pi * 360.0)))
+        # Fit all models to the mean (Kabsch algorithm).
+        trans_vect, trans_dist, R, angle, pivot = kabsch_batch(coord_from=new_coord, coord_to=mean, centre_type=centre_type, elements=elements, centroid=centroid)
 
-            # Shift the coordinates.
-            for j in range(N):
-                # Translate.
-                coord[i][j] += trans_vect
-
-                # The pivot to atom vector.
-                coord[i][j] -= pivot
-
-                # Rotation.
-                coord[i][j] = dot(R, coord[i][j])
+        # Table printout.
+        if verbosity:
+            for i in range(M):
+                print("%-10i%25.3g%25.3g" % (i, trans_dist[i], (angle[i] / 2.0 / pi * 360.0)))
 
-                # The new position.
-                coord[i][j] += pivot
+        # Shift the coordinates of all models - translate, then rotate about the pivot.
+        new_coord = einsum('mij,mnj->mni', R, new_coord + (trans_vect - pivot)[:, None, :]) + pivot
 
-            # Convergence test.
-            if trans_dist > 1e-10 or angle > 1e-10:
-                converged = False
+        # Convergence test.
+        converged = not (trans_dist > 1e-10).any() and not (angle > 1e-10).any()
 
         # Increment the iteration number.
         iter += 1
 
-    # Perform the fit once from the original coordinates to obtain the full transforms.
-    for i in range(len(models)):
-        # Calculate the displacements (Kabsch algorithm).
-        trans_vect, trans_dist, R, axis, angle, pivot = kabsch(name_from='model %s'%models[i], name_to='the mean structure', coord_from=orig_coord[i], coord_to=mean, centre_type=centre_type, elements=elements, centroid=centroid, verbosity=0)
+    # Update the coordinates in place.
+    for i in range(M):
+        coord[i][:] = new_coord[i]
 
-        # Store the transforms.
-        T_list.append(trans_vect)
-        R_list.append(R)
-        pivot_list.append(pivot)
+    # Perform the fit once from the original coordinates to obtain the full transforms.
+    trans_vect, trans_dist, R, angle, pivot = kabsch_batch(coord_from=orig_coord, coord_to=mean, centre_type=centre_type, elements=elements, centroid=centroid)
 
     # Return the transform data.
-    return T_list, R_list, pivot_list
+    return list(trans_vect), list(R), [pivot.copy() for i in range(M)]
 
 
 def kabsch(name_from=None, name_to=None, coord_from=None, coord_to=None, centre_type="centroid", elements=None, centroid=None, verbosity=1):
@@ -248,6 +226,76 @@ def kabsch(name_from=None, name_to=None, coord_from=None, coord_to=None, centre_
     return trans_vect, trans_dist, R, axis, angle, centroid_to
 
 
+def kabsch_batch(coord_from=None, coord_to=None, centre_type="centroid", elements=None, centroid=None):
+    """Calculate the displacements from a set of structures to a single structure in one vectorised operation.
+
+    This is the Kabsch algorithm of the kabsch() function applied to all starting structures simultaneously, without the printouts.  The covariance matrices of all structures are calculated with a single einsum() call and the rotations are obtained from one stacked SVD.
+
+
+    @keyword coord_from:    The atomic coordinates for all the starting structures.
+    @type coord_from:       numpy rank-3, MxNx3 array
+    @keyword coord_to:      The atomic coordinates for the ending structure.
+    @type coord_to:         numpy rank-2, Nx3 array
+    @keyword centre_type:   The type of centre to superimpose over.  This can either be the standard centroid superimposition or the CoM could be used instead.
+    @type centre_type:      str
+    @keyword elements:      The list of elements corresponding to the atoms.
+    @type elements:         list of str
+    @keyword centroid:      An alternative position of the centroid, used for studying pivoted systems.
+    @type centroid:         list of float or numpy rank-1, 3D array
+    @return:                The translation vectors T, translation distances d, rotation matrices R, rotation angles theta, and the rotational pivot defined as the centroid of the ending structure.
+    @rtype:                 numpy rank-2 Mx3 array, numpy rank-1 array, numpy rank-3 Mx3x3 array, numpy rank-1 array, numpy rank-1 3D array
+    """
+
+    # The number of structures.
+    M = len(coord_from)
+
+    # Calculate the centroids.
+    if centroid is not None:
+        centroid_to = array(centroid, float64)
+        centroid_from = zeros((M, 3), float64)
+        centroid_from[:] = centroid_to
+    elif centre_type == 'centroid':
+        centroid_from = coord_from.sum(axis=1) / coord_from.shape[1]
+        centroid_to = find_centroid(coord_to)
+    else:
+        # The atomic masses (unknown elements are skipped as in the centre_of_mass() function).
+        masses = zeros(len(elements), float64)
+        mass = 0.0
+        for i in range(len(elements)):
+            try:
+                mass = periodic_table.atomic_mass(elements[i])
+            except RelaxError:
+                warn(RelaxWarning("Skipping the atom index %s as the element '%s' is unknown." % (i, elements[i])))
+            masses[i] = mass
+
+        # The centres of mass.
+        centroid_from = einsum('n,mni->mi', masses, coord_from) / masses.sum()
+        centroid_to = dot(masses, coord_to) / masses.sum()
+
+    # The translations.
+    trans_vect = centroid_to - centroid_from
+    trans_dist = sqrt((trans_vect**2).sum(axis=1))
+
+    # The covariance matrices of all structures.
+    A = einsum('mni,nj->mij', coord_from - centroid_from[:, None, :], coord_to - centroid_to)
+
+    # Stacked SVD.
+    U, S, V = svd(A)
+
+    # The rotations, with the handedness of the covariance matrices applied to the last column of V^T.
+    Vt = V.transpose(0, 2, 1).copy()
+    Vt[:, :, 2] *= sign(det(A))[:, None]
+    R = einsum('mij,mkj->mik', Vt, U)
+
+    # The rotation angles, as in R_to_axis_angle().
+    r = sqrt((R[:, 2, 1] - R[:, 1, 2])**2 + (R[:, 0, 2] - R[:, 2, 0])**2 + (R[:, 1, 0] - R[:, 0, 1])**2)
+    t = R[:, 0, 0] + R[:, 1, 1] + R[:, 2, 2]
+    angle = arctan2(r, t-1)
+
+    # Return the data.
+    return trans_vect, trans_dist, R, angle, centroid_to
+
+
 def kabsch_rotation(coord_from=None, coord_to=None, centroid_from=None, centroid_to=None):
     """Calculate the rotation via SVD.
 
@@ -263,17 +311,8 @@ def kabsch_rotation(coord_from=None, coord_to=None, centroid_from=None, centroid
     @rtype:                 numpy rank-2, 3D array
     """
 
-    # Initialise the covariance matrix A.
-    A = zeros((3, 3), float64)
-
-    # Loop over the atoms.
-    for i in range(coord_from.shape[0]):
-        # The positions shifted to the origin.
-        orig_from = coord_from[i] - centroid_from
-        orig_to = coord_to[i] - centroid_to
-
-        # The outer product.
-        A += outer(orig_from, orig_to)
+    # The covariance matrix A, as the sum of the outer products of the positions shifted to the origin.
+    A = dot(transpose(coord_from - centroid_from), coord_to - centroid_to)
 
     # SVD.
     U, S, V = svd(A)
@@ -22,10 +22,15 @@
 # Module docstring.
 """Module containing generic functions for creation and parsing of XML representations of Python objects."""
 
-# Python module imports (note that some of these are needed for the eval() function call).
+# Python module imports.
+import ast
+from json import loads
 import numpy
-from numpy import set_printoptions, array, int16, int32, float32, float64, inf, nan, ndarray, zeros
+from numpy import set_printoptions, array, int16, int32, int64, float32, float64, inf, nan, ndarray, zeros
 from re import search
+import sys
+from xml.dom.pulldom import END_ELEMENT, START_ELEMENT
+from xml.sax.saxutils import escape
 
 # Modify numpy for better output of numbers and structures.
 set_printoptions(precision=15, threshold=nan)
@@ -33,11 +38,59 @@ set_printoptions(precision=15, threshold=nan)
 # relax module imports.
 import lib.arg_check
 import lib.check_types
-from lib.compat import unicode
+from lib.compat import PY_VERSION, unicode
 from lib.float import floatAsByteArray, packBytesAsPyFloat
 from lib.errors import RelaxError
 
 
+# The indentation of the pretty printed XML files.
+XML_INDENT = '    '
+
+# The Python names which can be found in the XML values.
+PYTHON_NAMES = {
+    'None': None,
+    'True': True,
+    'False': False,
+    'inf': inf,
+    'nan': nan
+}
+
+# The callables which can be found in the XML values, either bare or prefixed by 'numpy.' or 'np.'.
+PYTHON_CALLABLES = {
+    'array': array,
+    'dtype': numpy.dtype,
+    'float': float,
+    'float32': float32,
+    'float64': float64,
+    'int': int,
+    'int16': int16,
+    'int32': int32,
+    'int64': int64,
+    'zeros': zeros
+}
+
+# The Python types of the XML 'type' attribute.
+PYTHON_TYPES = {
+    'None': None,
+    'bool': bool,
+    'dict': dict,
+    'float': float,
+    'int': int,
+    'list': list,
+    'str': str
+}
+
+# The literal AST nodes and their value attributes.
+if sys.version_info >= (3, 8):
+    AST_LITERALS = [[ast.Constant, 'value']]
+else:
+    AST_LITERALS = [[ast.Num, 'n'], [ast.Str, 's']]
+    if hasattr(ast, 'Bytes'):
+        AST_LITERALS.append([ast.Bytes, 's'])
+    if hasattr(ast, 'NameConstant'):
+        AST_LITERALS.append([ast.NameConstant, 'value'])
+
+
 def fill_object_contents(doc, elem, object=None, blacklist=[]):
     """Place all simple python objects into the XML element namespace.
 
@@ -83,11 +136,8 @@ def node_value_to_python(elem):
     @type elem:     xml.dom.minidom.Element instance
     """
 
-    # Remove whitespace.
-    val = elem.nodeValue.strip()
-
     # Convert to python and return.
-    return eval(val)
+    return str_to_python(elem.nodeValue)
 
 
 def object_to_xml(doc, elem, value=None):
@@ -201,6 +251,108 @@ def object_to_xml(doc, elem, value=None):
         val_elem.appendChild(doc.createTextNode(repr(ieee_obj)))
 
 
+def str_to_python(string):
+    """Safely convert the Python representation of an object back into the object.
+
+    This replaces eval() for the values stored in the relax XML files.  Only literals, lists, tuples, dictionaries, sets, the unary operators + and -, the names of the PYTHON_NAMES dictionary, and calls to the functions and types of the PYTHON_CALLABLES dictionary are allowed.  The numbers, strings, lists and dictionaries which make up the bulk of the relax XML files are converted using the much faster JSON decoder.
+
+
+    @param string:      The Python representation of the object.
+    @type string:       str
+    @raises RelaxError: If the string is not a valid or safe Python expression.
+    @return:            The Python object.
+    @rtype:             anything
+    """
+
+    # Remove whitespace.
+    string = string.strip()
+
+    # Simple names.
+    if string in PYTHON_NAMES:
+        return PYTHON_NAMES[string]
+
+    # Numbers, strings, and lists and dictionaries of these using the JSON decoder, converting the Python single quotes to the JSON double quotes (only for Python 3 where the JSON strings are of the str type).
+    if '"' not in string and '\\' not in string and (PY_VERSION == 3 or "'" not in string):
+        try:
+            return loads(string.replace("'", '"'))
+        except ValueError:
+            pass
+
+    # Parse the string.
+    try:
+        tree = ast.parse(string, mode='eval')
+    except SyntaxError:
+        raise RelaxError("The XML value '%s' is not a valid Python expression." % string)
+
+    # Convert and return.
+    return ast_to_python(tree.body, string)
+
+
+def ast_to_python(node, string):
+    """Recursively convert the abstract syntax tree node into the Python object.
+
+    @param node:        The abstract syntax tree node.
+    @type node:         ast.AST instance
+    @param string:      The full Python representation, for the error messages.
+    @type string:       str
+    @raises RelaxError: If the node is not allowed.
+    @return:            The Python object.
+    @rtype:             anything
+    """
+
+    # Literals.
+    for node_type, attr in AST_LITERALS:
+        if isinstance(node, node_type):
+            return getattr(node, attr)
+
+    # Containers.
+    if isinstance(node, ast.List):
+        return [ast_to_python(elt, string) for elt in node.elts]
+    if isinstance(node, ast.Tuple):
+        return tuple([ast_to_python(elt, string) for elt in node.elts])
+    if isinstance(node, ast.Set):
+        return set([ast_to_python(elt, string) for elt in node.elts])
+    if isinstance(node, ast.Dict):
+        return dict([[ast_to_python(node.keys[i], string), ast_to_python(node.values[i], string)] for i in range(len(node.keys))])
+
+    # Signed numbers.
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = ast_to_python(node.operand, string)
+        if not lib.check_types.is_num(value):
+            raise RelaxError("The XML value '%s' contains a signed non-numeric value." % string)
+        if isinstance(node.op, ast.USub):
+            return -value
+        return value
+
+    # Names.
+    if isinstance(node, ast.Name):
+        if node.id in PYTHON_NAMES:
+            return PYTHON_NAMES[node.id]
+        if node.id in PYTHON_CALLABLES:
+            return PYTHON_CALLABLES[node.id]
+
+    # Numpy attributes.
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in ['numpy', 'np']:
+        if node.attr in PYTHON_NAMES:
+            return PYTHON_NAMES[node.attr]
+        if node.attr in PYTHON_CALLABLES:
+            return PYTHON_CALLABLES[node.attr]
+
+    # Function calls.
+    if isinstance(node, ast.Call):
+        func = ast_to_python(node.func, string)
+        if not any(func is fn for fn in PYTHON_CALLABLES.values()):
+            raise RelaxError("The XML value '%s' contains a call to a non-allowed function." % string)
+        args = [ast_to_python(arg, string) for arg in node.args]
+        kwargs = {}
+        for keyword in node.keywords:
+            kwargs[keyword.arg] = ast_to_python(keyword.value, string)
+        return func(*args, **kwargs)
+
+    # Everything else is forbidden.
+    raise RelaxError("The XML value '%s' contains the non-allowed Python expression '%s'." % (string, node.__class__.__name__))
+
+
 def xml_to_object(elem, base_object=None, set_fn=None, file_version=1, blacklist=[]):
     """Convert the XML elements into python objects, and place these into the base object.
 
@@ -235,7 +387,7 @@ def xml_to_object(elem, base_object=None, set_fn=None, file_version=1, blacklist
             # IEEE-754 floats (for full precision restoration).
             ieee_array = node.getAttribute('ieee_754_byte_array')
             if ieee_array:
-                value = packBytesAsPyFloat(eval(ieee_array))
+                value = packBytesAsPyFloat(str_to_python(ieee_array))
 
             # Get the node contents.
             else:
@@ -246,7 +398,9 @@ def xml_to_object(elem, base_object=None, set_fn=None, file_version=1, blacklist
             # Get the type.
             py_type = node.getAttribute('type')
             if not search('dtype', py_type):
-                py_type = eval(py_type)
+                if py_type not in PYTHON_TYPES:
+                    raise RelaxError("The XML Python type '%s' is unknown." % py_type)
+                py_type = PYTHON_TYPES[py_type]
 
             # Loop over the info nodes of the Python object.
             ieee_value = None
@@ -308,3 +462,227 @@ def xml_to_object(elem, base_object=None, set_fn=None, file_version=1, blacklist
 
         # Set the value.
         setattr(base_object, name, value)
+
+
+def write_element_end(file, elem, indent=''):
+    """Write out the end tag of the XML element, as in the pretty printed output of elem.writexml().
+
+    @param file:        The open file object.
+    @type file:         file
+    @param elem:        The XML element.
+    @type elem:         xml.dom.minidom.Element instance
+    @keyword indent:    The indentation of the element.
+    @type indent:       str
+    """
+
+    # Write the tag.
+    file.write("%s</%s>\n" % (indent, elem.tagName))
+
+
+def write_element_start(file, elem, indent=''):
+    """Write out the start tag of the XML element and all of its current child nodes, as in the pretty printed output of elem.writexml().
+
+    This allows the contents of a large element to be written out in parts, with the child nodes being freed once written.  More child elements can then be written out at the indentation level of indent + XML_INDENT, and the element closed with write_element_end().  The element must have at least one child element in the final output.
+
+
+    @param file:        The open file object.
+    @type file:         file
+    @param elem:        The XML element.
+    @type elem:         xml.dom.minidom.Element instance
+    @keyword indent:    The indentation of the element.
+    @type indent:       str
+    """
+
+    # The start tag and attributes.
+    file.write(indent + "<" + elem.tagName)
+    for name, value in elem.attributes.items():
+        file.write(' %s="%s"' % (name, escape(value, {'"': "&quot;"})))
+    file.write(">\n")
+
+    # Write out and free the child nodes.
+    write_elements(file, elem, indent=indent+XML_INDENT)
+
+
+def write_elements(file, elem, indent=''):
+    """Write out all child nodes of the XML element, as in the pretty printed output of elem.writexml(), and then free them.
+
+    @param file:        The open file object.
+    @type file:         file
+    @param elem:        The XML element.
+    @type elem:         xml.dom.minidom.Element instance
+    @keyword indent:    The indentation of the child nodes.
+    @type indent:       str
+    """
+
+    # Loop over the child nodes.
+    for node in list(elem.childNodes):
+        # Write out the node.
+        node.writexml(file, indent, XML_INDENT, "\n")
+
+        # Free the node.
+        elem.removeChild(node)
+        node.unlink()
+
+
+
+class Xml_element_stream(object):
+    """A stream of the XML elements of a xml.dom.pulldom event stream, for reading large XML files one element at a time.
+
+    Each element returned by the stream must either be expanded into a full DOM tree with expand(), or have its own child elements read from the stream until the end of the element is reached.
+    """
+
+    def __init__(self, events):
+        """Set up the stream.
+
+        @param events:  The pulldom event stream.
+        @type events:   xml.dom.pulldom.DOMEventStream instance
+        """
+
+        # Store the arguments.
+        self.events = events
+
+        # The event put back into the stream.
+        self._pending = None
+
+
+    def _next_event(self):
+        """Return the next start or end element event.
+
+        @return:    The pulldom event and node.  At the end of the file, the END_ELEMENT event and None are returned.
+        @rtype:     str, xml.dom.minidom.Element instance or None
+        """
+
+        # The event put back into the stream.
+        if self._pending:
+            event = self._pending
+            self._pending = None
+            return event
+
+        # Skip all other events.
+        for event, node in self.events:
+            if event in [START_ELEMENT, END_ELEMENT]:
+                return event, node
+
+        # The end of the file.
+        return END_ELEMENT, None
+
+
+    def child_elements(self, tag, expand=False):
+        """Generator for all child elements of the current element with the given tag name, consuming the stream up to and including the end of the current element.
+
+        All other child elements are expanded and discarded.
+
+
+        @param tag:         The tag name of the child elements.
+        @type tag:          str
+        @keyword expand:    A flag which if True will cause each element to be expanded into a full DOM tree, and then freed when the next element is requested.  Otherwise the child elements of each element must be read from the stream by the caller.
+        @type expand:       bool
+        @return:            The child elements.
+        @rtype:             xml.dom.minidom.Element instance
+        """
+
+        # Loop over the child elements.
+        while True:
+            # The next element.
+            node = self.next_child()
+            if node == None:
+                return
+
+            # Discard the element.
+            if node.tagName != tag:
+                self.expand(node).unlink()
+                continue
+
+            # Return the element.
+            if expand:
+                self.expand(node)
+            yield node
+
+            # Free the DOM tree.
+            if expand:
+                node.unlink()
+
+
+    def children(self, tag, expand=False):
+        """Generator for the consecutive child elements of the current element with the given tag name.
+
+        The iteration stops at the first child element with a different tag name or at the end of the current element, both of which are left in the stream.
+
+
+        @param tag:         The tag name of the child elements.
+        @type tag:          str
+        @keyword expand:    A flag which if True will cause each element to be expanded into a full DOM tree, and then freed when the next element is requested.  Otherwise the child elements of each element must be read from the stream by the caller.
+        @type expand:       bool
+        @return:            The child elements.
+        @rtype:             xml.dom.minidom.Element instance
+        """
+
+        # Loop over the matching elements.
+        while self.peek() != None and self.peek().tagName == tag:
+            # The element.
+            node = self.next_child()
+
+            # Return the element.
+            if expand:
+                self.expand(node)
+            yield node
+
+            # Free the DOM tree.
+            if expand:
+                node.unlink()
+
+
+    def expand(self, node):
+        """Build the full DOM tree of the element which has just been returned by the stream.
+
+        The text nodes split by the parser are merged.
+
+
+        @param node:    The element.
+        @type node:     xml.dom.minidom.Element instance
+        @return:        The element, now containing its full DOM tree.
+        @rtype:         xml.dom.minidom.Element instance
+        """
+
+        # Expand the node.
+        self.events.expandNode(node)
+        node.normalize()
+
+        # Return the node.
+        return node
+
+
+    def next_child(self):
+        """Return the next child element of the current element.
+
+        @return:    The next child element, or None if the end of the current element has been reached (the end is then removed from the stream).
+        @rtype:     xml.dom.minidom.Element instance or None
+        """
+
+        # The next event.
+        event, node = self._next_event()
+
+        # The end of the element.
+        if event == END_ELEMENT:
+            return None
+
+        # Return the child element.
+        return node
+
+
+    def peek(self):
+        """Return the next child element of the current element, leaving it in the stream.
+
+        @return:    The next child element, or None if the end of the current element has been reached.
+        @rtype:     xml.dom.minidom.Element instance or None
+        """
+
+        # Put the next event back into the stream.
+        self._pending = self._next_event()
+
+        # The end of the element.
+        if self._pending[0] == END_ELEMENT:
+            return None
+
+        # Return the child element.
+        return self._pending[1]
@@ -26,7 +26,7 @@
 1 Introduction
 ==============
 
-This package is an abstraction of specific multi-processor implementations or fabrics such as MPI via mpi4py.  It is designed to be extended for use on other fabrics such as grid computing via SSH tunnelling, threading, etc.  It also has a uni-processor mode as the default fabric.
+This package is an abstraction of specific multi-processor implementations or fabrics such as MPI via mpi4py, or the local cores of a single machine via the Python multiprocessing module.  It is designed to be extended for use on other fabrics such as grid computing via SSH tunnelling, threading, etc.  It also has a uni-processor mode as the default fabric.
 
 
 2 API
@@ -121,6 +121,7 @@ This appears to be an OpenMPI problem with late 2.6 Linux kernels.
 __all__ = ['memo',
            'misc',
            'mpi4py_processor',
+           'multiprocessing_processor',
            'multi_processor_base',
            'processor',
            'processor_io',
@@ -164,7 +165,7 @@ def load_multiprocessor(processor_name, callback, processor_size, verbosity=1):
     """
 
     # Check that the processor type is supported.
-    if processor_name not in ['uni', 'mpi4py']:
+    if processor_name not in ['uni', 'mpi4py', 'multiprocessing']:
         _sys.stderr.write("The processor type '%s' is not supported.\n" % processor_name)
         _sys.exit()
 
@@ -33,8 +33,6 @@ including, for example:
 """
 
 # Python module imports.
-from copy import copy
-import math
 import sys
 
 # multi module imports.
@@ -70,20 +68,24 @@ class Multi_processor(Processor):
 
     #TODO: move up a level
     def chunk_queue(self, queue):
-        lqueue = copy(queue)
-        result = []
-        processors = self.processor_size()
-        chunks = processors * self.grainyness
-        chunk_size = int(math.floor(float(len(queue)) / float(chunks)))
+        """Split the command queue into the jobs to send to the slaves.
 
-        if chunk_size < 1:
-            result = queue
-        else:
-            for i in range(chunks):
-                result.append(lqueue[:chunk_size])
-                del lqueue[:chunk_size]
-            for i, elem in enumerate(lqueue):
-                result[i].append(elem)
+        The commands are ordered by their cost hints, most expensive first, and then grouped into jobs of self.chunk_size commands.  No attempt is made to statically balance the jobs between the slaves, as this is performed dynamically by run_command_queue().
+
+
+        @param queue:   The command queue.
+        @type queue:    list of Slave_command instances
+        @return:        The list of jobs, each being a list of commands.
+        @rtype:         list of list of Slave_command instances
+        """
+
+        # Order the commands, keeping the original order for equal costs.
+        lqueue = sorted(queue, key=self.job_cost, reverse=True)
+
+        # Chunk the queue.
+        result = []
+        for i in range(0, len(lqueue), self.chunk_size):
+            result.append(lqueue[i:i+self.chunk_size])
         return result
 
 
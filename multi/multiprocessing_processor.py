@@ -0,0 +1,310 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""The local multi-core processor fabric via the Python multiprocessing module.
+
+This allows all the cores of a single machine to be used without an MPI installation.  The slave processes are forked from the master at the start of the processor's run() method, so that each slave starts with a copy of the program state, as is the case for the MPI fabric.  The commands and results are transferred between the master and slaves via multiprocessing queues.
+"""
+
+# Python module imports.
+import multiprocessing
+import os
+import platform
+import sys
+
+# relax module imports.
+from lib.compat import pickle, queue
+from lib.errors import RelaxError
+from multi.misc import Capturing_exception
+from multi.multi_processor_base import Multi_processor, Too_few_slaves_exception
+from multi.result_commands import Result_exception
+from multi.slave_commands import Exit_command
+
+
+class Multiprocessing_processor(Multi_processor):
+    """The multiprocessing multi-processor class.
+
+    The commands and results are pickled before being placed on the multiprocessing queues.  The queues would otherwise pickle the objects in a background feeder thread, where any pickling failure is lost and the receiving process blocks forever.
+    """
+
+    # The time, in seconds, between the checks that the slave processes are still alive while the master waits for results.
+    poll_time = 1.0
+
+    def __init__(self, processor_size, callback):
+        """Initialise the multiprocessing processor.
+
+        @param processor_size:  The number of slave processes to create.  For the default value of -1, one slave per CPU core will be used.
+        @type processor_size:   int
+        @param callback:        The callback object.
+        @type callback:         multi.Application_callback instance
+        """
+
+        # The slave processes are created by forking the master.
+        if hasattr(multiprocessing, 'get_context'):
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                raise Exception("The multiprocessing processor fabric requires the 'fork' start method which is not supported on this platform.")
+            self._context = multiprocessing.get_context('fork')
+        elif sys.platform == 'win32':
+            raise Exception("The multiprocessing processor fabric is not supported on MS Windows.")
+        else:
+            self._context = multiprocessing
+
+        # The default number of slaves.
+        if processor_size == -1:
+            processor_size = multiprocessing.cpu_count()
+
+        # Too few slaves.
+        if processor_size < 1:
+            raise Too_few_slaves_exception()
+
+        # The rank of this process, the master being 0.
+        self._rank = 0
+
+        super(Multiprocessing_processor, self).__init__(processor_size=processor_size, callback=callback)
+
+        # The communication queues.
+        self._command_queues = []
+        self._result_queue = None
+
+        # The slave processes.
+        self._slaves = []
+
+
+    def _broadcast_command(self, command):
+        """Send the command to all slaves which are still alive.
+
+        @param command: The command to send.
+        @type command:  Slave_command instance
+        """
+
+        # Loop over the slaves.
+        for i in range(len(self._slaves)):
+            if self._slaves[i].is_alive():
+                self.master_queue_command(command=command, dest=i+1)
+
+
+    def _ditch_all_results(self):
+        """Discard all results until all slaves have terminated."""
+
+        # Loop until the queue is empty and the slaves are dead.
+        while True:
+            # Discard the next result.
+            try:
+                self._result_queue.get(timeout=0.1)
+                continue
+            except queue.Empty:
+                pass
+
+            # All slaves have terminated.
+            if not [slave for slave in self._slaves if slave.is_alive()]:
+                break
+
+
+    def _run_slave(self, rank):
+        """The main function of the forked slave processes.
+
+        @param rank:    The rank of the slave.
+        @type rank:     int
+        """
+
+        # Set the rank, so that this is now a slave.
+        self._rank = rank
+
+        # Execute the slave main loop.
+        super(Multiprocessing_processor, self).run()
+
+
+    def _start_slaves(self):
+        """Create the communication queues and fork the slave processes."""
+
+        # The queues.
+        self._command_queues = [self._context.Queue() for i in range(self.processor_size())]
+        self._result_queue = self._context.Queue()
+
+        # Fork the slaves.
+        for i in range(self.processor_size()):
+            slave = self._context.Process(target=self._run_slave, args=(i+1,))
+            slave.daemon = True
+            slave.start()
+            self._slaves.append(slave)
+
+
+    def abort(self):
+        """Terminate all slave processes and exit."""
+
+        # Kill the slaves.
+        for slave in self._slaves:
+            slave.terminate()
+        self._slaves = []
+
+        # Exit the program.
+        sys.exit(1)
+
+
+    def assert_on_master(self):
+        """Make sure that this is the master processor and not a slave.
+
+        @raises Exception:  If not on the master processor.
+        """
+
+        # Check if this processor is a slave, and if so throw an exception.
+        if self.on_slave():
+            msg = 'running on slave when expected master with rank == 0, rank was %d'% self.rank()
+            raise Exception(msg)
+
+
+    def exit(self, status=0):
+        """Exit the multiprocessing processor with the given status.
+
+        @keyword status:    The program exit status.
+        @type status:       int
+        """
+
+        # Catch sys.exit being called on an executing slave.
+        if self.on_slave():
+            raise Exception('sys.exit unexpectedly called on slave!')
+
+        # Slave clean up.
+        if len(self._slaves):
+            # Send the exit command to all slaves.
+            self._broadcast_command(Exit_command())
+
+            # Dump all results.
+            self._ditch_all_results()
+
+            # Wait for the slaves to terminate.
+            for slave in self._slaves:
+                slave.join()
+            self._slaves = []
+
+        # Exit the program with the given status.
+        sys.exit(status)
+
+
+    def get_intro_string(self):
+        """Return the string to append to the end of the relax introduction string.
+
+        @return:    The string describing this Processor fabric.
+        @rtype:     str
+        """
+
+        # Return the string.
+        return "Multiprocessing with %i slave processors & 1 master." % self.processor_size()
+
+
+    def get_name(self):
+        return '%s-pid%s' % (platform.node(), os.getpid())
+
+
+    def master_queue_command(self, command, dest):
+        """Master to slave processor data transfer - send the command to the slave.
+
+        @param command: The command to send to the slave.
+        @type command:  Slave_command instance or list of Slave_command instances
+        @param dest:    The destination processor's rank.
+        @type dest:     int
+        """
+
+        # Pickle the command here, so that failures are raised on the master.
+        try:
+            data = pickle.dumps(command, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            raise RelaxError("The command %s cannot be sent to the slave processor %s as it cannot be pickled:  %s" % (command, dest, sys.exc_info()[1]))
+
+        # Place the command on the queue of the slave.
+        self._command_queues[dest-1].put(data)
+
+
+    def master_receive_result(self):
+        """Slave to master processor data transfer - receive the result command from the slave.
+
+        This is invoked by the master processor.
+
+        @return:        The result command sent by the slave.
+        @rtype:         Result_command instance
+        """
+
+        # Wait for the result command.
+        while True:
+            try:
+                data = self._result_queue.get(timeout=self.poll_time)
+                break
+
+            # Check that the slaves are still alive.
+            except queue.Empty:
+                for slave in self._slaves:
+                    if not slave.is_alive():
+                        raise RelaxError("The slave processor %s has terminated unexpectedly with the exit code %s." % (slave.name, slave.exitcode))
+
+        # Return the result command.
+        return pickle.loads(data)
+
+
+    def rank(self):
+        return self._rank
+
+
+    def return_result_command(self, result_object):
+        """Slave to master processor data transfer - send the result command to the master.
+
+        If the result command cannot be pickled, a Result_exception is sent instead so that the master does not wait forever.
+
+
+        @param result_object:   The result command to send.
+        @type result_object:    Result_command instance
+        """
+
+        # Pickle the result command.
+        try:
+            data = pickle.dumps(result_object, pickle.HIGHEST_PROTOCOL)
+
+        # Replace it by the pickling failure.
+        except Exception:
+            error = RelaxError("The result %s cannot be returned to the master processor as it cannot be pickled:  %s" % (result_object, sys.exc_info()[1]))
+            capturing_exception = Capturing_exception(exc_info=(RelaxError, error, sys.exc_info()[2]), rank=self.rank(), name=self.get_name())
+            exception_result = Result_exception(exception=capturing_exception, processor=self, completed=True)
+            exception_result.rank = self.rank()
+            data = pickle.dumps(exception_result, pickle.HIGHEST_PROTOCOL)
+
+        # Place the result on the queue of the master.
+        self._result_queue.put(data)
+
+
+    def run(self):
+        # Create the slaves.
+        if self.on_master():
+            self._start_slaves()
+
+        # Execute the main loop.
+        try:
+            super(Multiprocessing_processor, self).run()
+
+        # Kill the slaves if the master terminated without exiting cleanly.
+        finally:
+            if self.on_master():
+                for slave in self._slaves:
+                    slave.terminate()
+                self._slaves = []
+
+
+    def slave_receive_commands(self):
+        return pickle.loads(self._command_queues[self.rank()-1].get())
@@ -102,7 +102,7 @@ import time, datetime, math, sys
 
 # multi module imports.
 from multi.misc import Capturing_exception, raise_unimplemented, Verbosity; verbosity = Verbosity()
-from multi.result_queue import Threaded_result_queue
+from multi.result_queue import Immediate_result_queue, Threaded_result_queue
 from multi.processor_io import Redirect_text
 from multi.result_commands import Batched_result_command, Null_result_command, Result_exception
 from multi.slave_commands import Slave_storage_command
@@ -155,8 +155,8 @@ class Processor(object):
 
         @see:  Application_callback."""
 
-        self.grainyness = 1
-        """The number of sub jobs to queue for each processor if we have more jobs than processors."""
+        self.chunk_size = 1
+        """The number of commands sent to a slave as a single job.  Small values allow the scheduler to balance the load dynamically."""
 
 #        # CHECKME: am I implemented?, should I be an application callback function
 #        self.pre_queue_command = None
@@ -344,6 +344,26 @@ class Processor(object):
         return time_delta_str
 
 
+    def job_cost(self, job):
+        """Return the cost hint of a job sent to a slave, used for ordering the command queue.
+
+        @param job: The job, either a single slave command or a list of slave commands sent as one batch.
+        @type job:  Slave_command instance or list of Slave_command instances
+        @return:    The cost hint, summed over the batch.  Commands without a hint have a cost of zero.
+        @rtype:     float
+        """
+
+        # A batch of commands.
+        if isinstance(job, list):
+            return sum([self.job_cost(command) for command in job])
+
+        # A single command.
+        cost = getattr(job, 'cost', None)
+        if cost == None:
+            return 0.0
+        return cost
+
+
     def is_queued(self):
         """Determine if any slave commands are queued.
 
@@ -570,12 +590,56 @@ class Processor(object):
         """
 
         queue = [command for i in range(self.processor_size())]
-        self.run_command_queue(queue)
+        self.run_command_on_each_slave(queue)
+
+
+    def run_command_on_each_slave(self, commands):
+        """Send one command to each slave processor and wait for completion.
+
+        The commands are sent directly to the slaves, bypassing both the processor queue and the dynamic scheduling of run_command_queue().  Hence each slave is guaranteed to run exactly one of the commands, whatever the chunk size, and any commands already waiting on the processor queue are left untouched.
+
+
+        @param commands:    The commands, one for each slave processor in order of rank.
+        @type commands:     list of Slave_command instances
+        """
+
+        # This must only be run on the master processor.
+        self.assert_on_master()
+
+        if self.threaded_result_processing:
+            result_queue = Threaded_result_queue(self)
+        else:
+            result_queue = Immediate_result_queue(self)
+
+        # Send the commands, as single command jobs.
+        running_set = set()
+        for i in range(len(commands)):
+            self.master_queue_command(command=[commands[i]], dest=i+1)
+            running_set.add(i+1)
+
+        # Wait until all slaves have reported back.
+        while len(running_set) != 0:
+            # Get the next result.
+            result = self.master_receive_result()
+
+            # Remove the processor rank from the running set.
+            if result.completed:
+                running_set.remove(result.rank)
+
+            # Add to the result queue for instant or threaded processing.
+            result_queue.put(result)
+
+        # Process the threaded results.
+        if self.threaded_result_processing:
+            result_queue.run_all()
 
 
     def run_command_queue(self, queue):
         """Process all commands on the queue and wait for completion.
 
+        The scheduling is dynamic.  The jobs are first ordered by their cost hints so that the most expensive jobs are started first, and then a new job is sent to each slave as soon as it reports back as idle.  Hence a single slow job will not stall the other slaves.
+
+
         @param queue:   The command queue.
         @type queue:    list of Command instances
         """
@@ -591,34 +655,33 @@ class Processor(object):
         else:
             result_queue = Immediate_result_queue(self)
 
-        while len(queue) != 0:
+        # Order the jobs so that the most expensive are popped off the end of the queue first (the sort is stable, so jobs without cost hints keep their order).
+        queue = sorted(queue, key=self.job_cost)
 
-            while len(idle_set) != 0:
-                if len(queue) != 0:
-                    command = queue.pop()
-                    dest = idle_set.pop()
-                    self.master_queue_command(command=command, dest=dest)
-                    running_set.add(dest)
-                else:
-                    break
+        # Loop until the queue of calculations is depleted and all slaves have reported back.
+        while len(queue) != 0 or len(running_set) != 0:
+            # Send jobs to all idle slaves.
+            while len(idle_set) != 0 and len(queue) != 0:
+                command = queue.pop()
+                dest = idle_set.pop()
+                self.master_queue_command(command=command, dest=dest)
+                running_set.add(dest)
 
-            # Loop until the queue of calculations is depleted.
-            while len(running_set) != 0:
-                # Get the result.
-                result = self.master_receive_result()
+            # Get the next result.
+            result = self.master_receive_result()
 
-                # Debugging printout.
-                if verbosity.level():
-                    print('\nIdle set:    %s' % idle_set)
-                    print('Running set: %s' % running_set)
+            # Debugging printout.
+            if verbosity.level():
+                print('\nIdle set:    %s' % idle_set)
+                print('Running set: %s' % running_set)
 
-                # Shift the processor rank to the idle set.
-                if result.completed:
-                    idle_set.add(result.rank)
-                    running_set.remove(result.rank)
+            # Shift the processor rank to the idle set.
+            if result.completed:
+                idle_set.add(result.rank)
+                running_set.remove(result.rank)
 
-                # Add to the result queue for instant or threaded processing.
-                result_queue.put(result)
+            # Add to the result queue for instant or threaded processing.
+            result_queue.put(result)
 
         # Process the threaded results.
         if self.threaded_result_processing:
@@ -652,19 +715,18 @@ class Processor(object):
         # This must be the master processor!
         self.assert_on_master()
 
-        # Create the command list.
+        # Create the command list, one command per slave.
+        commands = []
         for i in range(self.processor_size()):
             # Create and append the command.
             command = Slave_storage_command()
+            commands.append(command)
 
             # Add the data to the command.
             command.add(name, value)
 
-            # Add the command to the queue.
-            self.add_to_queue(command)
-
-        # Flush the queue.
-        self.run_queue()
+        # Send the data to each slave, leaving the processor queue untouched.
+        self.run_command_on_each_slave(commands)
 
 
     def stdio_capture(self):
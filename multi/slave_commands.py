@@ -45,6 +45,9 @@ class Slave_command(object):
     def __init__(self):
         self.memo_id = None
 
+        self.cost = None
+        """An optional hint of the relative computational cost of the command.  The most expensive commands are sent to the slaves first."""
+
 
     def run(self, processor, completed):
         """Run the slave command on the slave processor
@@ -174,6 +174,21 @@ class Uni_processor(Processor):
             raise Exception(message)
 
 
+    def run_command_on_each_slave(self, commands):
+        """Run the commands directly, as the master is also the only slave.
+
+        The processor queue is left untouched.
+
+
+        @param commands:    The commands, one for each slave processor.
+        @type commands:     list of Slave_command instances
+        """
+
+        # Run each command.
+        for command in commands:
+            command.run(self, True)
+
+
     def run_queue(self):
         """Safely run each command in the queue, cleaning up after failures."""
 
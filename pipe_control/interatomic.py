@@ -196,11 +196,10 @@ def create_interatom(spin_id1=None, spin_id2=None, spin1=None, spin2=None, pipe=
             raise RelaxNoSpinError(spin_id2)
 
     # Check if the two spin IDs have already been added.
-    for i in range(len(dp.interatomic)):
-        if spin1._hash != spin2._hash and spin1._hash in [dp.interatomic[i]._spin_hash1, dp.interatomic[i]._spin_hash2] and spin2._hash in [dp.interatomic[i]._spin_hash1, dp.interatomic[i]._spin_hash2]:
-            raise RelaxError("The spin pair %s and %s have already been added." % (spin_id1, spin_id2))
+    if spin1._hash != spin2._hash and dp.interatomic.hash_pair(spin1._hash, spin2._hash) in dp.interatomic._spin_hash_pair_lookup:
+        raise RelaxError("The spin pair %s and %s have already been added." % (spin_id1, spin_id2))
 
-    # Add the data.
+    # Add the data (this also updates the lookup tables).
     interatom = dp.interatomic.add_item(spin_id1=spin_id1, spin_id2=spin_id2, spin_hash1=spin1._hash, spin_hash2=spin2._hash)
 
     # Store the interatom hash in the spin containers.
@@ -430,9 +429,25 @@ def hash_update(interatom=None, pipe=None):
     spin1 = return_spin(spin_hash=interatom._spin_hash1, pipe=pipe)
     spin2 = return_spin(spin_hash=interatom._spin_hash2, pipe=pipe)
 
-    # Reset the hashes.
+    # The data pipe.
+    if pipe == None:
+        pipe = pipes.cdp_name()
+
+    # Get the data pipe.
+    dp = pipes.get_pipe(pipe)
+
+    # The index of the container, from the lookup table or otherwise from the list.
+    indices = [i for i in dp.interatomic._spin_hash_lookup.get(interatom._spin_hash1, ()) if dp.interatomic[i] is interatom]
+    if not indices:
+        indices = [i for i in range(len(dp.interatomic)) if dp.interatomic[i] is interatom]
+
+    # Reset the hashes, updating the lookup tables.
+    for i in indices:
+        dp.interatomic.lookup_remove(i)
     interatom._spin_hash1 = spin1._hash
     interatom._spin_hash2 = spin2._hash
+    for i in indices:
+        dp.interatomic.lookup_add(i)
 
 
 def interatomic_loop(selection1=None, selection2=None, pipe=None, skip_desel=True):
@@ -542,6 +557,10 @@ def metadata_update(interatom_index=None, pipe=None):
         spin1 = return_spin(spin_id=interatom.spin_id1, pipe=pipe)
         spin2 = return_spin(spin_id=interatom.spin_id2, pipe=pipe)
 
+        # Remove the old hashes from the lookup tables.
+        if interatom_index != None:
+            dp.interatomic.lookup_remove(i)
+
         # Update the hashes.
         interatom._spin_hash1 = None
         interatom._spin_hash2 = None
@@ -550,6 +569,14 @@ def metadata_update(interatom_index=None, pipe=None):
         if spin2:
             interatom._spin_hash2 = spin2._hash
 
+        # Add the new hashes to the lookup tables.
+        if interatom_index != None:
+            dp.interatomic.lookup_add(i)
+
+    # Rebuild the lookup tables.
+    if interatom_index == None:
+        dp.interatomic.lookup_reset()
+
 
 def read_dist(file=None, dir=None, unit='meter', spin_id1_col=None, spin_id2_col=None, data_col=None, sep=None):
     """Set up the magnetic dipole-dipole interaction.
@@ -668,10 +695,11 @@ def return_interatom(spin_hash1=None, spin_hash2=None, pipe=None):
     # Get the data pipe.
     dp = pipes.get_pipe(pipe)
 
-    # Return the matching container.
-    for i in range(len(dp.interatomic)):
-        if spin_hash1 != spin_hash2 and spin_hash1 in [dp.interatomic[i]._spin_hash1, dp.interatomic[i]._spin_hash2] and spin_hash2 in [dp.interatomic[i]._spin_hash1, dp.interatomic[i]._spin_hash2]:
-            return dp.interatomic[i]
+    # Return the matching container from the lookup table.
+    if spin_hash1 != spin_hash2:
+        index = dp.interatomic._spin_hash_pair_lookup.get(dp.interatomic.hash_pair(spin_hash1, spin_hash2))
+        if index != None:
+            return dp.interatomic[index]
 
     # No matchs.
     return None
@@ -702,10 +730,9 @@ def return_interatom_list(spin_hash=None, pipe=None):
     # Initialise.
     interatoms = []
 
-    # Find and append all containers.
-    for i in range(len(dp.interatomic)):
-        if spin_hash in [dp.interatomic[i]._spin_hash1, dp.interatomic[i]._spin_hash2]:
-            interatoms.append(dp.interatomic[i])
+    # Find and append all containers, in the list order, from the lookup table.
+    for i in sorted(dp.interatomic._spin_hash_lookup.get(spin_hash, ())):
+        interatoms.append(dp.interatomic[i])
 
     # Return the list of containers.
     return interatoms
@@ -429,7 +429,7 @@ def grid_zoom(level=0):
     cdp.grid_zoom_level = level
 
 
-def minimise(min_algor=None, line_search=None, hessian_mod=None, hessian_type=None, func_tol=None, grad_tol=None, max_iter=None, constraints=True, scaling=True, verbosity=1, sim_index=None):
+def minimise(min_algor=None, line_search=None, hessian_mod=None, hessian_type=None, func_tol=None, grad_tol=None, max_iter=None, constraints=True, scaling=True, verbosity=1, mc_batch=False, sim_index=None):
     """Minimisation function.
 
     @keyword min_algor:         The minimisation algorithm to use.
@@ -452,6 +452,8 @@ def minimise(min_algor=None, line_search=None, hessian_mod=None, hessian_type=No
     @type scaling:              bool
     @keyword verbosity:         The amount of information to print.  The higher the value, the greater the verbosity.
     @type verbosity:            int
+    @keyword mc_batch:          A flag which if True will cause all Monte Carlo simulations to be optimised simultaneously by the batched optimisation of the specific analysis, rather than one simulation at a time.
+    @type mc_batch:             bool
     @keyword sim_index:         The index of the simulation to optimise.  This should be None if normal optimisation is desired.
     @type sim_index:            None or int
     """
@@ -496,6 +498,14 @@ def minimise(min_algor=None, line_search=None, hessian_mod=None, hessian_type=No
         # Optimise.
         api.minimise(min_algor=min_algor, min_options=min_options, func_tol=func_tol, grad_tol=grad_tol, max_iterations=max_iter, constraints=constraints, scaling_matrix=scaling_matrix, verbosity=verbosity, sim_index=sim_index)
 
+    # Batched Monte Carlo simulation minimisation.
+    elif mc_batch and hasattr(cdp, 'sim_state') and cdp.sim_state == 1:
+        # Reset the minimisation statistics.
+        reset_min_stats(sim_index=list(range(cdp.sim_number)), verbosity=verbosity)
+
+        # Optimisation of all simulations.
+        api.minimise_mc(func_tol=func_tol, grad_tol=grad_tol, max_iterations=max_iter, constraints=constraints, scaling_matrix=scaling_matrix, verbosity=verbosity)
+
     # Monte Carlo simulation minimisation.
     elif hasattr(cdp, 'sim_state') and cdp.sim_state == 1:
         for i in range(cdp.sim_number):
@@ -538,8 +548,8 @@ def reset_min_stats(data_pipe=None, sim_index=None, verbosity=1):
 
     @keyword data_pipe:     The name of the data pipe to reset the minimisation statistics of.  This defaults to the current data pipe.
     @type data_pipe:        str
-    @keyword sim_index:     The optional Monte Carlo simulation index.
-    @type sim_index:        int
+    @keyword sim_index:     The optional Monte Carlo simulation index, or list of indices.
+    @type sim_index:        int or list of int
     @keyword verbosity:     The amount of information to print.  The higher the value, the greater the verbosity.
     @type verbosity:        int
     """
@@ -548,6 +558,11 @@ def reset_min_stats(data_pipe=None, sim_index=None, verbosity=1):
     if data_pipe == None:
         data_pipe = pipes.cdp_name()
 
+    # The simulation indices.
+    sim_indices = sim_index
+    if sim_index != None and not isinstance(sim_index, list):
+        sim_indices = [sim_index]
+
     # Get the data pipe.
     dp = pipes.get_pipe(data_pipe)
 
@@ -581,8 +596,9 @@ def reset_min_stats(data_pipe=None, sim_index=None, verbosity=1):
                 sim_obj = getattr(dp, sim_name)
 
                 # Reset the object to None if possible.
-                if sim_index < len(sim_obj):
-                    sim_obj[sim_index] = None
+                for i in sim_indices:
+                    if i < len(sim_obj):
+                        sim_obj[i] = None
 
         # Loop over all spins.
         for spin in spin_loop(skip_desel=False):
@@ -600,8 +616,9 @@ def reset_min_stats(data_pipe=None, sim_index=None, verbosity=1):
                     sim_obj = getattr(spin, sim_name)
 
                     # Reset the object to None if possible.
-                    if sim_index < len(sim_obj):
-                        sim_obj[sim_index] = None
+                    for i in sim_indices:
+                        if i < len(sim_obj):
+                            sim_obj[i] = None
 
     # Printout.
     if verbosity and flag and sim_index == None:
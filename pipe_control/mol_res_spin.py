@@ -36,6 +36,7 @@ The functionality of this module is diverse:
 
 # Python module imports.
 from numpy import array, float64
+from re import search
 import sys
 from warnings import warn
 
@@ -196,6 +197,74 @@ def check_mol_res_spin_data():
         raise RelaxNoSequenceError
 
 
+def compile_selection(selection=None, pipe_cont=None):
+    """Return the molecule, residue and spin indices of all spins matching the selection.
+
+    The selection is only matched against the spins once, as the compiled indices are stored in the private selection lookup table of the molecule list.  This table is reset by the metadata updates.
+
+
+    @keyword selection: The spin selection identifier.
+    @type selection:    str or None
+    @keyword pipe_cont: The data pipe object.
+    @type pipe_cont:    PipeContainer instance
+    @return:            The list of molecule, residue and spin indices.
+    @rtype:             list of tuple of 3 int
+    """
+
+    # Handle Unicode.
+    if is_unicode(selection):
+        selection = str(selection)
+
+    # Use the compiled selection.
+    if selection in pipe_cont.mol._selection_lookup:
+        return pipe_cont.mol._selection_lookup[selection]
+
+    # Parse the selection string.
+    select_obj = Selection(selection)
+
+    # A unique spin ID, which only matches the spin of the look up table if no name can match other names or numbers.  As look up table entries are not removed when a later spin makes the ID ambiguous, the ID must also be a current variant of the spin ID.
+    if selection in pipe_cont.mol._spin_id_lookup and has_plain_names(pipe_cont=pipe_cont):
+        i, j, k = pipe_cont.mol._spin_id_lookup[selection]
+        mol = pipe_cont.mol[i]
+        res = mol.res[j]
+        spin = res.spin[k]
+        if selection in spin_id_variants(dp=pipe_cont, mol_index=i, res_index=j, spin_index=k) and select_obj.contains_spin(spin_num=spin.num, spin_name=spin.name, res_num=res.num, res_name=res.name, mol=mol.name):
+            pipe_cont.mol._selection_lookup[selection] = [(i, j, k)]
+            return pipe_cont.mol._selection_lookup[selection]
+
+    # Loop over the molecules.
+    indices = []
+    for i in range(len(pipe_cont.mol)):
+        # Alias.
+        mol = pipe_cont.mol[i]
+
+        # Skip the molecule if there is no match to the selection.
+        if not select_obj.contains_mol(mol=mol.name):
+            continue
+
+        # Loop over the residues.
+        for j in range(len(mol.res)):
+            # Alias.
+            res = mol.res[j]
+
+            # Skip the residue if there is no match to the selection.
+            if not select_obj.contains_res(res_num=res.num, res_name=res.name, mol=mol.name):
+                continue
+
+            # Loop over the spins.
+            for k in range(len(res.spin)):
+                # Alias.
+                spin = res.spin[k]
+
+                # Store the indices of the matching spins.
+                if select_obj.contains_spin(spin_num=spin.num, spin_name=spin.name, res_num=res.num, res_name=res.name, mol=mol.name):
+                    indices.append((i, j, k))
+
+    # Store and return the indices.
+    pipe_cont.mol._selection_lookup[selection] = indices
+    return indices
+
+
 def copy_molecule(pipe_from=None, mol_from=None, pipe_to=None, mol_to=None):
     """Copy the contents of a molecule container to a new molecule.
 
@@ -1789,6 +1858,46 @@ def get_spin_ids(selection=None):
     return spin_ids
 
 
+def has_plain_names(pipe_cont=None):
+    """Determine if all molecule, residue and spin names are plain names.
+
+    Plain names consist of letters, numbers, underscores and primes, are not purely numeric, and the molecule names are unique.  Such names cannot be matched by the selection of another name or number.  The result is stored until the next metadata update.
+
+
+    @keyword pipe_cont: The data pipe object.
+    @type pipe_cont:    PipeContainer instance
+    @return:            True if all names are plain.
+    @rtype:             bool
+    """
+
+    # The stored result.
+    if pipe_cont.mol._plain_names != None:
+        return pipe_cont.mol._plain_names
+
+    # Collect all names.
+    names = []
+    mol_names = []
+    for mol in pipe_cont.mol:
+        if mol.name != None:
+            mol_names.append(mol.name)
+        for res in mol.res:
+            names.append(res.name)
+            for spin in res.spin:
+                names.append(spin.name)
+
+    # Check the names.
+    plain = len(set(mol_names)) == len(mol_names)
+    for name in mol_names + names:
+        if not plain:
+            break
+        if name != None and (not search("^[A-Za-z0-9_']+$", str(name)) or search("^[0-9]+$", str(name))):
+            plain = False
+
+    # Store and return the result.
+    pipe_cont.mol._plain_names = plain
+    return plain
+
+
 def is_pseudoatom(spin=None):
     """Check if the given spin container corresponds to a pseudo-atom.
 
@@ -2015,6 +2124,11 @@ def metadata_counts(pipe_cont=None):
     @type pipe_cont:    PipeContainer instance
     """
 
+    # Reset the compiled spin selections, unique spin IDs, and plain name flag, as these depend on the names, numbers, and counts.
+    pipe_cont.mol._selection_lookup = {}
+    pipe_cont.mol._spin_unique_id_lookup = {}
+    pipe_cont.mol._plain_names = None
+
     # The top level counts.
     pipe_cont.mol._res_name_count = {}
     pipe_cont.mol._res_num_count = {}
@@ -2956,47 +3070,27 @@ def return_spin_from_selection(selection=None, pipe=None, full_info=False, multi
     # Get the data pipe.
     dp = pipes.get_pipe(pipe)
 
-    # Parse the selection string.
-    select_obj = Selection(selection)
-
-    # Loop over the molecules.
-    spin_num = 0
+    # Loop over the compiled selection.
     spins = []
     mol_names = []
     res_nums = []
     res_names = []
-    spin_ids = []
-    for mol in dp.mol:
-        # Skip the molecule if there is no match to the selection.
-        if not select_obj.contains_mol(mol=mol.name):
-            continue
-
-        # Loop over the residues.
-        for res in mol.res:
-            # Skip the residue if there is no match to the selection.
-            if not select_obj.contains_res(res_num=res.num, res_name=res.name, mol=mol.name):
-                continue
-
-            # Loop over the spins.
-            for spin in res.spin:
-                # Skip the spin if there is no match to the selection.
-                if not select_obj.contains_spin(spin_num=spin.num, spin_name=spin.name, res_num=res.num, res_name=res.name, mol=mol.name):
-                    continue
-
-                # Store all data.
-                mol_names.append(mol.name)
-                res_nums.append(res.num)
-                res_names.append(res.name)
-                spins.append(spin)
-
-                # Increment the spin number counter.
-                spin_num = spin_num + 1
+    for mol_index, res_index, spin_index in compile_selection(selection=selection, pipe_cont=dp):
+        # Alias the containers.
+        mol = dp.mol[mol_index]
+        res = mol.res[res_index]
 
-                # Generate as store the spin ID.
-                spin_ids.append(generate_spin_id(pipe_cont=dp, mol_name=mol.name, res_num=res.num, res_name=res.name, spin_num=spin.num, spin_name=spin.name))
+        # Store all data.
+        mol_names.append(mol.name)
+        res_nums.append(res.num)
+        res_names.append(res.name)
+        spins.append(res.spin[spin_index])
 
     # No unique identifier.
-    if not multi and spin_num > 1:
+    if not multi and len(spins) > 1:
+        spin_ids = []
+        for i in range(len(spins)):
+            spin_ids.append(generate_spin_id(pipe_cont=dp, mol_name=mol_names[i], res_num=res_nums[i], res_name=res_names[i], spin_num=spins[i].num, spin_name=spins[i].name))
         raise RelaxMultiSpinIDError(selection, spin_ids)
 
     # Return the spin container.
@@ -3771,30 +3865,9 @@ def spin_index_loop(selection=None, pipe=None):
     if not exists_mol_res_spin_data(pipe=pipe):
         return
 
-    # Parse the selection string.
-    select_obj = Selection(selection)
-
-    # Loop over the molecules.
-    for mol_index in range(len(dp.mol)):
-        # Alias the molecule container.
-        mol = dp.mol[mol_index]
-
-        # Loop over the residues.
-        for res_index in range(len(dp.mol[mol_index].res)):
-            # Alias the residue container.
-            res = dp.mol[mol_index].res[res_index]
-
-            # Loop over the spins.
-            for spin_index in range(len(dp.mol[mol_index].res[res_index].spin)):
-                # Alias the spin container.
-                spin = dp.mol[mol_index].res[res_index].spin[spin_index]
-
-                # Skip the spin if there is no match to the selection.
-                if not select_obj.contains_spin(spin_num=spin.num, spin_name=spin.name, res_num=res.num, res_name=res.name, mol=mol.name):
-                    continue
-
-                # Yield the spin system specific indices.
-                yield mol_index, res_index, spin_index
+    # Loop over the compiled selection, yielding the spin system specific indices.
+    for mol_index, res_index, spin_index in compile_selection(selection=selection, pipe_cont=dp):
+        yield mol_index, res_index, spin_index
 
 
 def spin_loop(selection=None, pipe=None, full_info=False, return_id=False, skip_desel=False):
@@ -3828,36 +3901,33 @@ def spin_loop(selection=None, pipe=None, full_info=False, return_id=False, skip_
     if not exists_mol_res_spin_data(pipe=pipe):
         return
 
-    # Parse the selection string.
-    select_obj = Selection(selection)
+    # Loop over the compiled selection.
+    for indices in compile_selection(selection=selection, pipe_cont=dp):
+        # Alias the containers.
+        mol = dp.mol[indices[0]]
+        res = mol.res[indices[1]]
+        spin = res.spin[indices[2]]
 
-    # Loop over the molecules.
-    for mol in dp.mol:
-        # Loop over the residues.
-        for res in mol.res:
-            # Loop over the spins.
-            for spin in res.spin:
-                # Skip the spin if there is no match to the selection.
-                if not select_obj.contains_spin(spin_num=spin.num, spin_name=spin.name, res_num=res.num, res_name=res.name, mol=mol.name):
-                    continue
+        # Skip deselected spins.
+        if skip_desel and not spin.select:
+            continue
 
-                # Skip deselected spins.
-                if skip_desel and not spin.select:
-                    continue
+        # The spin id, generated only once.
+        if return_id:
+            spin_id = dp.mol._spin_unique_id_lookup.get(indices)
+            if spin_id == None:
+                spin_id = generate_spin_id_unique(pipe_cont=dp, mol=mol, res=res, spin=spin)
+                dp.mol._spin_unique_id_lookup[indices] = spin_id
 
-                # Generate the spin id.
-                if return_id:
-                    spin_id = generate_spin_id_unique(pipe_cont=dp, mol=mol, res=res, spin=spin)
-
-                # Yield the data.
-                if full_info and return_id:
-                    yield spin, mol.name, res.num, res.name, spin_id
-                elif full_info:
-                    yield spin, mol.name, res.num, res.name
-                elif return_id:
-                    yield spin, spin_id
-                else:
-                    yield spin
+        # Yield the data.
+        if full_info and return_id:
+            yield spin, mol.name, res.num, res.name, spin_id
+        elif full_info:
+            yield spin, mol.name, res.num, res.name
+        elif return_id:
+            yield spin, spin_id
+        else:
+            yield spin
 
 
 def type_molecule(mol_id, type=None, force=False):
@@ -33,7 +33,6 @@ from lib.checks import Check
 from lib.compat import builtins
 from lib.errors import RelaxError, RelaxNoPipeError, RelaxPipeError
 from lib.io import sort_filenames, write_data
-import pipe_control
 from status import Status; status = Status()
 
 
@@ -202,7 +201,7 @@ def copy(pipe_from=None, pipe_to=None, bundle_to=None):
         if pipe_from == None:
             pipe_from = cdp_name()
 
-        # Copy the data.
+        # Copy the data (a copy-on-write clone, so that all data is shared until first accessed).
         ds[pipe_to] = ds[pipe_from].__clone__()
 
         # Bundle the pipe.
@@ -213,11 +212,7 @@ def copy(pipe_from=None, pipe_to=None, bundle_to=None):
     finally:
         status.pipe_lock.release(sys._getframe().f_code.co_name)
 
-    # Update all of the required metadata structures.
-    pipe_control.mol_res_spin.metadata_update(pipe=pipe_to)
-    pipe_control.interatomic.metadata_update(pipe=pipe_to)
-
-    # Notify observers that a pipe change has occurred.
+    # Notify observers that a pipe change has occurred (the metadata of the clone is identical, so no update is required).
     status.observers.pipe_alteration.notify()
 
 
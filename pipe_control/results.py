@@ -23,13 +23,15 @@
 """Module for reading/writing/displaying the results in a data pipe."""
 
 # Python module imports.
+from os import F_OK, access
 from os.path import dirname
 from re import search
 import sys
 
 # relax module imports.
 from data_store import Relax_data_store; ds = Relax_data_store()
-from lib.errors import RelaxError, RelaxFileEmptyError
+from data_store.columns import is_binary_dir
+from lib.errors import RelaxError, RelaxFileEmptyError, RelaxFileOverwriteError
 from lib.io import extract_data, get_file_path, open_read_file, open_write_file, strip
 from pipe_control import interatomic, mol_res_spin, pipes
 from pipe_control.pipes import check_pipe
@@ -86,6 +88,15 @@ def read(file='results', dir=None):
     # Get the full file path, for later use.
     file_path = get_file_path(file_name=file, dir=dir)
 
+    # Binary columnar results.
+    if is_binary_dir(file_path):
+        ds.from_binary(file_path, pipe_to=pipes.cdp_name())
+
+        # Update all of the required metadata structures.
+        mol_res_spin.metadata_update()
+        interatomic.metadata_update()
+        return
+
     # Open the file.
     file = open_read_file(file_name=file_path)
 
@@ -120,7 +131,7 @@ def read(file='results', dir=None):
     interatomic.metadata_update()
 
 
-def write(file="results", dir=None, force=False, compress_type=1, verbosity=1):
+def write(file="results", dir=None, force=False, compress_type=1, verbosity=1, format='xml'):
     """Create the results file."""
 
     # Test if the current data pipe exists.
@@ -130,6 +141,21 @@ def write(file="results", dir=None, force=False, compress_type=1, verbosity=1):
     if dir == 'pipe_name':
         dir = pipes.cdp_name()
 
+    # The binary columnar format.
+    if format == 'binary':
+        # Fail if the directory already exists and the force flag is not set.
+        path = get_file_path(file_name=file, dir=dir)
+        if access(path, F_OK) and not force:
+            raise RelaxFileOverwriteError(path, 'force flag')
+
+        # Write the results.
+        ds.to_binary(path, pipes=pipes.cdp_name(), compress_type=compress_type, verbosity=verbosity)
+        return
+
+    # Unknown format.
+    if format != 'xml':
+        raise RelaxError("The results format '%s' must be one of 'xml' or 'binary'." % format)
+
     # Open the file for writing.
     results_file = open_write_file(file_name=file, dir=dir, force=force, compress_type=compress_type, verbosity=verbosity)
 
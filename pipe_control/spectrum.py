@@ -28,7 +28,7 @@
 
 # Python module imports.
 from math import sqrt
-from numpy import asarray
+from numpy import asarray, isnan
 import operator
 import sys
 from warnings import warn
@@ -37,6 +37,7 @@ from warnings import warn
 from lib.errors import RelaxError, RelaxImplementError, RelaxNoSpectraError
 from lib.io import sort_filenames, write_data
 from lib.text.sectioning import section, subsection
+from lib.spectrum import nmrpipe
 from lib.spectrum.peak_list import read_peak_list
 from lib.statistics import std
 from lib.warnings import RelaxWarning, RelaxNoSpinWarning
@@ -270,21 +271,44 @@ def add_spectrum_id(spectrum_id=None):
     cdp.spectrum_ids.append(spectrum_id)
 
 
-def baseplane_rmsd(error=0.0, spectrum_id=None, spin_id=None):
+def baseplane_rmsd(error=0.0, spectrum_id=None, spin_id=None, file=None, dir=None):
     """Set the peak intensity errors, as defined as the baseplane RMSD.
 
     @param error:           The peak intensity error value defined as the RMSD of the base plane
                             noise.
     @type error:            float
-    @keyword spectrum_id:   The spectrum id.
-    @type spectrum_id:      str
+    @keyword spectrum_id:   The spectrum id.  This can be a list of IDs matching the planes of the spectrum files.
+    @type spectrum_id:      str or list of str
     @param spin_id:         The spin identification string.
     @type spin_id:          str
+    @keyword file:          The optional NMRPipe spectrum or list of spectra from which the baseplane RMSD will be estimated, replacing the error value.
+    @type file:             None, str or list of str
+    @keyword dir:           The directory where the spectra are located.
+    @type dir:              None or str
     """
 
     # Data checks.
     check_pipe()
     check_mol_res_spin_data()
+
+    # Estimate the RMSD of all planes of the spectra.
+    if file != None:
+        # The spectrum IDs.
+        spectrum_ids = spectrum_id
+        if not isinstance(spectrum_ids, list):
+            spectrum_ids = [spectrum_ids]
+
+        # The RMSD values.
+        rmsd = nmrpipe.spectrum_rmsd(file_name=file, dir=dir)
+        if len(rmsd) != len(spectrum_ids):
+            raise RelaxError("The number of spectral planes, %s, does not match the %s spectrum IDs." % (len(rmsd), len(spectrum_ids)))
+
+        # Set the errors.
+        for i in range(len(rmsd)):
+            baseplane_rmsd(error=rmsd[i], spectrum_id=spectrum_ids[i], spin_id=spin_id)
+        return
+
+    # Check the spectrum ID.
     check_spectrum_id(spectrum_id)
 
     # The scaling by NC_proc.
@@ -501,7 +525,7 @@ def integration_points(N=0, spectrum_id=None, spin_id=None):
     raise RelaxImplementError
 
 
-def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=None, spin_id_col=None, mol_name_col=None, res_num_col=None, res_name_col=None, spin_num_col=None, spin_name_col=None, sep=None, spin_id=None, ncproc=None, verbose=True):
+def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=None, spin_id_col=None, mol_name_col=None, res_num_col=None, res_name_col=None, spin_num_col=None, spin_name_col=None, sep=None, spin_id=None, ncproc=None, spectrum_file=None, verbose=True):
     """Read the peak intensity data.
 
     @keyword file:          The name of the file(s) containing the peak intensities.
@@ -534,6 +558,8 @@ def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=
     @type spin_id:          None or str
     @keyword ncproc:        The Bruker ncproc binary intensity scaling factor.
     @type ncproc:           int or None
+    @keyword spectrum_file: The NMRPipe spectrum or list of spectra from which the intensities will be extracted at the peak positions of the peak list file.  The planes of all spectra correspond to the list of spectrum IDs.
+    @type spectrum_file:    None, str or list of str
     @keyword verbose:       A flag which if True will cause all relaxation data loaded to be printed out.
     @type verbose:          bool
     """
@@ -546,6 +572,13 @@ def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=
     if file == None:
         raise RelaxError("The file name must be supplied.")
 
+    # Intensity extraction from spectra.
+    if spectrum_file != None:
+        if isinstance(file, list):
+            raise RelaxError("Only a single peak list can be supplied when extracting the intensities from spectra.")
+        if int_method == 'other':
+            raise RelaxError("The intensities extracted from spectra can only be peak heights or point sums.")
+
     # Test that the intensity measures are identical.
     if hasattr(cdp, 'int_method') and cdp.int_method != int_method:
         raise RelaxError("The '%s' measure of peak intensities does not match '%s' of the previously loaded spectra." % (int_method, cdp.int_method))
@@ -560,6 +593,8 @@ def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=
         flag_multi_file = True
     if isinstance(int_col, list) or spectrum_id == 'auto':
         flag_multi_col = True
+    if spectrum_file != None and isinstance(spectrum_id, list):
+        flag_multi_col = True
 
     # List argument checks.
     if flag_multi:
@@ -609,60 +644,91 @@ def read(file=None, dir=None, spectrum_id=None, dim=1, int_col=None, int_method=
         # Read the peak list data.
         peak_list = read_peak_list(file=file[file_index], dir=dir, int_col=int_col, spin_id_col=spin_id_col, mol_name_col=mol_name_col, res_num_col=res_num_col, res_name_col=res_name_col, spin_num_col=spin_num_col, spin_name_col=spin_name_col, sep=sep, spin_id=spin_id)
 
+        # Replace the intensities by those of the spectra.
+        if spectrum_file != None:
+            nmrpipe.read_intensities(peak_list=peak_list, file_name=spectrum_file, dir=dir, volume=(int_method == 'point sum'))
+
         # Automatic spectrum IDs.
         if spectrum_id == 'auto':
             spectrum_id = peak_list[0].intensity_name
 
-        # Loop over the assignments.
+        # Convert the peak list into column arrays.
+        res_nums, spin_names, intensities = peak_list.columns(dim=dim)
+
+        # Check that the spectral planes match the spectrum IDs.
+        if spectrum_file != None:
+            num = 1
+            if isinstance(spectrum_id, list):
+                num = len(spectrum_id)
+            if intensities.shape[1] != num:
+                raise RelaxError("The number of spectral planes, %s, does not match the %s spectrum IDs." % (intensities.shape[1], num))
+
+        # Intensity scaling.
+        if ncproc != None:
+            intensities = intensities / float(2**ncproc)
+
+        # The spectrum IDs of the intensity columns.
+        if flag_multi_file:
+            ids = [spectrum_id[file_index]] * intensities.shape[1]
+        elif flag_multi_col:
+            ids = [spectrum_id[int_index] for int_index in range(intensities.shape[1])]
+        else:
+            ids = [spectrum_id] * intensities.shape[1]
+
+        # Flag the zero and missing intensities for the whole peak list.
+        zero = intensities == 0.0
+        zero_rows = zero.any(axis=1)
+        missing = isnan(intensities)
+        missing_rows = missing.any(axis=1)
+
+        # Loop over the assignments, resolving each spin ID only once.
         data = []
         data_flag = False
-        for assign in peak_list:
+        spins = {}
+        for i in range(len(res_nums)):
             # Generate the spin_id.
-            spin_id = generate_spin_id_unique(res_num=assign.res_nums[dim-1], spin_name=assign.spin_names[dim-1])
-
-            # Convert the intensity data to a list if needed.
-            intensity = assign.intensity
-            if not isinstance(intensity, list):
-                intensity = [intensity]
-
-            # Loop over the intensity data.
-            for int_index in range(len(intensity)):
-                # Sanity check.
-                if intensity[int_index] == 0.0:
-                    warn(RelaxWarning("A peak intensity of zero has been encountered for the spin '%s' - this could be fatal later on." % spin_id))
-
-                # Get the spin container.
-                spin = return_spin(spin_id=spin_id)
-                if not spin:
-                    warn(RelaxNoSpinWarning(spin_id))
-                    continue
+            spin_id = generate_spin_id_unique(res_num=res_nums[i], spin_name=spin_names[i])
+
+            # Sanity check.
+            if zero_rows[i]:
+                for int_index in range(zero.shape[1]):
+                    if zero[i, int_index]:
+                        warn(RelaxWarning("A peak intensity of zero has been encountered for the spin '%s' - this could be fatal later on." % spin_id))
+
+            # Get the spin container.
+            if spin_id not in spins:
+                spins[spin_id] = return_spin(spin_id=spin_id)
+            spin = spins[spin_id]
+            if not spin:
+                warn(RelaxNoSpinWarning(spin_id))
+                continue
 
-                # Skip deselected spins.
-                if not spin.select:
-                    continue
+            # Skip deselected spins.
+            if not spin.select:
+                continue
 
-                # Initialise.
-                if not hasattr(spin, 'peak_intensity'):
-                    spin.peak_intensity = {}
+            # Initialise.
+            if not hasattr(spin, 'peak_intensity'):
+                spin.peak_intensity = {}
 
-                # Intensity scaling.
-                if ncproc != None:
-                    intensity[int_index] = intensity[int_index] / float(2**ncproc)
+            # The intensities for all spectra, skipping missing values.
+            values = intensities[i].tolist()
+            if missing_rows[i]:
+                pairs = [(ids[j], values[j]) for j in range(len(values)) if not missing[i, j]]
+            else:
+                pairs = list(zip(ids, values))
 
-                # Add the data.
-                if flag_multi_file:
-                    id = spectrum_id[file_index]
-                elif flag_multi_col:
-                    id = spectrum_id[int_index]
-                else:
-                    id = spectrum_id
-                spin.peak_intensity[id] = intensity[int_index]
+            # Add the data.
+            spin.peak_intensity.update(pairs)
 
-                # Switch the flag.
+            # Switch the flag.
+            if pairs:
                 data_flag = True
 
-                # Append the data for printing out.
-                data.append([spin_id, repr(intensity[int_index])])
+            # Append the data for printing out.
+            if verbose:
+                for id, value in pairs:
+                    data.append([spin_id, repr(value)])
 
         # Add the spectrum id (and ncproc) to the relax data store.
         spectrum_ids = spectrum_id
@@ -22,10 +22,14 @@
 # Module docstring.
 """Module for reading and writing the relax program state."""
 
+# Python module imports.
+from os import F_OK, access
+
 # relax module imports.
 from data_store import Relax_data_store; ds = Relax_data_store()
-from lib.errors import RelaxError
-from lib.io import open_read_file, open_write_file
+from data_store.columns import is_binary_dir
+from lib.errors import RelaxError, RelaxFileOverwriteError
+from lib.io import get_file_path, open_read_file, open_write_file
 from pipe_control import interatomic, mol_res_spin, pipes
 from pipe_control.reset import reset
 from status import Status; status = Status()
@@ -74,7 +78,10 @@ def load_pickle(file):
 def load_state(state=None, dir=None, verbosity=1, force=False):
     """Function for loading a saved program state.
 
-    @keyword state:     The saved state file.
+    The XML and binary columnar formats are automatically detected.
+
+
+    @keyword state:     The saved state file or binary format directory.
     @type state:        str
     @keyword dir:       The path of the state file.
     @type dir:          str
@@ -84,8 +91,14 @@ def load_state(state=None, dir=None, verbosity=1, force=False):
     @type force:        bool
     """
 
+    # The binary columnar format.
+    binary = False
+    if isinstance(state, str) and is_binary_dir(get_file_path(state, dir)):
+        binary = True
+
     # Open the file for reading.
-    file = open_read_file(file_name=state, dir=dir, verbosity=verbosity)
+    else:
+        file = open_read_file(file_name=state, dir=dir, verbosity=verbosity)
 
     # Reset.
     if force:
@@ -95,8 +108,13 @@ def load_state(state=None, dir=None, verbosity=1, force=False):
     if not ds.is_empty():
         raise RelaxError("The relax data store is not empty.")
 
+    # Restore from the binary format.
+    if binary:
+        ds.from_binary(get_file_path(state, dir), verbosity=verbosity)
+
     # Restore from the XML.
-    ds.from_xml(file)
+    else:
+        ds.from_xml(file)
 
     # Update all of the required metadata structures.
     for pipe, pipe_name in pipes.pipe_loop(name=True):
@@ -110,10 +128,10 @@ def load_state(state=None, dir=None, verbosity=1, force=False):
     status.observers.state_load.notify()
 
 
-def save_state(state=None, dir=None, compress_type=1, verbosity=1, force=False):
+def save_state(state=None, dir=None, compress_type=1, verbosity=1, force=False, format='xml'):
     """Function for saving the program state.
 
-    @keyword state:         The saved state file.
+    @keyword state:         The saved state file or, for the binary format, directory.
     @type state:            str
     @keyword dir:           The path of the state file.
     @type dir:              str
@@ -125,8 +143,29 @@ def save_state(state=None, dir=None, compress_type=1, verbosity=1, force=False):
     @keyword compress_type: The compression type.  The integer values correspond to the compression
                             type: 0, no compression; 1, Bzip2 compression; 2, Gzip compression.
     @type compress_type:    int
+    @keyword format:        The format of the saved state, either 'xml' or 'binary'.
+    @type format:           str
     """
 
+    # Save in the binary columnar format.
+    if format == 'binary':
+        # A directory name is required.
+        if not isinstance(state, str):
+            raise RelaxError("The binary format requires the state to be a directory name.")
+
+        # Fail if the directory already exists and the force flag is not set.
+        path = get_file_path(state, dir)
+        if access(path, F_OK) and not force:
+            raise RelaxFileOverwriteError(path, 'force flag')
+
+        # Save.
+        ds.to_binary(path, compress_type=compress_type, verbosity=verbosity)
+        return
+
+    # Unknown format.
+    if format != 'xml':
+        raise RelaxError("The state format '%s' must be one of 'xml' or 'binary'." % format)
+
     # Open the file for writing.
     file = open_write_file(file_name=state, dir=dir, verbosity=verbosity, force=force, compress_type=compress_type)
 
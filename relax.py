@@ -258,6 +258,19 @@ class Relax:
             runner = Test_suite_runner(self.tests, timing=self.test_timings)
             runner.run_verification_tests()
 
+        # Execute the relax benchmarks.
+        elif self.mode == 'benchmarks':
+            # Only import the module in the test modes (to improve program start up speeds).
+            from test_suite.test_suite_runner import Test_suite_runner
+
+            # Load the interpreter and turn intros on.
+            self.interpreter = interpreter.Interpreter(show_script=False, raise_relax_error=True)
+            self.interpreter.on()
+
+            # Run the tests.
+            runner = Test_suite_runner(self.tests, timing=self.test_timings, benchmark_save=self.benchmark_save, benchmark_baseline=self.benchmark_baseline, benchmark_threshold=self.benchmark_threshold)
+            runner.run_benchmarks()
+
         # Test mode.
         elif self.mode == 'test':
             self.test_mode()
@@ -289,7 +302,7 @@ class Relax:
 
         # Recognised command line options for the multiprocessor.
         group = OptionGroup(parser, 'Multi-processor options')
-        group.add_option('-m', '--multi', action='store', type='string', dest='multiprocessor', default='uni', help='set multi processor method')
+        group.add_option('-m', '--multi', action='store', type='string', dest='multiprocessor', default='uni', help='set multi processor method, one of \'uni\', \'mpi4py\' or \'multiprocessing\'')
         group.add_option('-n', '--processors', action='store', type='int', dest='n_processors', default=-1, help='set number of processors (may be ignored)')
         parser.add_option_group(group)
 
@@ -306,6 +319,10 @@ class Relax:
         group.add_option('-u', '--unit-tests', action='store_true', dest='unit_tests', default=0, help='execute the unit tests.  Module names, revealed with the --time option, can be supplied to perform a subset of all tests.')
         group.add_option('--gui-tests', action='store_true', dest='gui_tests', default=0, help='execute the GUI tests.  Test names, revealed with the --time option, can be supplied to perform a subset of all tests.')
         group.add_option('--verification-tests', action='store_true', dest='verification_tests', default=0, help='execute the software verification tests.  Test names, revealed with the --time option, can be supplied to perform a subset of all tests.')
+        group.add_option('--benchmarks', action='store_true', dest='benchmarks', default=0, help='execute the benchmarks for detecting performance regressions.  Benchmark names, revealed with the --time option, can be supplied to perform a subset of all benchmarks.')
+        group.add_option('--benchmark-save', action='store', type='string', dest='benchmark_save', help='save the benchmark timings as JSON to the file BENCHMARK_FILE', metavar='BENCHMARK_FILE')
+        group.add_option('--benchmark-baseline', action='store', type='string', dest='benchmark_baseline', help='compare the benchmark timings to the baseline JSON file BENCHMARK_FILE saved by a previous run', metavar='BENCHMARK_FILE')
+        group.add_option('--benchmark-threshold', action='store', type='float', dest='benchmark_threshold', help='the factor by which a benchmark can be slower than its baseline before failing (the default is 1.5)', metavar='FACTOR')
         group.add_option('--time', action='store_true', dest='tt', default=0, help='print out the timings of individual tests in the test suite')
         group.add_option('--no-skip', action='store_true', dest='no_skip', default=0, help='a debugging option for relax developers to turn on all blacklisted tests, even those that will fail')
         parser.add_option_group(group)
@@ -370,7 +387,7 @@ class Relax:
             self.tee_file = None
 
         # Test suite mode, therefore the args are the tests to run and not a script file.
-        if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests:
+        if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests or options.benchmarks:
             # Store the arguments.
             self.tests = args
 
@@ -384,6 +401,15 @@ class Relax:
             if options.no_skip:
                 status.skip_blacklisted_tests = False
 
+            # The benchmark options.
+            self.benchmark_save = options.benchmark_save
+            self.benchmark_baseline = options.benchmark_baseline
+            self.benchmark_threshold = options.benchmark_threshold
+
+            # Test if the benchmark baseline file exists.
+            if self.benchmark_baseline and not access(self.benchmark_baseline, F_OK):
+                parser.error("the benchmark baseline file " + repr(self.benchmark_baseline) + " does not exist")
+
         # The argument is a script.
         else:
             # Number of positional arguments should only be 0 or 1.  1 should be the script file.
@@ -420,7 +446,7 @@ class Relax:
             self.mode = 'info'
 
         # Run the relax tests.
-        elif options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests:
+        elif options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests or options.benchmarks:
             # Exclusive modes.
             if options.test:
                 parser.error("executing the relax test suite and running relax in test mode are mutually exclusive")
@@ -438,6 +464,8 @@ class Relax:
                 self.mode = 'GUI tests'
             elif options.verification_tests:
                 self.mode = 'verification tests'
+            elif options.benchmarks:
+                self.mode = 'benchmarks'
 
             # Set the status flag.
             status.test_mode = True
@@ -449,7 +477,7 @@ class Relax:
                 parser.error("a script should not be supplied in test mode")
 
             # Exclusive modes.
-            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests:
+            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests or options.benchmarks:
                 parser.error("the relax test mode and executing the test suite are mutually exclusive")
             elif options.licence:
                 parser.error("the relax modes test and licence are mutually exclusive")
@@ -464,7 +492,7 @@ class Relax:
                 parser.error("a script should not be supplied in test mode")
 
             # Exclusive modes.
-            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests:
+            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests or options.benchmarks:
                 parser.error("the relax licence mode and executing the test suite are mutually exclusive")
             elif options.test:
                 parser.error("the relax modes licence and test are mutually exclusive")
@@ -475,7 +503,7 @@ class Relax:
         # GUI.
         elif options.gui:
             # Exclusive models.
-            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests:
+            if options.test_suite or options.system_tests or options.unit_tests or options.gui_tests or options.verification_tests or options.benchmarks:
                 parser.error("the relax GUI mode and testing modes are mutually exclusive")
             elif options.licence:
                 parser.error("the relax GUI mode and licence mode are mutually exclusive")
@@ -419,6 +419,30 @@ class API_base(object):
         raise RelaxImplementError('minimise')
 
 
+    def minimise_mc(self, func_tol=None, grad_tol=None, max_iterations=None, constraints=False, scaling_matrix=None, verbosity=0):
+        """Batched minimisation of all Monte Carlo simulations.
+
+        Rather than optimising each simulation separately via the minimise() method, all simulations of a model are optimised simultaneously using a target function evaluating the stack of simulation parameter vectors against the matrix of simulated data.
+
+
+        @keyword func_tol:          The function tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+        @type func_tol:             None or float
+        @keyword grad_tol:          The gradient tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+        @type grad_tol:             None or float
+        @keyword max_iterations:    The maximum number of iterations for the algorithm.
+        @type max_iterations:       int
+        @keyword constraints:       If True, constraints are used during optimisation.
+        @type constraints:          bool
+        @keyword scaling_matrix:    The per-model list of diagonal and square scaling matrices.
+        @type scaling_matrix:       list of numpy rank-2, float64 array or list of None
+        @keyword verbosity:         The amount of information to print.  The higher the value, the greater the verbosity.
+        @type verbosity:            int
+        """
+
+        # Not implemented.
+        raise RelaxImplementError('minimise_mc')
+
+
     def model_desc(self, model_info=None):
         """Return a description of the model.
 
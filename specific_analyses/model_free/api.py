@@ -38,6 +38,7 @@ from types import MethodType
 from warnings import warn
 
 # relax module imports.
+from data_store.prototype import cow_clone_list, cow_share, peek
 from lib.arg_check import is_num_list, is_str_list
 from lib.errors import RelaxError, RelaxFault, RelaxNoModelError, RelaxNoSequenceError, RelaxNoTensorError
 from lib.float import isInf
@@ -851,22 +852,22 @@ class Model_free(API_base, API_common):
         # Sequence specific data.
         spin, spin_id = return_spin_from_index(global_index=model_info, pipe=pipe_from, return_spin_id=True)
         if model_type == 'mf' or (model_type == 'local_tm' and not global_stats):
-            # Duplicate the spin specific data.
+            # The names of the spin specific data.
+            names = []
             for name in dir(spin):
                 # Skip special objects.
                 if search('^__', name):
                     continue
 
-                # Get the object.
-                obj = getattr(spin, name)
-
                 # Skip methods.
-                if isinstance(obj, MethodType):
+                if isinstance(peek(spin, name), MethodType):
                     continue
 
-                # Duplicate the object.
-                new_obj = deepcopy(getattr(spin, name))
-                setattr(dp_to.mol[spin._mol_index].res[spin._res_index].spin[spin._spin_index], name, new_obj)
+                # Store the name.
+                names.append(name)
+
+            # Duplicate the spin specific data, sharing the objects until first accessed.
+            cow_share(source=spin, target=dp_to.mol[spin._mol_index].res[spin._res_index].spin[spin._spin_index], names=names)
 
             # Duplicate the relaxation active spins which have not been copied yet.
             interatoms = interatomic.return_interatom_list(spin_hash=spin._hash)
@@ -888,8 +889,8 @@ class Model_free(API_base, API_common):
 
         # Other data types.
         else:
-            # Duplicate all the spin specific data.
-            dp_to.mol = deepcopy(dp_from.mol)
+            # Duplicate all the spin specific data, sharing the objects until first accessed.
+            dp_to.mol = cow_clone_list(dp_from.mol)
 
 
     def eliminate(self, name, value, args, sim=None, model_info=None):
@@ -1335,25 +1336,27 @@ class Model_free(API_base, API_common):
             else:
                 algor = min_algor
 
-            # Initialise the function to minimise (for back-calculation and LM minimisation).
-            if min_algor == 'back_calc' or match('[Ll][Mm]$', algor) or match('[Ll]evenburg-[Mm]arquardt$', algor):
+            # Initialise the function to minimise (for back-calculation).
+            if min_algor == 'back_calc':
                 mf = Mf(init_params=opt_params.param_vector, model_type=data_store.model_type, diff_type=data_store.diff_type, diff_params=data_store.diff_params, scaling_matrix=data_store.scaling_matrix, num_spins=data_store.num_spins, equations=data_store.equations, param_types=data_store.param_types, param_values=data_store.param_values, relax_data=data_store.ri_data, errors=data_store.ri_data_err, bond_length=data_store.r, csa=data_store.csa, num_frq=data_store.num_frq, frq=data_store.frq, num_ri=data_store.num_ri, remap_table=data_store.remap_table, noe_r1_table=data_store.noe_r1_table, ri_labels=data_store.ri_types, gx=data_store.gx, gh=data_store.gh, h_bar=data_store.h_bar, mu0=data_store.mu0, num_params=data_store.num_params, vectors=data_store.xh_unit_vectors)
 
             # Levenberg-Marquardt minimisation.
+            opt_params.lm_error = None
             if match('[Ll][Mm]$', algor) or match('[Ll]evenburg-[Mm]arquardt$', algor):
                 # Total number of ri.
                 number_ri = 0
-                for k in range(len(ri_data_err)):
-                    number_ri = number_ri + len(ri_data_err[k])
+                for k in range(len(data_store.ri_data_err)):
+                    number_ri = number_ri + len(data_store.ri_data_err[k])
 
                 # Reconstruct the error data structure.
                 lm_error = zeros(number_ri, float64)
                 index = 0
-                for k in range(len(ri_data_err)):
-                    lm_error[index:index+len(ri_data_err[k])] = ri_data_err[k]
-                    index = index + len(ri_data_err[k])
+                for k in range(len(data_store.ri_data_err)):
+                    lm_error[index:index+len(data_store.ri_data_err[k])] = data_store.ri_data_err[k]
+                    index = index + len(data_store.ri_data_err[k])
 
-                opt_params.min_options = opt_params.min_options + (mf.lm_dri, lm_error)
+                # The Jacobian function is added on the slave, from its own target function class.
+                opt_params.lm_error = lm_error
 
             # Back-calculation.
             if min_algor == 'back_calc':
@@ -1373,7 +1376,7 @@ class Model_free(API_base, API_common):
                     command = MF_grid_command()
 
                     # Pass in the data and optimisation parameters.
-                    command.store_data(deepcopy(data_store), deepcopy(opt_params))
+                    command.store_data(data_store, deepcopy(opt_params))
 
                     # Set up the model-free memo and add it to the processor queue.
                     memo = MF_memo(model_free=self, model_type=data_store.model_type, spin=spin, sim_index=sim_index, scaling_matrix=data_store.scaling_matrix)
@@ -1394,7 +1397,7 @@ class Model_free(API_base, API_common):
                 command = MF_minimise_command()
 
             # Pass in the data and optimisation parameters.
-            command.store_data(deepcopy(data_store), deepcopy(opt_params))
+            command.store_data(data_store, deepcopy(opt_params))
 
             # Set up the model-free memo and add it to the processor queue.
             memo = MF_memo(model_free=self, model_type=data_store.model_type, spin=spin, sim_index=sim_index, scaling_matrix=data_store.scaling_matrix)
@@ -26,6 +26,7 @@
 """The model-free analysis optimisation functions."""
 
 # Python module imports.
+from copy import deepcopy
 from minfx.generic import generic_minimise
 from minfx.grid import grid, grid_point_array
 from numpy import array, dot, float64
@@ -35,6 +36,7 @@ import sys
 import lib.arg_check
 from lib.errors import RelaxError, RelaxInfError, RelaxMultiVectorError, RelaxNaNError
 from lib.float import isNaN, isInf
+from lib.minimise import grid_batch
 from lib.periodic_table import periodic_table
 from lib.text.sectioning import subsection
 from multi import Memo, Result_command, Slave_command
@@ -540,8 +542,13 @@ class MF_minimise_command(Slave_command):
         @rtype:     tuple of numpy array, float, int, int, int, int, str
         """
 
+        # The Levenberg-Marquardt Jacobian function and errors, using the target function class of this processor.
+        min_options = self.opt_params.min_options
+        if self.opt_params.lm_error is not None:
+            min_options = min_options + (self.mf.lm_dri, self.opt_params.lm_error)
+
         # Minimisation.
-        results = generic_minimise(func=self.mf.func, dfunc=self.mf.dfunc, d2func=self.mf.d2func, args=(), x0=self.opt_params.param_vector, min_algor=self.opt_params.min_algor, min_options=self.opt_params.min_options, func_tol=self.opt_params.func_tol, grad_tol=self.opt_params.grad_tol, maxiter=self.opt_params.max_iterations, A=self.opt_params.A, b=self.opt_params.b, full_output=True, print_flag=self.opt_params.verbosity)
+        results = generic_minimise(func=self.mf.func, dfunc=self.mf.dfunc, d2func=self.mf.d2func, args=(), x0=self.opt_params.param_vector, min_algor=self.opt_params.min_algor, min_options=min_options, func_tol=self.opt_params.func_tol, grad_tol=self.opt_params.grad_tol, maxiter=self.opt_params.max_iterations, A=self.opt_params.A, b=self.opt_params.b, full_output=True, print_flag=self.opt_params.verbosity)
 
         # Return the minfx results unmodified.
         return results
@@ -551,11 +558,11 @@ class MF_minimise_command(Slave_command):
         """Setup and perform the model-free optimisation."""
 
         # Initialise the function to minimise.
-        self.mf = Mf(init_params=self.opt_params.param_vector, model_type=self.data.model_type, diff_type=self.data.diff_type, diff_params=self.data.diff_params, scaling_matrix=self.data.scaling_matrix, num_spins=self.data.num_spins, equations=self.data.equations, param_types=self.data.param_types, param_values=self.data.param_values, relax_data=self.data.ri_data, errors=self.data.ri_data_err, bond_length=self.data.r, csa=self.data.csa, num_frq=self.data.num_frq, frq=self.data.frq, num_ri=self.data.num_ri, remap_table=self.data.remap_table, noe_r1_table=self.data.noe_r1_table, ri_labels=self.data.ri_types, gx=self.data.gx, gh=self.data.gh, h_bar=self.data.h_bar, mu0=self.data.mu0, num_params=self.data.num_params, vectors=self.data.xh_unit_vectors)
+        self.mf = Mf(init_params=self.opt_params.param_vector, **self.mf_args)
 
         # Printout.
-        if self.opt_params.verbosity >= 1 and (self.data.model_type == 'mf' or self.data.model_type == 'local_tm'):
-            subsection(file=sys.stdout, text="Optimisation:  Spin '%s'" % self.data.spin_id, prespace=2, postspace=0)
+        if self.opt_params.verbosity >= 1 and (self.model_type == 'mf' or self.model_type == 'local_tm'):
+            subsection(file=sys.stdout, text="Optimisation:  Spin '%s'" % self.spin_id, prespace=2, postspace=0)
 
         # Preform optimisation.
         results = self.optimise()
@@ -569,14 +576,48 @@ class MF_minimise_command(Slave_command):
     def store_data(self, data, opt_params):
         """Store all the data required for model-free optimisation.
 
+        Only the arguments of the model-free target function class are stored, rather than the full data container, with the relaxation data and errors packed into numpy arrays.  The target function class itself is only initialised on the slave.
+
+
         @param data:        The data used to initialise the model-free target function class.
         @type data:         class instance
         @param opt_params:  The parameters and data required for optimisation using minfx.
         @type opt_params:   class instance
         """
 
-        # Store the data.
-        self.data = data
+        # The model type and spin ID for the printouts.
+        self.model_type = data.model_type
+        self.spin_id = data.spin_id
+
+        # The arguments of the target function class.
+        self.mf_args = deepcopy({
+            'model_type': data.model_type,
+            'diff_type': data.diff_type,
+            'diff_params': data.diff_params,
+            'scaling_matrix': data.scaling_matrix,
+            'num_spins': data.num_spins,
+            'equations': data.equations,
+            'param_types': data.param_types,
+            'param_values': data.param_values,
+            'relax_data': [array(ri_data, float64) for ri_data in data.ri_data],
+            'errors': [array(ri_data_err, float64) for ri_data_err in data.ri_data_err],
+            'bond_length': data.r,
+            'csa': data.csa,
+            'num_frq': data.num_frq,
+            'frq': data.frq,
+            'num_ri': data.num_ri,
+            'remap_table': data.remap_table,
+            'noe_r1_table': data.noe_r1_table,
+            'ri_labels': data.ri_types,
+            'gx': data.gx,
+            'gh': data.gh,
+            'h_bar': data.h_bar,
+            'mu0': data.mu0,
+            'num_params': data.num_params,
+            'vectors': data.xh_unit_vectors
+        })
+
+        # The optimisation parameters.
         self.opt_params = opt_params
 
 
@@ -598,8 +639,12 @@ class MF_grid_command(MF_minimise_command):
         @rtype:     tuple of numpy array, float, int, int, int, int, str
         """
 
+        # Grid search of a single spin, evaluating blocks of grid points at once.
+        if self.model_type == 'mf' or self.model_type == 'local_tm':
+            results = grid_batch(func_batch=self.mf.func_batch, num_incs=self.opt_params.inc, lower=self.opt_params.lower, upper=self.opt_params.upper, A=self.opt_params.A, b=self.opt_params.b, verbosity=self.opt_params.verbosity)
+
         # Normal grid search.
-        if not hasattr(self.opt_params, 'subdivision'):
+        elif not hasattr(self.opt_params, 'subdivision'):
             results = grid(func=self.mf.func, args=(), num_incs=self.opt_params.inc, lower=self.opt_params.lower, upper=self.opt_params.upper, A=self.opt_params.A, b=self.opt_params.b, verbosity=self.opt_params.verbosity)
 
         # Subdivided grid.
@@ -35,6 +35,7 @@ import sys
 from types import MethodType
 
 # relax module imports.
+from data_store.prototype import cow_share, peek
 from lib.arg_check import is_list, is_str_list
 from lib.dispersion.variables import EXP_TYPE_CPMG_PROTON_MQ, EXP_TYPE_CPMG_PROTON_SQ, MODEL_LIST_MMQ, MODEL_R2EFF, PARAMS_R20
 from lib.errors import RelaxError, RelaxImplementError
@@ -50,7 +51,7 @@ from specific_analyses.api_base import API_base
 from specific_analyses.api_common import API_common
 from specific_analyses.relax_disp.checks import check_model_type
 from specific_analyses.relax_disp.data import average_intensity, calc_rotating_frame_params, find_intensity_keys, generate_r20_key, has_exponential_exp_type, has_proton_mmq_cpmg, loop_cluster, loop_exp_frq, loop_exp_frq_offset_point, loop_time, pack_back_calc_r2eff, return_param_key_from_data, spin_ids_to_containers
-from specific_analyses.relax_disp.optimisation import Disp_memo, Disp_minimise_command, back_calc_peak_intensities, back_calc_r2eff, calculate_r2eff, minimise_r2eff
+from specific_analyses.relax_disp.optimisation import Disp_memo, Disp_minimise_command, back_calc_peak_intensities, back_calc_r2eff, calculate_r2eff, minimise_r2eff, send_shared_data_to_slaves
 from specific_analyses.relax_disp.parameter_object import Relax_disp_params
 from specific_analyses.relax_disp.parameters import get_param_names, get_value, loop_parameters, param_index_to_param_info, param_num, r1_setup
 
@@ -455,22 +456,22 @@ class Relax_disp(API_base, API_common):
             # The original spin container.
             spin = return_spin(spin_id=id, pipe=pipe_from)
 
-            # Duplicate the spin specific data.
+            # The names of the spin specific data.
+            names = []
             for name in dir(spin):
                 # Skip special objects.
                 if search('^__', name):
                     continue
 
-                # Get the object.
-                obj = getattr(spin, name)
-
                 # Skip methods.
-                if isinstance(obj, MethodType):
+                if isinstance(peek(spin, name), MethodType):
                     continue
 
-                # Duplicate the object.
-                new_obj = deepcopy(getattr(spin, name))
-                setattr(dp_to.mol[spin._mol_index].res[spin._res_index].spin[spin._spin_index], name, new_obj)
+                # Store the name.
+                names.append(name)
+
+            # Duplicate the spin specific data, sharing the objects until first accessed.
+            cow_share(source=spin, target=dp_to.mol[spin._mol_index].res[spin._res_index].spin[spin._spin_index], names=names)
 
 
     def eliminate(self, name, value, args, sim=None, model_info=None):
@@ -779,6 +780,10 @@ class Relax_disp(API_base, API_common):
             fields = cdp.spectrometer_frq_list
             field_count = cdp.spectrometer_frq_count
 
+        # Send the dispersion data shared by all spin clusters to the slaves before queuing the commands (this is skipped for the Monte Carlo simulations, as the data is unchanged).
+        if cdp.model_type != MODEL_R2EFF:
+            send_shared_data_to_slaves()
+
         # Loop over the spin blocks.
         model_index = -1
         for spin_ids in self.model_loop():
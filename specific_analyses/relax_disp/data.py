@@ -104,6 +104,119 @@ INTERPOLATE_OFFSET = "offset"
 # Default hardcoded colours (one colour for each magnetic field strength).
 COLOUR_ORDER = [4, 15, 2, 13, 11, 1, 3, 5, 6, 7, 8, 9, 10, 12, 14] * 1000
 
+# The data pipe structures defining the dispersion experiment layout.
+LAYOUT_STRUCTURES = ['spectrum_ids', 'exp_type', 'exp_type_list', 'spectrometer_frq', 'spectrometer_frq_list', 'spin_lock_offset', 'spin_lock_offset_list', 'cpmg_frqs', 'cpmg_frqs_list', 'spin_lock_nu1', 'spin_lock_nu1_list', 'relax_times', 'relax_time_list']
+
+
+class Disp_layout:
+    """The compiled layout of the dispersion experiments of a data pipe.
+
+    The layout holds the experiment type, spectrometer frequency, offset, dispersion point and relaxation time structure of all spectra, as generated by the loop_exp_frq_offset_point() and loop_time() generators, so that the data assembly functions do not need to repeat the nested spectrum ID searches for every spin.  The dispersion points of all experiments are flattened into the columns of a dense matrix, ordered by the Ei, Mi, Oi and Di indices, with the parameter keys of the points indexing the columns.
+    """
+
+    def __init__(self, signature=None):
+        """Compile the layout of the current data pipe.
+
+        @keyword signature: The experimental set up the layout is compiled from, as returned by layout_signature().
+        @type signature:    tuple
+        """
+
+        # Store the set up.
+        self.signature = signature
+
+        # The experiment types and spectrometer frequencies.
+        self.exp_types = list(loop_exp())
+        self.frqs = list(loop_frq())
+
+        # Initialise the nested structures and the point columns.
+        self.offsets = []
+        self.points = []
+        self.times = []
+        self.blocks = []
+        self.ids = []
+        self.keys = []
+        ei_list, mi_list, oi_list, di_list = [], [], [], []
+
+        # Loop over the experiment types and spectrometer frequencies.
+        for exp_type, ei in loop_exp(return_indices=True):
+            for structure in [self.offsets, self.points, self.times, self.blocks, self.ids]:
+                structure.append([])
+            for frq, mi in loop_frq(return_indices=True):
+                for structure in [self.offsets, self.points, self.times, self.blocks, self.ids]:
+                    structure[ei].append([])
+
+                # Loop over the offsets.
+                for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
+                    self.offsets[ei][mi].append(offset)
+                    self.points[ei][mi].append([])
+                    self.times[ei][mi].append([])
+                    self.ids[ei][mi].append(self._find_id(exp_type=exp_type, frq=frq, offset=offset))
+
+                    # The dispersion points, their keys and relaxation times.
+                    start = len(self.keys)
+                    for point, di in loop_point(exp_type=exp_type, frq=frq, offset=offset, return_indices=True):
+                        self.points[ei][mi][oi].append(point)
+                        self.times[ei][mi][oi].append(list(loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point)))
+                        self.keys.append(return_param_key_from_data(exp_type=exp_type, frq=frq, offset=offset, point=point))
+                        ei_list.append(ei)
+                        mi_list.append(mi)
+                        oi_list.append(oi)
+                        di_list.append(di)
+
+                    # The column range of the offset.
+                    self.blocks[ei][mi].append((start, len(self.keys)))
+
+        # The index tables of the point columns, and the column of each parameter key.
+        self.ei = array(ei_list, int32)
+        self.mi = array(mi_list, int32)
+        self.oi = array(oi_list, int32)
+        self.di = array(di_list, int32)
+        self.key_index = dict((key, col) for col, key in enumerate(self.keys))
+
+        # The columns of the proton CPMG experiments.
+        self.proton = array([self.exp_types[ei] in [EXP_TYPE_CPMG_PROTON_SQ, EXP_TYPE_CPMG_PROTON_MQ] for ei in ei_list], bool)
+
+        # The experiment type and spectrometer frequency pairs with data.
+        self.exp_frq_pairs = sorted(set(zip(ei_list, mi_list)))
+        self.data_exp_types = [self.exp_types[ei] for ei in sorted(set(ei_list))]
+
+        # The cache of the assembled dispersion point structures.
+        self.disp_points = {}
+
+
+    def _find_id(self, exp_type=None, frq=None, offset=None):
+        """Find the first spectrum ID matching the experiment type, spectrometer frequency and, for R1rho-type data, the spin-lock offset.
+
+        @keyword exp_type:  The experiment type.
+        @type exp_type:     str
+        @keyword frq:       The spectrometer frequency in Hz.
+        @type frq:          float
+        @keyword offset:    The spin-lock offset.
+        @type offset:       float
+        @return:            The spectrum ID, or None if there is no data.
+        @rtype:             str or None
+        """
+
+        # Loop over all spectrum IDs.
+        for id in cdp.exp_type:
+            # Skip non-matching experiments.
+            if cdp.exp_type[id] != exp_type:
+                continue
+
+            # Skip non-matching spectrometer frequencies.
+            if hasattr(cdp, 'spectrometer_frq') and cdp.spectrometer_frq[id] != frq:
+                continue
+
+            # Skip non-matching offsets.
+            if exp_type in EXP_TYPE_LIST_R1RHO and hasattr(cdp, 'spin_lock_offset') and cdp.spin_lock_offset[id] != offset:
+                continue
+
+            # Found.
+            return id
+
+
+
+
 
 def average_intensity(spin=None, exp_type=None, frq=None, offset=None, point=None, time=None, sim_index=None, error=False):
     """Return the average peak intensity for the spectrometer frequency, dispersion point, and relaxation time.
@@ -1191,6 +1304,32 @@ def is_r1rho_exp_type(id=None):
     return False
 
 
+def layout_signature():
+    """Return the experimental set up of the current data pipe which defines the dispersion experiment layout.
+
+    @return:    The contents of the layout defining data pipe structures.
+    @rtype:     tuple
+    """
+
+    # Loop over the structures.
+    signature = []
+    for name in LAYOUT_STRUCTURES:
+        # Missing structures.
+        if not hasattr(cdp, name):
+            signature.append(None)
+            continue
+
+        # Add the contents.
+        structure = getattr(cdp, name)
+        if isinstance(structure, dict):
+            signature.append(tuple(structure.items()))
+        else:
+            signature.append(tuple(structure))
+
+    # Return the set up.
+    return tuple(signature)
+
+
 def loop_cluster(skip_desel=True):
     """Loop over the spin groupings for one model applied to multiple spins.
 
@@ -2745,6 +2884,11 @@ def return_cpmg_frqs(ref_flag=True):
     if not hasattr(cdp, 'cpmg_frqs_list'):
         return None
 
+    # The structure cached in the experiment layout.
+    layout = return_layout()
+    if ('cpmg_frqs', ref_flag) in layout.disp_points:
+        return [[[points.copy() for points in frq_points] for frq_points in exp_points] for exp_points in layout.disp_points['cpmg_frqs', ref_flag]]
+
     # Initialise.
     cpmg_frqs = []
 
@@ -2798,6 +2942,9 @@ def return_cpmg_frqs(ref_flag=True):
                 # Convert to a numpy array.
                 cpmg_frqs[ei][mi][oi] = array(cpmg_frqs[ei][mi][oi], float64)
 
+    # Cache the data.
+    layout.disp_points['cpmg_frqs', ref_flag] = [[[points.copy() for points in frq_points] for frq_points in exp_points] for exp_points in cpmg_frqs]
+
     # Return the data.
     return cpmg_frqs
 
@@ -3925,6 +4072,27 @@ def return_key_from_di(mi=None, di=None):
     return key
 
 
+def return_layout():
+    """Return the dispersion experiment layout of the current data pipe.
+
+    The layout is compiled once and stored in the data pipe.  It is recompiled whenever the experimental set up changes, for example when spectra are added or deleted or when the experiment type, spectrometer frequency, offset, dispersion point or relaxation time of a spectrum is set.
+
+
+    @return:    The compiled layout.
+    @rtype:     Disp_layout instance
+    """
+
+    # The current experimental set up.
+    signature = layout_signature()
+
+    # Compile the layout, if not present or out of date.
+    if not hasattr(cdp, '_disp_layout') or cdp._disp_layout.signature != signature:
+        cdp._disp_layout = Disp_layout(signature=signature)
+
+    # Return the layout.
+    return cdp._disp_layout
+
+
 def return_offset_data(spins=None, spin_ids=None, field_count=None, spin_lock_offset=None, fields=None):
     """Return numpy arrays of the chemical shifts, offsets and tilt angles.
 
@@ -3961,6 +4129,9 @@ def return_offset_data(spins=None, spin_ids=None, field_count=None, spin_lock_of
         if spin.select:
             spin_num += 1
 
+    # The experiment layout.
+    layout = return_layout()
+
     # Initialise the data structures for the target function.
     fields_orig = fields
     shifts = []
@@ -3999,7 +4170,7 @@ def return_offset_data(spins=None, spin_ids=None, field_count=None, spin_lock_of
                         Domega[ei][si][mi].append([])
                         w_e[ei][si][mi].append([])
                 else:
-                    for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
+                    for offset in layout.offsets[ei][mi]:
                         offsets[ei][si][mi].append(None)
                         spin_lock_fields_inter[ei][mi].append([])
                         tilt_angles[ei][si][mi].append([])
@@ -4104,40 +4275,21 @@ def return_offset_data(spins=None, spin_ids=None, field_count=None, spin_lock_of
 
             else:
                 # Loop over offset.
-                for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
+                for oi in range(len(layout.offsets[ei][mi])):
                     # The spin-lock data.
                     if fields_orig != None:
                         fields = fields_orig[ei][mi][oi]
                     else:
-                        if not r1rho_flag:
-                            fields = return_cpmg_frqs_single(exp_type=exp_type, frq=frq, offset=offset, ref_flag=False)
-                        else:
-                            fields = return_spin_lock_nu1_single(exp_type=exp_type, frq=frq, offset=offset, ref_flag=False)
+                        fields = array(layout.points[ei][mi][oi], float64)
 
                     # Save the fields to list.
                     spin_lock_fields_inter[ei][mi][oi] = fields
 
-                    # Find a matching experiment ID.
-                    found = False
-                    for id in cdp.exp_type:
-                        # Skip non-matching experiments.
-                        if cdp.exp_type[id] != exp_type:
-                            continue
-
-                        # Skip non-matching spectrometer frequencies.
-                        if hasattr(cdp, 'spectrometer_frq') and cdp.spectrometer_frq[id] != frq:
-                            continue
-
-                        # Skip non-matching offsets.
-                        if r1rho_flag and hasattr(cdp, 'spin_lock_offset') and cdp.spin_lock_offset[id] != offset:
-                            continue
-
-                        # Found.
-                        found = True
-                        break
+                    # The first matching experiment ID.
+                    id = layout.ids[ei][mi][oi]
 
                     # No data.
-                    if not found:
+                    if id == None:
                         continue
 
                     # Store the offset in rad/s.  Only once and using the first key.
@@ -4467,47 +4619,29 @@ def return_r2eff_arrays(spins=None, spin_ids=None, fields=None, field_count=None
     """
 
     # The counts.
-    exp_num = num_exp_types()
     spin_num = count_spins(spins)
 
     # 1H MMQ flag.
     proton_mmq_flag = has_proton_mmq_cpmg()
 
-    # Initialise the data structures for the target function.
-    exp_types = []
-    values = []
-    errors = []
-    missing = []
+    # The experiment layout.
+    layout = return_layout()
+    point_num = len(layout.keys)
+
+    # The dense R2eff/R1rho value, error and missing data matrices, with one row per spin and one column per dispersion point.
+    value_matrix = zeros((spin_num, point_num), float64)
+    error_matrix = ones((spin_num, point_num), float64)
+    missing_matrix = ones((spin_num, point_num), int32)
+
+    # Initialise the Larmor frequency structures.
     frqs = []
     frqs_H = []
-    relax_times = []
-    for exp_type, ei in loop_exp(return_indices=True):
-        values.append([])
-        errors.append([])
-        missing.append([])
+    for ei in range(len(layout.exp_types)):
         frqs.append([])
         frqs_H.append([])
-        relax_times.append([])
         for si in range(spin_num):
-            values[ei].append([])
-            errors[ei].append([])
-            missing[ei].append([])
-            frqs[ei].append([])
-            frqs_H[ei].append([])
-            for frq, mi in loop_frq(return_indices=True):
-                values[ei][si].append([])
-                errors[ei][si].append([])
-                missing[ei][si].append([])
-                frqs[ei][si].append(0.0)
-                frqs_H[ei][si].append(0.0)
-                relax_times[ei].append([])
-                for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
-                    values[ei][si][mi].append([])
-                    errors[ei][si][mi].append([])
-                    missing[ei][si][mi].append([])
-                    relax_times[ei][mi].append([])
-                    for point, di in loop_point(exp_type=exp_type, frq=frq, offset=offset, return_indices=True):
-                        relax_times[ei][mi][oi].append([])
+            frqs[ei].append([0.0]*len(layout.frqs))
+            frqs_H[ei].append([0.0]*len(layout.frqs))
 
     # Pack the R2eff/R1rho data.
     data_flag = False
@@ -4547,50 +4681,34 @@ def return_r2eff_arrays(spins=None, spin_ids=None, fields=None, field_count=None
         if not hasattr(spin, 'isotope'):
             raise RelaxSpinTypeError(spin_id=spin_ids[si])
 
-        # Loop over the R2eff data.
-        for exp_type, frq, offset, point, ei, mi, oi, di in loop_exp_frq_offset_point(return_indices=True):
-            # Alias the correct spin.
-            current_spin = spin
-            if exp_type in [EXP_TYPE_CPMG_PROTON_SQ, EXP_TYPE_CPMG_PROTON_MQ]:
-                current_spin = proton
-
-            # Add the experiment type.
-            if exp_type not in exp_types:
-                exp_types.append(exp_type)
-
-            # The key.
-            key = return_param_key_from_data(exp_type=exp_type, frq=frq, offset=offset, point=point)
-            if mi == 0:
-                fact = 60.83831274541046
-            else:
-                fact = 81.11775032721394
-            
-            # The Larmor frequency for this spin (and that of an attached proton for the MMQ models) and field strength (in MHz*2pi to speed up the ppm to rad/s conversion).
+        # The Larmor frequency for this spin (and that of an attached proton for the MMQ models) and field strength (in MHz*2pi to speed up the ppm to rad/s conversion).
+        for ei, mi in layout.exp_frq_pairs:
+            frq = layout.frqs[mi]
             if frq != None:
                 frqs[ei][si][mi] = 2.0 * pi * frq / periodic_table.gyromagnetic_ratio('1H') * periodic_table.gyromagnetic_ratio(spin.isotope) * 1e-6
                 frqs_H[ei][si][mi] = 2.0 * pi * frq * 1e-6
 
-            # The relaxation times.
-            for time, ti in loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point, return_indices=True):
-                relax_times[ei][mi][oi][di].append(time)
+        # Loop over the dispersion point columns.
+        for col in range(point_num):
+            # Alias the correct spin.
+            current_spin = spin
+            if layout.proton[col]:
+                current_spin = proton
 
             # Missing data.
+            key = layout.keys[col]
             if key not in current_spin.r2eff:
-                values[ei][si][mi][oi].append(0.0)
-                errors[ei][si][mi][oi].append(1.0)
-                missing[ei][si][mi][oi].append(1)
                 continue
-            else:
-                missing[ei][si][mi][oi].append(0)
+            missing_matrix[si, col] = 0
 
             # The values.
             if sim_index == None:
-                values[ei][si][mi][oi].append(current_spin.r2eff[key])
+                value_matrix[si, col] = current_spin.r2eff[key]
             else:
-                values[ei][si][mi][oi].append(current_spin.r2eff_sim[sim_index][key])
+                value_matrix[si, col] = current_spin.r2eff_sim[sim_index][key]
 
             # The errors.
-            errors[ei][si][mi][oi].append(current_spin.r2eff_err[key])
+            error_matrix[si, col] = current_spin.r2eff_err[key]
 
         # Increment the spin index.
         si += 1
@@ -4599,16 +4717,43 @@ def return_r2eff_arrays(spins=None, spin_ids=None, fields=None, field_count=None
     if not data_flag:
         raise RelaxError("No R2eff/R1rho data could be found for the spin cluster %s." % spin_ids)
 
-    # Convert to numpy arrays.
-    for exp_type, ei in loop_exp(return_indices=True):
+    # The number of spins with data, the remaining spins having no data points.
+    data_num = si
+
+    # Split the matrices into the {Ei, Si, Mi, Oi} structures.
+    values = []
+    errors = []
+    missing = []
+    for ei in range(len(layout.exp_types)):
+        values.append([])
+        errors.append([])
+        missing.append([])
         for si in range(spin_num):
-            for frq, mi in loop_frq(return_indices=True):
-                for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
-                    values[ei][si][mi][oi] = array(values[ei][si][mi][oi], float64)
-                    errors[ei][si][mi][oi] = array(errors[ei][si][mi][oi], float64)
-                    missing[ei][si][mi][oi] = array(missing[ei][si][mi][oi], int32)
-                    for point, di in loop_point(exp_type=exp_type, frq=frq, offset=offset, return_indices=True):
-                        relax_times[ei][mi][oi][di] = array(relax_times[ei][mi][oi][di], float64)
+            values[ei].append([])
+            errors[ei].append([])
+            missing[ei].append([])
+            for mi in range(len(layout.frqs)):
+                values[ei][si].append([])
+                errors[ei][si].append([])
+                missing[ei][si].append([])
+                for start, end in layout.blocks[ei][mi]:
+                    if si >= data_num:
+                        end = start
+                    values[ei][si][mi].append(value_matrix[si, start:end].copy())
+                    errors[ei][si][mi].append(error_matrix[si, start:end].copy())
+                    missing[ei][si][mi].append(missing_matrix[si, start:end].copy())
+
+    # The relaxation times, as {Ei, Mi, Oi, Di} numpy arrays.
+    relax_times = []
+    for ei in range(len(layout.exp_types)):
+        relax_times.append([])
+        for mi in range(len(layout.frqs)):
+            relax_times[ei].append([])
+            for oi in range(len(layout.times[ei][mi])):
+                relax_times[ei][mi].append([array(times, float64) for times in layout.times[ei][mi][oi]])
+
+    # The experiment types with data.
+    exp_types = list(layout.data_exp_types)
 
     # Return the structures.
     return values, errors, missing, frqs, frqs_H, exp_types, relax_times
@@ -4657,6 +4802,11 @@ def return_spin_lock_nu1(ref_flag=True):
     if not hasattr(cdp, 'spin_lock_nu1_list'):
         return None
 
+    # The structure cached in the experiment layout.
+    layout = return_layout()
+    if ('spin_lock_nu1', ref_flag) in layout.disp_points:
+        return [[[points.copy() for points in frq_points] for frq_points in exp_points] for exp_points in layout.disp_points['spin_lock_nu1', ref_flag]]
+
     # Initialise.
     nu1 = []
 
@@ -4714,6 +4864,9 @@ def return_spin_lock_nu1(ref_flag=True):
                 # Convert to a numpy array.
                 nu1[ei][mi][oi] = array(nu1[ei][mi][oi], float64)
 
+    # Cache the data.
+    layout.disp_points['spin_lock_nu1', ref_flag] = [[[points.copy() for points in frq_points] for frq_points in exp_points] for exp_points in nu1]
+
     # Return the data.
     return nu1
 
@@ -20,11 +20,11 @@
 ###############################################################################
 
 # Module docstring.
-"""Target functions for relaxation exponential curve fitting with both minfx and scipy.optimize.leastsq."""
+"""Target functions for relaxation exponential curve fitting with minfx, scipy.optimize.leastsq, and the batched Levenberg-Marquardt optimisation of all curves."""
 
 # Python module imports.
 from copy import deepcopy
-from numpy import array, asarray, diag, exp, log, ones, sqrt, sum, transpose, zeros
+from numpy import array, asarray, diag, diagonal, einsum, exp, float64, log, ones, sqrt, sum, transpose, where, zeros
 from minfx.generic import generic_minimise
 import sys
 from warnings import warn
@@ -33,9 +33,11 @@ from warnings import warn
 from dep_check import C_module_exp_fn, scipy_module
 from lib.dispersion.variables import MODEL_R2EFF
 from lib.errors import RelaxError
+from lib.minimise import newton_batch
 from lib.statistics import multifit_covar
 from lib.text.sectioning import subsection
 from lib.warnings import RelaxWarning
+from multi import Memo, Processor_box, Result_command, Slave_command
 from pipe_control.mol_res_spin import generate_spin_string, spin_loop
 from specific_analyses.relax_disp.checks import check_model_type
 from specific_analyses.relax_disp.data import average_intensity, loop_exp_frq_offset_point, loop_time, return_param_key_from_data
@@ -48,6 +50,9 @@ if scipy_module:
     # Import leastsq.
     from scipy.optimize import leastsq
 
+# The maximum number of exponential curves per batched optimisation, bounding the memory usage of the stacked arrays.
+EXP_BATCH_SIZE = 10000
+
 
 def estimate_r2eff_err(spin_id=None, epsrel=0.0, verbosity=1):
     """This will estimate the R2eff and i0 errors from the covariance matrix Qxx.  Qxx is calculated from the Jacobian matrix and the optimised parameters.
@@ -60,10 +65,6 @@ def estimate_r2eff_err(spin_id=None, epsrel=0.0, verbosity=1):
     @type verbosity:        int
     """
 
-    # Check that the C modules have been compiled.
-    if not C_module_exp_fn:
-        raise RelaxError("Relaxation curve fitting is not available.  Try compiling the C modules on your platform.")
-
     # Perform checks.
     check_model_type(model=MODEL_R2EFF)
 
@@ -82,88 +83,74 @@ def estimate_r2eff_err(spin_id=None, epsrel=0.0, verbosity=1):
                 text = "Spin %s contains a gradient count of 0.0.  Is the R2eff parameter optimised?  Try execute: minimise.execute(min_algor='Newton', constraints=False)" %(spin_string)
                 warn(RelaxWarning("%s." % text))
 
-        # Print information.
-        if verbosity >= 1:
-            # Individual spin block section.
-            top = 2
-            if verbosity >= 2:
-                top += 2
-            subsection(file=sys.stdout, text="Estimating R2eff error for spin: %s"%spin_string, prespace=top)
-
-        # Loop over each spectrometer frequency and dispersion point.
-        for exp_type, frq, offset, point, ei, mi, oi, di in loop_exp_frq_offset_point(return_indices=True):
-            # The parameter key.
-            param_key = return_param_key_from_data(exp_type=exp_type, frq=frq, offset=offset, point=point)
-
-            # Extract values.
-            r2eff = getattr(cur_spin, 'r2eff')[param_key]
-            i0 = getattr(cur_spin, 'i0')[param_key]
-
-            # Pack data
-            param_vector = [r2eff, i0]
+    # The exponential curves of all spins, stacked.
+    curves, times, values, errors, mask = return_exp_curves(spin_id=spin_id)
+    if not len(curves):
+        return
 
-            # The peak intensities, errors and times.
-            values = []
-            errors = []
-            times = []
-            for time in loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point):
-                values.append(average_intensity(spin=cur_spin, exp_type=exp_type, frq=frq, offset=offset, point=point, time=time))
-                errors.append(average_intensity(spin=cur_spin, exp_type=exp_type, frq=frq, offset=offset, point=point, time=time, error=True))
-                times.append(time)
+    # The optimised parameters of all curves.
+    param_vector = array([[curve[0].r2eff[curve[6]], curve[0].i0[curve[6]]] for curve in curves], float64)
 
-            # Convert to numpy array.
-            values = asarray(values)
-            errors = asarray(errors)
-            times = asarray(times)
+    # The direct Jacobians and covariance matrices of all curves at once.
+    E = Exp_batch(times=times, values=values, errors=errors, mask=mask)
+    pcov = E.covariance(param_vector)
 
-            # Initialise data in C code.
-            scaling_list = [1.0, 1.0]
-            model = Relax_fit_opt(model='exp', num_params=len(param_vector), values=values, errors=errors, relax_times=times, scaling_matrix=scaling_list)
+    # Exclude linearly-dependent columns with the QR decomposition of the individual curves.
+    if epsrel:
+        jacobian = E.jacobian(param_vector)
+        for i in range(len(curves)):
+            pcov[i] = multifit_covar(J=jacobian[i][mask[i]], epsrel=epsrel, weights=E.weights[i][mask[i]])
 
-            # Use the direct Jacobian from function.
-            jacobian_matrix_exp = transpose(asarray( model.jacobian(param_vector) ) )
-            weights = 1. / errors**2
+    # To compute one standard deviation errors on the parameters, take the square root of the diagonal covariance.
+    param_vector_error = sqrt(diagonal(pcov, axis1=1, axis2=2))
 
-            # Get the co-variance
-            pcov = multifit_covar(J=jacobian_matrix_exp, weights=weights)
+    # Loop over the curves.
+    for i in range(len(curves)):
+        # Unpack the curve.
+        cur_spin, spin_string, exp_type, frq, offset, point, param_key = curves[i]
 
-            # To compute one standard deviation errors on the parameters, take the square root of the diagonal covariance.
-            param_vector_error = sqrt(diag(pcov))
+        # Extract values.
+        r2eff, i0 = param_vector[i]
+        r2eff_err, i0_err = param_vector_error[i]
 
-            # Extract values.
-            r2eff_err, i0_err = param_vector_error
+        # Copy r2eff dictionary, to r2eff_err dictionary. They have same keys to the dictionary,
+        if not hasattr(cur_spin, 'r2eff_err'):
+            setattr(cur_spin, 'r2eff_err', deepcopy(getattr(cur_spin, 'r2eff')))
+        if not hasattr(cur_spin, 'i0_err'):
+            setattr(cur_spin, 'i0_err', deepcopy(getattr(cur_spin, 'i0')))
 
-            # Copy r2eff dictionary, to r2eff_err dictionary. They have same keys to the dictionary,
-            if not hasattr(cur_spin, 'r2eff_err'):
-                setattr(cur_spin, 'r2eff_err', deepcopy(getattr(cur_spin, 'r2eff')))
-            if not hasattr(cur_spin, 'i0_err'):
-                setattr(cur_spin, 'i0_err', deepcopy(getattr(cur_spin, 'i0')))
+        # Set error.
+        cur_spin.r2eff_err[param_key] = r2eff_err
+        cur_spin.i0_err[param_key] = i0_err
 
-            # Set error.
-            cur_spin.r2eff_err[param_key] = r2eff_err
-            cur_spin.i0_err[param_key] = i0_err
+        # Get other relevant information.
+        chi2 = getattr(cur_spin, 'chi2')
 
-            # Get other relevant information.
-            chi2 = getattr(cur_spin, 'chi2')
+        # Print information.
+        print_strings = []
+        if verbosity >= 1:
+            # Individual spin block section, for the first curve of the spin.
+            if i == 0 or curves[i-1][0] is not cur_spin:
+                top = 2
+                if verbosity >= 2:
+                    top += 2
+                subsection(file=sys.stdout, text="Estimating R2eff error for spin: %s"%spin_string, prespace=top)
 
-            # Print information.
-            print_strings = []
-            if verbosity >= 1:
-                # Add print strings.
-                point_info = "%s at %3.1f MHz, for offset=%3.3f ppm and dispersion point %-5.1f, with %i time points." % (exp_type, frq/1E6, offset, point, len(times))
-                print_strings.append(point_info)
+            # Add print strings.
+            point_info = "%s at %3.1f MHz, for offset=%3.3f ppm and dispersion point %-5.1f, with %i time points." % (exp_type, frq/1E6, offset, point, mask[i].sum())
+            print_strings.append(point_info)
 
-                par_info = "r2eff=%3.3f r2eff_err=%3.4f, i0=%6.1f, i0_err=%3.4f, chi2=%3.3f.\n" % ( r2eff, r2eff_err, i0, i0_err, chi2)
-                print_strings.append(par_info)
+            par_info = "r2eff=%3.3f r2eff_err=%3.4f, i0=%6.1f, i0_err=%3.4f, chi2=%3.3f.\n" % ( r2eff, r2eff_err, i0, i0_err, chi2)
+            print_strings.append(par_info)
 
-                if verbosity >= 2:
-                    time_info = ', '.join(map(str, times))
-                    print_strings.append('For time array: '+time_info+'.\n\n')
+            if verbosity >= 2:
+                time_info = ', '.join(map(str, times[i][mask[i]]))
+                print_strings.append('For time array: '+time_info+'.\n\n')
 
-            # Print info
-            if len(print_strings) > 0:
-                for print_string in print_strings:
-                    print(print_string),
+        # Print info
+        if len(print_strings) > 0:
+            for print_string in print_strings:
+                print(print_string),
 
 
 #### This class is only for testing.
@@ -489,6 +476,183 @@ class Exp:
         return jacobian_matrix_exp_chi2
 
 
+class Exp_batch:
+    def __init__(self, times=None, values=None, errors=None, mask=None):
+        """Class for the exponential curve target functions of a stack of curves, all optimised simultaneously.
+
+        The curves are padded to the same number of time points, the padding being excluded via the mask.  The chi-squared Hessian is the Gauss-Newton approximation 2 J^T.W.J, so that the batched Newton optimisation of lib.minimise.newton_batch becomes the Levenberg-Marquardt algorithm.
+
+        @keyword times:     The time points, one row per curve.
+        @type times:        numpy rank-2 float array
+        @keyword values:    The measured intensity values, one row per curve.
+        @type values:       numpy rank-2 float array
+        @keyword errors:    The standard deviation of the measured intensity values, one row per curve.
+        @type errors:       numpy rank-2 float array
+        @keyword mask:      The flags which are True for the time points of the curves and False for the padding.
+        @type mask:         numpy rank-2 bool array
+        """
+
+        # Store the data, with the padding set to harmless values.
+        self.mask = asarray(mask, bool)
+        self.times = where(self.mask, times, 0.0)
+        self.values = where(self.mask, values, 0.0)
+
+        # The weights, zero for the padding.
+        self.weights = where(self.mask, 1.0 / where(self.mask, errors, 1.0)**2, 0.0)
+
+
+    def curve_data(self, index=None):
+        """Return the time points, intensity values and weights of the given curves.
+
+        @keyword index: The indices of the curves, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The time points, intensity values and weights, one row per curve.
+        @rtype:         numpy rank-2 float arrays
+        """
+
+        # All curves.
+        if index is None:
+            return self.times, self.values, self.weights
+
+        # The subset.
+        return self.times[index], self.values[index], self.weights[index]
+
+
+    def estimate_x0_exp(self):
+        """Estimate the starting parameters [r2eff_est, i0_est] of all curves, by the linear least squares solution of: ln(Intensity[j]) = ln(i0) - time[j]* r2eff.
+
+        This is the vectorised form of Exp.estimate_x0_exp().
+
+
+        @return:    The estimated r2eff and i0 parameters, one row per curve.
+        @rtype:     numpy rank-2 float array
+        """
+
+        # Convert to linear problem.
+        w = where(self.mask, log(where(self.mask, self.values, 1.0)), 0.0)
+        x = -self.times
+        n = self.mask.sum(axis=1)
+
+        # Solve by linear least squares.
+        b = ((x*w).sum(axis=1) - 1./n * x.sum(axis=1) * w.sum(axis=1)) / ((x**2).sum(axis=1) - 1./n * x.sum(axis=1)**2)
+        a = 1./n * w.sum(axis=1) - b * 1./n * x.sum(axis=1)
+
+        # Convert back from linear to exp function.
+        return transpose([b, exp(a)])
+
+
+    def back_calc(self, params, index=None):
+        """Back-calculate the intensity values of the curves.
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @keyword index: The indices of the curves of the parameter vectors, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The back-calculated intensity values, one row per curve.
+        @rtype:         numpy rank-2 float array
+        """
+
+        # The exponential decay.
+        times = self.curve_data(index)[0]
+        return params[:, 1:2] * exp(-params[:, 0:1] * times)
+
+
+    def jacobian(self, params, index=None):
+        """The direct Jacobians of the exponential curves, the vectorised form of Exp.func_exp_grad().
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @keyword index: The indices of the curves of the parameter vectors, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The Jacobians, with the dimensions of curves, time points and parameters.
+        @rtype:         numpy rank-3 float array
+        """
+
+        # The exponential decay.
+        times = self.curve_data(index)[0]
+        decay = exp(-params[:, 0:1] * times)
+
+        # The partial derivatives with respect to r2eff and i0.
+        return transpose([-params[:, 1:2] * times * decay, decay], (1, 2, 0))
+
+
+    def func(self, params, index=None):
+        """The chi-squared values of the curves.
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @keyword index: The indices of the curves of the parameter vectors, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared values, one per curve.
+        @rtype:         numpy rank-1 float array
+        """
+
+        # The chi-squared values.
+        times, values, weights = self.curve_data(index)
+        return ((values - self.back_calc(params, index=index))**2 * weights).sum(axis=1)
+
+
+    def dfunc(self, params, index=None):
+        """The chi-squared gradients of the curves.
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @keyword index: The indices of the curves of the parameter vectors, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared gradients, one row per curve.
+        @rtype:         numpy rank-2 float array
+        """
+
+        # The weighted residuals.
+        times, values, weights = self.curve_data(index)
+        residuals = (values - self.back_calc(params, index=index)) * weights
+
+        # The gradient.
+        return -2.0 * einsum('ct,ctp->cp', residuals, self.jacobian(params, index=index))
+
+
+    def d2func(self, params, index=None):
+        """The Gauss-Newton approximation of the chi-squared Hessians of the curves.
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @keyword index: The indices of the curves of the parameter vectors, or None for all curves.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared Hessians, one per curve.
+        @rtype:         numpy rank-3 float array
+        """
+
+        # The Hessian 2 J^T.W.J.
+        jacobian = self.jacobian(params, index=index)
+        return 2.0 * einsum('ctp,ct,ctq->cpq', jacobian, self.curve_data(index)[2], jacobian)
+
+
+    def covariance(self, params):
+        """The covariance matrices Qxx = (J^T.W.J)^-1 of all curves.
+
+        This is the batched form of lib.statistics.multifit_covar() for epsrel = 0, with the 2x2 matrices inverted analytically.
+
+
+        @param params:  The parameter vectors [r2eff, i0], one row per curve.
+        @type params:   numpy rank-2 float array
+        @return:        The covariance matrices, one per curve.
+        @rtype:         numpy rank-3 float array
+        """
+
+        # The J^T.W.J matrices.
+        jacobian = self.jacobian(params)
+        Jt_W_J = einsum('ctp,ct,ctq->cpq', jacobian, self.weights, jacobian)
+
+        # The analytic inverse.
+        det = Jt_W_J[:, 0, 0] * Jt_W_J[:, 1, 1] - Jt_W_J[:, 0, 1] * Jt_W_J[:, 1, 0]
+        pcov = zeros(Jt_W_J.shape, float64)
+        pcov[:, 0, 0] = Jt_W_J[:, 1, 1]
+        pcov[:, 1, 1] = Jt_W_J[:, 0, 0]
+        pcov[:, 0, 1] = -Jt_W_J[:, 0, 1]
+        pcov[:, 1, 0] = -Jt_W_J[:, 1, 0]
+        return pcov / det[:, None, None]
+
+
 def estimate_r2eff(method='minfx', min_algor='simplex', c_code=True, constraints=False, chi2_jacobian=False, spin_id=None, ftol=1e-15, xtol=1e-15, maxfev=10000000, factor=100.0, verbosity=1):
     """Estimate r2eff and errors by exponential curve fitting with scipy.optimize.leastsq or minfx.
 
@@ -507,7 +671,10 @@ def estimate_r2eff(method='minfx', min_algor='simplex', c_code=True, constraints
     Then solving initial guess by linear least squares of: ln(Intensity[j]) = ln(i0) - time[j]* r2eff.
 
 
-    @keyword method:            The method to minimise and estimate errors.  Options are: 'minfx' or 'scipy.optimize.leastsq'.
+    The 'batch' method fits all exponential curves simultaneously, by the Levenberg-Marquardt algorithm vectorised over the stacked curves, with the curves being split into chunks and sent to the slave processors.
+
+
+    @keyword method:            The method to minimise and estimate errors.  Options are: 'minfx', 'scipy.optimize.leastsq' or 'batch'.
     @type method:               string
     @keyword min_algor:         The minimisation algorithm
     @type min_algor:            string
@@ -538,6 +705,11 @@ def estimate_r2eff(method='minfx', min_algor='simplex', c_code=True, constraints
     if not C_module_exp_fn and method == 'minfx':
         raise RelaxError("Relaxation curve fitting is not available.  Try compiling the C modules on your platform.")
 
+    # Batched optimisation of all curves.
+    if method == 'batch':
+        minimise_batch_curves(constraints=constraints, spin_id=spin_id, verbosity=verbosity)
+        return
+
     # Set class scipy setting.
     E = Exp(verbosity=verbosity)
     E.set_settings_leastsq(ftol=ftol, xtol=xtol, maxfev=maxfev, factor=factor)
@@ -605,7 +777,7 @@ def estimate_r2eff(method='minfx', min_algor='simplex', c_code=True, constraints
                 # Acquire results.
                 results = minimise_minfx(E=E)
             else:
-                raise RelaxError("Method for minimisation not known. Try setting: method='scipy.optimize.leastsq'.")
+                raise RelaxError("Method for minimisation not known. Try setting: method='scipy.optimize.leastsq' or method='batch'.")
 
             # Unpack results
             param_vector, param_vector_error, chi2, iter_count, f_count, g_count, h_count, warning = results
@@ -847,3 +1019,323 @@ def minimise_minfx(E=None):
 
     # Return, including errors.
     return results
+
+
+def minimise_batch(E=None, A=None, b=None, func_tol=1e-25, max_iterations=10000000):
+    """Estimate r2eff and errors of all curves by the batched Levenberg-Marquardt optimisation.
+
+    @keyword E:                 The batched exponential function class, which contain data and functions.
+    @type E:                    Exp_batch instance
+    @keyword A:                 The linear constraint matrix.
+    @type A:                    numpy rank-2 array or None
+    @keyword b:                 The linear constraint scalar vector.
+    @type b:                    numpy rank-1 array or None
+    @keyword func_tol:          The function tolerance which, when reached, terminates optimisation.
+    @type func_tol:             float
+    @keyword max_iterations:    The maximum number of iterations for the algorithm.
+    @type max_iterations:       int
+    @return:                    Packed list with the optimised parameters, estimated parameter errors, chi2, iter_count, f_count, g_count, h_count and warning arrays, one element per curve.
+    @rtype:                     list
+    """
+
+    # Initial guess for minimisation. Solved by linear least squares.
+    x0 = E.estimate_x0_exp()
+
+    # Minimise.
+    param_vector, chi2, iter_count, f_count, g_count, h_count, warning = newton_batch(func=E.func, dfunc=E.dfunc, d2func=E.d2func, x0=x0, A=A, b=b, func_tol=func_tol, maxiter=max_iterations)
+
+    # To compute one standard deviation errors on the parameters, take the square root of the diagonal covariance.
+    param_vector_error = sqrt(diagonal(E.covariance(param_vector), axis1=1, axis2=2))
+
+    # Pack to list.
+    results = [param_vector, param_vector_error, chi2, iter_count, f_count, g_count, h_count, warning]
+
+    # Return, including errors.
+    return results
+
+
+def minimise_batch_curves(constraints=False, spin_id=None, verbosity=1):
+    """Estimate r2eff and errors by fitting all exponential curves simultaneously.
+
+    The stacked curves are split into chunks, one per slave processor (up to EXP_BATCH_SIZE curves per chunk), and each chunk is optimised by minimise_batch() on the slave.
+
+
+    @keyword constraints:   If constraints should be used.
+    @type constraints:      bool
+    @keyword spin_id:       The spin identification string.
+    @type spin_id:          str
+    @keyword verbosity:     The amount of information to print.  The higher the value, the greater the verbosity.
+    @type verbosity:        int
+    """
+
+    # The exponential curves of all spins, stacked.
+    curves, times, values, errors, mask = return_exp_curves(spin_id=spin_id)
+    num = len(curves)
+    if not num:
+        return
+
+    # The optimisation settings, as used for minfx.
+    E = Exp(verbosity=verbosity)
+    E.set_settings_minfx(constraints=constraints)
+
+    # Get the Processor box singleton (it contains the Processor instance) and alias the Processor.
+    processor_box = Processor_box()
+    processor = processor_box.processor
+
+    # The number of curves per chunk, spreading the curves over all slaves.
+    slaves = processor.processor_size()
+    size = min(EXP_BATCH_SIZE, (num + slaves - 1) // slaves)
+
+    # The chi-squared values of the individual curves, set by the result commands.
+    chi2 = zeros(num, float64)
+
+    # Queue the chunks.
+    for start in range(0, num, size):
+        end = min(start + size, num)
+        command = Exp_batch_command(times=times[start:end], values=values[start:end], errors=errors[start:end], mask=mask[start:end], A=E.A, b=E.b, func_tol=E.func_tol, max_iterations=E.max_iterations)
+        memo = Exp_batch_memo(curves=curves[start:end], chi2=chi2, start=start)
+        processor.add_to_queue(command, memo)
+
+    # Execute the queued elements.
+    processor.run_queue()
+
+    # No printouts.
+    if verbosity < 1:
+        return
+
+    # Loop over the curves.
+    for i in range(num):
+        # Unpack the curve.
+        cur_spin, spin_string, exp_type, frq, offset, point, param_key = curves[i]
+
+        # Individual spin block section, for the first curve of the spin.
+        if i == 0 or curves[i-1][0] is not cur_spin:
+            top = 2
+            if verbosity >= 2:
+                top += 2
+            subsection(file=sys.stdout, text="Fitting with batch to: %s"%spin_string, prespace=top)
+            subsection(file=sys.stdout, text="min_algor='Levenberg-Marquardt', constraints=%s"%constraints, prespace=0)
+
+        # Print information.
+        print("%s at %3.1f MHz, for offset=%3.3f ppm and dispersion point %-5.1f, with %i time points." % (exp_type, frq/1E6, offset, point, mask[i].sum()))
+        print("r2eff=%3.3f r2eff_err=%3.4f, i0=%6.1f, i0_err=%3.4f, chi2=%3.3f.\n" % (cur_spin.r2eff[param_key], cur_spin.r2eff_err[param_key], cur_spin.i0[param_key], cur_spin.i0_err[param_key], chi2[i]))
+        if verbosity >= 2:
+            time_info = ', '.join(map(str, times[i][mask[i]]))
+            print('For time array: '+time_info+'.\n\n')
+
+
+def return_exp_curves(spin_id=None):
+    """Collect the exponential curves of all selected spins as stacked arrays.
+
+    The curves are padded with zeros to the largest number of time points, with the mask flagging the real time points.
+
+
+    @keyword spin_id:   The spin identification string.
+    @type spin_id:      str
+    @return:            The list of curves, each being the spin container, spin string, experiment type, spectrometer frequency, offset, dispersion point, and parameter key, and the time points, intensity values, intensity errors and mask, one row per curve.
+    @rtype:             list of lists, numpy rank-2 float arrays, numpy rank-2 bool array
+    """
+
+    # Loop over the spins.
+    curves = []
+    curve_data = []
+    for cur_spin, mol_name, resi, resn, cur_spin_id in spin_loop(selection=spin_id, full_info=True, return_id=True, skip_desel=True):
+        # Generate spin string.
+        spin_string = generate_spin_string(spin=cur_spin, mol_name=mol_name, res_num=resi, res_name=resn)
+
+        # Loop over each spectrometer frequency and dispersion point.
+        for exp_type, frq, offset, point, ei, mi, oi, di in loop_exp_frq_offset_point(return_indices=True):
+            # The parameter key.
+            param_key = return_param_key_from_data(exp_type=exp_type, frq=frq, offset=offset, point=point)
+
+            # The peak intensities, errors and times.
+            values = []
+            errors = []
+            times = []
+            for time in loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point):
+                values.append(average_intensity(spin=cur_spin, exp_type=exp_type, frq=frq, offset=offset, point=point, time=time))
+                errors.append(average_intensity(spin=cur_spin, exp_type=exp_type, frq=frq, offset=offset, point=point, time=time, error=True))
+                times.append(time)
+
+            # Store.
+            curves.append([cur_spin, spin_string, exp_type, frq, offset, point, param_key])
+            curve_data.append([times, values, errors])
+
+    # The padded arrays.
+    num_times = max([len(data[0]) for data in curve_data] + [0])
+    times = zeros((len(curves), num_times), float64)
+    values = zeros((len(curves), num_times), float64)
+    errors = ones((len(curves), num_times), float64)
+    mask = zeros((len(curves), num_times), bool)
+    for i in range(len(curves)):
+        n = len(curve_data[i][0])
+        times[i, :n], values[i, :n], errors[i, :n] = curve_data[i]
+        mask[i, :n] = True
+
+    # Return the data.
+    return curves, times, values, errors, mask
+
+
+
+class Exp_batch_memo(Memo):
+    """The batched exponential curve fitting memo class."""
+
+    def __init__(self, curves=None, chi2=None, start=None):
+        """Initialise the batched exponential curve fitting memo class.
+
+        This is used for handling the optimisation results returned from a slave processor.  It runs on the master processor and is used to store data which is passed to the slave processor and then passed back to the master via the results command.
+
+
+        @keyword curves:    The curves of the chunk, as returned by return_exp_curves().
+        @type curves:       list of lists
+        @keyword chi2:      The chi-squared values of all curves, to be filled in.
+        @type chi2:         numpy rank-1 float array
+        @keyword start:     The index of the first curve of the chunk within all curves.
+        @type start:        int
+        """
+
+        # Execute the base class __init__() method.
+        super(Exp_batch_memo, self).__init__()
+
+        # Store the arguments.
+        self.curves = curves
+        self.chi2 = chi2
+        self.start = start
+
+
+
+class Exp_batch_command(Slave_command):
+    """Command class for the batched exponential curve fitting on the slave processor."""
+
+    def __init__(self, times=None, values=None, errors=None, mask=None, A=None, b=None, func_tol=None, max_iterations=None):
+        """Initialise the base class, storing all the master data to be sent to the slave processor.
+
+        This method is run on the master processor whereas the run() method is run on the slave processor.
+
+
+        @keyword times:             The time points, one row per curve.
+        @type times:                numpy rank-2 float array
+        @keyword values:            The measured intensity values, one row per curve.
+        @type values:               numpy rank-2 float array
+        @keyword errors:            The standard deviation of the measured intensity values, one row per curve.
+        @type errors:               numpy rank-2 float array
+        @keyword mask:              The flags which are True for the time points of the curves and False for the padding.
+        @type mask:                 numpy rank-2 bool array
+        @keyword A:                 The linear constraint matrix.
+        @type A:                    numpy rank-2 array or None
+        @keyword b:                 The linear constraint scalar vector.
+        @type b:                    numpy rank-1 array or None
+        @keyword func_tol:          The function tolerance which, when reached, terminates optimisation.
+        @type func_tol:             float
+        @keyword max_iterations:    The maximum number of iterations for the algorithm.
+        @type max_iterations:       int
+        """
+
+        # Execute the base class __init__() method.
+        super(Exp_batch_command, self).__init__()
+
+        # Store the arguments needed by the run() method.
+        self.times = times
+        self.values = values
+        self.errors = errors
+        self.mask = mask
+        self.A = A
+        self.b = b
+        self.func_tol = func_tol
+        self.max_iterations = max_iterations
+
+        # The cost hint for the scheduler, as the optimisation time scales with the number of curves.
+        self.cost = len(times)
+
+
+    def run(self, processor, completed):
+        """Set up and perform the optimisation."""
+
+        # Initialise the function to minimise.
+        E = Exp_batch(times=self.times, values=self.values, errors=self.errors, mask=self.mask)
+
+        # Minimise.
+        param_vector, param_vector_error, chi2, iter_count, f_count, g_count, h_count, warning = minimise_batch(E=E, A=self.A, b=self.b, func_tol=self.func_tol, max_iterations=self.max_iterations)
+
+        # Create the result command object to send back to the master.
+        processor.return_object(Exp_batch_result_command(processor=processor, memo_id=self.memo_id, param_vector=param_vector, param_vector_error=param_vector_error, chi2=chi2, f_count=f_count, warning=warning, completed=False))
+
+
+
+class Exp_batch_result_command(Result_command):
+    """Class for processing the batched exponential curve fitting results.
+
+    This object will be sent from the slave back to the master to have its run() method executed.
+    """
+
+    def __init__(self, processor=None, memo_id=None, param_vector=None, param_vector_error=None, chi2=None, f_count=None, warning=None, completed=True):
+        """Set up this class object on the slave, placing the minimisation results here.
+
+        @keyword processor:             The processor object.
+        @type processor:                multi.processor.Processor instance
+        @keyword memo_id:               The memo identification string.
+        @type memo_id:                  str
+        @keyword param_vector:          The optimised parameter vectors, one row per curve.
+        @type param_vector:             numpy rank-2 float array
+        @keyword param_vector_error:    The estimated parameter errors, one row per curve.
+        @type param_vector_error:       numpy rank-2 float array
+        @keyword chi2:                  The final target function values.
+        @type chi2:                     numpy rank-1 float array
+        @keyword f_count:               The function call counts.
+        @type f_count:                  numpy rank-1 int array
+        @keyword warning:               Any optimisation warnings.
+        @type warning:                  list of str or None
+        @keyword completed:             A flag which if True signals that the optimisation successfully completed.
+        @type completed:                bool
+        """
+
+        # Execute the base class __init__() method.
+        super(Exp_batch_result_command, self).__init__(processor=processor, completed=completed)
+
+        # Store the arguments (to be sent back to the master).
+        self.memo_id = memo_id
+        self.param_vector = param_vector
+        self.param_vector_error = param_vector_error
+        self.chi2 = chi2
+        self.f_count = f_count
+        self.warning = warning
+        self.completed = completed
+
+
+    def run(self, processor, memo):
+        """Disassemble the optimisation results of the curves into the spin containers.
+
+        @param processor:   The processor object.
+        @type processor:    multi.processor.Processor instance
+        @param memo:        The batched exponential curve fitting memo.
+        @type memo:         Exp_batch_memo instance
+        """
+
+        # Loop over the curves of the chunk.
+        for i in range(len(memo.curves)):
+            # The spin and parameter key.
+            cur_spin = memo.curves[i][0]
+            param_key = memo.curves[i][6]
+
+            # Disassemble the parameter vector.
+            disassemble_param_vector(param_vector=self.param_vector[i], spins=[cur_spin], key=param_key)
+
+            # Errors.
+            if not hasattr(cur_spin, 'r2eff_err'):
+                setattr(cur_spin, 'r2eff_err', deepcopy(getattr(cur_spin, 'r2eff')))
+            if not hasattr(cur_spin, 'i0_err'):
+                setattr(cur_spin, 'i0_err', deepcopy(getattr(cur_spin, 'i0')))
+
+            # Set error.
+            cur_spin.r2eff_err[param_key] = self.param_vector_error[i, 0]
+            cur_spin.i0_err[param_key] = self.param_vector_error[i, 1]
+
+            # Chi-squared statistic.
+            cur_spin.chi2 = self.chi2[i]
+            memo.chi2[memo.start+i] = self.chi2[i]
+
+            # Iterations.
+            cur_spin.f_count = int(self.f_count[i])
+
+            # Warning.
+            cur_spin.warning = self.warning[i]
@@ -26,7 +26,7 @@
 # Python module imports.
 from minfx.generic import generic_minimise
 from minfx.grid import grid
-from numpy import dot, float64, int32, ones, zeros
+from numpy import array, dot, float64, int32, ones, zeros
 from numpy.linalg import inv
 from operator import mul
 from re import match, search
@@ -35,15 +35,17 @@ from warnings import warn
 
 # relax module imports.
 from dep_check import C_module_exp_fn
+from lib.compat import pickle
 from lib.dispersion.two_point import calc_two_point_r2eff, calc_two_point_r2eff_err
 from lib.dispersion.variables import EXP_TYPE_LIST_CPMG, MODEL_CR72, MODEL_CR72_FULL, MODEL_LM63, MODEL_M61, MODEL_MP05, MODEL_TAP03, MODEL_TP02
 from lib.errors import RelaxError
+from lib.minimise import grid_batch
 from lib.text.sectioning import subsection
 from lib.warnings import RelaxWarning
-from multi import Memo, Result_command, Slave_command
+from multi import Memo, Result_command, Slave_command, fetch_data, fetch_data_store, send_data_to_slaves
 from pipe_control.mol_res_spin import generate_spin_string, spin_loop
 from specific_analyses.relax_disp.checks import check_disp_points, check_exp_type, check_exp_type_fixed_time
-from specific_analyses.relax_disp.data import average_intensity, count_spins, find_intensity_keys, has_exponential_exp_type, has_proton_mmq_cpmg, is_r1_optimised, loop_exp, loop_exp_frq_offset_point, loop_exp_frq_offset_point_time, loop_frq, loop_offset, loop_time, pack_back_calc_r2eff, return_cpmg_frqs, return_offset_data, return_param_key_from_data, return_r1_data, return_r2eff_arrays, return_spin_lock_nu1
+from specific_analyses.relax_disp.data import average_intensity, count_spins, find_intensity_keys, has_exponential_exp_type, has_proton_mmq_cpmg, is_r1_optimised, loop_exp, loop_exp_frq_offset_point, loop_exp_frq_offset_point_time, loop_frq, loop_offset, loop_point, loop_time, pack_back_calc_r2eff, return_cpmg_frqs, return_offset_data, return_param_key_from_data, return_r1_data, return_r2eff_arrays, return_spin_lock_nu1
 from specific_analyses.relax_disp.parameters import assemble_param_vector, disassemble_param_vector, linear_constraints, param_conversion, param_num, r1_setup
 from target_functions.relax_disp import Dispersion
 from target_functions.relax_fit_wrapper import Relax_fit_opt
@@ -434,7 +436,7 @@ def minimise_r2eff(spins=None, spin_ids=None, min_algor=None, min_options=None,
 
             # Grid search.
             if search('^[Gg]rid', min_algor):
-                results = grid(func=model.func, args=(), num_incs=inc, lower=lower, upper=upper, A=A, b=b, verbosity=verbosity)
+                results = grid_batch(func_batch=model.func_batch, num_incs=inc, lower=lower, upper=upper, A=A, b=b, verbosity=verbosity)
 
                 # Unpack the results.
                 param_vector, chi2, iter_count, warning = results
@@ -500,6 +502,44 @@ def minimise_r2eff(spins=None, spin_ids=None, min_algor=None, min_options=None,
 
 
 
+def send_shared_data_to_slaves():
+    """Send the dispersion data shared by all spin clusters to the data stores of the slave processors.
+
+    The nu_CPMG frequencies, spin-lock field strengths, and relaxation times do not depend on the spins.  These are therefore sent to the slaves in a single storage command per slave, rather than being packed into every Disp_minimise_command.  As the data is also identical for all Monte Carlo simulations, a record of the last data sent is kept in the data store of the master and the transfer is skipped if the data is unchanged.  This must be called before the commands are added to the processor queue.
+    """
+
+    # The relaxation times, with the dimensions {Ei, Mi, Oi, Di, Ti}.
+    relax_times = []
+    for exp_type, ei in loop_exp(return_indices=True):
+        relax_times.append([])
+        for frq, mi in loop_frq(return_indices=True):
+            relax_times[ei].append([])
+            for offset, oi in loop_offset(exp_type=exp_type, frq=frq, return_indices=True):
+                relax_times[ei][mi].append([])
+                for point, di in loop_point(exp_type=exp_type, frq=frq, offset=offset, return_indices=True):
+                    relax_times[ei][mi][oi].append(array([time for time in loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point)], float64))
+
+    # The shared data.
+    data = {
+        'cpmg_frqs': return_cpmg_frqs(ref_flag=False),
+        'spin_lock_nu1': return_spin_lock_nu1(ref_flag=False),
+        'relax_times': relax_times
+    }
+
+    # Skip the transfer if the slaves already hold the same data.
+    data_store = fetch_data_store()
+    record = pickle.dumps(data, 2)
+    if getattr(data_store, 'relax_disp_shared_data_sent', None) == record:
+        return
+
+    # Send the data.
+    send_data_to_slaves(name='relax_disp_shared_data', value=data)
+
+    # Keep a record of the data sent.
+    data_store.relax_disp_shared_data_sent = record
+
+
+
 class Disp_memo(Memo):
     """The relaxation dispersion memo class."""
 
@@ -580,7 +620,8 @@ class Disp_minimise_command(Slave_command):
         super(Disp_minimise_command, self).__init__()
 
         # Store the arguments needed by the run() method.
-        self.spins = spins
+        self.model = spins[0].model
+        self.num_spins = count_spins(spins)
         self.spin_ids = spin_ids
         self.sim_index = sim_index
         self.scaling_matrix = scaling_matrix
@@ -597,7 +638,7 @@ class Disp_minimise_command(Slave_command):
         self.param_names = param_names
 
         # Create the initial parameter vector.
-        self.param_vector = assemble_param_vector(spins=self.spins)
+        self.param_vector = assemble_param_vector(spins=spins)
         if len(scaling_matrix):
             self.param_vector = dot(inv(scaling_matrix), self.param_vector)
 
@@ -610,8 +651,8 @@ class Disp_minimise_command(Slave_command):
         if spins[0].model in [MODEL_LM63, MODEL_CR72, MODEL_CR72_FULL, MODEL_M61, MODEL_TP02, MODEL_TAP03, MODEL_MP05] and not hasattr(cdp, 'spectrometer_frq'):
             raise RelaxError("The spectrometer frequency information has not been specified.")
 
-        # The R2eff/R1rho data.
-        self.values, self.errors, self.missing, self.frqs, self.frqs_H, self.exp_types, self.relax_times = return_r2eff_arrays(spins=spins, spin_ids=spin_ids, fields=fields, field_count=len(fields), sim_index=sim_index)
+        # The R2eff/R1rho data (the relaxation times are shared by all clusters and are sent separately to the slaves).
+        self.values, self.errors, self.missing, self.frqs, self.frqs_H, self.exp_types, relax_times = return_r2eff_arrays(spins=spins, spin_ids=spin_ids, fields=fields, field_count=len(fields), sim_index=sim_index)
 
         # The offset and R1 data.
         r1_setup()
@@ -622,10 +663,8 @@ class Disp_minimise_command(Slave_command):
         # Parameter number.
         self.param_num = param_num(spins=spins)
 
-        # The dispersion data.
-        self.dispersion_points = cdp.dispersion_points
-        self.cpmg_frqs = return_cpmg_frqs(ref_flag=False)
-        self.spin_lock_nu1 = return_spin_lock_nu1(ref_flag=False)
+        # The cost hint for the scheduler, as the optimisation time scales with the cluster size.
+        self.cost = self.num_spins
 
 
     def run(self, processor, completed):
@@ -646,8 +685,14 @@ class Disp_minimise_command(Slave_command):
                     result = mul(result, x)
                 print("Unconstrained grid search size: %s (constraints may decrease this size).\n" % result)
 
+        # The dispersion data shared by all spin clusters, from the data store of the slave.
+        shared_data = fetch_data(name='relax_disp_shared_data')
+        cpmg_frqs = shared_data['cpmg_frqs']
+        spin_lock_nu1 = shared_data['spin_lock_nu1']
+        relax_times = shared_data['relax_times']
+
         # Initialise the function to minimise.
-        model = Dispersion(model=self.spins[0].model, num_params=self.param_num, num_spins=count_spins(self.spins), num_frq=len(self.fields), exp_types=self.exp_types, values=self.values, errors=self.errors, missing=self.missing, frqs=self.frqs, frqs_H=self.frqs_H, cpmg_frqs=self.cpmg_frqs, spin_lock_nu1=self.spin_lock_nu1, chemical_shifts=self.chemical_shifts, offset=self.offsets, tilt_angles=self.tilt_angles, r1=self.r1, relax_times=self.relax_times, scaling_matrix=self.scaling_matrix, r1_fit=self.r1_fit)
+        model = Dispersion(model=self.model, num_params=self.param_num, num_spins=self.num_spins, num_frq=len(self.fields), exp_types=self.exp_types, values=self.values, errors=self.errors, missing=self.missing, frqs=self.frqs, frqs_H=self.frqs_H, cpmg_frqs=cpmg_frqs, spin_lock_nu1=spin_lock_nu1, chemical_shifts=self.chemical_shifts, offset=self.offsets, tilt_angles=self.tilt_angles, r1=self.r1, relax_times=relax_times, scaling_matrix=self.scaling_matrix, r1_fit=self.r1_fit)
 
         # Grid search.
         if search('^[Gg]rid', self.min_algor):
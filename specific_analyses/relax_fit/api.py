@@ -26,8 +26,7 @@
 
 # Python module imports.
 from minfx.generic import generic_minimise
-from minfx.grid import grid
-from numpy import asarray, dot, float64, transpose, zeros
+from numpy import array, asarray, dot, float64, transpose, zeros
 from numpy.linalg import inv
 from re import match, search
 import sys
@@ -36,6 +35,7 @@ from warnings import warn
 # relax module imports.
 from dep_check import C_module_exp_fn
 from lib.errors import RelaxError, RelaxNoModelError
+from lib.minimise import grid_batch, newton_batch
 from lib.text.sectioning import subsection
 from lib.warnings import RelaxDeselectWarning
 from pipe_control.mol_res_spin import check_mol_res_spin_data, return_spin, spin_loop
@@ -45,6 +45,7 @@ from specific_analyses.relax_fit.checks import check_model_setup
 from specific_analyses.relax_fit.optimisation import back_calc
 from specific_analyses.relax_fit.parameter_object import Relax_fit_params
 from specific_analyses.relax_fit.parameters import assemble_param_vector, disassemble_param_vector, linear_constraints
+from target_functions.relax_fit_batch import Relax_fit_batch
 from target_functions.relax_fit_wrapper import Relax_fit_opt
 
 
@@ -396,7 +397,7 @@ class Relax_fit(API_base, API_common):
 
             # Grid search.
             if search('^[Gg]rid', min_algor):
-                results = grid(func=model.func, args=(), num_incs=inc[model_index], lower=lower[model_index], upper=upper[model_index], A=A, b=b, verbosity=verbosity)
+                results = grid_batch(func_batch=model.func_batch, num_incs=inc[model_index], lower=lower[model_index], upper=upper[model_index], A=A, b=b, verbosity=verbosity)
 
                 # Unpack the results.
                 param_vector, chi2, iter_count, warning = results
@@ -465,6 +466,107 @@ class Relax_fit(API_base, API_common):
             model_index += 1
 
 
+    def minimise_mc(self, func_tol=None, grad_tol=None, max_iterations=None, constraints=False, scaling_matrix=None, verbosity=0):
+        """Batched relaxation curve fitting minimisation of all Monte Carlo simulations.
+
+        For each spin, the simulations are optimised simultaneously using the batched exponential target function and the batched Newton optimisation with Levenberg-Marquardt damping.
+
+
+        @keyword func_tol:          The function tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+        @type func_tol:             None or float
+        @keyword grad_tol:          The gradient tolerance which, when reached, terminates optimisation.  Setting this to None turns of the check.
+        @type grad_tol:             None or float
+        @keyword max_iterations:    The maximum number of iterations for the algorithm.
+        @type max_iterations:       int
+        @keyword constraints:       If True, constraints are used during optimisation.
+        @type constraints:          bool
+        @keyword scaling_matrix:    The per-model list of diagonal and square scaling matrices.
+        @type scaling_matrix:       list of numpy rank-2, float64 array or list of None
+        @keyword verbosity:         The amount of information to print.  The higher the value, the greater the verbosity.
+        @type verbosity:            int
+        """
+
+        # Check that the C modules have been compiled, as the batched target functions use them.
+        if not C_module_exp_fn:
+            raise RelaxError("Relaxation curve fitting is not available.  Try compiling the C modules on your platform.")
+
+        # Checks.
+        check_mol_res_spin_data()
+
+        # Loop over the sequence.
+        model_index = 0
+        for spin, spin_id in self.model_loop():
+            # Skip deselected spins.
+            if not spin.select:
+                continue
+
+            # Skip spins which have no data.
+            if not hasattr(spin, 'peak_intensity'):
+                continue
+
+            # The initial parameter vectors of all simulations.
+            param_vectors = array([assemble_param_vector(spin=spin, sim_index=i) for i in range(cdp.sim_number)], float64)
+
+            # Diagonal scaling.
+            if scaling_matrix[model_index] is not None:
+                param_vectors = dot(param_vectors, inv(scaling_matrix[model_index]))
+
+            # Linear constraints.
+            if constraints:
+                A, b = linear_constraints(spin=spin, scaling_matrix=scaling_matrix[model_index])
+            else:
+                A, b = None, None
+
+            # Print out.
+            if verbosity >= 1:
+                string = "Fitting %s simulations to spin %s" % (cdp.sim_number, repr(spin_id))
+                print("\n\n" + string)
+                print(len(string) * '~')
+
+            # The simulated peak intensities, errors, and times.
+            keys = list(spin.peak_intensity.keys())
+            values = [[spin.peak_intensity_sim[i][key] for key in keys] for i in range(cdp.sim_number)]
+            errors = [spin.peak_intensity_err[key] for key in keys]
+            times = [cdp.relax_times[key] for key in keys]
+
+            # The scaling matrix in a diagonalised list form.
+            if scaling_matrix[model_index] is None:
+                scaling_list = None
+            else:
+                scaling_list = scaling_matrix[model_index].diagonal()
+
+            # Set up the target function.
+            model = Relax_fit_batch(model=spin.model, num_params=len(spin.params), values=values, errors=errors, relax_times=times, scaling_matrix=scaling_list)
+
+            # Minimisation.
+            param_vectors, chi2, iter_count, f_count, g_count, h_count, warning = newton_batch(func=model.func, dfunc=model.dfunc, d2func=model.d2func, x0=param_vectors, A=A, b=b, func_tol=func_tol, grad_tol=grad_tol, maxiter=max_iterations)
+
+            # Scaling.
+            if scaling_matrix[model_index] is not None:
+                param_vectors = dot(param_vectors, scaling_matrix[model_index])
+
+            # Store the results.
+            for i in range(cdp.sim_number):
+                # Disassemble the parameter vector.
+                disassemble_param_vector(param_vector=param_vectors[i], spin=spin, sim_index=i)
+
+                # The minimisation statistics.
+                spin.chi2_sim[i] = chi2[i]
+                spin.iter_sim[i] = int(iter_count[i])
+                spin.f_count_sim[i] = int(f_count[i])
+                spin.g_count_sim[i] = int(g_count[i])
+                spin.h_count_sim[i] = int(h_count[i])
+                spin.warning_sim[i] = warning[i]
+
+            # Print out.
+            if verbosity >= 1:
+                print("Total iterations:  %s" % iter_count.sum())
+                print("Mean chi-squared value:  %s" % chi2.mean())
+
+            # Increment the model index.
+            model_index += 1
+
+
     def overfit_deselect(self, data_check=True, verbose=True):
         """Deselect spins which have insufficient data to support minimisation.
 
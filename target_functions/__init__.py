@@ -34,5 +34,6 @@ __all__ = [
     'potential',
     'relax_disp',
     'relax_fit',
+    'relax_fit_batch',
     'relax_fit_wrapper'
 ]
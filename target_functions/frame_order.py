@@ -24,11 +24,11 @@
 
 # Python module imports.
 from copy import deepcopy
-from math import acos, cos, pi, sin, sqrt
+from math import pi, sqrt
 from numpy import add, array, dot, float32, float64, ones, outer, subtract, transpose, uint8, zeros
 
 # relax module imports.
-from extern.sobol.sobol_lib import i4_sobol_generate
+import extern.sobol.sobol_lib as sobol_lib
 from lib.alignment.alignment_tensor import to_5D, to_tensor
 from lib.alignment.pcs import pcs_tensor
 from lib.alignment.rdc import rdc_tensor
@@ -46,9 +46,10 @@ from lib.frame_order.pseudo_ellipse import compile_2nd_matrix_pseudo_ellipse, pc
 from lib.frame_order.pseudo_ellipse_free_rotor import compile_2nd_matrix_pseudo_ellipse_free_rotor
 from lib.frame_order.pseudo_ellipse_torsionless import compile_2nd_matrix_pseudo_ellipse_torsionless, pcs_numeric_quad_int_pseudo_ellipse_torsionless, pcs_numeric_qr_int_pseudo_ellipse_torsionless
 from lib.frame_order.rotor import compile_2nd_matrix_rotor, pcs_numeric_quad_int_rotor, pcs_numeric_qr_int_rotor
+from lib.frame_order.sobol import load_sobol_cache, save_sobol_cache, sobol_angles, sobol_cache_file, sobol_points, sobol_rotations
 from lib.frame_order.variables import MODEL_DOUBLE_ROTOR, MODEL_FREE_ROTOR, MODEL_ISO_CONE, MODEL_ISO_CONE_FREE_ROTOR, MODEL_ISO_CONE_TORSIONLESS, MODEL_PSEUDO_ELLIPSE, MODEL_PSEUDO_ELLIPSE_FREE_ROTOR, MODEL_PSEUDO_ELLIPSE_TORSIONLESS, MODEL_RIGID, MODEL_ROTOR
 from lib.geometry.coord_transform import spherical_to_cartesian
-from lib.geometry.rotations import euler_to_R_zyz, tilt_torsion_to_R, two_vect_to_R
+from lib.geometry.rotations import euler_to_R_zyz, two_vect_to_R
 from lib.linear_algebra.kronecker_product import kron_prod
 from lib.physical_constants import pcs_constant
 from target_functions.chi2 import chi2
@@ -57,7 +58,7 @@ from target_functions.chi2 import chi2
 class Frame_order:
     """Class containing the target function of the optimisation of Frame Order matrix components."""
 
-    def __init__(self, model=None, init_params=None, full_tensors=None, full_in_ref_frame=None, rdcs=None, rdc_errors=None, rdc_weights=None, rdc_vect=None, dip_const=None, pcs=None, pcs_errors=None, pcs_weights=None, atomic_pos=None, temp=None, frq=None, paramag_centre=zeros(3), scaling_matrix=None, sobol_max_points=200, sobol_oversample=100, com=None, ave_pos_pivot=zeros(3), pivot=None, pivot_opt=False, quad_int=False):
+    def __init__(self, model=None, init_params=None, full_tensors=None, full_in_ref_frame=None, rdcs=None, rdc_errors=None, rdc_weights=None, rdc_vect=None, dip_const=None, pcs=None, pcs_errors=None, pcs_weights=None, atomic_pos=None, temp=None, frq=None, paramag_centre=zeros(3), scaling_matrix=None, sobol_max_points=200, sobol_oversample=100, sobol_cache_dir=None, com=None, ave_pos_pivot=zeros(3), pivot=None, pivot_opt=False, quad_int=False):
         """Set up the target functions for the Frame Order theories.
 
         @keyword model:             The name of the Frame Order model.
@@ -98,6 +99,8 @@ class Frame_order:
         @type sobol_max_points:     int
         @keyword sobol_oversample:  The oversampling factor Ov used for the total number of points N * Ov * 10**M, where N is the maximum number of Sobol' points and M is the number of dimensions or torsion-tilt angles for the system.
         @type sobol_oversample:     int
+        @keyword sobol_cache_dir:   The optional directory for the persistent on-disk cache of the Sobol' angles and rotation matrices.  If None, the data is regenerated for each relax instance.
+        @type sobol_cache_dir:      None or str
         @keyword com:               The centre of mass of the system.  This is used for defining the rotor model systems.
         @type com:                  numpy 3D rank-1 array
         @keyword ave_pos_pivot:     The pivot point to rotate all atoms about to the average domain position.  In most cases this will be the centre of mass of the moving domain.  This pivot is shifted by the translation vector.
@@ -133,6 +136,7 @@ class Frame_order:
         self.total_num_params = len(init_params)
         self.sobol_max_points = sobol_max_points
         self.sobol_oversample = sobol_oversample
+        self.sobol_cache_dir = sobol_cache_dir
         self.com = deepcopy(com)
         self.pivot_opt = pivot_opt
         self.quad_int = quad_int
@@ -1996,7 +2000,7 @@ class Frame_order:
     def create_sobol_data(self, dims=None):
         """Create the Sobol' quasi-random data for numerical integration.
 
-        This uses the external sobol_lib module to create the data.  The algorithm is that modified by Antonov and Saleev.
+        The Sobol' points are those of the external sobol_lib module, using the algorithm modified by Antonov and Saleev, but generated for all points at once.  If the Sobol' cache directory is set, the angles and rotation matrices are shared between relax instances via memory-mapped .npy files.
 
 
         @keyword dims:      The list of parameters.
@@ -2023,91 +2027,36 @@ class Frame_order:
         # Initialise.
         sobol_data.model = self.model
         sobol_data.total_num = total_num
-        sobol_data.sobol_angles = zeros((m, total_num), float32)
-        sobol_data.Ri_prime = zeros((total_num, 3, 3), float32)
-        sobol_data.Ri2_prime = zeros((total_num, 3, 3), float32)
-
-        # The Sobol' points.
-        points = i4_sobol_generate(m, total_num, 1000)
-
-        # Loop over the points.
-        for i in range(total_num):
-            # Loop over the dimensions, converting the points to angles.
-            theta = None
-            phi = None
-            sigma = None
-            for j in range(m):
-                # The tilt angle - the angle of rotation about the x-y plane rotation axis.
-                if dims[j] in ['theta']:
-                    theta = acos(2.0*points[j, i] - 1.0)
-                    sobol_data.sobol_angles[j, i] = theta
-
-                # The angle defining the x-y plane rotation axis.
-                if dims[j] in ['phi']:
-                    phi = 2.0 * pi * points[j, i]
-                    sobol_data.sobol_angles[j, i] = phi
-
-                # The 1st torsion angle - the angle of rotation about the z' axis (or y' for the double motion models).
-                if dims[j] in ['sigma']:
-                    sigma = 2.0 * pi * (points[j, i] - 0.5)
-                    sobol_data.sobol_angles[j, i] = sigma
-
-                # The 2nd torsion angle - the angle of rotation about the x' axis.
-                if dims[j] in ['sigma2']:
-                    sigma2 = 2.0 * pi * (points[j, i] - 0.5)
-                    sobol_data.sobol_angles[j, i] = sigma2
-
-            # Pre-calculate the rotation matrices for the double motion models.
-            if 'sigma2' in dims:
-                # The 1st rotation about the y-axis.
-                c_sigma = cos(sigma)
-                s_sigma = sin(sigma)
-                sobol_data.Ri_prime[i, 0, 0] =  c_sigma
-                sobol_data.Ri_prime[i, 0, 2] =  s_sigma
-                sobol_data.Ri_prime[i, 1, 1] = 1.0
-                sobol_data.Ri_prime[i, 2, 0] = -s_sigma
-                sobol_data.Ri_prime[i, 2, 2] =  c_sigma
-
-                # The 2nd rotation about the x-axis.
-                c_sigma2 = cos(sigma2)
-                s_sigma2 = sin(sigma2)
-                sobol_data.Ri2_prime[i, 0, 0] = 1.0
-                sobol_data.Ri2_prime[i, 1, 1] =  c_sigma2
-                sobol_data.Ri2_prime[i, 1, 2] = -s_sigma2
-                sobol_data.Ri2_prime[i, 2, 1] =  s_sigma2
-                sobol_data.Ri2_prime[i, 2, 2] =  c_sigma2
-
-            # Pre-calculate the rotation matrix for the full tilt-torsion.
-            elif theta != None and phi != None and sigma != None:
-                tilt_torsion_to_R(phi, theta, sigma, sobol_data.Ri_prime[i])
-
-            # Pre-calculate the rotation matrix for the torsionless models.
-            elif sigma == None:
-                c_theta = cos(theta)
-                s_theta = sin(theta)
-                c_phi = cos(phi)
-                s_phi = sin(phi)
-                c_phi_c_theta = c_phi * c_theta
-                s_phi_c_theta = s_phi * c_theta
-                sobol_data.Ri_prime[i, 0, 0] =  c_phi_c_theta*c_phi + s_phi**2
-                sobol_data.Ri_prime[i, 0, 1] =  c_phi_c_theta*s_phi - c_phi*s_phi
-                sobol_data.Ri_prime[i, 0, 2] =  c_phi*s_theta
-                sobol_data.Ri_prime[i, 1, 0] =  s_phi_c_theta*c_phi - c_phi*s_phi
-                sobol_data.Ri_prime[i, 1, 1] =  s_phi_c_theta*s_phi + c_phi**2
-                sobol_data.Ri_prime[i, 1, 2] =  s_phi*s_theta
-                sobol_data.Ri_prime[i, 2, 0] = -s_theta*c_phi
-                sobol_data.Ri_prime[i, 2, 1] = -s_theta*s_phi
-                sobol_data.Ri_prime[i, 2, 2] =  c_theta
-
-            # Pre-calculate the rotation matrix for the rotor models.
-            else:
-                c_sigma = cos(sigma)
-                s_sigma = sin(sigma)
-                sobol_data.Ri_prime[i, 0, 0] =  c_sigma
-                sobol_data.Ri_prime[i, 0, 1] = -s_sigma
-                sobol_data.Ri_prime[i, 1, 0] =  s_sigma
-                sobol_data.Ri_prime[i, 1, 1] =  c_sigma
-                sobol_data.Ri_prime[i, 2, 2] = 1.0
+        sobol_data.Ri2_prime = None
+
+        # The cached arrays.
+        names = ['angles', 'Ri_prime']
+        if 'sigma2' in dims:
+            names.append('Ri2_prime')
+
+        # Load the memory-mapped data from the on-disk cache.
+        if self.sobol_cache_dir != None:
+            files = [sobol_cache_file(cache_dir=self.sobol_cache_dir, model=self.model, dims=dims, total_num=total_num, name=name) for name in names]
+            data = load_sobol_cache(files=files, m=m, total_num=total_num)
+            if data != None:
+                sobol_data.sobol_angles, sobol_data.Ri_prime = data[:2]
+                if len(data) == 3:
+                    sobol_data.Ri2_prime = data[2]
+                print("   Loaded %s points from the Sobol' cache." % total_num)
+                return
+
+        # The Sobol' points, using the direction numbers of the sobol_lib module.
+        sobol_lib.i4_sobol(m, 0)
+        points = sobol_points(v=sobol_lib.v[:m], recipd=sobol_lib.recipd, n=total_num, skip=1000)
+
+        # Convert the points to angles and pre-calculate the rotation matrices.
+        angles = sobol_angles(dims=dims, points=points)
+        sobol_data.Ri_prime, sobol_data.Ri2_prime = sobol_rotations(dims=dims, angles=angles)
+        sobol_data.sobol_angles = angles.astype(float32)
+
+        # Store the data in the on-disk cache.
+        if self.sobol_cache_dir != None:
+            save_sobol_cache(files=files, data=[sobol_data.sobol_angles, sobol_data.Ri_prime, sobol_data.Ri2_prime][:len(names)])
 
         # Printout (useful to see how long this takes!).
         print("   Oversampled to %s points." % total_num)
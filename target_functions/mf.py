@@ -24,7 +24,7 @@
 
 # Python module imports.
 from math import pi
-from numpy import dot, float64, ones, sum, transpose, zeros
+from numpy import arange, array, concatenate, dot, float64, moveaxis, ndarray, ones, repeat, sum, transpose, zeros
 
 # relax module imports.
 from lib.auto_relaxation.ri import calc_noe, calc_dnoe, calc_d2noe, calc_r1, calc_dr1, calc_d2r1, extract_r1, extract_dr1, extract_d2r1
@@ -39,6 +39,10 @@ from lib.spectral_densities.model_free_components import calc_S2_te_jw_comps, ca
 from target_functions.chi2 import chi2, dchi2_element, d2chi2_element
 
 
+# The maximum number of parameter vectors per spin block of the batched target function, bounding the memory usage.
+BATCH_SIZE = 1000
+
+
 class Mf:
     def __init__(self, init_params=None, model_type=None, diff_type=None, diff_params=None, scaling_matrix=None, num_spins=None, equations=None, param_types=None, param_values=None, relax_data=None, errors=None, bond_length=None, csa=None, num_frq=0, frq=None, num_ri=None, remap_table=None, noe_r1_table=None, ri_labels=None, gx=0, gh=0, h_bar=0, mu0=0, num_params=None, vectors=None):
         """The model-free minimisation class.
@@ -338,6 +342,13 @@ class Mf:
             if missing_r1:
                 self.init_res_r1_data(self.data[i])
 
+        # Group the spins into blocks for the global diffusion tensor models.
+        if self.model_type == 'diff' or self.model_type == 'all':
+            self.init_blocks()
+
+        # The spin block of the batched target function, created on the first call.
+        self.batch_data = None
+
         # Scaling initialisation.
         if self.scaling_matrix is not None:
             self.scaling_flag = 1
@@ -489,7 +500,7 @@ class Mf:
         """Function for calculating the chi-squared value.
 
         Used in the minimisation of diffusion tensor parameters with all model-free parameters
-        fixed.
+        fixed.  The values of all spins of a spin block are calculated simultaneously.
         """
 
         # Store the parameter values in self.func_test for testing.
@@ -505,11 +516,11 @@ class Mf:
         # Set the total chi2 to zero.
         self.total_chi2 = 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation times (common to all spins).
+        self.diff_data.calc_ti(self.tau_data, self.diff_data)
 
+        # Loop over the spin blocks.
+        for data in self.blocks:
             # Direction cosine calculations.
             if self.diff_data.calc_di:
                 self.diff_data.calc_di(data, self.diff_data)
@@ -517,8 +528,8 @@ class Mf:
             # Diffusion tensor weight calculations.
             self.diff_data.calc_ci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            self.diff_data.calc_ti(data, self.diff_data)
+            # Diffusion tensor correlation times, broadcast over the spin dimension.
+            data.ti = self.tau_data.ti[:, None]
 
             # ti spectral density components.
             data.w_ti_sqrd = data.frq_sqrd_list_ext * data.ti ** 2
@@ -543,11 +554,11 @@ class Mf:
                 if data.create_ri[m]:
                     data.create_ri[m](data, m, data.remap_table[m], data.get_r1, data.param_values)
 
-            # Calculate the chi-squared value.
+            # Calculate the chi-squared values of the spins.
             data.chi2 = chi2(data.relax_data, data.ri, data.errors)
 
-            # Add the residue specific chi2 to the total chi2.
-            self.total_chi2 = self.total_chi2 + data.chi2
+            # Add the spin specific chi2 values to the total chi2.
+            self.total_chi2 = self.total_chi2 + sum(data.chi2)
 
         return self.total_chi2
 
@@ -556,7 +567,7 @@ class Mf:
         """Function for calculating the chi-squared value.
 
         Used in the minimisation of diffusion tensor parameters together with all model-free
-        parameters.
+        parameters.  The values of all spins of a spin block are calculated simultaneously.
         """
 
         # Store the parameter values in self.func_test for testing.
@@ -572,10 +583,13 @@ class Mf:
         # Set the total chi2 to zero.
         self.total_chi2 = 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation times (common to all spins).
+        self.diff_data.calc_ti(self.tau_data, self.diff_data)
+
+        # Loop over the spin blocks.
+        for data in self.blocks:
+            # The parameters of the spins, one column per spin.
+            block_params = params[data.param_index]
 
             # Direction cosine calculations.
             if self.diff_data.calc_di:
@@ -584,8 +598,8 @@ class Mf:
             # Diffusion tensor weight calculations.
             self.diff_data.calc_ci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            self.diff_data.calc_ti(data, self.diff_data)
+            # Diffusion tensor correlation times, broadcast over the spin dimension.
+            data.ti = self.tau_data.ti[:, None]
 
             # ti spectral density components.
             data.w_ti_sqrd = data.frq_sqrd_list_ext * data.ti ** 2
@@ -593,13 +607,13 @@ class Mf:
 
             # Calculate the components of the spectral densities.
             if data.calc_jw_comps:
-                data.calc_jw_comps(data, params)
+                data.calc_jw_comps(data, block_params)
 
             # Calculate the spectral density values.
-            data.jw = data.calc_jw(data, params)
+            data.jw = data.calc_jw(data, block_params)
 
             # Calculate the relaxation formula components.
-            data.create_ri_comps(data, params)
+            data.create_ri_comps(data, block_params)
 
             # Calculate the R1, R2, and sigma_noe values.
             data.ri_prime = data.create_ri_prime(data)
@@ -608,17 +622,92 @@ class Mf:
             data.ri = data.ri_prime * 1.0
             for m in range(data.num_ri):
                 if data.create_ri[m]:
-                    data.create_ri[m](data, m, data.remap_table[m], data.get_r1, params)
+                    data.create_ri[m](data, m, data.remap_table[m], data.get_r1, block_params)
 
-            # Calculate the chi-squared value.
+            # Calculate the chi-squared values of the spins.
             data.chi2 = chi2(data.relax_data, data.ri, data.errors)
 
-            # Add the residue specific chi2 to the total chi2.
-            self.total_chi2 = self.total_chi2 + data.chi2
+            # Add the spin specific chi2 values to the total chi2.
+            self.total_chi2 = self.total_chi2 + sum(data.chi2)
 
         return self.total_chi2
 
 
+    def func_batch(self, params):
+        """Function for calculating the chi-squared values of many parameter vectors at once.
+
+        Used in the grid search of the model-free parameters of a single spin, for the 'mf' and 'local_tm' model types.  The parameter vectors are evaluated in chunks of at most BATCH_SIZE vectors, as a spin block with one copy of the spin data per vector.
+
+
+        @param params:      The parameter vectors, one row per vector.
+        @type params:       numpy rank-2 array
+        @raises RelaxError: For the 'diff' and 'all' model types.
+        @return:            The chi-squared values.
+        @rtype:             numpy rank-1 float64 array
+        """
+
+        # Only single spins are supported.
+        if self.model_type != 'mf' and self.model_type != 'local_tm':
+            raise RelaxError("The batched target function is not implemented for the '%s' model type." % self.model_type)
+
+        # Loop over the chunks of parameter vectors.
+        chi2_values = []
+        for start in range(0, len(params), BATCH_SIZE):
+            # The parameter vectors, padded with copies of the last vector to the size of the spin block.
+            chunk = params[start:start+BATCH_SIZE]
+            num = len(chunk)
+            if self.batch_data is None or self.batch_data.num_spins < num:
+                self.batch_data = self.init_batch_data(num)
+            data = self.batch_data
+            if num < data.num_spins:
+                chunk = concatenate([chunk, repeat(chunk[-1:], data.num_spins - num, axis=0)])
+
+            # Scaling.
+            if self.scaling_flag:
+                chunk = dot(chunk, self.scaling_matrix)
+
+            # The parameters of the vectors, one column per vector.
+            chunk = transpose(chunk)
+
+            # Local tm correlation times.
+            if self.model_type == 'local_tm':
+                # Diffusion tensor parameters.
+                data.diff_data.params = chunk[0:1]
+
+                # Diffusion tensor correlation times.
+                data.diff_data.calc_ti(data, data.diff_data)
+
+                # ti spectral density components.
+                data.w_ti_sqrd = data.frq_sqrd_list_ext * data.ti ** 2
+                data.fact_ti = 1.0 / (1.0 + data.w_ti_sqrd)
+
+            # Calculate the components of the spectral densities.
+            if data.calc_jw_comps:
+                data.calc_jw_comps(data, chunk)
+
+            # Calculate the spectral density values.
+            data.jw = data.calc_jw(data, chunk)
+
+            # Calculate the relaxation formula components.
+            data.create_ri_comps(data, chunk)
+
+            # Calculate the R1, R2, and sigma_noe values.
+            data.ri_prime = data.create_ri_prime(data)
+
+            # Calculate the NOE values.
+            data.ri = data.ri_prime * 1.0
+            for m in range(data.num_ri):
+                if data.create_ri[m]:
+                    data.create_ri[m](data, m, data.remap_table[m], data.get_r1, chunk)
+
+            # Calculate the chi-squared values of the vectors.
+            data.chi2 = chi2(data.relax_data, data.ri, data.errors)
+            chi2_values.append(data.chi2[:num])
+
+        # Return the chi-squared values.
+        return concatenate(chi2_values)
+
+
     def dfunc_mf(self, params):
         """Function for calculating the chi-squared gradient.
 
@@ -739,7 +828,7 @@ class Mf:
         """Function for calculating the chi-squared gradient.
 
         Used in the minimisation of diffusion tensor parameters with all model-free parameters
-        fixed.
+        fixed.  The gradients of all spins of a spin block are calculated simultaneously.
         """
 
         # Test if the function has already been called, otherwise run self.func.
@@ -759,12 +848,11 @@ class Mf:
         # Set the total chi2 gradient to zero.
         self.total_dchi2 = self.total_dchi2 * 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation time gradients (common to all spins).
+        self.diff_data.calc_dti(self.tau_data, self.diff_data)
 
+        # Loop over the spin blocks.
+        for data in self.blocks:
             # Direction cosine calculations.
             if self.diff_data.calc_ddi:
                 self.diff_data.calc_ddi(data, self.diff_data)
@@ -773,8 +861,8 @@ class Mf:
             if self.diff_data.calc_dci:
                 self.diff_data.calc_dci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            self.diff_data.calc_dti(data, self.diff_data)
+            # Diffusion tensor correlation time gradients, broadcast over the spin dimension.
+            data.dti = self.tau_data.dti[..., None]
 
             # Calculate the spectral density gradient components.
             if data.calc_djw_comps:
@@ -798,16 +886,16 @@ class Mf:
                 data.dri[j] = data.dri_prime[j]
                 for m in range(data.num_ri):
                     if data.create_dri[m]:
-                        data.create_dri[m](data, m, data.remap_table[m], data.get_dr1, params, j)
+                        data.create_dri[m](data, m, data.remap_table[m], data.get_dr1, data.param_values, j)
 
-                # Calculate the chi-squared gradient.
+                # Calculate the chi-squared gradients of the spins.
                 data.dchi2[j] = dchi2_element(data.relax_data, data.ri, data.dri[j], data.errors)
 
             # Index for the construction of the global generic model-free gradient.
             index = self.diff_data.num_params
 
             # Diffusion parameter part of the global generic model-free gradient.
-            self.total_dchi2[0:index] = self.total_dchi2[0:index] + data.dchi2[0:index]
+            self.total_dchi2[0:index] = self.total_dchi2[0:index] + sum(data.dchi2[0:index], axis=1)
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -821,7 +909,7 @@ class Mf:
         """Function for calculating the chi-squared gradient.
 
         Used in the minimisation of diffusion tensor parameters together with all model-free
-        parameters.
+        parameters.  The gradients of all spins of a spin block are calculated simultaneously.
         """
 
         # Test if the function has already been called, otherwise run self.func.
@@ -841,10 +929,13 @@ class Mf:
         # Set the total chi2 gradient to zero.
         self.total_dchi2 = self.total_dchi2 * 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation time gradients (common to all spins).
+        self.diff_data.calc_dti(self.tau_data, self.diff_data)
+
+        # Loop over the spin blocks.
+        for data in self.blocks:
+            # The parameters of the spins, one column per spin.
+            block_params = params[data.param_index]
 
             # Direction cosine calculations.
             if self.diff_data.calc_ddi:
@@ -854,23 +945,23 @@ class Mf:
             if self.diff_data.calc_dci:
                 self.diff_data.calc_dci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            self.diff_data.calc_dti(data, self.diff_data)
+            # Diffusion tensor correlation time gradients, broadcast over the spin dimension.
+            data.dti = self.tau_data.dti[..., None]
 
             # Calculate the spectral density gradient components.
             if data.calc_djw_comps:
-                data.calc_djw_comps(data, params)
+                data.calc_djw_comps(data, block_params)
 
             # Loop over the gradient.
             for j in range(data.total_num_params):
                 # Calculate the spectral density gradients.
                 if data.calc_djw[j]:
-                    data.djw = data.calc_djw[j](data, params, j)
+                    data.djw = data.calc_djw[j](data, block_params, j)
                 else:
                     data.djw = data.djw * 0.0
 
                 # Calculate the relaxation gradient components.
-                data.create_dri_comps(data, params)
+                data.create_dri_comps(data, block_params)
 
                 # Calculate the R1, R2, and sigma_noe gradients.
                 data.dri_prime[j] = data.create_dri_prime[j](data)
@@ -879,19 +970,20 @@ class Mf:
                 data.dri[j] = data.dri_prime[j]
                 for m in range(data.num_ri):
                     if data.create_dri[m]:
-                        data.create_dri[m](data, m, data.remap_table[m], data.get_dr1, params, j)
+                        data.create_dri[m](data, m, data.remap_table[m], data.get_dr1, block_params, j)
 
-                # Calculate the chi-squared gradient.
+                # Calculate the chi-squared gradients of the spins.
                 data.dchi2[j] = dchi2_element(data.relax_data, data.ri, data.dri[j], data.errors)
 
             # Index for the construction of the global generic model-free gradient.
             index = self.diff_data.num_params
 
             # Diffusion parameter part of the global generic model-free gradient.
-            self.total_dchi2[0:index] = self.total_dchi2[0:index] + data.dchi2[0:index]
+            self.total_dchi2[0:index] = self.total_dchi2[0:index] + sum(data.dchi2[0:index], axis=1)
 
             # Model-free parameter part of the global generic model-free gradient.
-            self.total_dchi2[data.start_index:data.end_index] = self.total_dchi2[data.start_index:data.end_index] + data.dchi2[index:]
+            mf_index = data.param_index[index:]
+            self.total_dchi2[mf_index] = self.total_dchi2[mf_index] + data.dchi2[index:]
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -1008,7 +1100,7 @@ class Mf:
         """Function for calculating the chi-squared Hessian.
 
         Used in the minimisation of diffusion tensor parameters with all model-free parameters
-        fixed.
+        fixed.  The Hessians of all spins of a spin block are calculated simultaneously.
         """
 
         # Test if the gradient has already been called, otherwise run self.dfunc.
@@ -1025,11 +1117,12 @@ class Mf:
         # Set the total chi2 Hessian to zero.
         self.total_d2chi2 = self.total_d2chi2 * 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation time Hessians (common to all spins).
+        if self.diff_data.calc_d2ti:
+            self.diff_data.calc_d2ti(self.tau_data, self.diff_data)
 
+        # Loop over the spin blocks.
+        for data in self.blocks:
             # Direction cosine calculations.
             if self.diff_data.calc_d2di:
                self.diff_data.calc_d2di(data, self.diff_data)
@@ -1038,9 +1131,8 @@ class Mf:
             if self.diff_data.calc_d2ci:
                 self.diff_data.calc_d2ci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            if self.diff_data.calc_d2ti:
-               self.diff_data.calc_d2ti(data, self.diff_data)
+            # Diffusion tensor correlation time Hessians, broadcast over the spin dimension.
+            data.d2ti = self.tau_data.d2ti[..., None]
 
             # Loop over the lower triangle of the Hessian.
             for j in range(data.total_num_params):
@@ -1062,13 +1154,13 @@ class Mf:
                     data.d2ri[j, k] = data.d2ri_prime[j, k]
                     for m in range(data.num_ri):
                         if data.create_d2ri[m]:
-                            data.create_d2ri[m](data, m, data.remap_table[m], data.get_d2r1, params, j, k)
+                            data.create_d2ri[m](data, m, data.remap_table[m], data.get_d2r1, data.param_values, j, k)
 
-                    # Calculate the chi-squared Hessian.
+                    # Calculate the chi-squared Hessians of the spins.
                     data.d2chi2[j, k] = data.d2chi2[k, j] = d2chi2_element(data.relax_data, data.ri, data.dri[j], data.dri[k], data.d2ri[j, k], data.errors)
 
             # Pure diffusion parameter part of the global generic model-free Hessian.
-            self.total_d2chi2 = self.total_d2chi2 + data.d2chi2
+            self.total_d2chi2 = self.total_d2chi2 + sum(data.d2chi2, axis=2)
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -1082,7 +1174,7 @@ class Mf:
         """Function for calculating the chi-squared Hessian.
 
         Used in the minimisation of diffusion tensor parameters together with all model-free
-        parameters.
+        parameters.  The Hessians of all spins of a spin block are calculated simultaneously.
         """
 
         # Test if the gradient has already been called, otherwise run self.dfunc.
@@ -1099,10 +1191,14 @@ class Mf:
         # Set the total chi2 Hessian to zero.
         self.total_d2chi2 = self.total_d2chi2 * 0.0
 
-        # Loop over the residues.
-        for i in range(self.num_spins):
-            # Set self.data[i] to data.
-            data = self.data[i]
+        # Diffusion tensor correlation time Hessians (common to all spins).
+        if self.diff_data.calc_d2ti:
+            self.diff_data.calc_d2ti(self.tau_data, self.diff_data)
+
+        # Loop over the spin blocks.
+        for data in self.blocks:
+            # The parameters of the spins, one column per spin.
+            block_params = params[data.param_index]
 
             # Direction cosine calculations.
             if self.diff_data.calc_d2di:
@@ -1112,21 +1208,20 @@ class Mf:
             if self.diff_data.calc_d2ci:
                 self.diff_data.calc_d2ci(data, self.diff_data)
 
-            # Diffusion tensor correlation times.
-            if self.diff_data.calc_d2ti:
-               self.diff_data.calc_d2ti(data, self.diff_data)
+            # Diffusion tensor correlation time Hessians, broadcast over the spin dimension.
+            data.d2ti = self.tau_data.d2ti[..., None]
 
             # Loop over the lower triangle of the Hessian.
             for j in range(data.total_num_params):
                 for k in range(j + 1):
                     # Calculate the spectral density Hessians.
                     if data.calc_d2jw[j][k]:
-                        data.d2jw = data.calc_d2jw[j][k](data, params, j, k)
+                        data.d2jw = data.calc_d2jw[j][k](data, block_params, j, k)
                     else:
                         data.d2jw = data.d2jw * 0.0
 
                     # Calculate the relaxation Hessian components.
-                    data.create_d2ri_comps(data, params)
+                    data.create_d2ri_comps(data, block_params)
 
                     # Calculate the R1, R2, and sigma_noe Hessians.
                     if data.create_d2ri_prime[j][k]:
@@ -1136,23 +1231,25 @@ class Mf:
                     data.d2ri[j, k] = data.d2ri_prime[j, k]
                     for m in range(data.num_ri):
                         if data.create_d2ri[m]:
-                            data.create_d2ri[m](data, m, data.remap_table[m], data.get_d2r1, params, j, k)
+                            data.create_d2ri[m](data, m, data.remap_table[m], data.get_d2r1, block_params, j, k)
 
-                    # Calculate the chi-squared Hessian.
+                    # Calculate the chi-squared Hessians of the spins.
                     data.d2chi2[j, k] = data.d2chi2[k, j] = d2chi2_element(data.relax_data, data.ri, data.dri[j], data.dri[k], data.d2ri[j, k], data.errors)
 
             # Index for the construction of the global generic model-free Hessian.
             index = self.diff_data.num_params
+            diff_index = arange(index)
+            mf_index = data.param_index[index:]
 
             # Pure diffusion parameter part of the global generic model-free Hessian.
-            self.total_d2chi2[0:index, 0:index] = self.total_d2chi2[0:index, 0:index] + data.d2chi2[0:index, 0:index]
+            self.total_d2chi2[0:index, 0:index] = self.total_d2chi2[0:index, 0:index] + sum(data.d2chi2[0:index, 0:index], axis=2)
 
             # Pure model-free parameter part of the global generic model-free Hessian.
-            self.total_d2chi2[data.start_index:data.end_index, data.start_index:data.end_index] = self.total_d2chi2[data.start_index:data.end_index, data.start_index:data.end_index] + data.d2chi2[index:, index:]
+            self.total_d2chi2[mf_index[:, None], mf_index[None, :]] = self.total_d2chi2[mf_index[:, None], mf_index[None, :]] + data.d2chi2[index:, index:]
 
             # Off diagonal diffusion and model-free parameter parts of the global generic model-free Hessian.
-            self.total_d2chi2[0:index, data.start_index:data.end_index] = self.total_d2chi2[0:index, data.start_index:data.end_index] + data.d2chi2[0:index, index:]
-            self.total_d2chi2[data.start_index:data.end_index, 0:index] = self.total_d2chi2[data.start_index:data.end_index, 0:index] + data.d2chi2[index:, 0:index]
+            self.total_d2chi2[diff_index[:, None, None], mf_index[None, :]] = self.total_d2chi2[diff_index[:, None, None], mf_index[None, :]] + data.d2chi2[0:index, index:]
+            self.total_d2chi2[mf_index[:, None], diff_index[None, :, None]] = self.total_d2chi2[mf_index[:, None], diff_index[None, :, None]] + data.d2chi2[index:, 0:index]
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -1172,6 +1269,136 @@ class Mf:
         return self.data[0].ri[0]
 
 
+    def init_blocks(self):
+        """Function for grouping the spins into blocks for the global diffusion tensor models.
+
+        The spins of a block share the model-free equations, parameter types, relaxation data types
+        and spectrometer frequencies, and hence all equations.  The spin specific data of the block
+        is stacked along a trailing spin dimension so that the values of all spins are calculated
+        simultaneously.  The correlation times ti are the same for all spins and are calculated once
+        in the separate data structure self.tau_data.
+        """
+
+        # Group the spins, keeping the spin order within the blocks.
+        keys = []
+        groups = {}
+        ri_index = 0
+        for data in self.data:
+            # The indices of the relaxation data of the spin within the Levenberg-Marquardt Jacobian.
+            data.ri_index = arange(ri_index, ri_index + data.num_ri)
+            ri_index = ri_index + data.num_ri
+
+            # The spin block.
+            key = (data.equations, tuple(data.param_types), tuple(data.frq), tuple(data.ri_labels), tuple(data.remap_table), tuple(data.noe_r1_table), data.gh, data.gx)
+            if key not in groups:
+                keys.append(key)
+                groups[key] = []
+            groups[key].append(data)
+
+        # Initialise the spin blocks.
+        self.blocks = []
+        for key in keys:
+            self.blocks.append(self.init_block_data(groups[key]))
+
+        # Initialise the correlation time data structure.
+        self.tau_data = self.init_tau_data(self.diff_data)
+
+
+    def init_block_data(self, spins):
+        """Function for the initialisation of the data of a block of spins.
+
+        @param spins:   The data of the spins of the block, all sharing the same equations.
+        @type spins:    list of Data instances
+        @return:        The spin block data, with the spin specific data stacked along the last dimension.
+        @rtype:         Data instance
+        """
+
+        # Stack the spin specific data, the equations being shared.
+        block = self.stack_spin_data(spins, names=['relax_data', 'errors', 'bond_length', 'csa', 'dip_const_func', 'param_values'])
+        block.num_spins = len(spins)
+
+        # The frequencies are the same for all spins of the block.
+        block.frq_list_ext = spins[0].frq_list_ext[..., None]
+        block.frq_sqrd_list_ext = spins[0].frq_sqrd_list_ext[..., None]
+
+        # The XH unit vectors, one row per spin.
+        if spins[0].xh_unit_vector is not None:
+            block.xh_unit_vector = array([spin.xh_unit_vector for spin in spins], float64)
+
+        # The parameter indices within the parameters of the block.
+        block.tm_i = block.tm_li
+        block.s2_i = block.s2_li
+        block.s2f_i = block.s2f_li
+        block.s2s_i = block.s2s_li
+        block.te_i = block.te_li
+        block.tf_i = block.tf_li
+        block.ts_i = block.ts_li
+        block.rex_i = block.rex_li
+        block.r_i = block.r_li
+        block.csa_i = block.csa_li
+
+        # The indices of the diffusion and model-free parameters of each spin within the global parameter vector.
+        if self.model_type == 'all':
+            block.param_index = zeros((block.total_num_params, block.num_spins), int)
+            for i in range(block.num_spins):
+                block.param_index[:self.diff_data.num_params, i] = arange(self.diff_data.num_params)
+                block.param_index[self.diff_data.num_params:, i] = arange(spins[i].start_index, spins[i].end_index)
+
+        # The R1 data class.
+        if hasattr(spins[0], 'r1_data'):
+            block.r1_data = self.stack_spin_data([spin.r1_data for spin in spins])
+            block.r1_data.csa_i = block.csa_i
+            block.r1_data.r_i = block.r_i
+            block.r1_data.rex_i = block.rex_i
+
+        # Return the block.
+        return block
+
+
+    def init_batch_data(self, num):
+        """Function for the initialisation of the spin block of the batched target function.
+
+        The data of the single spin is repeated along the trailing spin dimension, once per parameter vector.  The diffusion tensor weights, and for the 'mf' model type the correlation times, are fixed and are calculated before the repetition.
+
+
+        @param num: The number of parameter vectors.
+        @type num:  int
+        @return:    The spin block data.
+        @rtype:     Data instance
+        """
+
+        # Alias.
+        data = self.data[0]
+
+        # Direction cosine calculations.
+        if self.diff_data.calc_di:
+            self.diff_data.calc_di(data, self.diff_data)
+
+        # Diffusion tensor weight calculations.
+        self.diff_data.calc_ci(data, self.diff_data)
+
+        # The spin block of the single spin.
+        block = self.init_block_data([data])
+        block.num_spins = num
+
+        # Repeat the spin data along the spin dimension (the frequencies are broadcast).
+        containers = [block]
+        if hasattr(block, 'r1_data'):
+            containers.append(block.r1_data)
+        for container in containers:
+            for name in container.__dict__:
+                value = getattr(container, name)
+                if isinstance(value, ndarray) and value.ndim and value.shape[-1] == 1 and name not in ['frq_list_ext', 'frq_sqrd_list_ext']:
+                    setattr(container, name, repeat(value, num, axis=-1))
+
+        # A separate diffusion tensor data structure for the local tm parameters of the vectors.
+        block.diff_data = Data()
+        block.diff_data.__dict__.update(self.diff_data.__dict__)
+
+        # Return the block.
+        return block
+
+
     def init_diff_data(self, diff_data):
         """Function for the initialisation of diffusion tensor specific data."""
 
@@ -1486,6 +1713,67 @@ class Mf:
         data.r1_data = r1_data
 
 
+    def init_tau_data(self, diff_data):
+        """Function for the initialisation of the correlation time data of the spin blocks.
+
+        @param diff_data:   The diffusion tensor data.
+        @type diff_data:    Data instance
+        @return:            The data structure for the correlation times ti and their gradients and Hessians.
+        @rtype:             Data instance
+        """
+
+        # Initialise an instance of Data.
+        data = Data()
+
+        # Correlation times and their components.
+        data.ti = zeros(diff_data.num_indices, float64)
+        data.tau_comps = zeros(diff_data.num_indices, float64)
+        data.tau_comps_sqrd = zeros(diff_data.num_indices, float64)
+        data.tau_comps_cubed = zeros(diff_data.num_indices, float64)
+        data.tau_scale = zeros(diff_data.num_indices, float64)
+
+        # The gradients and Hessians of the correlation times.
+        if diff_data.type == 'sphere':
+            data.dti = zeros((1, diff_data.num_indices), float64)
+            data.d2ti = zeros((1, 1, diff_data.num_indices), float64)
+        elif diff_data.type == 'spheroid':
+            data.dti = zeros((2, diff_data.num_indices), float64)
+            data.d2ti = zeros((2, 2, diff_data.num_indices), float64)
+        elif diff_data.type == 'ellipsoid':
+            data.dti = zeros((3, diff_data.num_indices), float64)
+            data.d2ti = zeros((3, 3, diff_data.num_indices), float64)
+
+        # Return the data.
+        return data
+
+
+    def stack_spin_data(self, spins, names=[]):
+        """Function for stacking the data of a number of spins along a trailing spin dimension.
+
+        All numpy arrays are stacked, the remaining data, including the equations, being taken from
+        the first spin.
+
+        @param spins:   The data of the spins.
+        @type spins:    list of Data instances
+        @keyword names: The names of the additional non-array data to stack.
+        @type names:    list of str
+        @return:        The stacked data.
+        @rtype:         Data instance
+        """
+
+        # Initialise an instance of Data, starting from the first spin.
+        block = Data()
+        block.__dict__.update(spins[0].__dict__)
+
+        # Stack the data.
+        for name in spins[0].__dict__:
+            if isinstance(getattr(spins[0], name), ndarray) or name in names:
+                setattr(block, name, moveaxis(array([getattr(spin, name) for spin in spins]), 0, -1))
+
+        # Return the stacked data.
+        return block
+
+
     def lm_dri(self):
         """Return the function used for Levenberg-Marquardt minimisation."""
 
@@ -1496,23 +1784,10 @@ class Mf:
             # Set the total dri gradient to zero.
             self.total_dri = self.total_dri * 0.0
 
-            # Ri indices.
-            ri_start_index = 0
-            ri_end_index = 0
-
-            # Loop over the residues.
-            for i in range(self.num_spins):
-                # Set self.data[i] to data.
-                data = self.data[i]
-
-                # Increment Ri end index.
-                ri_end_index = ri_end_index + data.num_ri
-
+            # Loop over the spin blocks.
+            for data in self.blocks:
                 # Diffusion parameter part of the global generic model-free gradient.
-                self.total_dri[0:self.diff_data.num_params, ri_start_index:ri_end_index] = self.total_dri[0:self.diff_data.num_params, ri_start_index:ri_end_index] + data.dri[0:self.diff_data.num_params]
-
-                # Increment Ri start index.
-                ri_start_index = ri_start_index + data.num_ri
+                self.total_dri[0:self.diff_data.num_params, data.ri_index] = self.total_dri[0:self.diff_data.num_params, data.ri_index] + data.dri[0:self.diff_data.num_params]
 
             # dri.
             dri = self.total_dri
@@ -1521,26 +1796,14 @@ class Mf:
             # Set the total dri gradient to zero.
             self.total_dri = self.total_dri * 0.0
 
-            # Ri indices.
-            ri_start_index = 0
-            ri_end_index = 0
-
-            # Loop over the residues.
-            for i in range(self.num_spins):
-                # Set self.data[i] to data.
-                data = self.data[i]
-
-                # Increment Ri end index.
-                ri_end_index = ri_end_index + data.num_ri
-
+            # Loop over the spin blocks.
+            for data in self.blocks:
                 # Diffusion parameter part of the global generic model-free gradient.
-                self.total_dri[0:self.diff_data.num_params, ri_start_index:ri_end_index] = self.total_dri[0:self.diff_data.num_params, ri_start_index:ri_end_index] + data.dri[0:self.diff_data.num_params]
+                self.total_dri[0:self.diff_data.num_params, data.ri_index] = self.total_dri[0:self.diff_data.num_params, data.ri_index] + data.dri[0:self.diff_data.num_params]
 
                 # Model-free parameter part of the global generic model-free gradient.
-                self.total_dri[data.start_index:data.end_index, ri_start_index:ri_end_index] = self.total_dri[data.start_index:data.end_index, ri_start_index:ri_end_index] + data.dri[self.diff_data.num_params:]
-
-                # Increment Ri start index.
-                ri_start_index = ri_start_index + data.num_ri
+                mf_index = data.param_index[self.diff_data.num_params:, None]
+                self.total_dri[mf_index, data.ri_index] = self.total_dri[mf_index, data.ri_index] + data.dri[self.diff_data.num_params:]
 
             # dri.
             dri = self.total_dri
@@ -21,18 +21,17 @@
 
 # Python module imports.
 from math import sqrt
-from numpy import array, dot, eye, float64, ones, transpose, zeros
+from numpy import absolute, add, append, array, dot, einsum, eye, float64, int32, ones, transpose, where, zeros
 
 # relax module imports.
 from lib.alignment.alignment_tensor import dAi_dAxx, dAi_dAyy, dAi_dAxy, dAi_dAxz, dAi_dAyz, to_tensor
 from lib.alignment.paramag_centre import vectors_single_centre, vectors_centre_per_state
-from lib.alignment.pcs import ave_pcs_tensor, ave_pcs_tensor_ddeltaij_dAmn, ave_pcs_tensor_ddeltaij_dc, pcs_constant_grad, pcs_tensor
-from lib.alignment.rdc import ave_rdc_tensor, ave_rdc_tensor_dDij_dAmn, ave_rdc_tensor_pseudoatom, ave_rdc_tensor_pseudoatom_dDij_dAmn, rdc_tensor
+from lib.alignment.pcs import pcs_constant_grad
 from lib.errors import RelaxError
 from lib.float import isNaN
 from lib.geometry.rotations import euler_to_R_zyz
 from lib.physical_constants import pcs_constant
-from target_functions.chi2 import chi2, dchi2_element, d2chi2_element
+from target_functions.chi2 import chi2
 
 
 class N_state_opt:
@@ -371,6 +370,12 @@ class N_state_opt:
                             # The PCS weights.
                             self.pcs_errors[align_index, j] = self.pcs_errors[align_index, j] / sqrt(pcs_weights[align_index, j])
 
+            # The masks of the back-calculated data, excluding the missing data and the alignments without data.
+            if self.rdc_flag_sum:
+                self.rdc_mask = (self.missing_rdc == 0) & array(self.rdc_flag)[:, None]
+            if self.pcs_flag_sum:
+                self.pcs_mask = (self.missing_deltaij == 0) & array(self.pcs_flag)[:, None]
+
             # The paramagnetic centre vectors and distances.
             if self.pcs_flag_sum:
                 # Initialise the data structures.
@@ -388,15 +393,17 @@ class N_state_opt:
                 # Set up the paramagnetic info.
                 self.paramag_info()
 
-            # PCS function, gradient, and Hessian matrices.
+            # The interatomic vector and dipolar constant arrays.
+            if self.rdc_flag_sum:
+                self.rdc_info()
+
+            # PCS function and gradient matrices.
             self.deltaij_theta = zeros((self.num_align, self.num_spins), float64)
             self.ddeltaij_theta = zeros((self.total_num_params, self.num_align, self.num_spins), float64)
-            self.d2deltaij_theta = zeros((self.total_num_params, self.total_num_params, self.num_align, self.num_spins), float64)
 
-            # RDC function, gradient, and Hessian matrices.
+            # RDC function and gradient matrices.
             self.rdc_theta = zeros((self.num_align, self.num_interatom), float64)
             self.drdc_theta = zeros((self.total_num_params, self.num_align, self.num_interatom), float64)
-            self.d2rdc_theta = zeros((self.total_num_params, self.total_num_params, self.num_align, self.num_interatom), float64)
 
             # Set the target function, gradient, and Hessian.
             self.func = self.func_standard
@@ -661,53 +668,55 @@ class N_state_opt:
         elif not self.probs_fixed:
             self.probs = params[-(self.N-1):]
 
+        # The weights of all states, the last being 1 minus the sum of all others if not supplied.
+        self.weights = array(self.probs, float64)
+        if len(self.weights) < self.N:
+            self.weights = append(self.weights, 1.0 - self.weights.sum())
+
         # Unpack the paramagnetic centre (also update the paramagnetic info).
         if not self.centre_fixed:
             self.paramag_centre = params[-3:]
             self.paramag_info()
 
-        # Loop over each alignment.
+        # Create the optimised alignment tensors from the parameters.
         index = 0
         for align_index in range(self.num_align):
-            # Create tensor i from the parameters.
             if not self.fixed_tensors[align_index]:
                 to_tensor(self.A[align_index], params[5*index:5*index + 5])
                 index += 1
 
-            # The back calculated RDC.
-            if self.rdc_flag[align_index]:
-                # Loop over the spin pairs k.
-                for j in range(self.num_interatom):
-                    # Calculate the average RDC.
-                    if not self.missing_rdc[align_index, j]:
-                        if self.rdc_pseudo_flags[j]:
-                            self.rdc_theta[align_index, j] = ave_rdc_tensor_pseudoatom(self.dip_const[j], self.dip_vect[j], self.N, self.A[align_index], weights=self.probs)
-                        else:
-                            self.rdc_theta[align_index, j] = ave_rdc_tensor(self.dip_const[j], self.dip_vect[j], self.N, self.A[align_index], weights=self.probs)
-
-                        # Add the J coupling to convert into the back-calculated T = J+D value.
-                        if self.T_flags[align_index, j]:
-                            self.rdc_theta[align_index, j] += self.j_couplings[j]
-
-                        # Take the absolute value.
-                        if self.absolute_rdc[align_index, j]:
-                            self.rdc_theta[align_index, j] = abs(self.rdc_theta[align_index, j])
-
-            # The back calculated PCS.
-            if self.pcs_flag[align_index]:
-                # Loop over the spin systems j.
-                for j in range(self.num_spins):
-                    # Calculate the average PCS.
-                    if not self.missing_deltaij[align_index, j]:
-                        self.deltaij_theta[align_index, j] = ave_pcs_tensor(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.A[align_index], weights=self.probs)
-
-            # Calculate and sum the single alignment chi-squared value (for the RDC).
-            if self.rdc_flag[align_index]:
-                chi2_sum = chi2_sum + chi2(self.rdc[align_index], self.rdc_theta[align_index], self.rdc_errors[align_index])
-
-            # Calculate and sum the single alignment chi-squared value (for the PCS).
-            if self.pcs_flag[align_index]:
-                chi2_sum = chi2_sum + chi2(self.deltaij[align_index], self.deltaij_theta[align_index], self.pcs_errors[align_index])
+        # The back calculated RDCs.
+        if self.rdc_flag_sum:
+            # The mu_jc . Ai . mu_jc projections for all alignments, vectors, and states.
+            self.rdc_orient = einsum('kcn,inm,kcm->ikc', self.rdc_vect, self.A, self.rdc_vect)
+
+            # The ensemble and pseudo-atom averaged RDCs.
+            rdc_theta = self.pseudo_average(self.rdc_const * dot(self.rdc_orient, self.weights))
+
+            # Add the J coupling to convert into the back-calculated T = J+D value.
+            if self.rdc_j is not None:
+                rdc_theta = rdc_theta + self.rdc_j
+
+            # Take the absolute value.
+            if self.rdc_absolute is not None:
+                rdc_theta = where(self.rdc_absolute, absolute(rdc_theta), rdc_theta)
+
+            # Store the values, skipping the missing data.
+            self.rdc_theta = where(self.rdc_mask, rdc_theta, 0.0)
+
+            # The chi-squared value for all alignments with RDC data.
+            chi2_sum = chi2_sum + chi2((self.rdc[self.rdc_flag]).ravel(), (self.rdc_theta[self.rdc_flag]).ravel(), (self.rdc_errors[self.rdc_flag]).ravel())
+
+        # The back calculated PCSs.
+        if self.pcs_flag_sum:
+            # The mu_jc . Ai . mu_jc projections for all alignments, spins, and states.
+            self.pcs_orient = einsum('jcn,inm,jcm->ijc', self.paramag_unit_vect, self.A, self.paramag_unit_vect)
+
+            # The ensemble averaged PCSs, skipping the missing data.
+            self.deltaij_theta = where(self.pcs_mask, dot(self.pcs_const * self.pcs_orient, self.weights), 0.0)
+
+            # The chi-squared value for all alignments with PCS data.
+            chi2_sum = chi2_sum + chi2((self.deltaij[self.pcs_flag]).ravel(), (self.deltaij_theta[self.pcs_flag]).ravel(), (self.pcs_errors[self.pcs_flag]).ravel())
 
         # Return the chi-squared value.
         return chi2_sum
@@ -935,78 +944,68 @@ class N_state_opt:
         # Initial chi-squared (or SSE) gradient.
         self.dchi2 = self.dchi2 * 0.0
 
-        # Loop over each alignment.
-        for align_index in range(self.num_align):
-            # Construct the Amn partial derivative components for the RDC.
-            if not self.fixed_tensors[align_index]:
-                for j in range(self.num_interatom):
-                    if self.rdc_flag[align_index] and not self.missing_rdc[align_index, j]:
-                        if self.rdc_pseudo_flags[j]:
-                            self.drdc_theta[align_index*5,   align_index, j] = ave_rdc_tensor_pseudoatom_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[0], weights=self.probs)
-                            self.drdc_theta[align_index*5+1, align_index, j] = ave_rdc_tensor_pseudoatom_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[1], weights=self.probs)
-                            self.drdc_theta[align_index*5+2, align_index, j] = ave_rdc_tensor_pseudoatom_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[2], weights=self.probs)
-                            self.drdc_theta[align_index*5+3, align_index, j] = ave_rdc_tensor_pseudoatom_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[3], weights=self.probs)
-                            self.drdc_theta[align_index*5+4, align_index, j] = ave_rdc_tensor_pseudoatom_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[4], weights=self.probs)
-                        else:
-                            self.drdc_theta[align_index*5,   align_index, j] = ave_rdc_tensor_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[0], weights=self.probs)
-                            self.drdc_theta[align_index*5+1, align_index, j] = ave_rdc_tensor_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[1], weights=self.probs)
-                            self.drdc_theta[align_index*5+2, align_index, j] = ave_rdc_tensor_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[2], weights=self.probs)
-                            self.drdc_theta[align_index*5+3, align_index, j] = ave_rdc_tensor_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[3], weights=self.probs)
-                            self.drdc_theta[align_index*5+4, align_index, j] = ave_rdc_tensor_dDij_dAmn(self.dip_const[j], self.dip_vect[j], self.N, self.dA[4], weights=self.probs)
-
-                        # Add the J coupling to convert into the back-calculated T = J+D value.
-                        if self.T_flags[align_index, j]:
-                            raise RelaxError("Gradients for T = J+D data have not been implemented yet.")
-
-            # Construct the Amn partial derivative components for the PCS.
-            if not self.fixed_tensors[align_index]:
-                for j in range(self.num_spins):
-                    if self.pcs_flag[align_index] and not self.missing_deltaij[align_index, j]:
-                        self.ddeltaij_theta[align_index*5, align_index, j] = ave_pcs_tensor_ddeltaij_dAmn(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.dA[0], weights=self.probs)
-                        self.ddeltaij_theta[align_index*5+1, align_index, j] = ave_pcs_tensor_ddeltaij_dAmn(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.dA[1], weights=self.probs)
-                        self.ddeltaij_theta[align_index*5+2, align_index, j] = ave_pcs_tensor_ddeltaij_dAmn(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.dA[2], weights=self.probs)
-                        self.ddeltaij_theta[align_index*5+3, align_index, j] = ave_pcs_tensor_ddeltaij_dAmn(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.dA[3], weights=self.probs)
-                        self.ddeltaij_theta[align_index*5+4, align_index, j] = ave_pcs_tensor_ddeltaij_dAmn(self.pcs_const[align_index, j], self.paramag_unit_vect[j], self.N, self.dA[4], weights=self.probs)
-
-            # Construct the pc partial derivative gradient components, looping over each state.
-            if not self.probs_fixed:
-                # Shift the parameter index if the paramagnetic position is optimised.
-                x = 0
-                if not self.centre_fixed:
-                    x = 3
+        # The number of probability parameters with gradients (shifted if the paramagnetic position is optimised).
+        num_probs = 0
+        if not self.probs_fixed:
+            num_probs = self.N - 1
+            if not self.centre_fixed:
+                num_probs = num_probs - 3
+        probs_slice = slice(self.num_align_params, self.num_align_params + num_probs)
 
-                # Loop over each state.
-                for c in range(self.N - 1 - x):
-                    # Index in the parameter array.
-                    param_index = self.num_align_params + c
+        # The RDC gradient.
+        if self.rdc_flag_sum:
+            # Reinitialise.
+            self.drdc_theta = self.drdc_theta * 0.0
+
+            # The Amn partial derivatives, identical for all alignments.
+            grad = self.pseudo_average(self.rdc_const * dot(self.rdc_vect_dA, self.weights))
+
+            # Construct the Amn partial derivative components.
+            index = 0
+            for align_index in range(self.num_align):
+                if not self.fixed_tensors[align_index]:
+                    self.drdc_theta[5*index:5*index+5, align_index] = where(self.rdc_mask[align_index], grad, 0.0)
+                    index += 1
+
+                    # Gradients for the T = J+D data.
+                    if self.T_flags[align_index][self.rdc_mask[align_index]].any():
+                        raise RelaxError("Gradients for T = J+D data have not been implemented yet.")
 
-                    # Calculate the RDC for state c (this is the pc partial derivative).
-                    for j in range(self.num_interatom):
-                        if self.rdc_flag[align_index] and not self.missing_rdc[align_index, j]:
-                            self.drdc_theta[param_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.A[align_index])
+            # The pc partial derivatives (the RDC for state c).
+            if num_probs > 0:
+                grad = self.pseudo_average(self.rdc_const * transpose(self.rdc_orient[:, :, :num_probs], (2, 0, 1)))
+                self.drdc_theta[probs_slice] = where(self.rdc_mask, grad, 0.0)
 
-                    # Calculate the PCS for state c (this is the pc partial derivative).
-                    for j in range(self.num_spins):
-                        if self.pcs_flag[align_index] and not self.missing_deltaij[align_index, j]:
-                            self.ddeltaij_theta[param_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.A[align_index])
+            # The chi-squared gradient.
+            self.dchi2 = self.dchi2 - 2.0 * einsum('kij,ij->k', self.drdc_theta, where(self.rdc_mask, (self.rdc - self.rdc_theta) / self.rdc_errors**2, 0.0))
 
-            # Construct the paramagnetic centre c partial derivative components for the PCS.
+        # The PCS gradient.
+        if self.pcs_flag_sum:
+            # Reinitialise.
+            self.ddeltaij_theta = self.ddeltaij_theta * 0.0
+
+            # Construct the Amn partial derivative components.
+            index = 0
+            for align_index in range(self.num_align):
+                if not self.fixed_tensors[align_index]:
+                    grad = dot(self.pcs_const[align_index] * self.pcs_vect_dA, self.weights)
+                    self.ddeltaij_theta[5*index:5*index+5, align_index] = where(self.pcs_mask[align_index], grad, 0.0)
+                    index += 1
+
+            # The pc partial derivatives (the PCS for state c).
+            if num_probs > 0:
+                grad = transpose((self.pcs_const * self.pcs_orient)[:, :, :num_probs], (2, 0, 1))
+                self.ddeltaij_theta[probs_slice] = where(self.pcs_mask, grad, 0.0)
+
+            # The paramagnetic centre partial derivatives, with the centre to spin vector derivative of -1 for each coordinate (scaled from Angstrom units).
             if not self.centre_fixed:
-                for j in range(self.num_spins):
-                    if self.pcs_flag[align_index] and not self.missing_deltaij[align_index, j]:
-                        self.ddeltaij_theta[-3, align_index, j] = ave_pcs_tensor_ddeltaij_dc(ddj=self.dpcs_const_theta[align_index, j,:, 0], dj=self.pcs_const[align_index, j], r=self.paramag_dist[j], unit_vect=self.paramag_unit_vect[j], N=self.N, Ai=self.A[align_index], dr_dc=self.dr_theta[0], weights=self.probs)
-                        self.ddeltaij_theta[-2, align_index, j] = ave_pcs_tensor_ddeltaij_dc(ddj=self.dpcs_const_theta[align_index, j,:, 1], dj=self.pcs_const[align_index, j], r=self.paramag_dist[j], unit_vect=self.paramag_unit_vect[j], N=self.N, Ai=self.A[align_index], dr_dc=self.dr_theta[1], weights=self.probs)
-                        self.ddeltaij_theta[-1, align_index, j] = ave_pcs_tensor_ddeltaij_dc(ddj=self.dpcs_const_theta[align_index, j,:, 2], dj=self.pcs_const[align_index, j], r=self.paramag_dist[j], unit_vect=self.paramag_unit_vect[j], N=self.N, Ai=self.A[align_index], dr_dc=self.dr_theta[2], weights=self.probs)
-
-            # Construct the chi-squared gradient element for parameter k, alignment i.
-            for k in range(self.total_num_params):
-                # RDC part of the chi-squared gradient.
-                if self.rdc_flag[align_index]:
-                    self.dchi2[k] = self.dchi2[k] + dchi2_element(self.rdc[align_index], self.rdc_theta[align_index], self.drdc_theta[k, align_index], self.rdc_errors[align_index])
-
-                # PCS part of the chi-squared gradient.
-                if self.pcs_flag[align_index]:
-                    self.dchi2[k] = self.dchi2[k] + dchi2_element(self.deltaij[align_index], self.deltaij_theta[align_index], self.ddeltaij_theta[k, align_index], self.pcs_errors[align_index])
+                Au = einsum('inm,jcm->ijcn', self.A, self.paramag_unit_vect)
+                grad = einsum('ijcx,ijc,c->xij', self.dpcs_const_theta, self.pcs_orient * self.paramag_dist**2, self.weights)
+                grad = grad - 2.0 * einsum('ijcx,ijc,c->xij', Au, self.pcs_const / self.paramag_dist, self.weights)
+                self.ddeltaij_theta[-3:] = where(self.pcs_mask, 1e-10 * grad, 0.0)
+
+            # The chi-squared gradient.
+            self.dchi2 = self.dchi2 - 2.0 * einsum('kij,ij->k', self.ddeltaij_theta, where(self.pcs_mask, (self.deltaij - self.deltaij_theta) / self.pcs_errors**2, 0.0))
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -1147,46 +1146,44 @@ class N_state_opt:
         # Initial chi-squared (or SSE) Hessian.
         self.d2chi2 = self.d2chi2 * 0.0
 
-        # Loop over each alignment.
-        for align_index in range(self.num_align):
-            # Construct the pc-Amn second partial derivative Hessian components.
-            if not self.probs_fixed:
+        # The Hessian equations for optimising the paramagnetic centre position.
+        if not self.centre_fixed and self.num_align:
+            raise RelaxError("The Hessian equations for optimising the paramagnetic centre position are not yet implemented.")
+
+        # The weighted residuals and the RDC and PCS gradient contributions to the chi-squared Hessian.
+        if self.rdc_flag_sum:
+            rdc_resid = where(self.rdc_mask, (self.rdc - self.rdc_theta) / self.rdc_errors**2, 0.0)
+            self.d2chi2 = self.d2chi2 + 2.0 * einsum('jia,kia,ia->jk', self.drdc_theta, self.drdc_theta, where(self.rdc_mask, 1.0 / self.rdc_errors**2, 0.0))
+        if self.pcs_flag_sum:
+            pcs_resid = where(self.pcs_mask, (self.deltaij - self.deltaij_theta) / self.pcs_errors**2, 0.0)
+            self.d2chi2 = self.d2chi2 + 2.0 * einsum('jia,kia,ia->jk', self.ddeltaij_theta, self.ddeltaij_theta, where(self.pcs_mask, 1.0 / self.pcs_errors**2, 0.0))
+
+        # The pc-Amn second partial derivative Hessian components, the RDC and PCS Hessians being zero otherwise.
+        if not self.probs_fixed:
+            for align_index in range(self.num_align):
+                # Skip the alignment.
+                if not self.fixed_tensors[align_index]:
+                    continue
+
+                # The residual weighted second partial derivatives, summed over the spins, for all states c and tensor elements Amn.
+                hess = zeros((self.N - 1, 5), float64)
+                if self.rdc_flag_sum:
+                    hess = hess + dot(self.pseudo_average(self.rdc_const * transpose(self.rdc_vect_dA[:, :, :self.N-1], (2, 0, 1))), rdc_resid[align_index])
+                if self.pcs_flag_sum:
+                    hess = hess + dot(transpose(self.pcs_const[align_index, :, :self.N-1] * self.pcs_vect_dA[:, :, :self.N-1], (2, 0, 1)), pcs_resid[align_index])
+
+                # Construct the Hessian components of the alignment.
+                d2chi2 = zeros((self.total_num_params, self.total_num_params), float64)
                 for c in range(self.N - 1):
                     # Index in the parameter array.
                     pc_index = self.num_align_params + c
 
-                    # Calculate the RDC Hessian component.
-                    for j in range(self.num_interatom):
-                        if self.fixed_tensors[align_index] and self.rdc_flag[align_index] and not self.missing_rdc[align_index, j]:
-                            self.d2rdc_theta[pc_index, align_index*5+0, align_index, j] = self.d2rdc_theta[align_index*5+0, pc_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.dA[0])
-                            self.d2rdc_theta[pc_index, align_index*5+1, align_index, j] = self.d2rdc_theta[align_index*5+1, pc_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.dA[1])
-                            self.d2rdc_theta[pc_index, align_index*5+2, align_index, j] = self.d2rdc_theta[align_index*5+2, pc_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.dA[2])
-                            self.d2rdc_theta[pc_index, align_index*5+3, align_index, j] = self.d2rdc_theta[align_index*5+3, pc_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.dA[3])
-                            self.d2rdc_theta[pc_index, align_index*5+4, align_index, j] = self.d2rdc_theta[align_index*5+4, pc_index, align_index, j] = rdc_tensor(self.dip_const[j], self.dip_vect[j][c], self.dA[4])
-
-                    # Calculate the PCS Hessian component.
-                    for j in range(self.num_spins):
-                        if self.fixed_tensors[align_index] and self.pcs_flag[align_index] and not self.missing_deltaij[align_index, j]:
-                            self.d2deltaij_theta[pc_index, align_index*5+0, align_index, j] = self.d2deltaij_theta[align_index*5+0, pc_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.dA[0])
-                            self.d2deltaij_theta[pc_index, align_index*5+1, align_index, j] = self.d2deltaij_theta[align_index*5+1, pc_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.dA[1])
-                            self.d2deltaij_theta[pc_index, align_index*5+2, align_index, j] = self.d2deltaij_theta[align_index*5+2, pc_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.dA[2])
-                            self.d2deltaij_theta[pc_index, align_index*5+3, align_index, j] = self.d2deltaij_theta[align_index*5+3, pc_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.dA[3])
-                            self.d2deltaij_theta[pc_index, align_index*5+4, align_index, j] = self.d2deltaij_theta[align_index*5+4, pc_index, align_index, j] = pcs_tensor(self.pcs_const[align_index, j, c], self.paramag_unit_vect[j, c], self.dA[4])
-
-            # Construct the paramagnetic centre c partial derivative components for the PCS.
-            if not self.centre_fixed:
-                raise RelaxError("The Hessian equations for optimising the paramagnetic centre position are not yet implemented.")
-
-            # Construct the chi-squared Hessian element for parameters j and k, alignment i.
-            for j in range(self.total_num_params):
-                for k in range(self.total_num_params):
-                    # RDC part of the chi-squared gradient.
-                    if self.rdc_flag[align_index]:
-                        self.d2chi2[j, k] = self.d2chi2[j, k] + d2chi2_element(self.rdc[align_index], self.rdc_theta[align_index], self.drdc_theta[j, align_index], self.drdc_theta[k, align_index], self.d2rdc_theta[j, k, align_index], self.rdc_errors[align_index])
+                    # The components.
+                    for p in range(5):
+                        d2chi2[pc_index, align_index*5+p] = d2chi2[align_index*5+p, pc_index] = hess[c, p]
 
-                    # PCS part of the chi-squared gradient.
-                    if self.pcs_flag[align_index]:
-                        self.d2chi2[j, k] = self.d2chi2[j, k] + d2chi2_element(self.deltaij[align_index], self.deltaij_theta[align_index], self.ddeltaij_theta[j, align_index], self.ddeltaij_theta[k, align_index], self.d2deltaij_theta[j, k, align_index], self.pcs_errors[align_index])
+                # Add the components.
+                self.d2chi2 = self.d2chi2 - 2.0 * d2chi2
 
         # Diagonal scaling.
         if self.scaling_flag:
@@ -1214,3 +1211,69 @@ class N_state_opt:
                     # The PCS constant gradient components.
                     if not self.centre_fixed:
                         pcs_constant_grad(T=self.temp[align_index], Bo=self.frq[align_index], r=self.paramag_dist[j, c], unit_vect=self.paramag_unit_vect[j, c], grad=self.dpcs_const_theta[align_index, j, c])
+
+        # The projections of the alignment tensor gradients, mu_jc . dAi/dAmn . mu_jc.
+        self.pcs_vect_dA = einsum('jcn,pnm,jcm->pjc', self.paramag_unit_vect, self.dA, self.paramag_unit_vect)
+
+
+    def pseudo_average(self, values):
+        """Average the RDC values of the atoms of each pseudo-atom.
+
+        @param values:  The RDC values, with the last dimension corresponding to the rows of the rdc_vect structure.
+        @type values:   numpy array
+        @return:        The averaged values, with the last dimension corresponding to the interatomic connections.
+        @rtype:         numpy array
+        """
+
+        # No pseudo-atoms.
+        if not self.rdc_pseudo:
+            return values
+
+        # Sum over the atoms and divide by their number.
+        return add.reduceat(values, self.rdc_pseudo_start, axis=-1) / self.rdc_pseudo_num
+
+
+    def rdc_info(self):
+        """Set up the interatomic vector and dipolar constant arrays for the RDC.
+
+        The atoms of each pseudo-atom are unpacked into their own rows of the rdc_vect and rdc_const structures, and the back-calculated RDCs for these rows are then combined by pseudo_average().
+        """
+
+        # Unpack the vectors and dipolar constants.
+        vect = []
+        const = []
+        self.rdc_pseudo_start = zeros(self.num_interatom, int32)
+        self.rdc_pseudo_num = ones(self.num_interatom, float64)
+        for j in range(self.num_interatom):
+            # The first row of the interatomic connection.
+            self.rdc_pseudo_start[j] = len(const)
+
+            # The atoms of the pseudo-atom.
+            if self.rdc_pseudo_flags[j]:
+                self.rdc_pseudo_num[j] = len(self.dip_const[j])
+                for d in range(len(self.dip_const[j])):
+                    vect.append(self.dip_vect[j][:, d])
+                    const.append(self.dip_const[j][d])
+
+            # A normal atom.
+            else:
+                vect.append(self.dip_vect[j])
+                const.append(self.dip_const[j])
+
+        # Convert to numpy.
+        self.rdc_vect = array(vect, float64)
+        self.rdc_const = array(const, float64)
+        self.rdc_pseudo = len(const) > self.num_interatom
+
+        # The J couplings for the T = J+D data.
+        self.rdc_j = None
+        if self.j_couplings is not None and self.T_flags.any():
+            self.rdc_j = where(self.T_flags, array(self.j_couplings, float64), 0.0)
+
+        # The signless RDC flags.
+        self.rdc_absolute = None
+        if self.absolute_rdc.any():
+            self.rdc_absolute = self.absolute_rdc != 0
+
+        # The projections of the alignment tensor gradients, mu_jc . dAi/dAmn . mu_jc, which do not change during optimisation.
+        self.rdc_vect_dA = einsum('kcn,pnm,kcm->pkc', self.rdc_vect, self.dA, self.rdc_vect)
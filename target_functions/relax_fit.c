@@ -22,6 +22,8 @@
 /* This include must come first. */
 #include <Python.h>
 #include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
 
 /* Include all of the variable definitions. */
 #include "relax_fit.h"
@@ -31,759 +33,897 @@
 #include "exponential.h"
 
 
-static PyObject *
-setup(PyObject *self, PyObject *args, PyObject *keywords) {
-    /* Set up the module in preparation for calls to the target function. */
+/*******************************************************/
+/* The re-entrant calculations (no Python API usage).  */
+/*******************************************************/
 
-    /* Python object declarations. */
-    PyObject *values_arg, *sd_arg, *relax_times_arg, *scaling_matrix_arg;
-    PyObject *element;
+static void calc_back_calc(relax_fit_data *data, int model) {
+    /* Back calculate the peak intensities. */
 
-    /* Normal declarations. */
-    int i;
+    if (model == MODEL_EXP)
+        exponential(data->params[index_I0], data->params[index_R], data->relax_times, data->back_calc, data->num_times);
+    else if (model == MODEL_INV)
+        exponential_inv(data->params[index_I0], data->params[index_inv_Iinf], data->params[index_R], data->relax_times, data->back_calc, data->num_times);
+    else
+        exponential_sat(data->params[index_Iinf], data->params[index_R], data->relax_times, data->back_calc, data->num_times);
+}
 
-    /* The keyword list. */
-    static char *keyword_list[] = {"num_params", "num_times", "values", "sd", "relax_times", "scaling_matrix", NULL};
 
-    /* Parse the function arguments. */
-    if (!PyArg_ParseTupleAndKeywords(args, keywords, "iiOOOO", keyword_list, &num_params, &num_times, &values_arg, &sd_arg, &relax_times_arg, &scaling_matrix_arg))
-        return NULL;
+static void calc_back_calc_grad(relax_fit_data *data, int model) {
+    /* The partial derivatives of the back calculated peak intensities. */
+
+    double *p = data->params;
 
-    /* Place the parameter related arguments into C arrays. */
-    for (i = 0; i < num_params; i++) {
-        /* The diagonalised scaling matrix list argument element. */
-        element = PySequence_GetItem(scaling_matrix_arg, i);
-        scaling_matrix[i] = PyFloat_AsDouble(element);
-        Py_CLEAR(element);
+    if (model == MODEL_EXP) {
+        exponential_dR(p[index_I0], p[index_R], index_R, data->relax_times, data->back_calc_grad, data->num_times);
+        exponential_dI0(p[index_I0], p[index_R], index_I0, data->relax_times, data->back_calc_grad, data->num_times);
+    } else if (model == MODEL_INV) {
+        exponential_inv_dR(p[index_I0], p[index_inv_Iinf], p[index_R], index_R, data->relax_times, data->back_calc_grad, data->num_times);
+        exponential_inv_dI0(p[index_I0], p[index_inv_Iinf], p[index_R], index_I0, data->relax_times, data->back_calc_grad, data->num_times);
+        exponential_inv_dIinf(p[index_I0], p[index_inv_Iinf], p[index_R], index_inv_Iinf, data->relax_times, data->back_calc_grad, data->num_times);
+    } else {
+        exponential_sat_dR(p[index_Iinf], p[index_R], index_R, data->relax_times, data->back_calc_grad, data->num_times);
+        exponential_sat_dIinf(p[index_Iinf], p[index_R], index_Iinf, data->relax_times, data->back_calc_grad, data->num_times);
     }
+}
 
-    /* Place the time related arguments into C arrays. */
-    for (i = 0; i < num_times; i++) {
-        /* The value argument element. */
-        element = PySequence_GetItem(values_arg, i);
-        values[i] = PyFloat_AsDouble(element);
-        Py_CLEAR(element);
-
-        /* The sd argument element. */
-        element = PySequence_GetItem(sd_arg, i);
-        sd[i] = PyFloat_AsDouble(element);
-        Py_CLEAR(element);
-
-        /* Convert the errors to variances to avoid duplicated maths operations for faster calculations. */
-        variance[i] = square(sd[i]);
-
-        /* The relax_times argument element. */
-        element = PySequence_GetItem(relax_times_arg, i);
-        relax_times[i] = PyFloat_AsDouble(element);
-        Py_CLEAR(element);
+
+static void calc_back_calc_hess(relax_fit_data *data, int model, double (*back_calc_hess)[MAX_PARAMS][MAX_DATA]) {
+    /* The second partial derivatives of the back calculated peak intensities, stored in the given workspace. */
+
+    double *p = data->params;
+
+    if (model == MODEL_EXP) {
+        exponential_dR2(p[index_I0], p[index_R], index_R, data->relax_times, back_calc_hess, data->num_times);
+        exponential_dI02(p[index_I0], p[index_R], index_I0, data->relax_times, back_calc_hess, data->num_times);
+        exponential_dR_dI0(p[index_I0], p[index_R], index_R, index_I0, data->relax_times, back_calc_hess, data->num_times);
+    } else if (model == MODEL_INV) {
+        exponential_inv_dR2(p[index_I0], p[index_inv_Iinf], p[index_R], index_R, data->relax_times, back_calc_hess, data->num_times);
+        exponential_inv_dI02(p[index_I0], p[index_inv_Iinf], p[index_R], index_I0, data->relax_times, back_calc_hess, data->num_times);
+        exponential_inv_dIinf2(p[index_I0], p[index_inv_Iinf], p[index_R], index_inv_Iinf, data->relax_times, back_calc_hess, data->num_times);
+        exponential_inv_dR_dI0(p[index_I0], p[index_inv_Iinf], p[index_R], index_R, index_I0, data->relax_times, back_calc_hess, data->num_times);
+        exponential_inv_dR_dIinf(p[index_I0], p[index_inv_Iinf], p[index_R], index_R, index_inv_Iinf, data->relax_times, back_calc_hess, data->num_times);
+        exponential_inv_dI0_dIinf(p[index_I0], p[index_inv_Iinf], p[index_R], index_I0, index_inv_Iinf, data->relax_times, back_calc_hess, data->num_times);
+    } else {
+        exponential_sat_dR2(p[index_Iinf], p[index_R], index_R, data->relax_times, back_calc_hess, data->num_times);
+        exponential_sat_dIinf2(p[index_Iinf], p[index_R], index_Iinf, data->relax_times, back_calc_hess, data->num_times);
+        exponential_sat_dR_dIinf(p[index_Iinf], p[index_R], index_R, index_Iinf, data->relax_times, back_calc_hess, data->num_times);
     }
+}
 
-    /* The macro for returning the Python None object. */
-    Py_RETURN_NONE;
+
+static void scale_params(relax_fit_data *data, double *params) {
+    /* Store the parameters, removing the scaling. */
+
+    int i;
+
+    for (i = 0; i < data->num_params; i++)
+        data->params[i] = params[i] * data->scaling_matrix[i];
 }
 
 
-void param_to_c(PyObject *params_arg) {
-    /* Convert the Python parameter list to a C array. */
+static double calc_func(relax_fit_data *data, int model) {
+    /* The chi-squared value, from the back calculated intensities. */
+
+    calc_back_calc(data, model);
+    return chi2(data->values, data->variance, data->back_calc, data->num_times);
+}
+
+
+static void calc_dfunc(relax_fit_data *data, int model, double *grad) {
+    /* The scaled chi-squared gradient. */
 
-    /* Declarations. */
-    PyObject *element;
     int i;
 
-    /* Place the parameter array elements into the C array. */
-    for (i = 0; i < num_params; i++) {
-        /* Get the element. */
-        element = PySequence_GetItem(params_arg, i);
+    calc_back_calc(data, model);
+    calc_back_calc_grad(data, model);
+    dchi2(data->dchi2_vals, data->values, data->back_calc, data->back_calc_grad, data->variance, data->num_times, data->num_params);
+    for (i = 0; i < data->num_params; i++)
+        grad[i] = data->dchi2_vals[i] * data->scaling_matrix[i];
+}
+
 
-        /* Convert to a C double, then free the memory. */
-        params[i] = PyFloat_AsDouble(element);
-        Py_CLEAR(element);
+static void calc_d2func(relax_fit_data *data, int model, double *hess, double (*back_calc_hess)[MAX_PARAMS][MAX_DATA]) {
+    /* The scaled chi-squared Hessian, as a flattened num_params x num_params array, using the given workspace for the back calculated Hessian. */
 
-        /* Scale the parameter. */
-        params[i] = params[i] * scaling_matrix[i];
+    int j, k;
+
+    calc_back_calc(data, model);
+    calc_back_calc_grad(data, model);
+    calc_back_calc_hess(data, model, back_calc_hess);
+    d2chi2(data->d2chi2_vals, data->values, data->back_calc, data->back_calc_grad, back_calc_hess, data->variance, data->num_times, data->num_params);
+    for (j = 0; j < data->num_params; j++) {
+        for (k = 0; k < data->num_params; k++)
+            hess[j*data->num_params + k] = data->d2chi2_vals[j][k] * data->scaling_matrix[j] * data->scaling_matrix[k];
     }
 }
 
-static PyObject *
-func_exp(PyObject *self, PyObject *args) {
-    /* Target function for the two parameter exponential for calculating and returning the chi-squared value.
-     *
-     * Firstly the back calculated intensities are generated, then the chi-squared statistic is
-     * calculated.
-     */
 
-    /* Declarations. */
-    PyObject *params_arg;
+static void calc_jacobian_chi2(relax_fit_data *data, int model) {
+    /* The Jacobian of the chi-squared function.
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+    The equation is::
+
+                     / yi - yi(theta)     dyi(theta) \
+        J_ji  =  -2  | --------------  .  ---------- |
+                     \   sigma_i**2        dthetaj   /
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
+    where
+        - i is the index over data sets.
+        - j is the parameter index.
+        - theta is the parameter vector.
+        - yi are the values of the measured data set.
+        - yi(theta) are the values of the back calculated data set.
+        - dyi(theta)/dthetaj are the values of the back calculated gradient for parameter j.
+        - sigma_i are the values of the error set.
+     */
 
-    /* Back calculated the peak intensities. */
-    exponential(params[index_I0], params[index_R], relax_times, back_calc, num_times);
+    int i, j;
 
-    /* Calculate and return the chi-squared value. */
-    return PyFloat_FromDouble(chi2(values, variance, back_calc, num_times));
+    calc_back_calc(data, model);
+    calc_back_calc_grad(data, model);
+    for (j = 0; j < data->num_params; ++j) {
+        for (i = 0; i < data->num_times; ++i)
+            data->jacobian_matrix[j][i] = -2.0 / data->variance[i] * (data->values[i] - data->back_calc[i]) * data->back_calc_grad[j][i];
+    }
 }
 
 
-static PyObject *
-func_inv(PyObject *self, PyObject *args) {
-    /* Inversion recovery experiment target function for calculating and returning the chi-squared value.
-     *
-     * Firstly the back calculated intensities are generated, then the chi-squared statistic is
-     * calculated.
-     */
+/*************************************/
+/* Python to C conversion functions. */
+/*************************************/
 
-    /* Declarations. */
-    PyObject *params_arg;
+static int sequence_to_c(PyObject *seq, double *array, int num) {
+    /* Convert the first num elements of a Python sequence to a C array, returning -1 on failure. */
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+    PyObject *element;
+    Py_ssize_t size;
+    int i;
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
+    size = PySequence_Size(seq);
+    if (size < 0)
+        return -1;
+    if (size < num) {
+        PyErr_Format(PyExc_ValueError, "The sequence of %d elements is shorter than the required %d elements.", (int)size, num);
+        return -1;
+    }
 
-    /* Back calculated the peak intensities. */
-    exponential_inv(params[index_I0], params[index_inv_Iinf], params[index_R], relax_times, back_calc, num_times);
+    for (i = 0; i < num; i++) {
+        element = PySequence_GetItem(seq, i);
+        if (element == NULL)
+            return -1;
+        array[i] = PyFloat_AsDouble(element);
+        Py_DECREF(element);
+    }
 
-    /* Calculate and return the chi-squared value. */
-    return PyFloat_FromDouble(chi2(values, variance, back_calc, num_times));
+    if (PyErr_Occurred())
+        return -1;
+    return 0;
 }
 
 
-static PyObject *
-func_sat(PyObject *self, PyObject *args) {
-    /* Saturation recovery experiment target function for calculating and returning the chi-squared value.
-     *
-     * Firstly the back calculated intensities are generated, then the chi-squared statistic is
-     * calculated.
-     */
+static int param_to_c(relax_fit_data *data, PyObject *params_arg) {
+    /* Convert the Python parameter list to the scaled C parameter array, returning -1 on failure. */
 
-    /* Declarations. */
-    PyObject *params_arg;
+    double params[MAX_PARAMS];
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+    if (sequence_to_c(params_arg, params, data->num_params) < 0)
+        return -1;
+    scale_params(data, params);
+    return 0;
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
 
-    /* Back calculated the peak intensities. */
-    exponential_sat(params[index_Iinf], params[index_R], relax_times, back_calc, num_times);
+static PyObject *c_to_list(double *array, int num) {
+    /* Convert a C array to a new Python list. */
 
+    PyObject *list = PyList_New(num);
+    int i;
 
-    /* Calculate and return the chi-squared value. */
-    return PyFloat_FromDouble(chi2(values, variance, back_calc, num_times));
+    if (list == NULL)
+        return NULL;
+    for (i = 0; i < num; i++)
+        PyList_SET_ITEM(list, i, PyFloat_FromDouble(array[i]));
+    return list;
 }
 
 
-static PyObject *
-dfunc_exp(PyObject *self, PyObject *args) {
-    /* Target function for the two parameter exponential for calculating and returning the chi-squared gradient.
-     * 
-     */
+static PyObject *c_to_list_of_lists(double *array, int num_rows, int num_cols, int stride) {
+    /* Convert a rank-2 C array, with the given row stride, to a new Python list of lists. */
 
-    /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list;
+    PyObject *list = PyList_New(num_rows);
+    PyObject *row;
     int i;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
+    if (list == NULL)
         return NULL;
+    for (i = 0; i < num_rows; i++) {
+        row = c_to_list(array + i*stride, num_cols);
+        if (row == NULL) {
+            Py_DECREF(list);
+            return NULL;
+        }
+        PyList_SET_ITEM(list, i, row);
+    }
+    return list;
+}
+
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
+static int check_dimensions(int num_params, int num_times) {
+    /* Check the dimensions against the maximum dimensions, returning -1 on failure. */
 
-    /* Back calculated the peak intensities. */
-    exponential(params[index_I0], params[index_R], relax_times, back_calc, num_times);
+    if (num_params < 1 || num_params > MAX_PARAMS) {
+        PyErr_Format(PyExc_ValueError, "The number of parameters %d must be between 1 and %d.", num_params, MAX_PARAMS);
+        return -1;
+    }
+    if (num_times < 1 || num_times > MAX_DATA) {
+        PyErr_Format(PyExc_ValueError, "The number of time points %d must be between 1 and %d.", num_times, MAX_DATA);
+        return -1;
+    }
+    return 0;
+}
 
-    /* The partial derivates. */
-    exponential_dR(params[index_I0], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_dI0(params[index_I0], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
 
-    /* The chi-squared gradient. */
-    dchi2(dchi2_vals, values, back_calc, back_calc_grad, variance, num_times, num_params);
+static int data_setup(relax_fit_data *data, int num_params, int num_times, PyObject *values_arg, PyObject *sd_arg, PyObject *relax_times_arg, PyObject *scaling_matrix_arg) {
+    /* Copy the Python data into the C data structure, returning -1 on failure. */
 
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        PyList_Append(list, PyFloat_FromDouble(dchi2_vals[i] * scaling_matrix[i]));
-    }
+    int i;
 
-    /* Return the gradient. */
-    return list;
+    data->num_params = num_params;
+    data->num_times = num_times;
+    if (sequence_to_c(scaling_matrix_arg, data->scaling_matrix, num_params) < 0)
+        return -1;
+    if (sequence_to_c(values_arg, data->values, num_times) < 0)
+        return -1;
+    if (sequence_to_c(sd_arg, data->sd, num_times) < 0)
+        return -1;
+    if (sequence_to_c(relax_times_arg, data->relax_times, num_times) < 0)
+        return -1;
+
+    /* Convert the errors to variances to avoid duplicated maths operations for faster calculations. */
+    for (i = 0; i < num_times; i++)
+        data->variance[i] = square(data->sd[i]);
+
+    return 0;
 }
 
 
+/***************************************************/
+/* The module level functions for the default data. */
+/***************************************************/
+
 static PyObject *
-dfunc_inv(PyObject *self, PyObject *args) {
-    /* Inversion recovery experiment target function for the two parameter exponential for calculating and returning the chi-squared gradient. */
+setup(PyObject *self, PyObject *args, PyObject *keywords) {
+    /* Set up the module in preparation for calls to the target function. */
 
-    /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list;
-    int i;
+    /* Python object declarations. */
+    PyObject *values_arg, *sd_arg, *relax_times_arg, *scaling_matrix_arg;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
+    /* Normal declarations. */
+    int num_params, num_times;
+
+    /* The keyword list. */
+    static char *keyword_list[] = {"num_params", "num_times", "values", "sd", "relax_times", "scaling_matrix", NULL};
+
+    /* Parse the function arguments. */
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "iiOOOO", keyword_list, &num_params, &num_times, &values_arg, &sd_arg, &relax_times_arg, &scaling_matrix_arg))
+        return NULL;
+    if (check_dimensions(num_params, num_times) < 0)
         return NULL;
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
+    /* Point the default data to the permanent storage. */
+    default_data.values = values;
+    default_data.sd = sd;
+    default_data.variance = variance;
+    default_data.relax_times = relax_times;
+    default_data.back_calc = back_calc;
+    default_data.back_calc_grad = back_calc_grad;
+    default_data.back_calc_hess = back_calc_hess;
+    default_data.jacobian_matrix = jacobian_matrix;
+
+    /* Store the data. */
+    if (data_setup(&default_data, num_params, num_times, values_arg, sd_arg, relax_times_arg, scaling_matrix_arg) < 0)
+        return NULL;
 
-    /* Back calculated the peak intensities. */
-    exponential_inv(params[index_I0], params[index_inv_Iinf], params[index_R], relax_times, back_calc, num_times);
+    /* The macro for returning the Python None object. */
+    Py_RETURN_NONE;
+}
 
-    /* The partial derivates. */
-    exponential_inv_dR(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_inv_dI0(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-    exponential_inv_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_inv_Iinf, relax_times, back_calc_grad, num_times);
 
-    /* The chi-squared gradient. */
-    dchi2(dchi2_vals, values, back_calc, back_calc_grad, variance, num_times, num_params);
+static PyObject *
+module_func(PyObject *args, int model) {
+    /* Calculate and return the chi-squared value for the default data. */
 
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        PyList_Append(list, PyFloat_FromDouble(dchi2_vals[i] * scaling_matrix[i]));
-    }
+    PyObject *params_arg;
 
-    /* Return the gradient. */
-    return list;
+    if (!PyArg_ParseTuple(args, "O", &params_arg))
+        return NULL;
+    if (param_to_c(&default_data, params_arg) < 0)
+        return NULL;
+    return PyFloat_FromDouble(calc_func(&default_data, model));
 }
 
 
 static PyObject *
-dfunc_sat(PyObject *self, PyObject *args) {
-    /* Saturation recovery experiment target function for the two parameter exponential for calculating and returning the chi-squared gradient.
-     * 
-     */
+module_dfunc(PyObject *args, int model) {
+    /* Calculate and return the chi-squared gradient for the default data. */
 
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list;
-    int i;
+    double grad[MAX_PARAMS];
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
+    if (param_to_c(&default_data, params_arg) < 0)
+        return NULL;
+    calc_dfunc(&default_data, model, grad);
+    return c_to_list(grad, default_data.num_params);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
 
-    /* Back calculated the peak intensities. */
-    exponential_sat(params[index_Iinf], params[index_R], relax_times, back_calc, num_times);
+static PyObject *
+module_d2func(PyObject *args, int model) {
+    /* Calculate and return the chi-squared Hessian for the default data. */
 
-    /* The partial derivates. */
-    exponential_sat_dR(params[index_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_sat_dIinf(params[index_Iinf], params[index_R], index_Iinf, relax_times, back_calc_grad, num_times);
+    PyObject *params_arg;
+    double hess[MAX_PARAMS*MAX_PARAMS];
 
-    /* The chi-squared gradient. */
-    dchi2(dchi2_vals, values, back_calc, back_calc_grad, variance, num_times, num_params);
+    if (!PyArg_ParseTuple(args, "O", &params_arg))
+        return NULL;
+    if (param_to_c(&default_data, params_arg) < 0)
+        return NULL;
+    calc_d2func(&default_data, model, hess, default_data.back_calc_hess);
+    return c_to_list_of_lists(hess, default_data.num_params, default_data.num_params, default_data.num_params);
+}
 
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        PyList_Append(list, PyFloat_FromDouble(dchi2_vals[i] * scaling_matrix[i]));
-    }
 
-    /* Return the gradient. */
-    return list;
+static PyObject *
+module_jacobian(PyObject *args, int model) {
+    /* Return the Jacobian of the exponential curve for the default data. */
+
+    PyObject *params_arg;
+
+    if (!PyArg_ParseTuple(args, "O", &params_arg))
+        return NULL;
+    if (param_to_c(&default_data, params_arg) < 0)
+        return NULL;
+    calc_back_calc_grad(&default_data, model);
+    return c_to_list_of_lists(&default_data.back_calc_grad[0][0], default_data.num_params, default_data.num_times, MAX_DATA);
 }
 
 
 static PyObject *
-d2func_exp(PyObject *self, PyObject *args) {
-    /* Target function for the two parameter exponential for calculating and returning the chi-squared Hessian.
-     * 
-     */
+module_jacobian_chi2(PyObject *args, int model) {
+    /* Return the Jacobian of the chi-squared function for the default data. */
 
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list, *list2;
-    int j, k;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
+    if (param_to_c(&default_data, params_arg) < 0)
+        return NULL;
+    calc_jacobian_chi2(&default_data, model);
+    return c_to_list_of_lists(&default_data.jacobian_matrix[0][0], default_data.num_params, default_data.num_times, MAX_DATA);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
 
-    /* Back calculated the peak intensities. */
-    exponential(params[index_I0], params[index_R], relax_times, back_calc, num_times);
+static PyObject *
+func_exp(PyObject *self, PyObject *args) {
+    /* Target function for the two parameter exponential for calculating and returning the chi-squared value. */
+    return module_func(args, MODEL_EXP);
+}
 
-    /* The partial derivatives. */
-    exponential_dR(params[index_I0], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_dI0(params[index_I0], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
+static PyObject *
+func_inv(PyObject *self, PyObject *args) {
+    /* Inversion recovery experiment target function for calculating and returning the chi-squared value. */
+    return module_func(args, MODEL_INV);
+}
 
-    /* The second partial derivatives. */
-    exponential_dR2(params[index_I0], params[index_R], index_R, relax_times, back_calc_hess, num_times);
-    exponential_dI02(params[index_I0], params[index_R], index_I0, relax_times, back_calc_hess, num_times);
-    exponential_dR_dI0(params[index_I0], params[index_R], index_R, index_I0, relax_times, back_calc_hess, num_times);
+static PyObject *
+func_sat(PyObject *self, PyObject *args) {
+    /* Saturation recovery experiment target function for calculating and returning the chi-squared value. */
+    return module_func(args, MODEL_SAT);
+}
 
-    /* The chi-squared Hessian. */
-    d2chi2(d2chi2_vals, values, back_calc, back_calc_grad, back_calc_hess, variance, num_times, num_params);
+static PyObject *
+dfunc_exp(PyObject *self, PyObject *args) {
+    /* Target function for the two parameter exponential for calculating and returning the chi-squared gradient. */
+    return module_dfunc(args, MODEL_EXP);
+}
 
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (j = 0; j < num_params; j++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (k = 0; k < num_params; k++) {
-            PyList_Append(list2, PyFloat_FromDouble(d2chi2_vals[j][k] * scaling_matrix[j] * scaling_matrix[k]));
-        }
-        PyList_Append(list, list2);
-    }
+static PyObject *
+dfunc_inv(PyObject *self, PyObject *args) {
+    /* Inversion recovery experiment target function for calculating and returning the chi-squared gradient. */
+    return module_dfunc(args, MODEL_INV);
+}
 
-    /* Return the Hessian. */
-    return list;
+static PyObject *
+dfunc_sat(PyObject *self, PyObject *args) {
+    /* Saturation recovery experiment target function for calculating and returning the chi-squared gradient. */
+    return module_dfunc(args, MODEL_SAT);
 }
 
+static PyObject *
+d2func_exp(PyObject *self, PyObject *args) {
+    /* Target function for the two parameter exponential for calculating and returning the chi-squared Hessian. */
+    return module_d2func(args, MODEL_EXP);
+}
 
 static PyObject *
 d2func_inv(PyObject *self, PyObject *args) {
-    /* Target function for the two parameter exponential for calculating and returning the chi-squared Hessian.
-     * 
-     */
+    /* Inversion recovery experiment target function for calculating and returning the chi-squared Hessian. */
+    return module_d2func(args, MODEL_INV);
+}
 
-    /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list, *list2;
-    int j, k;
+static PyObject *
+d2func_sat(PyObject *self, PyObject *args) {
+    /* Saturation recovery experiment target function for calculating and returning the chi-squared Hessian. */
+    return module_d2func(args, MODEL_SAT);
+}
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+static PyObject *
+back_calc_I(PyObject *self, PyObject *args) {
+    /* Return the back calculated peak intensities as a Python list. */
+    return c_to_list(default_data.back_calc, default_data.num_times);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* Back calculated the peak intensities. */
-    exponential_inv(params[index_I0], params[index_inv_Iinf], params[index_R], relax_times, back_calc, num_times);
-
-    /* The partial derivatives. */
-    exponential_inv_dR(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_inv_dI0(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-    exponential_inv_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_inv_Iinf, relax_times, back_calc_grad, num_times);
-
-    /* The second partial derivatives. */
-    exponential_inv_dR2(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, relax_times, back_calc_hess, num_times);
-    exponential_inv_dI02(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, relax_times, back_calc_hess, num_times);
-    exponential_inv_dIinf2(params[index_I0], params[index_inv_Iinf], params[index_R], index_inv_Iinf, relax_times, back_calc_hess, num_times);
-    exponential_inv_dR_dI0(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, index_I0, relax_times, back_calc_hess, num_times);
-    exponential_inv_dR_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, index_inv_Iinf, relax_times, back_calc_hess, num_times);
-    exponential_inv_dI0_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, index_inv_Iinf, relax_times, back_calc_hess, num_times);
-
-    /* The chi-squared Hessian. */
-    d2chi2(d2chi2_vals, values, back_calc, back_calc_grad, back_calc_hess, variance, num_times, num_params);
-
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (j = 0; j < num_params; j++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (k = 0; k < num_params; k++) {
-            PyList_Append(list2, PyFloat_FromDouble(d2chi2_vals[j][k] * scaling_matrix[j] * scaling_matrix[k]));
-        }
-        PyList_Append(list, list2);
-    }
+static PyObject *
+jacobian_exp(PyObject *self, PyObject *args) {
+    /* Return the Jacobian for the two parameter exponential as a Python list of lists. */
+    return module_jacobian(args, MODEL_EXP);
+}
 
-    /* Return the Hessian. */
-    return list;
+static PyObject *
+jacobian_inv(PyObject *self, PyObject *args) {
+    /* Return the Jacobian for the inversion recovery experiment as a Python list of lists. */
+    return module_jacobian(args, MODEL_INV);
 }
 
+static PyObject *
+jacobian_sat(PyObject *self, PyObject *args) {
+    /* Return the Jacobian for the saturation recovery experiment as a Python list of lists. */
+    return module_jacobian(args, MODEL_SAT);
+}
 
 static PyObject *
-d2func_sat(PyObject *self, PyObject *args) {
-    /* Saturation recovery experiment target function for the two parameter exponential for calculating and returning the chi-squared Hessian.
-     * 
-     */
+jacobian_chi2_exp(PyObject *self, PyObject *args) {
+    /* Return the chi-squared Jacobian for the two parameter exponential as a Python list of lists. */
+    return module_jacobian_chi2(args, MODEL_EXP);
+}
 
-    /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list, *list2;
-    int j, k;
+static PyObject *
+jacobian_chi2_inv(PyObject *self, PyObject *args) {
+    /* Return the chi-squared Jacobian for the inversion recovery experiment as a Python list of lists. */
+    return module_jacobian_chi2(args, MODEL_INV);
+}
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+static PyObject *
+jacobian_chi2_sat(PyObject *self, PyObject *args) {
+    /* Return the chi-squared Jacobian for the saturation recovery experiment as a Python list of lists. */
+    return module_jacobian_chi2(args, MODEL_SAT);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
 
-    /* Back calculated the peak intensities. */
-    exponential_sat(params[index_Iinf], params[index_R], relax_times, back_calc, num_times);
+/*****************************/
+/* The RelaxFit Python type. */
+/*****************************/
 
-    /* The partial derivatives. */
-    exponential_sat_dR(params[index_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_sat_dIinf(params[index_Iinf], params[index_R], index_Iinf, relax_times, back_calc_grad, num_times);
+static void
+RelaxFit_free_data(RelaxFit *self) {
+    /* Free the dynamically allocated data and workspace. */
 
-    /* The second partial derivatives. */
-    exponential_sat_dR2(params[index_Iinf], params[index_R], index_R, relax_times, back_calc_hess, num_times);
-    exponential_sat_dIinf2(params[index_Iinf], params[index_R], index_Iinf, relax_times, back_calc_hess, num_times);
-    exponential_sat_dR_dIinf(params[index_Iinf], params[index_R], index_R, index_Iinf, relax_times, back_calc_hess, num_times);
+    free(self->data.values);
+    free(self->data.back_calc_grad);
+    free(self->data.back_calc_hess);
+    free(self->data.jacobian_matrix);
+    self->data.values = NULL;
+    self->data.back_calc_grad = NULL;
+    self->data.back_calc_hess = NULL;
+    self->data.jacobian_matrix = NULL;
+}
 
-    /* The chi-squared Hessian. */
-    d2chi2(d2chi2_vals, values, back_calc, back_calc_grad, back_calc_hess, variance, num_times, num_params);
 
-    /* Convert to a Python list, and scale the values. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (j = 0; j < num_params; j++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (k = 0; k < num_params; k++) {
-            PyList_Append(list2, PyFloat_FromDouble(d2chi2_vals[j][k] * scaling_matrix[j] * scaling_matrix[k]));
-        }
-        PyList_Append(list, list2);
-    }
+static void
+RelaxFit_dealloc(RelaxFit *self) {
+    /* Destroy the object. */
 
-    /* Return the Hessian. */
-    return list;
+    RelaxFit_free_data(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
 }
 
 
-static PyObject *
-back_calc_I(PyObject *self, PyObject *args) {
-    /* Return the back calculated peak intensities as a Python list. */
+static int
+RelaxFit_init(RelaxFit *self, PyObject *args, PyObject *keywords) {
+    /* Set up the data for one exponential curve. */
 
     /* Declarations. */
-    PyObject *back_calc_py = PyList_New(num_times);
-    int i;
+    PyObject *values_arg, *sd_arg, *relax_times_arg, *scaling_matrix_arg;
+    char *model;
+    int num_params, num_times, required;
+    Py_ssize_t size;
 
-    /* Copy the values out of the C array into the Python array. */
-    for (i = 0; i < num_times; i++)
-        PyList_SetItem(back_calc_py, i, PyFloat_FromDouble(back_calc[i]));
+    /* The keyword list. */
+    static char *keyword_list[] = {"model", "num_params", "values", "sd", "relax_times", "scaling_matrix", NULL};
 
-    /* Return the Python list. */
-    return back_calc_py;
-}
+    /* Parse the function arguments. */
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "siOOOO", keyword_list, &model, &num_params, &values_arg, &sd_arg, &relax_times_arg, &scaling_matrix_arg))
+        return -1;
+
+    /* The curve type. */
+    if (strcmp(model, "exp") == 0) {
+        self->model = MODEL_EXP;
+        required = 2;
+    } else if (strcmp(model, "inv") == 0) {
+        self->model = MODEL_INV;
+        required = 3;
+    } else if (strcmp(model, "sat") == 0) {
+        self->model = MODEL_SAT;
+        required = 2;
+    } else {
+        PyErr_Format(PyExc_ValueError, "The exponential curve type '%s' must be one of 'exp', 'inv' or 'sat'.", model);
+        return -1;
+    }
+    if (num_params != required) {
+        PyErr_Format(PyExc_ValueError, "The '%s' exponential curve requires %d parameters, not %d.", model, required, num_params);
+        return -1;
+    }
 
+    /* The number of time points. */
+    size = PySequence_Size(relax_times_arg);
+    if (size < 0)
+        return -1;
+    num_times = (int)size;
+    if (check_dimensions(num_params, num_times) < 0)
+        return -1;
+
+    /* Allocate the storage (the Hessian workspace is allocated when first needed). */
+    RelaxFit_free_data(self);
+    self->data.values = (double *)malloc(5 * num_times * sizeof(double));
+    self->data.back_calc_grad = malloc(num_params * sizeof(*self->data.back_calc_grad));
+    self->data.jacobian_matrix = malloc(num_params * sizeof(*self->data.jacobian_matrix));
+    if (self->data.values == NULL || self->data.back_calc_grad == NULL || self->data.jacobian_matrix == NULL) {
+        RelaxFit_free_data(self);
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->data.sd = self->data.values + num_times;
+    self->data.variance = self->data.values + 2*num_times;
+    self->data.relax_times = self->data.values + 3*num_times;
+    self->data.back_calc = self->data.values + 4*num_times;
+    memset(self->data.back_calc, 0, num_times * sizeof(double));
+
+    /* Store the data. */
+    if (data_setup(&self->data, num_params, num_times, values_arg, sd_arg, relax_times_arg, scaling_matrix_arg) < 0) {
+        RelaxFit_free_data(self);
+        return -1;
+    }
 
-static PyObject *
-jacobian_exp(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the two parameter exponential as a Python list of lists. */
+    return 0;
+}
 
-    /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
-        return NULL;
+static int
+RelaxFit_check(RelaxFit *self, int hess) {
+    /* Check that the object has been set up and, if the hess flag is set, that the Hessian workspace exists, returning -1 on failure. */
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* The partial derivatives. */
-    exponential_dR(params[index_I0], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_dI0(params[index_I0], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(back_calc_grad[i][j]));
+    if (self->data.values == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "The RelaxFit object has not been initialised.");
+        return -1;
+    }
+    if (hess && self->data.back_calc_hess == NULL) {
+        self->data.back_calc_hess = malloc(self->data.num_params * sizeof(*self->data.back_calc_hess));
+        if (self->data.back_calc_hess == NULL) {
+            PyErr_NoMemory();
+            return -1;
         }
-        PyList_Append(list, list2);
     }
-
-    /* Return the Jacobian. */
-    return list;
+    return 0;
 }
 
 
 static PyObject *
-jacobian_inv(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the two parameter exponential as a Python list of lists. */
+RelaxFit_func(RelaxFit *self, PyObject *args) {
+    /* Calculate and return the chi-squared value. */
 
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
-
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* The partial derivatives. */
-    exponential_inv_dR(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_inv_dI0(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-    exponential_inv_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_inv_Iinf, relax_times, back_calc_grad, num_times);
-
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(back_calc_grad[i][j]));
-        }
-        PyList_Append(list, list2);
-    }
-
-    /* Return the Jacobian. */
-    return list;
+    if (RelaxFit_check(self, 0) < 0 || param_to_c(&self->data, params_arg) < 0)
+        return NULL;
+    return PyFloat_FromDouble(calc_func(&self->data, self->model));
 }
 
 
 static PyObject *
-jacobian_sat(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the two parameter exponential as a Python list of lists. */
+RelaxFit_dfunc(RelaxFit *self, PyObject *args) {
+    /* Calculate and return the chi-squared gradient. */
 
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
+    double grad[MAX_PARAMS];
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
-
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* The partial derivatives. */
-    exponential_sat_dR(params[index_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_sat_dIinf(params[index_Iinf], params[index_R], index_Iinf, relax_times, back_calc_grad, num_times);
-
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(back_calc_grad[i][j]));
-        }
-        PyList_Append(list, list2);
-    }
-
-    /* Return the Jacobian. */
-    return list;
+    if (RelaxFit_check(self, 0) < 0 || param_to_c(&self->data, params_arg) < 0)
+        return NULL;
+    calc_dfunc(&self->data, self->model, grad);
+    return c_to_list(grad, self->data.num_params);
 }
 
 
 static PyObject *
-jacobian_chi2_exp(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the two parameter exponential as a Python list of lists.
-
-    The Jacobian
-    ============
-
-    The equation is::
+RelaxFit_d2func(RelaxFit *self, PyObject *args) {
+    /* Calculate and return the chi-squared Hessian. */
 
-                     / yi - yi(theta)     dyi(theta) \
-        J_ji  =  -2  | --------------  .  ---------- |
-                     \   sigma_i**2        dthetaj   /
-
-    where
-        - i is the index over data sets.
-        - j is the parameter index.
-        - theta is the parameter vector.
-        - yi are the values of the measured data set.
-        - yi(theta) are the values of the back calculated data set.
-        - dyi(theta)/dthetaj are the values of the back calculated gradient for parameter j.
-        - sigma_i are the values of the error set.
-
-     */
-
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
+    double hess[MAX_PARAMS*MAX_PARAMS];
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
+    if (RelaxFit_check(self, 1) < 0 || param_to_c(&self->data, params_arg) < 0)
+        return NULL;
+    calc_d2func(&self->data, self->model, hess, self->data.back_calc_hess);
+    return c_to_list_of_lists(hess, self->data.num_params, self->data.num_params, self->data.num_params);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* Back calculated the peak intensities. */
-    exponential(params[index_I0], params[index_R], relax_times, back_calc, num_times);
-
-    /* The partial derivatives. */
-    exponential_dR(params[index_I0], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_dI0(params[index_I0], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-
-    /* Assemble the chi-squared Jacobian. */
-    for (j = 0; j < num_params; ++j) {
-        for (i = 0; i < num_times; ++i) {
-            jacobian_matrix[j][i] = -2.0 / variance[i] * (values[i] - back_calc[i]) * back_calc_grad[j][i];
-        }
-    }
 
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(jacobian_matrix[i][j]));
-        }
-        PyList_Append(list, list2);
-    }
+static PyObject *
+RelaxFit_back_calc_I(RelaxFit *self, PyObject *args) {
+    /* Return the back calculated peak intensities of the last function call as a Python list. */
 
-    /* Return the Jacobian. */
-    return list;
+    if (RelaxFit_check(self, 0) < 0)
+        return NULL;
+    return c_to_list(self->data.back_calc, self->data.num_times);
 }
 
 
 static PyObject *
-jacobian_chi2_inv(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the inversion recovery experiment as a Python list of lists.
-
-    The Jacobian
-    ============
+RelaxFit_jacobian(RelaxFit *self, PyObject *args) {
+    /* Return the Jacobian of the exponential curve as a Python list of lists. */
 
-    The equation is::
+    PyObject *params_arg;
 
-                     / yi - yi(theta)     dyi(theta) \
-        J_ji  =  -2  | --------------  .  ---------- |
-                     \   sigma_i**2        dthetaj   /
+    if (!PyArg_ParseTuple(args, "O", &params_arg))
+        return NULL;
+    if (RelaxFit_check(self, 0) < 0 || param_to_c(&self->data, params_arg) < 0)
+        return NULL;
+    calc_back_calc_grad(&self->data, self->model);
+    return c_to_list_of_lists(&self->data.back_calc_grad[0][0], self->data.num_params, self->data.num_times, MAX_DATA);
+}
 
-    where
-        - i is the index over data sets.
-        - j is the parameter index.
-        - theta is the parameter vector.
-        - yi are the values of the measured data set.
-        - yi(theta) are the values of the back calculated data set.
-        - dyi(theta)/dthetaj are the values of the back calculated gradient for parameter j.
-        - sigma_i are the values of the error set.
 
-     */
+static PyObject *
+RelaxFit_jacobian_chi2(RelaxFit *self, PyObject *args) {
+    /* Return the Jacobian of the chi-squared function as a Python list of lists. */
 
-    /* Declarations. */
     PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
     if (!PyArg_ParseTuple(args, "O", &params_arg))
         return NULL;
+    if (RelaxFit_check(self, 0) < 0 || param_to_c(&self->data, params_arg) < 0)
+        return NULL;
+    calc_jacobian_chi2(&self->data, self->model);
+    return c_to_list_of_lists(&self->data.jacobian_matrix[0][0], self->data.num_params, self->data.num_times, MAX_DATA);
+}
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
-
-    /* Back calculated the peak intensities. */
-    exponential_inv(params[index_I0], params[index_inv_Iinf], params[index_R], relax_times, back_calc, num_times);
 
-    /* The partial derivatives. */
-    exponential_inv_dR(params[index_I0], params[index_inv_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_inv_dI0(params[index_I0], params[index_inv_Iinf], params[index_R], index_I0, relax_times, back_calc_grad, num_times);
-    exponential_inv_dIinf(params[index_I0], params[index_inv_Iinf], params[index_R], index_inv_Iinf, relax_times, back_calc_grad, num_times);
+/* The method table for the RelaxFit objects. */
+static PyMethodDef RelaxFit_methods[] = {
+    {
+        "func",
+        (PyCFunction)RelaxFit_func,
+        METH_VARARGS,
+        "Target function for calculating and returning the chi-squared value.\n\nFirstly the back calculated intensities are generated, then the chi-squared statistic is calculated."
+    }, {
+        "dfunc",
+        (PyCFunction)RelaxFit_dfunc,
+        METH_VARARGS,
+        "Target function for calculating and returning the chi-squared gradient."
+    }, {
+        "d2func",
+        (PyCFunction)RelaxFit_d2func,
+        METH_VARARGS,
+        "Target function for calculating and returning the chi-squared Hessian."
+    }, {
+        "back_calc_I",
+        (PyCFunction)RelaxFit_back_calc_I,
+        METH_NOARGS,
+        "Return the back calculated peak intensities of the last target function call as a Python list."
+    }, {
+        "jacobian",
+        (PyCFunction)RelaxFit_jacobian,
+        METH_VARARGS,
+        "Return the Jacobian matrix of the exponential curve as a Python list."
+    }, {
+        "jacobian_chi2",
+        (PyCFunction)RelaxFit_jacobian_chi2,
+        METH_VARARGS,
+        "Return the Jacobian matrix of the chi-squared function as a Python list."
+    },
+        {NULL, NULL, 0, NULL}        /* Sentinel. */
+};
 
-    /* Assemble the chi-squared Jacobian. */
-    for (j = 0; j < num_params; ++j) {
-        for (i = 0; i < num_times; ++i) {
-            jacobian_matrix[j][i] = -2.0 / variance[i] * (values[i] - back_calc[i]) * back_calc_grad[j][i];
-        }
-    }
 
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(jacobian_matrix[i][j]));
-        }
-        PyList_Append(list, list2);
-    }
+/* The RelaxFit type. */
+static PyTypeObject RelaxFitType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "relax_fit.RelaxFit",           /* tp_name */
+    sizeof(RelaxFit),               /* tp_basicsize */
+    0,                              /* tp_itemsize */
+    (destructor)RelaxFit_dealloc,   /* tp_dealloc */
+    0,                              /* tp_print */
+    0,                              /* tp_getattr */
+    0,                              /* tp_setattr */
+    0,                              /* tp_compare */
+    0,                              /* tp_repr */
+    0,                              /* tp_as_number */
+    0,                              /* tp_as_sequence */
+    0,                              /* tp_as_mapping */
+    0,                              /* tp_hash */
+    0,                              /* tp_call */
+    0,                              /* tp_str */
+    0,                              /* tp_getattro */
+    0,                              /* tp_setattro */
+    0,                              /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,             /* tp_flags */
+    "RelaxFit(model, num_params, values, sd, relax_times, scaling_matrix)\n\nThe data and target functions for a single exponential curve.\n\nThe model argument is the curve type, one of 'exp', 'inv' or 'sat'.  As all data is held in the object rather than in the module, different objects can be used simultaneously from different threads.  A single object must not be used by two threads at the same time.",  /* tp_doc */
+    0,                              /* tp_traverse */
+    0,                              /* tp_clear */
+    0,                              /* tp_richcompare */
+    0,                              /* tp_weaklistoffset */
+    0,                              /* tp_iter */
+    0,                              /* tp_iternext */
+    RelaxFit_methods,               /* tp_methods */
+    0,                              /* tp_members */
+    0,                              /* tp_getset */
+    0,                              /* tp_base */
+    0,                              /* tp_dict */
+    0,                              /* tp_descr_get */
+    0,                              /* tp_descr_set */
+    0,                              /* tp_dictoffset */
+    (initproc)RelaxFit_init,        /* tp_init */
+    0,                              /* tp_alloc */
+    0,                              /* tp_new */
+};
 
-    /* Return the Jacobian. */
-    return list;
-}
 
+/***********************************************/
+/* The batched target functions for many curves. */
+/***********************************************/
 
 static PyObject *
-jacobian_chi2_sat(PyObject *self, PyObject *args) {
-    /* Return the Jacobian for the saturation recovery experiment as a Python list of lists.
-
-    The Jacobian
-    ============
-
-    The equation is::
-
-                     / yi - yi(theta)     dyi(theta) \
-        J_ji  =  -2  | --------------  .  ---------- |
-                     \   sigma_i**2        dthetaj   /
-
-    where
-        - i is the index over data sets.
-        - j is the parameter index.
-        - theta is the parameter vector.
-        - yi are the values of the measured data set.
-        - yi(theta) are the values of the back calculated data set.
-        - dyi(theta)/dthetaj are the values of the back calculated gradient for parameter j.
-        - sigma_i are the values of the error set.
+batch(PyObject *args, int order) {
+    /* Evaluate the target function (order 0), gradient (order 1) or Hessian (order 2) for a sequence of RelaxFit objects.
 
+    The parameters of all curves are first converted to C, then the Python global interpreter lock is released for the calculations.
      */
 
     /* Declarations. */
-    PyObject *params_arg;
-    PyObject *list, *list2;
-    int i, j;
+    PyObject *fits_arg, *params_arg, *fits, *params, *element, *result = NULL, *item;
+    RelaxFit **objects = NULL;
+    double *param_vals = NULL, *results = NULL;
+    double (*back_calc_hess)[MAX_PARAMS][MAX_DATA] = NULL;
+    Py_ssize_t num, i;
+    int size = 1, n, max_params = 0;
 
-    /* Parse the function arguments, the only argument should be the parameter array. */
-    if (!PyArg_ParseTuple(args, "O", &params_arg))
+    /* Parse the function arguments. */
+    if (!PyArg_ParseTuple(args, "OO", &fits_arg, &params_arg))
         return NULL;
 
-    /* Convert the parameters Python list to a C array. */
-    param_to_c(params_arg);
+    /* Fast sequence access. */
+    fits = PySequence_Fast(fits_arg, "The RelaxFit objects must be a sequence.");
+    if (fits == NULL)
+        return NULL;
+    params = PySequence_Fast(params_arg, "The parameters must be a sequence of parameter vectors.");
+    if (params == NULL) {
+        Py_DECREF(fits);
+        return NULL;
+    }
+    num = PySequence_Fast_GET_SIZE(fits);
+    if (PySequence_Fast_GET_SIZE(params) != num) {
+        PyErr_SetString(PyExc_ValueError, "The number of parameter vectors does not match the number of RelaxFit objects.");
+        goto cleanup;
+    }
 
-    /* Back calculated the peak intensities. */
-    exponential_sat(params[index_Iinf], params[index_R], relax_times, back_calc, num_times);
+    /* The result size per curve. */
+    if (order == 1)
+        size = MAX_PARAMS;
+    else if (order == 2)
+        size = MAX_PARAMS * MAX_PARAMS;
+
+    /* Allocate the C storage. */
+    objects = (RelaxFit **)malloc((num ? num : 1) * sizeof(RelaxFit *));
+    param_vals = (double *)malloc((num ? num : 1) * MAX_PARAMS * sizeof(double));
+    results = (double *)malloc((num ? num : 1) * size * sizeof(double));
+    if (objects == NULL || param_vals == NULL || results == NULL) {
+        PyErr_NoMemory();
+        goto cleanup;
+    }
 
-    /* The partial derivatives. */
-    exponential_sat_dR(params[index_Iinf], params[index_R], index_R, relax_times, back_calc_grad, num_times);
-    exponential_sat_dIinf(params[index_Iinf], params[index_R], index_Iinf, relax_times, back_calc_grad, num_times);
+    /* Convert the objects and parameters to C. */
+    for (i = 0; i < num; i++) {
+        element = PySequence_Fast_GET_ITEM(fits, i);
+        if (!PyObject_TypeCheck(element, &RelaxFitType)) {
+            PyErr_SetString(PyExc_TypeError, "All elements must be RelaxFit objects.");
+            goto cleanup;
+        }
+        objects[i] = (RelaxFit *)element;
+        if (RelaxFit_check(objects[i], 0) < 0)
+            goto cleanup;
+        if (sequence_to_c(PySequence_Fast_GET_ITEM(params, i), param_vals + i*MAX_PARAMS, objects[i]->data.num_params) < 0)
+            goto cleanup;
+        if (objects[i]->data.num_params > max_params)
+            max_params = objects[i]->data.num_params;
+    }
 
-    /* Assemble the chi-squared Jacobian. */
-    for (j = 0; j < num_params; ++j) {
-        for (i = 0; i < num_times; ++i) {
-            jacobian_matrix[j][i] = -2.0 / variance[i] * (values[i] - back_calc[i]) * back_calc_grad[j][i];
+    /* A single Hessian workspace for all curves. */
+    if (order == 2 && num) {
+        back_calc_hess = malloc(max_params * sizeof(*back_calc_hess));
+        if (back_calc_hess == NULL) {
+            PyErr_NoMemory();
+            goto cleanup;
         }
     }
 
-    /* Convert to a Python list of lists. */
-    list = PyList_New(0);
-    Py_INCREF(list);
-    for (i = 0; i < num_params; i++) {
-        list2 = PyList_New(0);
-        Py_INCREF(list2);
-        for (j = 0; j < num_times; j++) {
-            PyList_Append(list2, PyFloat_FromDouble(jacobian_matrix[i][j]));
+    /* The calculations, without the global interpreter lock. */
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < num; i++) {
+        scale_params(&objects[i]->data, param_vals + i*MAX_PARAMS);
+        if (order == 0)
+            results[i] = calc_func(&objects[i]->data, objects[i]->model);
+        else if (order == 1)
+            calc_dfunc(&objects[i]->data, objects[i]->model, results + i*size);
+        else
+            calc_d2func(&objects[i]->data, objects[i]->model, results + i*size, back_calc_hess);
+    }
+    Py_END_ALLOW_THREADS
+
+    /* Convert the results to a Python list. */
+    result = PyList_New(num);
+    if (result == NULL)
+        goto cleanup;
+    for (i = 0; i < num; i++) {
+        n = objects[i]->data.num_params;
+        if (order == 0)
+            item = PyFloat_FromDouble(results[i]);
+        else if (order == 1)
+            item = c_to_list(results + i*size, n);
+        else
+            item = c_to_list_of_lists(results + i*size, n, n, n);
+        if (item == NULL) {
+            Py_CLEAR(result);
+            goto cleanup;
         }
-        PyList_Append(list, list2);
+        PyList_SET_ITEM(result, i, item);
     }
 
-    /* Return the Jacobian. */
-    return list;
+    /* Clean up. */
+cleanup:
+    free(back_calc_hess);
+    free(objects);
+    free(param_vals);
+    free(results);
+    Py_DECREF(fits);
+    Py_DECREF(params);
+    return result;
+}
+
+
+static PyObject *
+func_batch(PyObject *self, PyObject *args) {
+    /* Calculate the chi-squared values for a sequence of RelaxFit objects. */
+    return batch(args, 0);
+}
+
+static PyObject *
+dfunc_batch(PyObject *self, PyObject *args) {
+    /* Calculate the chi-squared gradients for a sequence of RelaxFit objects. */
+    return batch(args, 1);
+}
+
+static PyObject *
+d2func_batch(PyObject *self, PyObject *args) {
+    /* Calculate the chi-squared Hessians for a sequence of RelaxFit objects. */
+    return batch(args, 2);
 }
 
 
@@ -874,6 +1014,21 @@ static PyMethodDef relax_fit_methods[] = {
         jacobian_chi2_sat,
         METH_VARARGS,
         "Return the Jacobian matrix of the chi-squared function for the saturation recovery experiment as a Python list."
+    }, {
+        "func_batch",
+        func_batch,
+        METH_VARARGS,
+        "func_batch(fits, params)\n\nCalculate the chi-squared values for a sequence of RelaxFit objects and their parameter vectors, returning a list of floats.\n\nThe calculations are performed without the Python global interpreter lock."
+    }, {
+        "dfunc_batch",
+        dfunc_batch,
+        METH_VARARGS,
+        "dfunc_batch(fits, params)\n\nCalculate the chi-squared gradients for a sequence of RelaxFit objects and their parameter vectors, returning a list of lists.\n\nThe calculations are performed without the Python global interpreter lock."
+    }, {
+        "d2func_batch",
+        d2func_batch,
+        METH_VARARGS,
+        "d2func_batch(fits, params)\n\nCalculate the chi-squared Hessians for a sequence of RelaxFit objects and their parameter vectors, returning a list of rank-2 lists.\n\nThe calculations are performed without the Python global interpreter lock."
     },
         {NULL, NULL, 0, NULL}        /* Sentinel. */
 };
@@ -899,11 +1054,36 @@ PyMODINIT_FUNC
 #if PY_MAJOR_VERSION >= 3
     PyInit_relax_fit(void)
     {
-        return PyModule_Create(&moduledef);
+        PyObject *module;
+
+        /* The RelaxFit type. */
+        RelaxFitType.tp_new = PyType_GenericNew;
+        if (PyType_Ready(&RelaxFitType) < 0)
+            return NULL;
+
+        /* The module. */
+        module = PyModule_Create(&moduledef);
+        if (module == NULL)
+            return NULL;
+        Py_INCREF(&RelaxFitType);
+        PyModule_AddObject(module, "RelaxFit", (PyObject *)&RelaxFitType);
+        return module;
     }
 #else
     initrelax_fit(void)
     {
-        (void) Py_InitModule("relax_fit", relax_fit_methods);
+        PyObject *module;
+
+        /* The RelaxFit type. */
+        RelaxFitType.tp_new = PyType_GenericNew;
+        if (PyType_Ready(&RelaxFitType) < 0)
+            return;
+
+        /* The module. */
+        module = Py_InitModule("relax_fit", relax_fit_methods);
+        if (module == NULL)
+            return;
+        Py_INCREF(&RelaxFitType);
+        PyModule_AddObject(module, "RelaxFit", (PyObject *)&RelaxFitType);
     }
 #endif
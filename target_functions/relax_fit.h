@@ -31,12 +31,10 @@
 #define square(x) ((x)*(x))
 
 
-/****************************************/
-/* External, hence permanent, variables. */
-/*****************************************/
-
-/* Variables sent to the setup function to be stored for later use. */
-static int num_params, num_times;
+/* The exponential curve types. */
+#define MODEL_EXP 0
+#define MODEL_INV 1
+#define MODEL_SAT 2
 
 /* Hardcoded parameter indices. */
 static int index_R = 0;
@@ -44,16 +42,53 @@ static int index_I0 = 1;
 static int index_Iinf = 1;
 static int index_inv_Iinf = 2;
 
-/* Variables used for storage during the function calls of optimisation. */
+
+/* The data and workspace for one exponential curve.  All target function calculations operate on this structure, so that the calculations are re-entrant. */
+typedef struct {
+    /* The dimensions. */
+    int num_params, num_times;
+
+    /* The data, of size num_times. */
+    double *values;
+    double *sd;
+    double *variance;
+    double *relax_times;
+
+    /* The parameters and scaling. */
+    double params[MAX_PARAMS];
+    double scaling_matrix[MAX_PARAMS];
+
+    /* Storage for the function calls of optimisation.  The gradient, Hessian and Jacobian structures only require the first num_params rows. */
+    double *back_calc;
+    double (*back_calc_grad)[MAX_DATA];
+    double (*back_calc_hess)[MAX_PARAMS][MAX_DATA];
+    double (*jacobian_matrix)[MAX_DATA];
+    double dchi2_vals[MAX_PARAMS];
+    double d2chi2_vals[MAX_PARAMS][MAX_PARAMS];
+} relax_fit_data;
+
+
+/* The Python RelaxFit object, holding the data for one exponential curve. */
+typedef struct {
+    PyObject_HEAD
+    int model;
+    relax_fit_data data;
+} RelaxFit;
+
+
+/****************************************/
+/* External, hence permanent, variables. */
+/*****************************************/
+
+/* The data set up by the module level setup() function, for the module level target functions. */
+static relax_fit_data default_data;
+
+/* Storage for the default data. */
 static double back_calc[MAX_DATA];
 static double back_calc_grad[MAX_PARAMS][MAX_DATA];
 static double back_calc_hess[MAX_PARAMS][MAX_PARAMS][MAX_DATA];
-static double dchi2_vals[MAX_PARAMS];
-static double d2chi2_vals[MAX_PARAMS][MAX_PARAMS];
 static double jacobian_matrix[MAX_PARAMS][MAX_DATA];
-static double params[MAX_PARAMS];
 static double relax_times[MAX_DATA];
-static double scaling_matrix[MAX_PARAMS];
 static double sd[MAX_DATA];
 static double values[MAX_DATA];
 static double variance[MAX_DATA];
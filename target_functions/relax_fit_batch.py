@@ -0,0 +1,130 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""The batched R1 and R2 exponential curve fitting target functions for Monte Carlo simulations.
+
+All Monte Carlo simulations of one spin share the model, the relaxation times and the errors, and differ only in the peak intensities.  The target functions of this module therefore evaluate a stack of parameter vectors, one per simulation, in single calls to the batched functions of the C module (via target_functions.relax_fit_wrapper), with the Python global interpreter lock released.
+"""
+
+# relax module imports.
+from lib.errors import RelaxError
+from target_functions.relax_fit_wrapper import Relax_fit_opt, d2func_batch_opt, dfunc_batch_opt, func_batch_opt
+
+
+class Relax_fit_batch:
+    """The batched exponential curve-fitting target function class."""
+
+    def __init__(self, model='exp', num_params=None, values=None, errors=None, relax_times=None, scaling_matrix=None):
+        """Set up the target function class.
+
+        @keyword model:             The exponential curve type.  This can be 'exp' for the standard two parameter exponential curve, 'inv' for the inversion recovery experiment, and 'sat' for the saturation recovery experiment.
+        @type model:                str
+        @keyword num_params:        The number of parameters in the model.
+        @type num_params:           int
+        @keyword values:            The peak intensities, with one row per simulation and one column per relaxation time.
+        @type values:               list of lists of float or numpy rank-2 array
+        @keyword errors:            The peak intensity errors.
+        @type errors:               list of float
+        @keyword relax_times:       The list of relaxation times.
+        @type relax_times:          list of float
+        @keyword scaling_matrix:    The scaling matrix in a diagonalised list form.
+        @type scaling_matrix:       list of float
+        """
+
+        # Check the model.
+        if model not in ['exp', 'inv', 'sat']:
+            raise RelaxError("The exponential curve type '%s' is unknown." % model)
+
+        # Store the args.
+        self.model = model
+        self.num_params = num_params
+
+        # The default scaling.
+        if scaling_matrix is None:
+            scaling_matrix = [1.0] * num_params
+
+        # The C target functions of each simulation.
+        self.targets = []
+        for sim_values in values:
+            self.targets.append(Relax_fit_opt(model=model, num_params=num_params, values=list(sim_values), errors=list(errors), relax_times=list(relax_times), scaling_matrix=list(scaling_matrix)))
+
+
+    def sim_targets(self, index=None):
+        """Return the C target functions of the given simulations.
+
+        @keyword index: The indices of the simulations, or None for all simulations.
+        @type index:    None or numpy rank-1 int array
+        @return:        The target functions, one per simulation.
+        @rtype:         list of Relax_fit_opt instances
+        """
+
+        # All simulations.
+        if index is None:
+            return self.targets
+
+        # The subset.
+        return [self.targets[i] for i in index]
+
+
+    def func(self, params, index=None):
+        """The chi-squared target function.
+
+        @param params:  The scaled parameter vectors, one row per simulation.
+        @type params:   numpy rank-2 array
+        @keyword index: The indices of the simulations of the parameter vectors, if only a subset of the simulations is to be evaluated.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared values, one per simulation.
+        @rtype:         numpy rank-1 float64 array
+        """
+
+        # The chi-squared values.
+        return func_batch_opt(targets=self.sim_targets(index), params=params)
+
+
+    def dfunc(self, params, index=None):
+        """The chi-squared gradient.
+
+        @param params:  The scaled parameter vectors, one row per simulation.
+        @type params:   numpy rank-2 array
+        @keyword index: The indices of the simulations of the parameter vectors, if only a subset of the simulations is to be evaluated.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared gradients, one row per simulation.
+        @rtype:         numpy rank-2 float64 array
+        """
+
+        # The gradients.
+        return dfunc_batch_opt(targets=self.sim_targets(index), params=params)
+
+
+    def d2func(self, params, index=None):
+        """The chi-squared Hessian.
+
+        @param params:  The scaled parameter vectors, one row per simulation.
+        @type params:   numpy rank-2 array
+        @keyword index: The indices of the simulations of the parameter vectors, if only a subset of the simulations is to be evaluated.
+        @type index:    None or numpy rank-1 int array
+        @return:        The chi-squared Hessians, one per simulation.
+        @rtype:         numpy rank-3 float64 array
+        """
+
+        # The Hessians.
+        return d2func_batch_opt(targets=self.sim_targets(index), params=params)
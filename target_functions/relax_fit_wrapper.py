@@ -33,13 +33,13 @@ from dep_check import C_module_exp_fn
 
 # C modules.
 if C_module_exp_fn:
-    from target_functions.relax_fit import back_calc_I, d2func_exp, d2func_inv, d2func_sat, dfunc_exp, dfunc_inv, dfunc_sat, func_exp, func_inv, func_sat, jacobian_chi2_exp, jacobian_chi2_inv, jacobian_chi2_sat, jacobian_exp, jacobian_inv, jacobian_sat, setup 
+    from target_functions.relax_fit import RelaxFit, d2func_batch, dfunc_batch, func_batch
 
 
 class Relax_fit_opt:
     """The exponential curve-fitting Python to C wrapper target function class."""
 
-    def __init__(self, model=None, num_params=None, values=None, errors=None, relax_times=None, scaling_matrix=None):
+    def __init__(self, model='exp', num_params=None, values=None, errors=None, relax_times=None, scaling_matrix=None):
         """Set up the target function class and alias the target functions.
 
         @keyword model:             The exponential curve type.  This can be 'exp' for the standard two parameter exponential curve, 'inv' for the inversion recovery experiment, and 'sat' for the saturation recovery experiment.
@@ -59,33 +59,12 @@ class Relax_fit_opt:
         # Store the args.
         self.model = model
 
-        # Initialise the C code.
-        setup(num_params=num_params, num_times=len(relax_times), values=values, sd=errors, relax_times=relax_times, scaling_matrix=scaling_matrix)
-
-        # Alias the target functions.
-        if model == 'exp':
-            self.func = self.func_exp
-            self.dfunc = self.dfunc_exp
-            self.d2func = self.d2func_exp
-        elif model == 'inv':
-            self.func = self.func_inv
-            self.dfunc = self.dfunc_inv
-            self.d2func = self.d2func_inv
-        elif model == 'sat':
-            self.func = self.func_sat
-            self.dfunc = self.dfunc_sat
-            self.d2func = self.d2func_sat
+        # Initialise the C object holding the data for this curve.  As the data is not stored in the C module, any number of these target functions can coexist.
+        self.fit = RelaxFit(model=model, num_params=num_params, values=values, sd=errors, relax_times=relax_times, scaling_matrix=scaling_matrix)
 
         # Alias the Jacobian C functions.
-        if model == 'exp':
-            self.jacobian = jacobian_exp
-            self.jacobian_chi2 = jacobian_chi2_exp
-        elif model == 'inv':
-            self.jacobian = jacobian_inv
-            self.jacobian_chi2 = jacobian_chi2_inv
-        elif model == 'sat':
-            self.jacobian = jacobian_sat
-            self.jacobian_chi2 = jacobian_chi2_sat
+        self.jacobian = self.fit.jacobian
+        self.jacobian_chi2 = self.fit.jacobian_chi2
 
 
     def back_calc_data(self):
@@ -96,50 +75,30 @@ class Relax_fit_opt:
         """
 
         # Return the data.
-        return back_calc_I()
+        return self.fit.back_calc_I()
 
 
-    def func_exp(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
-
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The function value generated by the C module.
-        @rtype:         float
-        """
-
-        # Convert if necessary.
-        if isinstance(params, ndarray):
-            params = params.tolist()
-
-        # Call the C code.
-        chi2 = func_exp(params)
-
-        # Return the chi2 value.
-        return nan_to_num(chi2)
+    def func_batch(self, params):
+        """Calculate the chi-squared values for many parameter vectors in a single C call.
 
+        This is the batched target function used by the grid search.
 
-    def func_inv(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
 
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The function value generated by the C module.
-        @rtype:         float
+        @param params:  The parameter vectors, one row per vector.
+        @type params:   numpy rank-2 array
+        @return:        The chi-squared values.
+        @rtype:         numpy rank-1 float64 array
         """
 
         # Convert if necessary.
         if isinstance(params, ndarray):
             params = params.tolist()
 
-        # Call the C code.
-        chi2 = func_inv(params)
-
-        # Return the chi2 value.
-        return nan_to_num(chi2)
+        # Call the C code, with the data of this curve for all parameter vectors.
+        return nan_to_num(array(func_batch([self.fit] * len(params), params), float64))
 
 
-    def func_sat(self, params):
+    def func(self, params):
         """Wrapper function for the C module, for converting numpy arrays.
 
         @param params:  The parameter array from the minimisation code.
@@ -153,33 +112,13 @@ class Relax_fit_opt:
             params = params.tolist()
 
         # Call the C code.
-        chi2 = func_sat(params)
+        chi2 = self.fit.func(params)
 
         # Return the chi2 value.
         return nan_to_num(chi2)
 
 
-    def dfunc_exp(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
-
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The gradient generated by the C module converted to numpy format.
-        @rtype:         numpy float64 array
-        """
-
-        # Convert if necessary.
-        if isinstance(params, ndarray):
-            params = params.tolist()
-
-        # Call the C code.
-        dchi2 = dfunc_exp(params)
-
-        # Return the chi2 gradient as a numpy array.
-        return array(dchi2, float64)
-
-
-    def dfunc_inv(self, params):
+    def dfunc(self, params):
         """Wrapper function for the C module, for converting numpy arrays.
 
         @param params:  The parameter array from the minimisation code.
@@ -193,19 +132,19 @@ class Relax_fit_opt:
             params = params.tolist()
 
         # Call the C code.
-        dchi2 = dfunc_inv(params)
+        dchi2 = self.fit.dfunc(params)
 
         # Return the chi2 gradient as a numpy array.
         return array(dchi2, float64)
 
 
-    def dfunc_sat(self, params):
+    def d2func(self, params):
         """Wrapper function for the C module, for converting numpy arrays.
 
         @param params:  The parameter array from the minimisation code.
         @type params:   numpy array
-        @return:        The gradient generated by the C module converted to numpy format.
-        @rtype:         numpy float64 array
+        @return:        The Hessian generated by the C module converted to numpy format.
+        @rtype:         numpy float64 rank-2 array
         """
 
         # Convert if necessary.
@@ -213,67 +152,68 @@ class Relax_fit_opt:
             params = params.tolist()
 
         # Call the C code.
-        dchi2 = dfunc_sat(params)
+        d2chi2 = self.fit.d2func(params)
 
-        # Return the chi2 gradient as a numpy array.
-        return array(dchi2, float64)
+        # Return the chi2 Hessian as a numpy array.
+        return array(d2chi2, float64)
 
 
-    def d2func_exp(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
 
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The Hessian generated by the C module converted to numpy format.
-        @rtype:         numpy float64 rank-2 array
-        """
+def func_batch_opt(targets=None, params=None):
+    """Calculate the chi-squared values for many exponential curves in a single C call.
 
-        # Convert if necessary.
-        if isinstance(params, ndarray):
-            params = params.tolist()
+    The C code releases the Python global interpreter lock, so that different lists of target functions can be evaluated in parallel threads.
 
-        # Call the C code.
-        d2chi2 = d2func_exp(params)
 
-        # Return the chi2 Hessian as a numpy array.
-        return array(d2chi2, float64)
+    @keyword targets:   The target function objects.
+    @type targets:      list of Relax_fit_opt instances
+    @keyword params:    The parameter vectors, one per target function.
+    @type params:       list of list of float or numpy rank-2 array
+    @return:            The chi-squared values.
+    @rtype:             numpy rank-1 float64 array
+    """
 
+    # Convert if necessary.
+    if isinstance(params, ndarray):
+        params = params.tolist()
 
-    def d2func_inv(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
+    # Call the C code.
+    return nan_to_num(array(func_batch([target.fit for target in targets], params), float64))
 
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The Hessian generated by the C module converted to numpy format.
-        @rtype:         numpy float64 rank-2 array
-        """
 
-        # Convert if necessary.
-        if isinstance(params, ndarray):
-            params = params.tolist()
+def dfunc_batch_opt(targets=None, params=None):
+    """Calculate the chi-squared gradients for many exponential curves in a single C call.
 
-        # Call the C code.
-        d2chi2 = d2func_inv(params)
+    @keyword targets:   The target function objects.
+    @type targets:      list of Relax_fit_opt instances
+    @keyword params:    The parameter vectors, one per target function.
+    @type params:       list of list of float or numpy rank-2 array
+    @return:            The chi-squared gradients, one row per target function.
+    @rtype:             numpy rank-2 float64 array
+    """
 
-        # Return the chi2 Hessian as a numpy array.
-        return array(d2chi2, float64)
+    # Convert if necessary.
+    if isinstance(params, ndarray):
+        params = params.tolist()
 
+    # Call the C code.
+    return array(dfunc_batch([target.fit for target in targets], params), float64)
 
-    def d2func_sat(self, params):
-        """Wrapper function for the C module, for converting numpy arrays.
 
-        @param params:  The parameter array from the minimisation code.
-        @type params:   numpy array
-        @return:        The Hessian generated by the C module converted to numpy format.
-        @rtype:         numpy float64 rank-2 array
-        """
+def d2func_batch_opt(targets=None, params=None):
+    """Calculate the chi-squared Hessians for many exponential curves in a single C call.
 
-        # Convert if necessary.
-        if isinstance(params, ndarray):
-            params = params.tolist()
+    @keyword targets:   The target function objects.
+    @type targets:      list of Relax_fit_opt instances
+    @keyword params:    The parameter vectors, one per target function.
+    @type params:       list of list of float or numpy rank-2 array
+    @return:            The chi-squared Hessians, one per target function.
+    @rtype:             numpy rank-3 float64 array
+    """
 
-        # Call the C code.
-        d2chi2 = d2func_sat(params)
+    # Convert if necessary.
+    if isinstance(params, ndarray):
+        params = params.tolist()
 
-        # Return the chi2 Hessian as a numpy array.
-        return array(d2chi2, float64)
+    # Call the C code.
+    return array(d2func_batch([target.fit for target in targets], params), float64)
@@ -0,0 +1,222 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Package docstring.
+"""The relax benchmarks for detecting performance regressions.
+
+Each benchmark times a parametrised workload, keyed as 'name[param=value, ...]'.  The timings can be saved as a JSON file and, in a later run, used as the baseline whereby each benchmark slower than the baseline by more than the threshold factor causes its test to fail.
+"""
+
+# Python module imports.
+from json import dump, load
+from numpy import __version__ as numpy_version
+import platform
+from re import search
+from unittest import TestSuite
+
+# relax module imports.
+from lib.errors import RelaxError
+from version import version_full
+
+# relax benchmark module imports.
+from test_suite.relax_test_loader import RelaxTestLoader as TestLoader
+from test_suite.benchmarks.base_classes import BenchmarkTestCase, DEFAULT_THRESHOLD
+from test_suite.benchmarks.frame_order import Frame_order
+from test_suite.benchmarks.model_free import Model_free
+from test_suite.benchmarks.multi_processor import Multi_processor
+from test_suite.benchmarks.n_state_model import N_state_model
+from test_suite.benchmarks.relax_disp import Relax_disp
+from test_suite.benchmarks.state import State
+from test_suite.benchmarks.structure import Structure
+
+
+__all__ = [
+    'base_classes',
+    'frame_order',
+    'model_free',
+    'multi_processor',
+    'n_state_model',
+    'relax_disp',
+    'state',
+    'structure'
+]
+
+
+class Benchmark_runner:
+    """Class for executing the benchmarks."""
+
+    def run(self, tests=None, runner=None, save_file=None, baseline_file=None, threshold=None):
+        """Run the benchmarks.
+
+        @keyword tests:         The list of benchmarks to preform.
+        @type tests:            list of str
+        @keyword runner:        A test runner such as TextTestRunner.  For an example of how to write a test runner see the python documentation for TextTestRunner in the python source.
+        @type runner:           Test runner instance (TextTestRunner, BaseGUITestRunner subclass, etc.)
+        @keyword save_file:     The JSON file to save the timings to.
+        @type save_file:        None or str
+        @keyword baseline_file: The JSON file of a previous run to compare the timings to.
+        @type baseline_file:    None or str
+        @keyword threshold:     The slowdown factor relative to the baseline above which a benchmark fails.
+        @type threshold:        None or float
+        @return:                The status of the benchmarks.
+        @rtype:                 bool
+        """
+
+        # Set up the benchmark configuration.
+        BenchmarkTestCase.results = {}
+        BenchmarkTestCase.baseline = {}
+        BenchmarkTestCase.threshold = DEFAULT_THRESHOLD
+        if baseline_file:
+            BenchmarkTestCase.baseline = self.load(baseline_file)
+        if threshold:
+            BenchmarkTestCase.threshold = threshold
+
+        # Create an array of test suites (add your new TestCase classes here).
+        suite_array = []
+
+        # Specific tests.
+        for test in tests:
+            # The entire test class.
+            if not search('\.', test):
+                # Check that the class exists.
+                if test not in globals():
+                    raise RelaxError("The benchmark class '%s' does not exist." % test)
+
+                # The uninstantiated class object.
+                obj = globals()[test]
+
+                # Add the tests.
+                suite_array.append(TestLoader().loadTestsFromTestCase(obj))
+
+            # Single benchmark.
+            else:
+                # Split.
+                row = test.split('.')
+
+                # Check.
+                if len(row) != 2:
+                    raise RelaxError("The test '%s' is not in the correct format.  It should consist of the test case class, a dot, and the specific test." % test)
+
+                # Unpack.
+                class_name, test_name = row
+
+                # Get the class object.
+                obj = globals()[class_name]
+
+                # Add the test.
+                suite_array.append(TestLoader().loadTestsFromNames([test_name], obj))
+
+        # All tests.
+        if not tests:
+            suite_array.append(TestLoader().loadTestsFromTestCase(Frame_order))
+            suite_array.append(TestLoader().loadTestsFromTestCase(Model_free))
+            suite_array.append(TestLoader().loadTestsFromTestCase(Multi_processor))
+            suite_array.append(TestLoader().loadTestsFromTestCase(N_state_model))
+            suite_array.append(TestLoader().loadTestsFromTestCase(Relax_disp))
+            suite_array.append(TestLoader().loadTestsFromTestCase(State))
+            suite_array.append(TestLoader().loadTestsFromTestCase(Structure))
+
+        # Group all tests together.
+        full_suite = TestSuite(suite_array)
+
+        # Run the test suite.
+        results = runner.run(full_suite)
+
+        # The timings.
+        self.print_results()
+        if save_file:
+            self.save(save_file)
+
+        # Return the status of the tests.
+        return results.wasSuccessful()
+
+
+    def load(self, file_name):
+        """Load the timings of a saved benchmark run.
+
+        @param file_name:   The JSON file created by the save() method.
+        @type file_name:    str
+        @raises RelaxError: If the file does not contain benchmark timings.
+        @return:            The timings, keyed by the benchmark key.
+        @rtype:             dict
+        """
+
+        # Read the file.
+        with open(file_name) as file:
+            data = load(file)
+
+        # Check the contents.
+        if not isinstance(data, dict) or 'benchmarks' not in data:
+            raise RelaxError("The file '%s' does not contain relax benchmark timings." % file_name)
+
+        # Return the timings.
+        return data['benchmarks']
+
+
+    def print_results(self):
+        """Print out the table of benchmark timings."""
+
+        # Nothing to do.
+        if not BenchmarkTestCase.results:
+            return
+
+        # The header.
+        width = max([len(key) for key in BenchmarkTestCase.results])
+        header = "%-*s %14s %14s %8s" % (width, "Benchmark", "Time (s)", "Baseline (s)", "Ratio")
+        print("\n\n" + '-'*len(header))
+        print(header)
+        print('-'*len(header))
+
+        # The table.
+        for key in sorted(BenchmarkTestCase.results):
+            entry = BenchmarkTestCase.results[key]
+            baseline = ratio = "-"
+            if 'baseline' in entry:
+                baseline = "%14.6g" % entry['baseline']
+                ratio = "%8.3f" % entry['ratio']
+            print("%-*s %14.6g %14s %8s" % (width, key, entry['time'], baseline, ratio))
+
+        # End the table.
+        print('-'*len(header))
+        print("\n")
+
+
+    def save(self, file_name):
+        """Save the timings of the benchmark run, together with the software versions and platform, as a JSON file.
+
+        @param file_name:   The name of the file to create.
+        @type file_name:    str
+        """
+
+        # The data.
+        data = {
+            'relax': version_full(),
+            'python': platform.python_version(),
+            'numpy': numpy_version,
+            'platform': platform.platform(),
+            'threshold': BenchmarkTestCase.threshold,
+            'benchmarks': BenchmarkTestCase.results
+        }
+
+        # Write the file.
+        with open(file_name, 'w') as file:
+            dump(data, file, indent=4, sort_keys=True)
+            file.write("\n")
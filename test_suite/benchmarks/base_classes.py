@@ -0,0 +1,153 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Base classes for the benchmarks."""
+
+# Python module imports.
+from timeit import default_timer
+
+# relax module imports.
+from test_suite.system_tests.base_classes import SystemTestCase
+
+
+# The default factor by which a benchmark can be slower than its baseline before it is reported as a performance regression.
+DEFAULT_THRESHOLD = 1.5
+
+
+def benchmark_key(name, params=None):
+    """Create the unique key of a parametrised benchmark.
+
+    @param name:        The name of the benchmark.
+    @type name:         str
+    @keyword params:    The workload parameters.
+    @type params:       dict or None
+    @return:            The benchmark key, for example 'model_free.func[diff_type=sphere, spins=10]'.
+    @rtype:             str
+    """
+
+    # No parameters.
+    if not params:
+        return name
+
+    # Append the sorted parameters.
+    return "%s[%s]" % (name, ", ".join(["%s=%s" % (key, params[key]) for key in sorted(params)]))
+
+
+class BenchmarkTestCase(SystemTestCase):
+    """The benchmark base class.
+
+    The class level attributes are the configuration and results of the benchmark run, shared by all benchmark classes and set up by the Benchmark_runner.
+    """
+
+    # The timings of all benchmarks, keyed by benchmark_key().
+    results = {}
+
+    # The baseline timings, in the same format as the results.
+    baseline = {}
+
+    # The default slowdown factor triggering a failure.
+    threshold = DEFAULT_THRESHOLD
+
+    # The number of repetitions of each timing, the fastest being kept.
+    repeat = 3
+
+    def __init__(self, methodName=None):
+        """Set up the benchmark class."""
+
+        # The skip type.
+        self._skip_type = 'benchmark'
+
+        # Execute the base class __init__ method.
+        super(BenchmarkTestCase, self).__init__(methodName)
+
+
+    def setUp(self):
+        """Initialise the list of performance regressions."""
+
+        # The slowdowns of the current test.
+        self.slowdowns = []
+
+
+    def assert_no_slowdown(self):
+        """Fail if any of the benchmarks of the test are slower than their baselines."""
+
+        # Nothing to report.
+        if not self.slowdowns:
+            return
+
+        # Fail with all of the regressions.
+        text = "Performance regressions detected:\n"
+        for key, ratio, threshold in self.slowdowns:
+            text += "    %s takes %.2f times the baseline time (threshold of %.2f).\n" % (key, ratio, threshold)
+        self.fail(text)
+
+
+    def benchmark(self, name, func, params=None, number=1):
+        """Time a workload and compare it to the baseline.
+
+        The workload is called number times per repetition, and the fastest of the repetitions is stored as the time per call.  The comparison uses the 'threshold' value of the baseline entry, if present, in preference to the global threshold.
+
+
+        @param name:        The name of the benchmark.
+        @type name:         str
+        @param func:        The workload, called without arguments.
+        @type func:         function
+        @keyword params:    The workload parameters, used to create the benchmark key.
+        @type params:       dict or None
+        @keyword number:    The number of calls per repetition, for timing fast workloads.
+        @type number:       int
+        @return:            The time per call, in seconds.
+        @rtype:             float
+        """
+
+        # Call once, so that one-off initialisation costs are not timed.
+        func()
+
+        # The timings.
+        times = []
+        for i in range(self.repeat):
+            start = default_timer()
+            for j in range(number):
+                func()
+            times.append((default_timer() - start) / number)
+        best = min(times)
+
+        # Store the result.
+        key = benchmark_key(name, params)
+        entry = {
+            'time': best,
+            'times': times,
+            'number': number,
+            'params': params or {}
+        }
+        self.results[key] = entry
+
+        # Baseline comparison.
+        if key in self.baseline:
+            entry['baseline'] = self.baseline[key]['time']
+            entry['ratio'] = best / self.baseline[key]['time']
+            threshold = self.baseline[key].get('threshold', self.threshold)
+            if entry['ratio'] > threshold:
+                self.slowdowns.append((key, entry['ratio'], threshold))
+
+        # Return the time.
+        return best
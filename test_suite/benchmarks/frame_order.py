@@ -0,0 +1,117 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the frame order target functions using the quasi-random numerical PCS integration."""
+
+# Python module imports.
+from numpy import array, cos, float64, ones, sin, zeros
+
+# relax module imports.
+from lib.frame_order.variables import MODEL_ISO_CONE, MODEL_PSEUDO_ELLIPSE, MODEL_ROTOR
+from target_functions.frame_order import Frame_order as Frame_order_target
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class Frame_order(BenchmarkTestCase):
+    """Class for benchmarking the frame order models."""
+
+    def create_target(self, model, num_spins, sobol_max_points):
+        """Create the frame order target function class for synthetic PCS data.
+
+        @param model:               The frame order model.
+        @type model:                str
+        @param num_spins:           The number of spins with PCS data.
+        @type num_spins:            int
+        @param sobol_max_points:    The maximum number of Sobol' points for the numerical PCS integration.
+        @type sobol_max_points:     int
+        @return:                    The target function class and the parameter vector.
+        @rtype:                     Frame_order instance, numpy rank-1 array
+        """
+
+        # The parameters, the translation and average domain position rotation followed by the motional parameters.
+        params = [0.1, -0.2, 0.3, 0.5, 1.0, -0.5]
+        if model == MODEL_ROTOR:
+            params += [0.3, 0.8]
+        elif model == MODEL_ISO_CONE:
+            params += [1.0, 0.5, 0.6, 0.8]
+        elif model == MODEL_PSEUDO_ELLIPSE:
+            params += [0.2, 1.2, -0.4, 0.5, 0.9, 0.8]
+        params = array(params, float64)
+
+        # Two alignments.
+        full_tensors = array([1.0, -2.0, 0.5, 1.5, -0.5, -1.0, 2.5, 1.0, -0.5, 0.8], float64) * 1e-4
+
+        # The atomic positions of the spins on a spiral around the pivot.
+        atomic_pos = zeros((num_spins, 3), float64)
+        for j in range(num_spins):
+            atomic_pos[j] = [10.0 * cos(j), 10.0 * sin(j), 0.2 * j - 10.0]
+
+        # The PCS data.
+        pcs = 1e-6 * ones((2, num_spins), float64)
+        pcs_errors = 0.1e-6 * ones((2, num_spins), float64)
+        pcs_weights = ones((2, num_spins), float64)
+
+        # Initialise the target function class.
+        target = Frame_order_target(model=model, init_params=params, full_tensors=full_tensors, full_in_ref_frame=[1, 1], pcs=pcs, pcs_errors=pcs_errors, pcs_weights=pcs_weights, atomic_pos=atomic_pos, temp=array([298.0, 298.0]), frq=array([900e6, 900e6]), paramag_centre=array([0.0, 0.0, 20.0]), com=array([0.0, 0.0, 5.0]), pivot=array([1.0, -1.0, 2.0]), sobol_max_points=sobol_max_points, sobol_oversample=10)
+
+        # Return the class and parameters.
+        return target, params
+
+
+    def run_model(self, model):
+        """Benchmark the target function of the frame order model for all workloads.
+
+        @param model:   The frame order model.
+        @type model:    str
+        """
+
+        # Loop over the workloads.
+        for sobol_max_points in [100, 1000]:
+            # The target function.
+            target, params = self.create_target(model, 100, sobol_max_points)
+
+            # The timing.
+            self.benchmark('frame_order.func', lambda: target.func(params), params={'model': model, 'sobol_max_points': sobol_max_points, 'spins': 100}, number=5)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def test_iso_cone(self):
+        """Benchmark the isotropic cone frame order model."""
+
+        # Run the workloads.
+        self.run_model(MODEL_ISO_CONE)
+
+
+    def test_pseudo_ellipse(self):
+        """Benchmark the pseudo-ellipse frame order model."""
+
+        # Run the workloads.
+        self.run_model(MODEL_PSEUDO_ELLIPSE)
+
+
+    def test_rotor(self):
+        """Benchmark the rotor frame order model."""
+
+        # Run the workloads.
+        self.run_model(MODEL_ROTOR)
@@ -0,0 +1,183 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the model-free target functions."""
+
+# Python module imports.
+from numpy import array, cos, float64, sin
+from numpy.linalg import norm
+
+# relax module imports.
+from lib.periodic_table import periodic_table
+from lib.physical_constants import h_bar, mu0
+from target_functions.mf import Mf
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class Model_free(BenchmarkTestCase):
+    """Class for benchmarking the model-free target functions."""
+
+    def setUp(self):
+        """Set up the parameters common to all workloads."""
+
+        # Execute the base class method.
+        super(Model_free, self).setUp()
+
+        # The diffusion tensors.
+        self.diff_params = {
+            'sphere': [8e-9],
+            'ellipsoid': [8e-9, 2e7, 0.3, 0.5, 1.1, 2.7]
+        }
+
+        # The model-free models cycled through by the spins.
+        self.models = [
+            ('mf_orig', ['s2', 'te'], [0.75, 40e-12]),
+            ('mf_orig', ['s2', 'te', 'rex'], [0.7, 30e-12, 1.5e-19]),
+            ('mf_ext', ['s2f', 'tf', 's2', 'ts'], [0.85, 20e-12, 0.6, 1.0e-9])
+        ]
+
+
+    def create_target(self, model_type, diff_type, num_spins, first_model=0):
+        """Create the model-free target function class for the synthetic spins.
+
+        @param model_type:      The model-free model type, either 'mf', 'diff' or 'all'.
+        @type model_type:       str
+        @param diff_type:       The diffusion tensor type.
+        @type diff_type:        str
+        @param num_spins:       The number of spins.  This must be 1 for the 'mf' model type.
+        @type num_spins:        int
+        @keyword first_model:   The index of the model-free model of the first spin.
+        @type first_model:      int
+        @return:                The target function class and the parameter vector.
+        @rtype:                 Mf instance, numpy rank-1 array
+        """
+
+        # The spin data, R1, R2 and NOE at two fields.
+        kwargs = {}
+        params = list(self.diff_params[diff_type])
+        if model_type == 'mf':
+            params = []
+        for i in range(num_spins):
+            model = self.models[(first_model + i) % len(self.models)]
+            vector = array([cos(i), sin(i), cos(3.0*i)], float64)
+            spin = {
+                'equations': model[0],
+                'param_types': model[1],
+                'param_values': array(model[2], float64),
+                'relax_data': array([1.5, 10.0, 0.7, 1.8, 9.0, 0.6], float64) * (1.0 + 0.001*i),
+                'errors': array([0.05, 0.3, 0.05, 0.05, 0.3, 0.05], float64),
+                'bond_length': 1.02e-10,
+                'csa': -172e-6,
+                'num_frq': 2,
+                'frq': [600e6, 500e6],
+                'num_ri': 6,
+                'remap_table': [0, 0, 0, 1, 1, 1],
+                'noe_r1_table': [None, None, 0, None, None, 3],
+                'ri_labels': ['R1', 'R2', 'NOE', 'R1', 'R2', 'NOE'],
+                'gx': periodic_table.gyromagnetic_ratio('15N'),
+                'gh': periodic_table.gyromagnetic_ratio('1H'),
+                'num_params': len(model[1]),
+                'vectors': vector / norm(vector)
+            }
+            for name in spin:
+                kwargs.setdefault(name, []).append(spin[name])
+            if model_type in ['mf', 'all']:
+                params = params + model[2]
+
+        # Model type specific arguments.
+        if model_type == 'all':
+            kwargs['param_values'] = None
+        if diff_type == 'sphere':
+            kwargs['vectors'] = [None] * num_spins
+
+        # Initialise the target function class.
+        params = array(params, float64)
+        mf = Mf(init_params=params, model_type=model_type, diff_type=diff_type, diff_params=self.diff_params[diff_type], num_spins=num_spins, h_bar=h_bar, mu0=mu0, **kwargs)
+
+        # Return the class and parameters.
+        return mf, params
+
+
+    def run_target(self, model_type):
+        """Benchmark the func, dfunc and d2func methods for all workloads of the model type.
+
+        @param model_type:  The model-free model type, either 'diff' or 'all'.  For the single spin 'mf' model type, see run_target_mf().
+        @type model_type:   str
+        """
+
+        # Loop over the workloads.
+        for diff_type in ['sphere', 'ellipsoid']:
+            for num_spins in [10, 100]:
+                # The target function.
+                mf, params = self.create_target(model_type, diff_type, num_spins)
+                workload = {'diff_type': diff_type, 'spins': num_spins}
+
+                # The timings.
+                self.benchmark('model_free.%s.func' % model_type, lambda: mf.func(params), params=workload, number=10)
+                self.benchmark('model_free.%s.dfunc' % model_type, lambda: mf.dfunc(params), params=workload, number=10)
+                self.benchmark('model_free.%s.d2func' % model_type, lambda: mf.d2func(params), params=workload, number=10)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def run_target_mf(self):
+        """Benchmark the func, dfunc and d2func methods for the single spin workloads of the 'mf' model type.
+
+        This is the target function for the optimisation of the individual spins with a fixed diffusion tensor.
+        """
+
+        # Loop over the workloads.
+        for diff_type in ['sphere', 'ellipsoid']:
+            for i in range(len(self.models)):
+                # The target function.
+                mf, params = self.create_target('mf', diff_type, 1, first_model=i)
+                workload = {'diff_type': diff_type, 'model': '+'.join(self.models[i][1])}
+
+                # The timings.
+                self.benchmark('model_free.mf.func', lambda: mf.func(params), params=workload, number=1000)
+                self.benchmark('model_free.mf.dfunc', lambda: mf.dfunc(params), params=workload, number=1000)
+                self.benchmark('model_free.mf.d2func', lambda: mf.d2func(params), params=workload, number=1000)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def test_all(self):
+        """Benchmark the model-free target functions for the 'all' model type."""
+
+        # Run the workloads.
+        self.run_target('all')
+
+
+    def test_diff(self):
+        """Benchmark the model-free target functions for the 'diff' model type."""
+
+        # Run the workloads.
+        self.run_target('diff')
+
+
+    def test_mf(self):
+        """Benchmark the model-free target functions for the single spin 'mf' model type."""
+
+        # Run the workloads.
+        self.run_target_mf()
@@ -0,0 +1,176 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the multi-processor command queues, without MPI."""
+
+# relax module imports.
+from multi.memo import Memo
+from multi.result_commands import Result_command
+from multi.slave_commands import Slave_command
+from multi.uni_processor import Uni_processor
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+from test_suite.unit_tests._multi.test_multi_processor_base import Simulated_processor, Timed_command
+
+
+class Sum_command(Slave_command):
+    """A slave command summing a list of numbers."""
+
+    def __init__(self, values):
+        """Store the numbers.
+
+        @param values:  The numbers to sum.
+        @type values:   list of float
+        """
+
+        # Execute the base class __init__ method.
+        super(Sum_command, self).__init__()
+
+        # Store the arg.
+        self.values = values
+
+
+    def run(self, processor, completed):
+        """Return the sum to the master.
+
+        @param processor:   The slave processor the command is running on.
+        @type processor:    Processor instance
+        @param completed:   The flag indicating the end of the batched result returns.
+        @type completed:    bool
+        """
+
+        # Return the result.
+        processor.return_object(Sum_result(processor, sum(self.values), memo_id=self.memo_id, completed=completed))
+
+
+
+class Sum_memo(Memo):
+    """The memo storing the sum on the master."""
+
+    def __init__(self):
+        """Initialise the sum."""
+
+        # The sum.
+        self.total = None
+
+
+
+class Sum_result(Result_command):
+    """The result command returning the sum to the master."""
+
+    def __init__(self, processor, total, memo_id=None, completed=True):
+        """Store the sum.
+
+        @param processor:   The slave processor.
+        @type processor:    Processor instance
+        @param total:       The sum.
+        @type total:        float
+        @keyword memo_id:   The ID of the memo of the slave command.
+        @type memo_id:      int
+        @keyword completed: The flag indicating the end of the batched result returns.
+        @type completed:    bool
+        """
+
+        # Execute the base class __init__ method.
+        super(Sum_result, self).__init__(processor=processor, completed=completed, memo_id=memo_id)
+
+        # Store the arg.
+        self.total = total
+
+
+    def run(self, processor, memo):
+        """Store the sum in the memo.
+
+        @param processor:   The master processor.
+        @type processor:    Processor instance
+        @param memo:        The memo of the slave command.
+        @type memo:         Sum_memo instance
+        """
+
+        # Store the result.
+        memo.total = self.total
+
+
+
+class Multi_processor(BenchmarkTestCase):
+    """Class for benchmarking the multi-processor command queues."""
+
+    def queue_sum_commands(self, processor, num_commands):
+        """Queue and run the summing commands with their memos.
+
+        @param processor:       The processor.
+        @type processor:        Processor instance
+        @param num_commands:    The number of commands.
+        @type num_commands:     int
+        """
+
+        # Queue the commands.
+        for i in range(num_commands):
+            processor.add_to_queue(Sum_command([1.0, 2.0, float(i)]), Sum_memo())
+
+        # Run the queue.
+        processor.run_queue()
+
+
+    def queue_timed_commands(self, num_slaves, num_commands):
+        """Run the queue of the simulated multi-processor fabric.
+
+        @param num_slaves:      The number of simulated slaves.
+        @type num_slaves:       int
+        @param num_commands:    The number of commands.
+        @type num_commands:     int
+        """
+
+        # The processor.
+        processor = Simulated_processor(num_slaves)
+
+        # Queue the commands, with the costs scattered.
+        for i in range(num_commands):
+            processor.add_to_queue(Timed_command(i, 1.0, cost=(7*i) % 13))
+
+        # Run the queue.
+        processor.run_queue()
+
+
+    def test_simulated(self):
+        """Benchmark the scheduling of the multi-processor master using a simulated slave fabric."""
+
+        # Loop over the workloads.
+        for num_slaves in [4, 16]:
+            for num_commands in [100, 1000]:
+                self.benchmark('multi_processor.simulated', lambda: self.queue_timed_commands(num_slaves, num_commands), params={'commands': num_commands, 'slaves': num_slaves})
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def test_uni(self):
+        """Benchmark the queue of the uni-processor with memo result handling."""
+
+        # The processor.
+        processor = Uni_processor(processor_size=1, callback=None)
+
+        # Loop over the workloads.
+        for num_commands in [100, 1000, 10000]:
+            self.benchmark('multi_processor.uni', lambda: self.queue_sum_commands(processor, num_commands), params={'commands': num_commands})
+
+        # Check for regressions.
+        self.assert_no_slowdown()
@@ -0,0 +1,92 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the N-state model target functions."""
+
+# Python module imports.
+from numpy import array, float64, int32, ones, sqrt, zeros
+from numpy.random import RandomState
+
+# relax module imports.
+from target_functions.n_state_model import N_state_opt
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class N_state_model(BenchmarkTestCase):
+    """Class for benchmarking the N-state model target functions."""
+
+    def create_target(self, N, num_align=3, num_interatoms=50, num_spins=50):
+        """Create the population N-state model target function class for random RDC and PCS data.
+
+        @param N:                   The number of states.
+        @type N:                    int
+        @keyword num_align:         The number of alignments.
+        @type num_align:            int
+        @keyword num_interatoms:    The number of RDCs per alignment.
+        @type num_interatoms:       int
+        @keyword num_spins:         The number of PCSs per alignment.
+        @type num_spins:            int
+        @return:                    The target function class and the parameter vector.
+        @rtype:                     N_state_opt instance, numpy rank-1 array
+        """
+
+        # A fixed random number sequence.
+        random = RandomState(0)
+
+        # The RDC data.
+        rdc_vect = random.normal(size=(num_interatoms, N, 3))
+        rdc_vect = rdc_vect / sqrt((rdc_vect**2).sum(axis=2))[:, :, None]
+        rdcs = random.normal(size=(num_align, num_interatoms)) * 10.0
+        dip_const = list(random.normal(size=num_interatoms) * 1e4)
+
+        # The PCS data.
+        pcs = random.normal(size=(num_align, num_spins)) * 1e-6
+        atomic_pos = random.normal(size=(num_spins, N, 3)) * 10.0
+
+        # The parameters, the tensors followed by the N-1 populations.
+        params = zeros(5*num_align + N - 1, float64)
+        params[:5*num_align] = random.normal(size=5*num_align) * 1e-4
+        params[5*num_align:] = 1.0 / N
+
+        # Initialise the target function class.
+        target = N_state_opt(model='population', N=N, init_params=params, fixed_tensors=[False]*num_align, rdcs=rdcs, rdc_errors=ones((num_align, num_interatoms), float64), rdc_weights=ones((num_align, num_interatoms), float64), rdc_vect=list(rdc_vect), dip_const=dip_const, rdc_pseudo_flags=zeros(num_interatoms, int32), T_flags=zeros((num_align, num_interatoms), int32), absolute_rdc=zeros((num_align, num_interatoms), int32), pcs=pcs, pcs_errors=0.1e-6*ones((num_align, num_spins), float64), pcs_weights=ones((num_align, num_spins), float64), pcs_pseudo_flags=zeros(num_spins, int32), temp=array([298.0]*num_align), frq=array([600e6]*num_align), atomic_pos=atomic_pos, paramag_centre=array([1.0, -2.0, 3.0]))
+
+        # Return the class and parameters.
+        return target, params
+
+
+    def test_population(self):
+        """Benchmark the func, dfunc and d2func methods of the population N-state model."""
+
+        # Loop over the workloads.
+        for N in [10, 100]:
+            # The target function.
+            target, params = self.create_target(N)
+            workload = {'N': N, 'align': 3, 'rdc': 50, 'pcs': 50}
+
+            # The timings.
+            self.benchmark('n_state_model.func', lambda: target.func(params), params=workload, number=10)
+            self.benchmark('n_state_model.dfunc', lambda: target.dfunc(params), params=workload, number=10)
+            self.benchmark('n_state_model.d2func', lambda: target.d2func(params), params=workload, number=3)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
@@ -0,0 +1,79 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the relaxation dispersion models."""
+
+# Python module imports.
+from os import sep
+
+# relax module imports.
+from lib.dispersion.variables import MODEL_LIST_CPMG, MODEL_LIST_R1RHO, MODEL_PARAMS
+from status import Status; status = Status()
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class Relax_disp(BenchmarkTestCase):
+    """Class for benchmarking the relaxation dispersion models."""
+
+    def run_models(self, data, models):
+        """Benchmark the chi-squared calculation of each dispersion model for the given R2eff data.
+
+        @param data:    The name of the directory in 'test_suite/shared_data/dispersion' containing the 'r2eff_values' state of the 'base pipe' and 'R2eff' data pipes.
+        @type data:     str
+        @param models:  The dispersion models.
+        @type models:   list of str
+        """
+
+        # Load the R2eff data.
+        data_path = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+data
+        self.interpreter.state.load(data_path+sep+'r2eff_values')
+
+        # Loop over the models.
+        for model in models:
+            # The model data pipe, with the R2eff data and the default parameter values.
+            pipe_name = "%s - relax_disp" % model
+            self.interpreter.pipe.copy(pipe_from='base pipe', pipe_to=pipe_name, bundle_to='relax_disp')
+            self.interpreter.pipe.switch(pipe_name=pipe_name)
+            self.interpreter.spin.isotope('15N', force=True)
+            self.interpreter.relax_disp.select_model(model=model)
+            self.interpreter.value.copy(pipe_from='R2eff', pipe_to=pipe_name, param='r2eff')
+            self.interpreter.value.set(param=MODEL_PARAMS[model])
+
+            # The timing.
+            self.benchmark('relax_disp.calculate', lambda: self.interpreter.minimise.calculate(verbosity=0), params={'data': data, 'model': model}, number=5)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def test_cpmg(self):
+        """Benchmark the CPMG dispersion models using the 'Hansen' R2eff data."""
+
+        # Run the workloads.
+        self.run_models('Hansen', MODEL_LIST_CPMG)
+
+
+    def test_r1rho(self):
+        """Benchmark the R1rho dispersion models using the 'r1rho_off_res_tp02' R2eff data."""
+
+        # Run the workloads.
+        self.run_models('r1rho_off_res_tp02', MODEL_LIST_R1RHO)
@@ -0,0 +1,88 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the saving and loading of the relax data store."""
+
+# Python module imports.
+from os import sep
+from tempfile import mkdtemp
+
+# relax module imports.
+from pipe_control.mol_res_spin import create_spin, spin_loop
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class State(BenchmarkTestCase):
+    """Class for benchmarking the saving and loading of the relax data store."""
+
+    def setUp(self):
+        """Set up the temporary directory."""
+
+        # Execute the base class method.
+        super(State, self).setUp()
+
+        # Create a temporary directory for the states.
+        self.tmpdir = mkdtemp()
+
+
+    def setup_data(self, num_spins):
+        """Create a model-free data pipe with the given number of spins.
+
+        @param num_spins:   The number of spins.
+        @type num_spins:    int
+        """
+
+        # Reset and create the data pipe.
+        self.interpreter.reset()
+        self.interpreter.pipe.create('benchmark', 'mf')
+
+        # Create the spins.
+        for i in range(num_spins):
+            create_spin(spin_num=i+1, spin_name='N', res_num=i+1, res_name='GLY')
+
+        # Add model-free parameters and relaxation data.
+        for spin in spin_loop():
+            spin.s2 = 0.8
+            spin.te = 20e-12
+            spin.rex = 0.0
+            spin.ri_data = {'R1_600': 1.5, 'R2_600': 10.0, 'NOE_600': 0.7}
+            spin.ri_data_err = {'R1_600': 0.05, 'R2_600': 0.3, 'NOE_600': 0.05}
+
+
+    def test_save_load(self):
+        """Benchmark the state.save and state.load user functions for the XML and binary formats."""
+
+        # Loop over the workloads.
+        for num_spins in [100, 1000]:
+            # The data.
+            self.setup_data(num_spins)
+
+            # Loop over the formats.
+            for format in ['xml', 'binary']:
+                # The timings.
+                state = self.tmpdir + sep + 'state_%s_%i' % (format, num_spins)
+                workload = {'format': format, 'spins': num_spins}
+                self.benchmark('state.save', lambda: self.interpreter.state.save(state, force=True, format=format), params=workload)
+                self.benchmark('state.load', lambda: self.interpreter.state.load(state, force=True), params=workload)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
@@ -0,0 +1,86 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Module docstring.
+"""Benchmarks of the structural analyses."""
+
+# Python module imports.
+from numpy import float64
+from numpy.random import RandomState
+from os import sep
+
+# relax module imports.
+from lib.structure.superimpose import fit_to_first, fit_to_mean
+from status import Status; status = Status()
+from test_suite.benchmarks.base_classes import BenchmarkTestCase
+
+
+class Structure(BenchmarkTestCase):
+    """Class for benchmarking the structural analyses."""
+
+    def read_pdb(self, file):
+        """Read the PDB file into a new data pipe.
+
+        @param file:    The name of the PDB file in the 'test_suite/shared_data/structures' directory.
+        @type file:     str
+        """
+
+        # Reset and create the data pipe.
+        self.interpreter.reset()
+        self.interpreter.pipe.create('benchmark', 'N-state')
+
+        # Read the structure.
+        self.interpreter.structure.read_pdb(file, dir=status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'structures')
+
+
+    def test_read_pdb(self):
+        """Benchmark the structure.read_pdb user function."""
+
+        # Loop over the workloads.
+        for file in ['1UBQ.pdb', '1OSA.pdb', 'Ap4Aase_res1-12.pdb']:
+            self.benchmark('structure.read_pdb', lambda: self.read_pdb(file), params={'file': file})
+
+        # Check for regressions.
+        self.assert_no_slowdown()
+
+
+    def test_superimpose(self):
+        """Benchmark the superimposition of perturbed models."""
+
+        # A fixed random number sequence.
+        random = RandomState(0)
+
+        # Loop over the workloads.
+        for num_models in [10, 100]:
+            for num_atoms in [100, 1000]:
+                # The perturbed atomic coordinates.
+                base = random.normal(size=(num_atoms, 3)) * 10.0
+                coord = base + random.normal(size=(num_models, num_atoms, 3))
+                coord = coord.astype(float64)
+                models = list(range(num_models))
+                workload = {'atoms': num_atoms, 'models': num_models}
+
+                # The timings.
+                self.benchmark('structure.fit_to_first', lambda: fit_to_first(models=models, coord=coord.copy()), params=workload)
+                self.benchmark('structure.fit_to_mean', lambda: fit_to_mean(models=models, coord=coord.copy(), verbosity=0), params=workload)
+
+        # Check for regressions.
+        self.assert_no_slowdown()
@@ -28,7 +28,7 @@ from tempfile import mkdtemp, NamedTemporaryFile
 
 # relax module imports.
 from data_store import Relax_data_store; ds = Relax_data_store()
-from pipe_control.mol_res_spin import spin_loop
+from pipe_control.mol_res_spin import return_spin, spin_loop
 from status import Status; status = Status()
 from test_suite.system_tests.base_classes import SystemTestCase
 
@@ -344,3 +344,31 @@ class Spectrum(SystemTestCase):
         # Make the test:
         self.assertEqual(spin_ids_sel, [':4@N', ':5@N', ':6@N'])
         self.assertEqual(spin_ids_desel, [':3@N'])
+
+
+    def test_read_nmrpipe_spectrum(self):
+        """Test the extraction of peak intensities and the baseplane RMSD directly from a NMRPipe spectrum."""
+
+        # The data paths.
+        base_path = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'repeated_analysis'+sep+'SOD1'+sep+'cpmg_disp_sod1d90a_060518'+sep+'cpmg_disp_sod1d90a_060518_normal.fid'
+        ser_path = base_path + sep+'analysis_FT'+sep+'ser_files'+sep+'FT'
+        ft2_file = '..'+sep+'..'+sep+'..'+sep+'ft2_data'+sep+'128_0_FT.ft2'
+
+        # Loop over the integration methods.
+        for int_method, values in [['height', [166086.46875, 810641.3125]], ['point sum', [1176450.7734375, 5746153.9375]]]:
+            # Create the data pipe and spins.
+            self.interpreter.pipe.create(pipe_name=int_method, pipe_type='relax_disp')
+            self.interpreter.spectrum.read_spins(file="128_FT.ser", dir=ser_path)
+
+            # Extract the intensities from the spectrum at the positions of the seriesTab peak list.
+            self.interpreter.spectrum.read_intensities(file="128_FT.ser", dir=ser_path, spectrum_id='128_0', int_method=int_method, spectrum_file=ft2_file)
+
+            # Estimate the baseplane RMSD.
+            self.interpreter.spectrum.baseplane_rmsd(spectrum_id='128_0', file=ft2_file, dir=ser_path)
+
+            # Checks.
+            spin_ids = [':2@N', ':3@N']
+            for i in range(len(spin_ids)):
+                spin = return_spin(spin_id=spin_ids[i])
+                self.assertAlmostEqual(spin.peak_intensity['128_0'], values[i])
+                self.assertAlmostEqual(spin.baseplane_rmsd['128_0'], 7725.040787768554)
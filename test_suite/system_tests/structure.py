@@ -3920,9 +3920,9 @@ class Structure(SystemTestCase):
         self.assertEqual(mol.res_name, ['Tyr', 'Phe'])
         self.assertEqual(mol.res_num, [2, 3])
         self.assertEqual(mol.seg_id, [None, None])
-        self.assertEqual(mol.x, [0.5, 0.0])
-        self.assertEqual(mol.y, [1.0, 0.0])
-        self.assertEqual(mol.z, [-1.0, 0.0])
+        self.assertEqual(mol.x.tolist(), [0.5, 0.0])
+        self.assertEqual(mol.y.tolist(), [1.0, 0.0])
+        self.assertEqual(mol.z.tolist(), [-1.0, 0.0])
 
 
     def test_mean_models(self):
@@ -3978,9 +3978,9 @@ class Structure(SystemTestCase):
             self.assertEqual(cdp.structure.structural_data[i].mol[0].res_name, ['UNK', 'UNK', 'UNK'])
             self.assertEqual(cdp.structure.structural_data[i].mol[0].res_num, [1, 2, 3])
             self.assertEqual(cdp.structure.structural_data[i].mol[0].seg_id, [None, None, None])
-            self.assertEqual(cdp.structure.structural_data[i].mol[0].x, x[i])
-            self.assertEqual(cdp.structure.structural_data[i].mol[0].y, y)
-            self.assertEqual(cdp.structure.structural_data[i].mol[0].z, z[i])
+            self.assertEqual(cdp.structure.structural_data[i].mol[0].x.tolist(), x[i])
+            self.assertEqual(cdp.structure.structural_data[i].mol[0].y.tolist(), y)
+            self.assertEqual(cdp.structure.structural_data[i].mol[0].z.tolist(), z[i])
 
 
     def test_mean_molecules(self):
@@ -4032,9 +4032,9 @@ class Structure(SystemTestCase):
             self.assertEqual(cdp.structure.structural_data[0].mol[i].res_name, ['UNK', 'UNK', 'UNK'])
             self.assertEqual(cdp.structure.structural_data[0].mol[i].res_num, [1, 2, 3])
             self.assertEqual(cdp.structure.structural_data[0].mol[i].seg_id, [None, None, None])
-            self.assertEqual(cdp.structure.structural_data[0].mol[i].x, x[i])
-            self.assertEqual(cdp.structure.structural_data[0].mol[i].y, y)
-            self.assertEqual(cdp.structure.structural_data[0].mol[i].z, z[i])
+            self.assertEqual(cdp.structure.structural_data[0].mol[i].x.tolist(), x[i])
+            self.assertEqual(cdp.structure.structural_data[0].mol[i].y.tolist(), y)
+            self.assertEqual(cdp.structure.structural_data[0].mol[i].z.tolist(), z[i])
 
 
     def test_metadata_xml(self):
@@ -5056,15 +5056,15 @@ class Structure(SystemTestCase):
         self.interpreter.structure.add_atom(atom_name='A', res_name='UNK', res_num=3, pos=[[1., 20., -1.], [0., 20., 0.], [-1., 20., 1.]], element='S')
 
         # Check the internal atomic info.
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].x, [1., 1., 1.])
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].z, [-1., -1., -1.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].x, [0., 0., 0.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].z, [0., 0., 0.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].x, [-1., -1., -1.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].z, [1., 1., 1.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].x.tolist(), [1., 1., 1.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].z.tolist(), [-1., -1., -1.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].x.tolist(), [0., 0., 0.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].z.tolist(), [0., 0., 0.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].x.tolist(), [-1., -1., -1.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].z.tolist(), [1., 1., 1.])
 
         # Calculate the RMSD.
         self.interpreter.structure.rmsd()
@@ -5118,15 +5118,15 @@ class Structure(SystemTestCase):
         self.interpreter.structure.add_atom(atom_name='CA', res_name='UNK', res_num=3, pos=[[1., 20., -1.], [0., 20., 0.], [-1., 20., 1.]], element='S')
 
         # Check the internal atomic info.
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].x, [1., 1., 1.])
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[0].mol[0].z, [-1., -1., -1.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].x, [0., 0., 0.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[1].mol[0].z, [0., 0., 0.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].x, [-1., -1., -1.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].y, [0., 2., 20.])
-        self.assertEqual(cdp.structure.structural_data[2].mol[0].z, [1., 1., 1.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].x.tolist(), [1., 1., 1.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[0].mol[0].z.tolist(), [-1., -1., -1.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].x.tolist(), [0., 0., 0.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[1].mol[0].z.tolist(), [0., 0., 0.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].x.tolist(), [-1., -1., -1.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].y.tolist(), [0., 2., 20.])
+        self.assertEqual(cdp.structure.structural_data[2].mol[0].z.tolist(), [1., 1., 1.])
 
         # Create the spins from the structural data.
         self.interpreter.structure.load_spins(ave_pos=False)
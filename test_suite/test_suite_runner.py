@@ -35,6 +35,7 @@ from test_suite.formatting import summary_line
 # Import the test suite categories.
 if dep_check.wx_module:
     from test_suite.gui_tests import GUI_test_runner
+from test_suite.benchmarks import Benchmark_runner
 from test_suite.system_tests import System_test_runner
 from test_suite.unit_tests.unit_test_runner import Unit_test_runner
 from test_suite.verification_tests import Verification_test_runner
@@ -56,28 +57,38 @@ class Test_suite_runner:
         - Unit tests.
         - GUI tests.
         - Verification tests.
+        - Benchmarks (only run when explicitly requested).
     """
 
-    def __init__(self, tests=[], from_gui=False, categories=['system', 'unit', 'gui', 'verification'], timing=False):
+    def __init__(self, tests=[], from_gui=False, categories=['system', 'unit', 'gui', 'verification'], timing=False, benchmark_save=None, benchmark_baseline=None, benchmark_threshold=None):
         """Store the list of tests to preform.
 
         The test list should be something like ['N_state_model.test_stereochem_analysis'].  The first part is the imported test case class, the second is the specific test.
 
 
-        @keyword tests:         The list of tests to preform.  If left at [], then all tests will be run.
-        @type tests:            list of str
-        @keyword from_gui:      A flag which indicates if the tests are being run from the GUI or not.
-        @type from_gui:         bool
-        @keyword categories:    The list of test categories to run, for example ['system', 'unit', 'gui', 'verification'] for all tests.
-        @type categories:       list of str
-        @keyword timing:        A flag which if True will enable timing of individual tests.
-        @type timing:           bool
+        @keyword tests:                 The list of tests to preform.  If left at [], then all tests will be run.
+        @type tests:                    list of str
+        @keyword from_gui:              A flag which indicates if the tests are being run from the GUI or not.
+        @type from_gui:                 bool
+        @keyword categories:            The list of test categories to run, for example ['system', 'unit', 'gui', 'verification'] for all tests.  The 'benchmark' category can be added to also run the benchmarks.
+        @type categories:               list of str
+        @keyword timing:                A flag which if True will enable timing of individual tests.
+        @type timing:                   bool
+        @keyword benchmark_save:        The JSON file to save the benchmark timings to.
+        @type benchmark_save:           None or str
+        @keyword benchmark_baseline:    The JSON file of a previous benchmark run to compare the timings to.
+        @type benchmark_baseline:       None or str
+        @keyword benchmark_threshold:   The slowdown factor relative to the baseline above which a benchmark fails.
+        @type benchmark_threshold:      None or float
         """
 
         # Store the args.
         self.tests = tests
         self.from_gui = from_gui
         self.categories = categories
+        self.benchmark_save = benchmark_save
+        self.benchmark_baseline = benchmark_baseline
+        self.benchmark_threshold = benchmark_threshold
 
         # Set up the test runner.
         if from_gui:
@@ -125,11 +136,55 @@ class Test_suite_runner:
             if not test_status:
                 return
 
+        # Execute the benchmarks.
+        if 'benchmark' in self.categories:
+            test_status = self.run_benchmarks(summary=False, reset=False)
+            if not test_status:
+                return
+
         # Print out a summary of the test suite.
         self.summary()
 
 
 
+    def run_benchmarks(self, summary=True, reset=True):
+        """Execute the benchmarks.
+
+        @keyword summary:   A flag which if True will cause a summary to be printed.
+        @type summary:      bool
+        @keyword reset:     A flag which if True will reset the relax status objects for the tests.
+        @type reset:        bool
+        @return:            True if the tests were run, False if a KeyboardInterrupt occurred.
+        @rtype:             bool
+        """
+
+        # Reset the list for skipped tests.
+        if reset:
+            status.skipped_tests = []
+
+        # Run the tests, catching the keyboard interrupt.
+        try:
+            # Print a header.
+            title(file=sys.stdout, text='Benchmarks')
+
+            # Run the tests.
+            benchmark_runner = Benchmark_runner()
+            self.runner.category = 'benchmark'
+            self.benchmark_result = benchmark_runner.run(self.tests, runner=self.runner, save_file=self.benchmark_save, baseline_file=self.benchmark_baseline, threshold=self.benchmark_threshold)
+
+            # Print out a summary of the test suite.
+            if summary:
+                self.summary()
+
+        # Catch the keyboard interrupt.
+        except KeyboardInterrupt:
+            print("\nKeyboardInterrupt:  Terminating all tests.\n")
+            return False
+
+        # All tests were run successfully.
+        return True
+
+
     def run_gui_tests(self, summary=True, reset=True):
         """Execute the GUI tests.
 
@@ -334,12 +389,18 @@ class Test_suite_runner:
         if hasattr(self, 'verification_result'):
             summary_line("Software verification tests", self.verification_result)
 
+        # Benchmark summary.
+        if hasattr(self, 'benchmark_result'):
+            summary_line("Benchmarks", self.benchmark_result)
+
         # Synopsis.
         if hasattr(self, 'system_result') and hasattr(self, 'unit_result') and hasattr(self, 'gui_result') and hasattr(self, 'verification_result'):
             if self.gui_result == "skip":
                 test_status = self.system_result and self.unit_result and self.verification_result
             else:
                 test_status = self.system_result and self.unit_result and self.gui_result and self.verification_result
+            if hasattr(self, 'benchmark_result'):
+                test_status = test_status and self.benchmark_result
             summary_line("Synopsis", test_status)
 
         # End.
@@ -354,6 +415,7 @@ class Test_suite_runner:
         unit_count = {}
         gui_count = {}
         verification_count = {}
+        benchmark_count = {}
         for i in range(len(status.skipped_tests)):
             # Alias.
             test = status.skipped_tests[i]
@@ -368,6 +430,7 @@ class Test_suite_runner:
                 unit_count[test[1]] = 0
                 gui_count[test[1]] = 0
                 verification_count[test[1]] = 0
+                benchmark_count[test[1]] = 0
 
             # A system test.
             if test[2] == 'system':
@@ -385,6 +448,10 @@ class Test_suite_runner:
             if test[2] == 'verification':
                 verification_count[test[1]] += 1
 
+            # A benchmark.
+            if test[2] == 'benchmark':
+                benchmark_count[test[1]] += 1
+
         # The missing modules.
         missing_modules = sorted(system_count.keys())
         section(file=sys.stdout, text="Optional packages/modules")
@@ -413,6 +480,8 @@ class Test_suite_runner:
             header = "%s %20s" % (header, "GUI test count")
         if len(verification_count):
             header = "%s %20s" % (header, "Verification test count")
+        if len(benchmark_count):
+            header = "%s %20s" % (header, "Benchmark count")
         print('-'*len(header))
         print(header)
         print('-'*len(header))
@@ -428,6 +497,8 @@ class Test_suite_runner:
                 text = "%s %20s" % (text, gui_count[module])
             if len(verification_count):
                 text = "%s %20s" % (text, verification_count[module])
+            if len(benchmark_count):
+                text = "%s %20s" % (text, benchmark_count[module])
             print(text)
 
         # End the table.
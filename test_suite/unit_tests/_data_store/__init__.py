@@ -21,7 +21,10 @@
 
 __all__ = [
     'test___init__',
+    'test_columns',
     'test_diff_tensor',
+    'test_interatomic',
     'test_mol_res_spin',
+    'test_prototype',
     'test_seq_align'
 ]
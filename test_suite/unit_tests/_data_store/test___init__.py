@@ -26,6 +26,11 @@ import sys
 # relax module imports.
 import data_store
 from data_store import Relax_data_store; ds = Relax_data_store()
+from lib.compat import StringIO
+from lib.errors import RelaxError
+from pipe_control.interatomic import create_interatom
+from pipe_control.mol_res_spin import create_spin
+import specific_analyses.api
 from test_suite.unit_tests.package_checking import PackageTestCase
 
 
@@ -54,6 +59,44 @@ class Test___init__(PackageTestCase):
         ds.test = 1
 
 
+    def tearDown(self):
+        """Reset the relax data store."""
+
+        # Reset.
+        ds.__reset__()
+
+
+    def setup_xml_pipe(self):
+        """Set up a data pipe with multiple molecules, residues, spins, and interatomic containers for the XML tests.
+
+        @return:    The XML document of the relax data store.
+        @rtype:     str
+        """
+
+        # Reset, and create the data pipe.
+        ds.__reset__()
+        ds.add(pipe_name='orig', pipe_type='mf')
+        ds['orig'].sim_number = 3
+
+        # Create the spins.
+        for mol_name in ['A', 'B']:
+            for res_num in [1, 2]:
+                for spin_name in ['N', 'H']:
+                    spin = create_spin(mol_name=mol_name, res_num=res_num, res_name='GLY', spin_name=spin_name)[0]
+                    spin.s2 = 0.8 + res_num / 100.0
+                    spin.s2_sim = [0.1, 0.2, res_num / 3.0]
+
+        # The interatomic containers.
+        for mol_name in ['A', 'B']:
+            interatom = create_interatom(spin_id1='#%s:1@N' % mol_name, spin_id2='#%s:1@H' % mol_name)
+            interatom.r = 1.02e-10
+
+        # The XML document.
+        file = StringIO()
+        ds.to_xml(file)
+        return file.getvalue()
+
+
     def test_add(self):
         """Unit test for testing the addition of a new data pipe by the 'add()' method."""
 
@@ -91,3 +134,67 @@ class Test___init__(PackageTestCase):
 
         # Test that the object's initial objects still exist.
         self.assert_(hasattr(ds, 'current_pipe'))
+
+
+    def test_xml(self):
+        """Test the streaming of a single data pipe by the to_xml() and from_xml() methods."""
+
+        # Set up the data pipe.
+        xml = self.setup_xml_pipe()
+
+        # The pipe contents are streamed into the file.
+        self.assert_('        <mol desc="Molecule container" name="B" type="None">\n' in xml)
+        self.assert_('                <spin desc="Spin container" name="H" num="None">\n' in xml)
+
+        # Read the data back.
+        ds.__reset__()
+        ds.from_xml(StringIO(xml))
+
+        # Check the data.
+        self.assertEqual(list(ds.keys()), ['orig'])
+        self.assertEqual(ds['orig'].sim_number, 3)
+        self.assertEqual([mol.name for mol in ds['orig'].mol], ['A', 'B'])
+        for mol in ds['orig'].mol:
+            self.assertEqual([res.num for res in mol.res], [1, 2])
+            for res in mol.res:
+                self.assertEqual([spin.name for spin in res.spin], ['N', 'H'])
+                for spin in res.spin:
+                    self.assertAlmostEqual(spin.s2, 0.8 + res.num / 100.0)
+                    self.assertEqual(spin.s2_sim, [0.1, 0.2, res.num / 3.0])
+        self.assertEqual([interatom.spin_id1 for interatom in ds['orig'].interatomic], ['#A:1@N', '#B:1@N'])
+        self.assertEqual(ds['orig'].interatomic[1].r, 1.02e-10)
+
+        # The data is written out identically.
+        file = StringIO()
+        ds.to_xml(file)
+        self.assertEqual(file.getvalue().split('\n')[2:], xml.split('\n')[2:])
+
+
+    def test_xml_pipe_to(self):
+        """Test the streaming of a single data pipe into the pipe_to data pipe by the from_xml() method."""
+
+        # Set up the data pipe.
+        xml = self.setup_xml_pipe()
+
+        # Read the data into a new data pipe.
+        ds.__reset__()
+        ds.add(pipe_name='new', pipe_type='mf')
+        ds.from_xml(StringIO(xml), pipe_to='new')
+
+        # Check the data.
+        self.assertEqual(list(ds.keys()), ['new'])
+        self.assertEqual(len(ds['new'].mol), 2)
+        self.assertEqual(ds['new'].mol[1].res[1].spin[1].s2_sim, [0.1, 0.2, 2 / 3.0])
+        self.assertEqual(len(ds['new'].interatomic), 2)
+
+        # Two data pipes in the file.
+        start = xml.index('    <pipe ')
+        end = xml.index('</relax>')
+        xml = xml[:end] + xml[start:end] + xml[end:]
+
+        # The target data pipe is emptied on failure.
+        ds.__reset__()
+        ds.add(pipe_name='new', pipe_type='mf')
+        self.assertRaises(RelaxError, ds.from_xml, StringIO(xml), pipe_to='new')
+        self.assert_(ds['new'].is_empty())
+        self.assertEqual(ds['new'].pipe_type, 'mf')
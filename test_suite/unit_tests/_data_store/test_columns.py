@@ -0,0 +1,143 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from copy import deepcopy
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+
+# relax module imports.
+from data_store.columns import attach_columns, extract_columns, read_columns, restore_columns, write_columns
+from data_store.mol_res_spin import SpinContainer
+
+
+class Test_columns(TestCase):
+    """Unit tests for the data_store.columns relax module."""
+
+
+    def setUp(self):
+        """Create a list of spin containers and a temporary directory."""
+
+        # The spins.
+        self.spins = [SpinContainer(), SpinContainer(), SpinContainer()]
+        self.spins[0].s2 = 0.8
+        self.spins[1].s2 = None
+        self.spins[2].s2 = 0.9
+        self.spins[0].r2 = {'r2_a': 1.0, 'r2_b': 2.0}
+        self.spins[2].r2 = {'r2_a': 3.0, 'r2_b': 4.0}
+        self.spins[0].vals = [1.0, 2.0]
+        self.spins[1].vals = [3.0, 4.0]
+        self.spins[2].vals = [5.0]
+        self.spins[0].model = 'm2'
+        self.spins[1].pos = [1.0, 2.0, 3.0]
+        self.spins[2].pos = [4.0, 5.0, 6.0]
+
+        # The directory.
+        self.tmpdir = mkdtemp()
+
+
+    def tearDown(self):
+        """Delete the temporary directory."""
+
+        rmtree(self.tmpdir)
+
+
+    def save_and_attach(self):
+        """Extract, save, and lazily attach the column data for the spins.
+
+        @return:    The fresh spin containers with the column data attached.
+        @rtype:     list of SpinContainer instances
+        """
+
+        # Extract and save.
+        columns, removed = extract_columns(containers=self.spins)
+        write_columns(dir=self.tmpdir, prefix='test', columns=columns)
+        restore_columns(containers=self.spins, removed=removed)
+
+        # Attach to new spins.
+        spins = [SpinContainer(), SpinContainer(), SpinContainer()]
+        attach_columns(containers=spins, columns=read_columns(dir=self.tmpdir, prefix='test', names=columns.names, kinds=columns.kinds))
+        return spins
+
+
+    def test_extract_columns(self):
+        """Test the extraction and restoration of the float data."""
+
+        # Extract.
+        columns, removed = extract_columns(containers=self.spins)
+
+        # Checks.
+        self.assertEqual(columns.names, ['pos', 'r2', 's2'])
+        self.assertEqual(columns.kinds, ['list', ['r2_a', 'r2_b'], 'float'])
+        self.assertEqual(list(columns.flags[2]), [2, 1, 2])
+        self.assertEqual(list(columns.flags[1]), [2, 0, 2])
+        self.assertEqual(list(columns.flags[0]), [0, 2, 2])
+        self.assertFalse(hasattr(self.spins[0], 's2'))
+        self.assertEqual(self.spins[0].model, 'm2')
+        self.assertEqual(self.spins[2].vals, [5.0])
+
+        # Restore.
+        restore_columns(containers=self.spins, removed=removed)
+        self.assertEqual(self.spins[0].s2, 0.8)
+        self.assertEqual(self.spins[1].s2, None)
+        self.assertEqual(self.spins[2].r2, {'r2_a': 3.0, 'r2_b': 4.0})
+
+
+    def test_lazy_attachment(self):
+        """Test the lazy attachment of the memory-mapped column data."""
+
+        # Save and attach.
+        spins = self.save_and_attach()
+
+        # The names are visible before attachment.
+        self.assertTrue('s2' in dir(spins[0]))
+        self.assertFalse('r2' in dir(spins[1]))
+        self.assertFalse('_lazy' in dir(spins[0]))
+        self.assertFalse('s2' in spins[0].__dict__)
+
+        # The values.
+        self.assertEqual(spins[0].s2, 0.8)
+        self.assertEqual(type(spins[0].s2), float)
+        self.assertEqual(spins[1].s2, None)
+        self.assertEqual(spins[2].r2, {'r2_a': 3.0, 'r2_b': 4.0})
+        self.assertEqual(spins[2].pos, [4.0, 5.0, 6.0])
+        self.assertFalse(hasattr(spins[1], 'r2'))
+        self.assertTrue('s2' in spins[0].__dict__)
+
+        # Deletion of pending data.
+        del spins[2].s2
+        self.assertFalse(hasattr(spins[2], 's2'))
+        self.assertRaises(AttributeError, delattr, spins[2], 's2')
+
+
+    def test_deepcopy(self):
+        """Test the deepcopy of containers with lazily attached column data."""
+
+        # Save, attach, and copy.
+        spins = self.save_and_attach()
+        spin = deepcopy(spins[0])
+
+        # Checks.
+        self.assertEqual(spin.s2, 0.8)
+        self.assertEqual(spin.r2, {'r2_a': 1.0, 'r2_b': 2.0})
+        self.assertFalse('_lazy' in spin.__dict__)
+        self.assertEqual(spins[0].s2, 0.8)
@@ -0,0 +1,70 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from unittest import TestCase
+
+# relax module imports.
+from data_store.interatomic import InteratomList
+
+
+class Test_interatomic(TestCase):
+    """Unit tests for the data_store.interatomic relax module."""
+
+    def setUp(self):
+        """Create an interatomic data structure for testing the lookup tables."""
+
+        # The structure.
+        self.interatomic = InteratomList()
+        self.interatomic.add_item(spin_id1='@N', spin_id2='@H', spin_hash1='a', spin_hash2='b')
+        self.interatomic.add_item(spin_id1='@N', spin_id2='@C', spin_hash1='a', spin_hash2='c')
+        self.interatomic.add_item(spin_id1='@H', spin_id2='@N', spin_hash1='b', spin_hash2='a')
+
+
+    def test_add_item(self):
+        """Unit test for the lookup tables updated by the 'add_item()' method of the InteratomList class."""
+
+        # The spin hash lookup table.
+        self.assertEqual(self.interatomic._spin_hash_lookup, {'a': (0, 1, 2), 'b': (0, 2), 'c': (1,)})
+
+        # The spin hash pair lookup table, with the first of the two duplicated pairs.
+        self.assertEqual(self.interatomic._spin_hash_pair_lookup, {('a', 'b'): 0, ('a', 'c'): 1})
+        self.assertEqual(self.interatomic.hash_pair('c', 'a'), ('a', 'c'))
+
+
+    def test_lookup_remove(self):
+        """Unit test for the 'lookup_remove()' and 'lookup_add()' methods of the InteratomList class."""
+
+        # Change the hashes of the first container.
+        self.interatomic.lookup_remove(0)
+        self.interatomic[0]._spin_hash1 = 'd'
+        self.interatomic.lookup_add(0)
+
+        # The duplicated pair falls back to the last container.
+        self.assertEqual(self.interatomic._spin_hash_lookup, {'a': (1, 2), 'b': (2, 0), 'c': (1,), 'd': (0,)})
+        self.assertEqual(self.interatomic._spin_hash_pair_lookup, {('a', 'b'): 2, ('a', 'c'): 1, ('b', 'd'): 0})
+
+        # The rebuilt tables are identical, up to the index order.
+        tables = [self.interatomic._spin_hash_lookup, self.interatomic._spin_hash_pair_lookup]
+        self.interatomic.lookup_reset()
+        self.assertEqual(self.interatomic._spin_hash_pair_lookup, tables[1])
+        for spin_hash in tables[0]:
+            self.assertEqual(sorted(self.interatomic._spin_hash_lookup[spin_hash]), sorted(tables[0][spin_hash]))
@@ -0,0 +1,172 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from copy import deepcopy
+from unittest import TestCase
+
+# relax module imports.
+from data_store.mol_res_spin import MoleculeList
+from data_store.pipe_container import PipeContainer
+from data_store.prototype import cow_clone, cow_share
+
+
+class Test_prototype(TestCase):
+    """Unit tests for the data_store.prototype relax module."""
+
+
+    def setUp(self):
+        """Create a data pipe with a single spin."""
+
+        # The data pipe.
+        self.pipe = PipeContainer()
+        self.pipe.mol.add_item(mol_name='Ubi')
+        self.pipe.mol[0].res.add_item(res_num=1, res_name='GLY')
+        self.pipe.mol[0].res[0].spin.add_item(spin_num=1, spin_name='N')
+        self.spin = self.pipe.mol[0].res[0].spin[0]
+        self.spin.s2 = 0.8
+        self.spin.ri_data = {'R1_600': 1.0}
+        self.pipe.ri_ids = ['R1_600']
+
+
+    def test_cow_clone(self):
+        """Test the isolation of the copy-on-write clones of a data pipe."""
+
+        # Clone twice.
+        clone1 = cow_clone(self.pipe)
+        clone2 = cow_clone(self.pipe)
+        spin1 = clone1.mol[0].res[0].spin[0]
+        spin2 = clone2.mol[0].res[0].spin[0]
+
+        # The containers are new, but the original spin container is preserved.
+        self.assertFalse(spin1 is self.spin)
+        self.assertTrue(self.pipe.mol[0].res[0].spin[0] is self.spin)
+        self.assertEqual(spin1._hash, self.spin._hash)
+        self.assertEqual(clone1.mol._spin_hash_lookup, self.pipe.mol._spin_hash_lookup)
+
+        # In-place modifications.
+        spin1.ri_data['R1_600'] = 2.0
+        self.spin.ri_data['R2_600'] = 3.0
+        clone2.ri_ids.append('NOE_600')
+
+        # Attribute modifications.
+        spin2.s2 = 0.9
+        del self.spin.s2
+
+        # Checks.
+        self.assertEqual(spin1.ri_data, {'R1_600': 2.0})
+        self.assertEqual(spin2.ri_data, {'R1_600': 1.0})
+        self.assertEqual(self.spin.ri_data, {'R1_600': 1.0, 'R2_600': 3.0})
+        self.assertEqual(spin1.s2, 0.8)
+        self.assertEqual(spin2.s2, 0.9)
+        self.assertFalse(hasattr(self.spin, 's2'))
+        self.assertFalse('s2' in dir(self.spin))
+        self.assertEqual(self.pipe.ri_ids, ['R1_600'])
+        self.assertEqual(clone1.ri_ids, ['R1_600'])
+        self.assertEqual(clone2.ri_ids, ['R1_600', 'NOE_600'])
+
+
+    def test_cow_clone_last_original(self):
+        """Test that the last container requiring a mutable object, other than a dictionary, receives the original."""
+
+        # The original object.
+        ri_ids = self.pipe.ri_ids
+
+        # Clone and access in both data pipes.
+        clone = cow_clone(self.pipe)
+        self.assertFalse(clone.ri_ids is ri_ids)
+        self.assertTrue(self.pipe.ri_ids is ri_ids)
+
+
+    def test_cow_clone_shared_reads(self):
+        """Test that the dictionaries of the copy-on-write clones are only copied when modified."""
+
+        # The original object.
+        ri_data = self.spin.ri_data
+
+        # Clone five times, reading the dictionary of all spins.
+        clones = [cow_clone(self.pipe) for i in range(5)]
+        spins = [self.spin] + [clone.mol[0].res[0].spin[0] for clone in clones]
+        for spin in spins:
+            self.assertEqual(spin.ri_data['R1_600'], 1.0)
+            self.assertEqual(list(spin.ri_data.items()), [('R1_600', 1.0)])
+            self.assertEqual(spin.ri_data, {'R1_600': 1.0})
+            self.assertTrue(isinstance(spin.ri_data, dict))
+
+        # The dictionary is still shared by all spins.
+        for spin in spins:
+            self.assertTrue(spin.ri_data.shared() is ri_data)
+
+        # A clone of a clone also shares the dictionary.
+        clone = cow_clone(clones[0])
+        self.assertTrue(clone.mol[0].res[0].spin[0].ri_data.shared() is ri_data)
+
+        # Modify one spin, which then has its own copy.
+        spins[3].ri_data['R1_600'] = 2.0
+        self.assertEqual(spins[3].ri_data.shared(), None)
+        self.assertEqual(spins[3].ri_data, {'R1_600': 2.0})
+        for i in [0, 1, 2, 4, 5]:
+            self.assertTrue(spins[i].ri_data.shared() is ri_data)
+            self.assertEqual(spins[i].ri_data, {'R1_600': 1.0})
+        self.assertEqual(ri_data, {'R1_600': 1.0})
+
+        # Copies are normal dictionaries.
+        self.assertEqual(type(deepcopy(spins[1].ri_data)), dict)
+        self.assertEqual(type(spins[1].ri_data.copy()), dict)
+
+
+    def test_cow_clone_deepcopy(self):
+        """Test the deepcopy and structure modification of the copy-on-write clones."""
+
+        # Clone and deepcopy.
+        clone = cow_clone(self.pipe)
+        spin = deepcopy(clone.mol[0].res[0].spin[0])
+        self.assertEqual(spin.ri_data, {'R1_600': 1.0})
+        self.assertFalse(spin._hash == self.spin._hash)
+
+        # Add a spin to the clone.
+        clone.mol[0].res[0].spin.add_item(spin_num=2, spin_name='H')
+        self.assertEqual(len(clone.mol[0].res[0].spin), 2)
+        self.assertEqual(len(self.pipe.mol[0].res[0].spin), 1)
+
+        # Clone the clone.
+        clone2 = cow_clone(clone)
+        self.assertEqual(clone2.mol[0].res[0].spin[0].s2, 0.8)
+        self.assertEqual(clone2.mol[0].res[0].spin[1].name, 'H')
+        self.assertTrue(isinstance(clone2.mol, MoleculeList))
+
+
+    def test_cow_share(self):
+        """Test the copy-on-write sharing of objects between two data containers."""
+
+        # A second spin.
+        self.pipe.mol[0].res[0].spin.add_item(spin_num=2, spin_name='H')
+        spin = self.pipe.mol[0].res[0].spin[1]
+        spin.s2 = 0.5
+
+        # Share.
+        cow_share(source=self.spin, target=spin, names=['s2', 'ri_data'])
+
+        # Checks.
+        self.assertEqual(spin.s2, 0.8)
+        spin.ri_data['R1_600'] = 5.0
+        self.assertEqual(self.spin.ri_data, {'R1_600': 1.0})
+        self.assertEqual(spin.name, 'H')
@@ -39,9 +39,11 @@ __all__ = [
     'test_float',
     'test_io',
     'test_mathematics',
+    'test_minimise',
     'test_periodic_table',
     'test_regex',
     'test_selection',
     'test_statistics',
-    'test_timing'
+    'test_timing',
+    'test_xml'
 ]
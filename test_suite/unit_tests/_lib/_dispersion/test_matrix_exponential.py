@@ -21,14 +21,14 @@
 
 # Python module imports.
 from os import sep
-from numpy import complex64, load, sum
+from numpy import complex64, exp, load, ones, sum
 from unittest import TestCase
 
 # relax module imports.
 from lib.dispersion.ns_cpmg_2site_3d import rcpmg_3d_rankN
 from lib.dispersion.ns_mmq_2site import rmmq_2site_rankN
 from lib.linear_algebra.matrix_exponential import matrix_exponential as np_matrix_exponential
-from lib.dispersion.matrix_exponential import matrix_exponential
+from lib.dispersion.matrix_exponential import Matrix_exponential_cache, matrix_exponential
 from status import Status; status = Status()
 
 
@@ -92,6 +92,46 @@ class Test_matrix_exponential(TestCase):
         return M0, r20a, r20b, pA, dw, dwH, kex, inv_tcpmg, tcp, num_points, power, back_calc, pB, k_BA, k_AB
 
 
+    def test_matrix_exponential_cache(self):
+        """Test the Matrix_exponential_cache class, with the R20 decay applied analytically to the cached R20-free exponentials.  This uses the data from systemtest Relax_disp.test_hansen_cpmg_data_to_ns_cpmg_2site_3D."""
+
+        fname = self.data + sep+ "test_hansen_cpmg_data_to_ns_cpmg_2site_3D"
+        r180x, M0, r10a, r10b, r20a, r20b, pA, dw, dw_orig, kex, inv_tcpmg, tcp, num_points, power, back_calc, pB, k_BA, k_AB = self.return_data_ns_cpmg_2site_3d(fname)
+
+        # The cache.
+        cache = Matrix_exponential_cache(size=2)
+        key = (float(pA), float(kex), dw.tobytes(), tcp.tobytes())
+
+        # Two different R20 values for the same exchange parameters.
+        for r20 in [r20a, 2.0*r20a]:
+            # The direct calculation.
+            R_mat = rcpmg_3d_rankN(R1A=r10a, R1B=r10b, R2A=r20, R2B=r20, pA=pA, pB=pB, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+            Rexpo_mat = matrix_exponential(R_mat)
+
+            # The cached R20-free exponential with the analytic R20 decay of the transverse components.
+            R0_mat = rcpmg_3d_rankN(R1A=r10a, R1B=r10b, R2A=0.0, R2B=0.0, pA=pA, pB=pB, dw=dw, k_AB=k_AB, k_BA=k_BA, tcp=tcp)
+            decay = ones(R0_mat.shape[:-1])
+            decay[..., [1, 2, 4, 5]] = exp(-r20 * tcp)[..., None]
+            Rexpo_cache_mat = cache.matrix_exponential(R0_mat, key) * decay[..., None, :]
+
+            # Check.
+            self.assertAlmostEqual(abs(Rexpo_mat - Rexpo_cache_mat).max(), 0.0)
+
+        # The second call must have been a cache hit.
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+        # LRU eviction.
+        cache.matrix_exponential(R0_mat, 'a')
+        cache.matrix_exponential(R0_mat, key)
+        cache.matrix_exponential(R0_mat, 'b')
+        self.assertEqual(len(cache), 2)
+        cache.matrix_exponential(R0_mat, key)
+        self.assertEqual(cache.hits, 3)
+        cache.matrix_exponential(R0_mat, 'a')
+        self.assertEqual(cache.misses, 4)
+
+
     def test_ns_cpmg_2site_3d_hansen_cpmg_data(self):
         """Test the matrix_exponential() function for higher dimensional data, and compare to matrix_exponential.  This uses the data from systemtest Relax_disp.test_hansen_cpmg_data_to_ns_cpmg_2site_3D."""
 
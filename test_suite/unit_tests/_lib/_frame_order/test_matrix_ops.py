@@ -21,7 +21,7 @@
 
 # Python module imports.
 from math import pi
-from numpy import array, float64, zeros
+from numpy import array, float64, ones, uint8, zeros
 from unittest import TestCase
 
 # relax module imports.
@@ -35,7 +35,7 @@ from lib.frame_order.pseudo_ellipse import compile_2nd_matrix_pseudo_ellipse
 from lib.frame_order.pseudo_ellipse_free_rotor import compile_2nd_matrix_pseudo_ellipse_free_rotor
 from lib.frame_order.pseudo_ellipse_torsionless import compile_2nd_matrix_pseudo_ellipse_torsionless
 from lib.frame_order.rotor import compile_2nd_matrix_rotor
-from lib.frame_order.matrix_ops import reduce_alignment_tensor
+from lib.frame_order.matrix_ops import pcs_pivot_motion_full_qr_int, pcs_qr_int_blocks, reduce_alignment_tensor
 from lib.geometry.coord_transform import cartesian_to_spherical, spherical_to_cartesian
 from lib.geometry.rotations import euler_to_R_zyz, two_vect_to_R
 from lib.linear_algebra.kronecker_product import kron_prod, transpose_23
@@ -1070,6 +1070,74 @@ class Test_matrix_ops(TestCase):
                 self.assert_(abs(f2[i, j] - real[i, j]) < 1e-3)
 
 
+    def test_pcs_pivot_motion_full_qr_int(self):
+        """Check that the PCS summed over a block of states by pcs_pivot_motion_full_qr_int() matches the state by state sum."""
+
+        # The rotations for three states.
+        Ri = zeros((3, 3, 3), float64)
+        euler_to_R_zyz(0.1, 0.2, 0.3, Ri[0])
+        euler_to_R_zyz(1.0, -0.5, 2.0, Ri[1])
+        euler_to_R_zyz(-2.0, 1.5, 0.7, Ri[2])
+
+        # Two alignments (the second using the reversed vectors), and two atoms with one missing PCS.
+        full_in_ref_frame = array([1, 0])
+        r_pivot_atom = array([[1.0, 2.0, 3.0], [-2.0, 0.5, 1.0]])
+        r_pivot_atom_rev = array([[3.0, -1.0, 2.0], [0.5, 2.0, -1.5]])
+        r_ln_pivot = array([[5.0, 1.0, -2.0], [5.0, 1.0, -2.0]])
+        A = array([[[1.0, 0.2, 0.0], [0.2, -0.3, 0.1], [0.0, 0.1, -0.7]], [[-0.5, 0.0, 0.3], [0.0, 0.8, 0.0], [0.3, 0.0, -0.3]]])
+        missing_pcs = zeros((2, 2), uint8)
+        missing_pcs[1, 0] = 1
+
+        # The state by state sum.
+        pcs_single = zeros((2, 2), float64)
+        for i in range(3):
+            pcs_pivot_motion_full_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri[i], pcs_theta=pcs_single, pcs_theta_err=None, missing_pcs=missing_pcs)
+
+        # The block sum.
+        pcs_block = zeros((2, 2), float64)
+        pcs_pivot_motion_full_qr_int(full_in_ref_frame=full_in_ref_frame, r_pivot_atom=r_pivot_atom, r_pivot_atom_rev=r_pivot_atom_rev, r_ln_pivot=r_ln_pivot, A=A, Ri=Ri, pcs_theta=pcs_block, pcs_theta_err=None, missing_pcs=missing_pcs)
+
+        # The direct calculation.
+        for i in range(2):
+            for j in range(2):
+                pcs = 0.0
+                if not missing_pcs[i, j]:
+                    for k in range(3):
+                        if full_in_ref_frame[i]:
+                            vect = r_pivot_atom[j].dot(Ri[k]) + r_ln_pivot[j]
+                        else:
+                            vect = r_pivot_atom_rev[j].dot(Ri[k]) + r_ln_pivot[j]
+                        pcs += vect.dot(A[i].dot(vect)) / vect.dot(vect)**2.5
+
+                # Check.
+                self.assertAlmostEqual(pcs_single[i, j], pcs)
+                self.assertAlmostEqual(pcs_block[i, j], pcs)
+
+
+    def test_pcs_qr_int_blocks(self):
+        """Check the selection and blocking of the Sobol' points by pcs_qr_int_blocks()."""
+
+        # Every second point in the distribution.
+        mask = zeros(10, bool)
+        mask[::2] = True
+
+        # All points in one block.
+        num, blocks = pcs_qr_int_blocks(mask=mask, max_points=100, num_atoms=1)
+        self.assertEqual(num, 5)
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(list(blocks[0]), [0, 2, 4, 6, 8])
+
+        # The maximum number of points, with many atoms to force single point blocks.
+        num, blocks = pcs_qr_int_blocks(mask=mask, max_points=3, num_atoms=100000000)
+        self.assertEqual(num, 3)
+        self.assertEqual([list(block) for block in blocks], [[0], [2], [4]])
+
+        # No points in the distribution.
+        num, blocks = pcs_qr_int_blocks(mask=~ones(10, bool), max_points=3, num_atoms=1)
+        self.assertEqual(num, 0)
+        self.assertEqual(blocks, [])
+
+
     def test_reduce_alignment_tensor_order(self):
         """Test the alignment tensor reduction for the order identity matrix."""
 
@@ -0,0 +1,109 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import float32, zeros
+from tempfile import mkdtemp
+from unittest import TestCase
+
+# relax module imports.
+import extern.sobol.sobol_lib as sobol_lib
+from extern.sobol.sobol_lib import i4_sobol_generate
+from lib.frame_order.sobol import load_sobol_cache, save_sobol_cache, sobol_angles, sobol_cache_file, sobol_points, sobol_rotations
+from lib.geometry.rotations import tilt_torsion_to_R
+from test_suite.clean_up import deletion
+
+
+class Test_sobol(TestCase):
+    """Unit tests for the lib.frame_order.sobol relax module."""
+
+    def setUp(self):
+        """Set up for all of the tests."""
+
+        # Initialise a temporary directory.
+        self.tmpdir = mkdtemp()
+
+
+    def tearDown(self):
+        """Clean up after the tests."""
+
+        # Remove the temporary directory and all its contents.
+        deletion(obj=self, name='tmpdir', dir=True)
+
+
+    def test_load_sobol_cache(self):
+        """Check the saving and memory-mapped loading of the Sobol' data by save_sobol_cache() and load_sobol_cache()."""
+
+        # The data.
+        dims = ['sigma']
+        sobol_lib.i4_sobol(1, 0)
+        angles = sobol_angles(dims=dims, points=sobol_points(v=sobol_lib.v[:1], recipd=sobol_lib.recipd, n=100)).astype(float32)
+        Ri_prime, Ri2_prime = sobol_rotations(dims=dims, angles=angles)
+
+        # The cache files, which do not exist yet.
+        files = [sobol_cache_file(cache_dir=self.tmpdir, model='free rotor', dims=dims, total_num=100, name=name) for name in ['angles', 'Ri_prime']]
+        self.assertEqual(load_sobol_cache(files=files, m=1, total_num=100), None)
+
+        # Save and reload.
+        save_sobol_cache(files=files, data=[angles, Ri_prime])
+        data = load_sobol_cache(files=files, m=1, total_num=100)
+
+        # Checks.
+        self.assertEqual(len(data), 2)
+        self.assertTrue((data[0] == angles).all())
+        self.assertTrue((data[1] == Ri_prime).all())
+        self.assertEqual(load_sobol_cache(files=files, m=1, total_num=200), None)
+
+
+    def test_sobol_points(self):
+        """Check that sobol_points() reproduces the extern.sobol.sobol_lib.i4_sobol_generate() function."""
+
+        # Loop over the dimensions.
+        for m in range(1, 4):
+            # The points.
+            points = i4_sobol_generate(m, 500, 1000)
+            sobol_lib.i4_sobol(m, 0)
+            points_vect = sobol_points(v=sobol_lib.v[:m], recipd=sobol_lib.recipd, n=500, skip=1000)
+
+            # Check.
+            self.assertEqual(points_vect.shape, (m, 500))
+            self.assertTrue((points_vect == points).all())
+
+
+    def test_sobol_rotations(self):
+        """Check the tilt-torsion rotation matrices of sobol_rotations() against tilt_torsion_to_R()."""
+
+        # The angles.
+        dims = ['theta', 'phi', 'sigma']
+        sobol_lib.i4_sobol(3, 0)
+        angles = sobol_angles(dims=dims, points=sobol_points(v=sobol_lib.v[:3], recipd=sobol_lib.recipd, n=50))
+
+        # The matrices.
+        Ri_prime, Ri2_prime = sobol_rotations(dims=dims, angles=angles)
+        self.assertEqual(Ri2_prime, None)
+
+        # Check each point.
+        R = zeros((3, 3), float32)
+        for i in range(50):
+            tilt_torsion_to_R(angles[1, i], angles[0, i], angles[2, i], R)
+            for j in range(3):
+                for k in range(3):
+                    self.assertEqual(Ri_prime[i, j, k], R[j, k])
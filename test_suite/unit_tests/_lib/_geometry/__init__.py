@@ -23,6 +23,7 @@
 __all__ = [
     'test___init_',
     'test_lines',
+    'test_neighbours',
     'test_pec',
     'test_rotations',
     'test_vectors'
@@ -0,0 +1,97 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+
+# Python module imports.
+from numpy import array, float64
+from numpy.random import RandomState
+from unittest import TestCase
+
+# relax module imports.
+from lib.geometry.neighbours import neighbour_pairs, point_neighbours
+
+
+class Test_neighbours(TestCase):
+    """Unit tests for the lib.geometry.neighbours relax module."""
+
+    def test_neighbour_pairs(self):
+        """Test the neighbour_pairs() function against a brute force search."""
+
+        # Random points in a 20 Angstrom box.
+        pos = RandomState(10).uniform(-10.0, 10.0, (500, 3))
+        radius = 2.0
+
+        # The brute force search.
+        real = []
+        for i in range(len(pos)):
+            for j in range(i+1, len(pos)):
+                dist = sum((pos[j] - pos[i])**2)**0.5
+                if dist < radius:
+                    real.append((i, j, dist))
+
+        # The cell list search.
+        index1, index2, dist = neighbour_pairs(pos=pos, radius=radius)
+        pairs = sorted(zip(index1.tolist(), index2.tolist(), dist.tolist()))
+
+        # Check the pairs.
+        self.assertEqual(len(pairs), len(real))
+        for k in range(len(real)):
+            self.assertEqual(pairs[k][0], real[k][0])
+            self.assertEqual(pairs[k][1], real[k][1])
+            self.assertAlmostEqual(pairs[k][2], real[k][2])
+
+
+    def test_neighbour_pairs_single(self):
+        """Test the neighbour_pairs() function for a single point."""
+
+        # Find the pairs.
+        index1, index2, dist = neighbour_pairs(pos=array([[1.0, 2.0, 3.0]], float64), radius=1.0)
+
+        # Check.
+        self.assertEqual(len(index1), 0)
+        self.assertEqual(len(index2), 0)
+        self.assertEqual(len(dist), 0)
+
+
+    def test_point_neighbours(self):
+        """Test the point_neighbours() function against a brute force search."""
+
+        # Random points in a 20 Angstrom box.
+        pos = RandomState(10).uniform(-10.0, 10.0, (500, 3))
+        radius = 2.0
+
+        # Loop over a few central points.
+        for index in [0, 17, 499]:
+            # The brute force search.
+            real = []
+            for j in range(len(pos)):
+                dist = sum((pos[j] - pos[index])**2)**0.5
+                if j != index and dist < radius:
+                    real.append((j, dist))
+
+            # The cell list search.
+            indices, dist = point_neighbours(pos=pos, index=index, radius=radius)
+
+            # Check the neighbours.
+            self.assertEqual(len(indices), len(real))
+            for k in range(len(real)):
+                self.assertEqual(indices[k], real[k][0])
+                self.assertAlmostEqual(dist[k], real[k][1])
@@ -23,5 +23,6 @@
 __all__ = [
     'test___init__',
     'test_kronecker_prod',
-    'test_matrix_exponential'
+    'test_matrix_exponential',
+    'test_matrix_power'
 ]
@@ -0,0 +1,71 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, complex128, float64, zeros
+from numpy.linalg import matrix_power
+from unittest import TestCase
+
+# relax module imports.
+from lib.errors import RelaxError
+from lib.linear_algebra.matrix_power import matrix_power_rankN
+
+
+class Test_matrix_power(TestCase):
+    """Unit tests for the lib.linear_algebra.matrix_power relax module."""
+
+
+    def test_matrix_power_rankN(self):
+        """Test the batched matrix power function matrix_power_rankN() against numpy.linalg.matrix_power()."""
+
+        # A stack of 2x3 real and complex 3D, rank-2 matrices.
+        R = zeros([2, 3, 3, 3], float64)
+        C = zeros([2, 3, 3, 3], complex128)
+        for i in range(2):
+            for j in range(3):
+                R[i, j] = array([[1, 4, 5], [-4, 2, 6], [-5, -6, 3]], float64) * 0.1 * (i+j+1)
+                C[i, j] = R[i, j] + 1.j * R[i, j].T
+
+        # The powers, including zero.
+        power = array([[0, 1, 2], [7, 13, 64]])
+
+        # The maths.
+        R_test = matrix_power_rankN(R, power)
+        C_test = matrix_power_rankN(C, power)
+
+        # Checks.
+        for i in range(2):
+            for j in range(3):
+                R_real = matrix_power(R[i, j], power[i, j])
+                C_real = matrix_power(C[i, j], power[i, j])
+                for k in range(3):
+                    for l in range(3):
+                        self.assertAlmostEqual(R_test[i, j, k, l] / abs(R_real).max(), R_real[k, l] / abs(R_real).max())
+                        self.assertAlmostEqual(C_test[i, j, k, l] / abs(C_real).max(), C_real[k, l] / abs(C_real).max())
+
+
+    def test_matrix_power_rankN_errors(self):
+        """Test the argument checking of the batched matrix power function matrix_power_rankN()."""
+
+        # Non-square matrices, mismatched powers and negative powers.
+        self.assertRaises(RelaxError, matrix_power_rankN, zeros([2, 3, 2]), array([1, 1]))
+        self.assertRaises(RelaxError, matrix_power_rankN, zeros([2, 3, 3]), array([1, 1, 1]))
+        self.assertRaises(RelaxError, matrix_power_rankN, zeros([2, 3, 3]), array([1, -1]))
@@ -0,0 +1,96 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, isnan
+from os import sep
+from unittest import TestCase
+
+# relax module imports.
+from lib.spectrum.nmrpipe import Spectrum
+from status import Status; status = Status()
+
+
+class Test_nmrpipe(TestCase):
+    """Unit tests for the lib.spectrum.nmrpipe relax module."""
+
+    def setUp(self):
+        """Map the NMRPipe spectrum."""
+
+        # The spectrum.
+        path = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'repeated_analysis'+sep+'SOD1'+sep+'cpmg_disp_sod1d90a_060518'+sep+'cpmg_disp_sod1d90a_060518_normal.fid'+sep+'ft2_data'
+        self.spectrum = Spectrum(file_name='128_0_FT.ft2', dir=path)
+
+        # The positions of the T2N-H and K3N-H peaks from the seriesTab file.
+        self.x_ppm = array([8.525, 8.696, 20.0])
+        self.y_ppm = array([116.014, 125.904, 116.0])
+
+
+    def test_Spectrum(self):
+        """Test the header and data mapping of the lib.spectrum.nmrpipe.Spectrum class."""
+
+        # Checks.
+        self.assertEqual(self.spectrum.shape, (1, 256, 513))
+        self.assertEqual(self.spectrum.dims, [2, 1])
+
+
+    def test_Spectrum_heights(self):
+        """Test the lib.spectrum.nmrpipe.Spectrum.heights() method."""
+
+        # Extract the heights.
+        heights = self.spectrum.heights(x_ppm=self.x_ppm, y_ppm=self.y_ppm)
+
+        # Checks against the seriesTab maximum mode.
+        self.assertEqual(heights.shape, (1, 3))
+        self.assertAlmostEqual(heights[0, 0], 1.660865e+05, 0)
+        self.assertAlmostEqual(heights[0, 1], 8.106413e+05, 0)
+        self.assertTrue(isnan(heights[0, 2]))
+
+
+    def test_Spectrum_noise_rmsd(self):
+        """Test the lib.spectrum.nmrpipe.Spectrum.noise_rmsd() method."""
+
+        # Check the estimate.
+        rmsd = self.spectrum.noise_rmsd()
+        self.assertEqual(len(rmsd), 1)
+        self.assertAlmostEqual(rmsd[0], 7725.040787768554, 5)
+
+
+    def test_Spectrum_ppm_to_points(self):
+        """Test the lib.spectrum.nmrpipe.Spectrum.ppm_to_points() method."""
+
+        # Checks against the one based seriesTab X_AXIS and Y_AXIS positions.
+        self.assertAlmostEqual(self.spectrum.ppm_to_points(ppm=self.x_ppm, axis=0)[0] + 1, 254.059, 2)
+        self.assertAlmostEqual(self.spectrum.ppm_to_points(ppm=self.y_ppm, axis=1)[0] + 1, 150.545, 2)
+        self.assertAlmostEqual(self.spectrum.ppm_to_points(ppm=self.x_ppm, axis=0)[1] + 1, 236.553, 2)
+        self.assertAlmostEqual(self.spectrum.ppm_to_points(ppm=self.y_ppm, axis=1)[1] + 1, 58.937, 2)
+
+
+    def test_Spectrum_volumes(self):
+        """Test the lib.spectrum.nmrpipe.Spectrum.volumes() method."""
+
+        # Box summation.
+        volumes = self.spectrum.volumes(x_ppm=self.x_ppm, y_ppm=self.y_ppm, box=1)
+
+        # Checks.
+        self.assertAlmostEqual(volumes[0, 0], 1176450.7734375)
+        self.assertAlmostEqual(volumes[0, 1], 5746153.9375)
+        self.assertTrue(isnan(volumes[0, 2]))
@@ -0,0 +1,52 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import isnan
+from unittest import TestCase
+
+# relax module imports.
+from lib.spectrum.objects import Peak_list
+
+
+class Test_objects(TestCase):
+    """Unit tests for the lib.spectrum.objects relax module."""
+
+    def test_Peak_list_columns(self):
+        """Test the lib.spectrum.objects.Peak_list.columns() method."""
+
+        # Create a peak list with multiple spectra and a missing intensity.
+        peak_list = Peak_list(dim=2)
+        peak_list.add(res_nums=[3, 3], spin_names=['N', 'HN'], intensity=[2535.0, 1200.0, 600.0])
+        peak_list.add(res_nums=[4, 4], spin_names=['N', 'HN'], intensity=[5050.0, 2100.0])
+        peak_list.add(res_nums=[40, 40], spin_names=['NE1', 'HE1'], intensity=[-181131.0, -90000.0, None])
+
+        # Convert to columns.
+        res_nums, spin_names, intensities = peak_list.columns(dim=2)
+
+        # Checks.
+        self.assertEqual(res_nums, [3, 4, 40])
+        self.assertEqual(spin_names, ['HN', 'HN', 'HE1'])
+        self.assertEqual(intensities.shape, (3, 3))
+        self.assertEqual(list(intensities[0]), [2535.0, 1200.0, 600.0])
+        self.assertEqual(list(intensities[1, :2]), [5050.0, 2100.0])
+        self.assertTrue(isnan(intensities[1, 2]))
+        self.assertTrue(isnan(intensities[2, 2]))
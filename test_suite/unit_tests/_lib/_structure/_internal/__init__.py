@@ -23,5 +23,6 @@
 __all__ = [
     'test___init__',
     'test_coordinates',
+    'test_molecules',
     'test_object'
 ]
@@ -0,0 +1,82 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+
+# Python module imports.
+from copy import deepcopy
+from numpy import array, float64
+
+# relax module imports.
+from lib.structure.internal.molecules import MolContainer
+from test_suite.unit_tests.base_classes import UnitTestCase
+
+
+class Test_molecules(UnitTestCase):
+    """Unit tests for the lib.structure.internal.molecules module."""
+
+    def test_atom_add_batch(self):
+        """Test the batched addition of atoms using the atom_add_batch() method."""
+
+        # Add single and batched atoms.
+        mol = MolContainer()
+        mol.atom_add(atom_name='N', res_name='Gly', res_num=1, pos=[1.0, 2.0, 3.0], element='N')
+        indices = mol.atom_add_batch(atom_names=['H', 'CA'], res_names=['Gly', 'Gly'], res_nums=[1, 1], pos=array([[4.0, 5.0, 6.0], [7.0, 8.0, 9.0]], float64), elements=['H', 'C'])
+
+        # Checks.
+        self.assertEqual(indices, [1, 2])
+        self.assertEqual(mol.atom_name, ['N', 'H', 'CA'])
+        self.assertEqual(mol.atom_num, [None, None, None])
+        self.assertEqual(mol.bonded, [[], [], []])
+        self.assertEqual(mol.element, ['N', 'H', 'C'])
+        self.assertEqual(mol.res_num, [1, 1, 1])
+        self.assertEqual(mol.x.tolist(), [1.0, 4.0, 7.0])
+        self.assertEqual(mol.y.tolist(), [2.0, 5.0, 8.0])
+        self.assertEqual(mol.z.tolist(), [3.0, 6.0, 9.0])
+        self.assertEqual(mol.pos.shape, (3, 3))
+
+
+    def test_coordinate_views(self):
+        """Test that the x, y, z, and pos attributes are views of the same coordinate array."""
+
+        # Add some atoms.
+        mol = MolContainer()
+        for i in range(20):
+            mol.atom_add(atom_name='C%i' % i, pos=[i, 2*i, 3*i], element='C')
+
+        # Modify the coordinates in place.
+        mol.pos[5] += 1.0
+        mol.x[6] = -1.0
+
+        # Checks.
+        self.assertEqual(len(mol.x), 20)
+        self.assertEqual(mol.pos[5].tolist(), [6.0, 11.0, 16.0])
+        self.assertEqual([mol.x[5], mol.y[5], mol.z[5]], [6.0, 11.0, 16.0])
+        self.assertEqual(mol.pos[6].tolist(), [-1.0, 12.0, 18.0])
+
+        # Replace a coordinate, including a missing value.
+        mol.z = [None] + list(range(19))
+        self.assertNotEqual(mol.z[0], mol.z[0])
+        self.assertEqual(mol.pos[1].tolist(), [1.0, 2.0, 0.0])
+
+        # A copy must be independent.
+        mol2 = deepcopy(mol)
+        mol2.pos[1] = 0.0
+        self.assertEqual(mol.pos[1].tolist(), [1.0, 2.0, 0.0])
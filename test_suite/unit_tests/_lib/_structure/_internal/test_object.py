@@ -82,3 +82,40 @@ class Test_object(UnitTestCase):
                 self.assertEqual(mol.z[j], data[i][j][3][2])
                 self.assertEqual(mol.element[j], data[i][j][4])
                 self.assertEqual(mol.bonded[j], data[i][j][5])
+
+
+    def test_bonded_atom(self):
+        """Test that the _bonded_atom() method only builds the connectivities of the queried atom of a non-protein molecule."""
+
+        # Initialise a structural object and add the atoms of methanol, and a distant carbon 1.8 Angstrom from a chlorine.
+        struct = object.Internal()
+        atoms = [
+            ['C1', [0.000, 0.000, 0.000], 'C'],
+            ['O1', [1.430, 0.000, 0.000], 'O'],
+            ['H1', [-0.360, 1.030, 0.000], 'H'],
+            ['H2', [-0.360, -0.510, 0.890], 'H'],
+            ['H3', [-0.360, -0.510, -0.890], 'H'],
+            ['H4', [1.750, 0.900, 0.000], 'H'],
+            ['C2', [10.000, 0.000, 0.000], 'C'],
+            ['CL', [11.800, 0.000, 0.000], 'Cl']
+        ]
+        for name, pos, element in atoms:
+            struct.add_atom(atom_name=name, res_name='MOH', res_num=1, mol_name='M', pos=pos, element=element)
+        mol = struct.structural_data[0].mol[0]
+
+        # The hydroxyl proton attached to the oxygen.
+        bonded_num, bonded_name, element, pos, attached_name, warning = struct._bonded_atom('H4', 1, mol)
+        self.assertEqual(warning, None)
+        self.assertEqual(bonded_name, 'H4')
+        self.assertEqual(element, 'H')
+
+        # Only the neighbourhood of the oxygen has been connected.
+        self.assertEqual(mol.bonded[6], [])
+        self.assertEqual(mol.bonded[7], [])
+
+        # A second lookup.
+        self.assertEqual(struct._bonded_atom('H1', 0, mol)[1], 'H1')
+
+        # The distant atoms are not bonded at the default radius.
+        struct._find_all_bonded_atoms(mol)
+        self.assertFalse(7 in mol.bonded[6])
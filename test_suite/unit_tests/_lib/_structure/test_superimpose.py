@@ -0,0 +1,87 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+
+# Python module imports.
+from numpy import array, dot, float64, zeros
+from numpy.random import RandomState
+
+# relax module imports.
+from lib.geometry.rotations import euler_to_R_zyz
+from lib.structure.superimpose import fit_to_mean, kabsch, kabsch_batch
+from test_suite.unit_tests.base_classes import UnitTestCase
+
+
+class Test_superimpose(UnitTestCase):
+    """Unit tests for the functions of the 'lib.structure.superimpose' module."""
+
+    def setUp(self):
+        """Create a randomly rotated and translated ensemble of noisy structures."""
+
+        # The base structure.
+        rand = RandomState(10)
+        base = rand.uniform(-10.0, 10.0, (50, 3))
+
+        # The models.
+        self.coord = []
+        for i in range(5):
+            R = zeros((3, 3), float64)
+            euler_to_R_zyz(rand.uniform(0.0, 3.0), rand.uniform(0.0, 3.0), rand.uniform(0.0, 3.0), R)
+            self.coord.append(dot(base + rand.normal(0.0, 0.1, (50, 3)), R.T) + rand.uniform(-5.0, 5.0, 3))
+        self.coord = array(self.coord, float64)
+
+        # The elements.
+        self.elements = ['C', 'N', 'O', 'H', 'S'] * 10
+
+
+    def test_fit_to_mean(self):
+        """Test that the lib.structure.superimpose.fit_to_mean() transforms superimpose the models."""
+
+        # Superimpose.
+        orig = self.coord.copy()
+        T, R, pivot = fit_to_mean(models=list(range(5)), coord=self.coord, verbosity=0)
+
+        # The transformed original coordinates must match the superimposed coordinates.
+        for i in range(5):
+            pos = dot(orig[i] + T[i] - pivot[i], R[i].T) + pivot[i]
+            for j in range(50):
+                for k in range(3):
+                    self.assertAlmostEqual(pos[j, k], self.coord[i, j, k], 6)
+
+
+    def test_kabsch_batch(self):
+        """Test that lib.structure.superimpose.kabsch_batch() matches kabsch() for each structure."""
+
+        # Loop over the centre types.
+        for centre_type, elements, centroid in [['centroid', None, None], ['CoM', self.elements, None], ['centroid', None, array([1.0, 2.0, 3.0])]]:
+            # The batched displacements to the first model.
+            T, d, R, angle, pivot = kabsch_batch(coord_from=self.coord, coord_to=self.coord[0], centre_type=centre_type, elements=elements, centroid=centroid)
+
+            # Compare to the single structure displacements.
+            for i in range(5):
+                trans_vect, trans_dist, rot, axis, theta, piv = kabsch(coord_from=self.coord[i], coord_to=self.coord[0], centre_type=centre_type, elements=elements, centroid=centroid, verbosity=0)
+                self.assertAlmostEqual(d[i], trans_dist)
+                self.assertAlmostEqual(angle[i], theta)
+                for j in range(3):
+                    self.assertAlmostEqual(T[i, j], trans_vect[j])
+                    self.assertAlmostEqual(pivot[j], piv[j])
+                    for k in range(3):
+                        self.assertAlmostEqual(R[i, j, k], rot[j, k])
@@ -0,0 +1,191 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, exp, float64, nan, ones, where
+from numpy.random import RandomState
+from unittest import TestCase
+
+# relax module imports.
+from dep_check import C_module_exp_fn
+from lib.minimise import grid_batch, newton_batch
+from target_functions.relax_fit_batch import Relax_fit_batch
+from status import Status; status = Status()
+
+
+class Test_minimise(TestCase):
+    """Unit tests for the functions of the 'lib.minimise' module."""
+
+    def __init__(self, methodName='runTest'):
+        """Skip the tests if the C modules are non-functional.
+
+        @keyword methodName:    The name of the test.
+        @type methodName:       str
+        """
+
+        # Execute the base class method.
+        super(Test_minimise, self).__init__(methodName)
+
+        # Missing module.
+        if not C_module_exp_fn:
+            # Store in the status object. 
+            status.skipped_tests.append([methodName, 'Relax curve-fitting C module', 'unit'])
+
+
+    def setUp(self):
+        """Create the simulated exponential curves."""
+
+        # The curve.
+        self.relax_times = array([0.0, 0.5, 1.0, 2.0, 4.0])
+        self.errors = 10.0 * ones(5)
+        curve = 1000.0 * exp(-1.5 * self.relax_times)
+
+        # The simulated data.
+        self.values = curve + RandomState(10).normal(0.0, 10.0, (50, 5))
+
+
+    def test_grid_batch(self):
+        """Test the block-wise grid search of the lib.minimise.grid_batch() function."""
+
+        # The target function.
+        target = Relax_fit_batch(model='exp', num_params=2, values=self.values[:1], errors=self.errors, relax_times=self.relax_times)
+        func_batch = lambda params: target.func(params, index=[0]*len(params))
+
+        # The grid search, with and without blocks.
+        results = []
+        for block_size in [7, 10000]:
+            results.append(grid_batch(func_batch=func_batch, num_incs=[21, 11], lower=[0.0, 500.0], upper=[5.0, 1500.0], block_size=block_size))
+
+        # Check the grid points of the minima and the function counts.
+        for x, f, f_count, warning in results:
+            self.assertEqual(x.tolist(), [1.5, 1000.0])
+            self.assertEqual(f_count, 231)
+            self.assertEqual(warning, None)
+        self.assertEqual(results[0][1], results[1][1])
+
+
+    def test_grid_batch_constraints(self):
+        """Test the constrained grid search of the lib.minimise.grid_batch() function."""
+
+        # The target function.
+        target = Relax_fit_batch(model='exp', num_params=2, values=self.values[:1], errors=self.errors, relax_times=self.relax_times)
+        func_batch = lambda params: target.func(params, index=[0]*len(params))
+
+        # The constraint Rx >= 2 excludes the true rate.
+        A = array([[1.0, 0.0]])
+        b = array([2.0])
+        x, f, f_count, warning = grid_batch(func_batch=func_batch, num_incs=[21, 11], lower=[0.0, 500.0], upper=[5.0, 1500.0], A=A, b=b, block_size=10)
+
+        # Checks.
+        self.assertEqual(x[0], 2.0)
+        self.assertEqual(f_count, 13*11)
+
+
+    def test_grid_batch_nan(self):
+        """Test that the NaN function values are skipped by the lib.minimise.grid_batch() function."""
+
+        # The target function, with NaN values for Rx < 2.
+        target = Relax_fit_batch(model='exp', num_params=2, values=self.values[:1], errors=self.errors, relax_times=self.relax_times)
+        func_batch = lambda params: where(params[:, 0] < 2.0, nan, target.func(params, index=[0]*len(params)))
+
+        # The grid search.
+        x, f, f_count, warning = grid_batch(func_batch=func_batch, num_incs=[21, 11], lower=[0.0, 500.0], upper=[5.0, 1500.0], block_size=10)
+
+        # Checks.
+        self.assertEqual(x[0], 2.0)
+        self.assertEqual(f_count, 231)
+
+
+    def test_newton_batch(self):
+        """Test the batched optimisation of exponential curves with the lib.minimise.newton_batch() function."""
+
+        # The target function, with diagonal scaling.
+        target = Relax_fit_batch(model='exp', num_params=2, values=self.values, errors=self.errors, relax_times=self.relax_times, scaling_matrix=[1.0, 1000.0])
+
+        # Optimise all simulations from the same starting point.
+        x0 = array([[1.0, 0.8]] * len(self.values), float64)
+        x, f, iter_count, f_count, g_count, h_count, warning = newton_batch(func=target.func, dfunc=target.dfunc, d2func=target.d2func, x0=x0, func_tol=1e-25, maxiter=1000)
+
+        # The optimised chi-squared values must be minima, with zero gradients.
+        self.assertEqual(warning, [None]*len(self.values))
+        grad = target.dfunc(x)
+        for i in range(len(self.values)):
+            self.assertAlmostEqual(grad[i, 0] / f[i], 0.0, 5)
+            self.assertAlmostEqual(grad[i, 1] / f[i], 0.0, 5)
+
+        # The parameters should be close to the true values.
+        self.assertAlmostEqual(x[:, 0].mean(), 1.5, 1)
+        self.assertAlmostEqual(x[:, 1].mean(), 1.0, 1)
+
+
+    def test_newton_batch_constraints(self):
+        """Test the constrained batched optimisation with the lib.minimise.newton_batch() function."""
+
+        # The target function for data with an increasing curve, forcing the rate to be negative.
+        values = 1000.0 * exp(0.5 * self.relax_times) * ones((3, 5))
+        target = Relax_fit_batch(model='exp', num_params=2, values=values, errors=self.errors, relax_times=self.relax_times)
+
+        # The constraints Rx >= 0 and I0 >= 0.
+        A = array([[1.0, 0.0], [0.0, 1.0]])
+        b = array([0.0, 0.0])
+
+        # Optimise.
+        x0 = array([[1.0, 1000.0]] * 3, float64)
+        x, f, iter_count, f_count, g_count, h_count, warning = newton_batch(func=target.func, dfunc=target.dfunc, d2func=target.d2func, x0=x0, A=A, b=b, maxiter=1000)
+
+        # The constraints must be satisfied, with the rate pushed towards zero.
+        for i in range(3):
+            self.assertTrue(x[i, 0] >= 0.0)
+            self.assertTrue(x[i, 1] >= 0.0)
+            self.assertTrue(x[i, 0] < 0.01)
+            self.assertTrue(f[i] < target.func(x0)[i])
+
+
+    def test_newton_batch_damping_limit(self):
+        """Test the warnings of the lib.minimise.newton_batch() function when the damping limit is reached."""
+
+        # The target function for data with an increasing curve, with the rate starting on the Rx >= 0 constraint boundary so that all steps are infeasible.
+        values = 1000.0 * exp(0.5 * self.relax_times) * ones((2, 5))
+        target = Relax_fit_batch(model='exp', num_params=2, values=values, errors=self.errors, relax_times=self.relax_times)
+        A = array([[1.0, 0.0], [0.0, 1.0]])
+        b = array([0.0, 0.0])
+
+        # Optimise.
+        x0 = array([[0.0, 1000.0]] * 2, float64)
+        x, f, iter_count, f_count, g_count, h_count, warning = newton_batch(func=target.func, dfunc=target.dfunc, d2func=target.d2func, x0=x0, A=A, b=b, maxiter=1000)
+
+        # Checks.
+        self.assertEqual(x.tolist(), x0.tolist())
+        self.assertEqual(iter_count.tolist(), [20, 20])
+        self.assertEqual(warning, ["Damping limit reached, the steps violate the linear constraints"] * 2)
+
+        # A target function with an inconsistent gradient, so that no step decreases the function value.
+        func = lambda x, index=None: (x**2).sum(axis=1)
+        dfunc = lambda x, index=None: -2.0 * x
+        d2func = lambda x, index=None: 2.0 * ones((len(x), 1, 1))
+
+        # Optimise, the second problem starting at the minimum.
+        x, f, iter_count, f_count, g_count, h_count, warning = newton_batch(func=func, dfunc=dfunc, d2func=d2func, x0=array([[1.0], [0.0]]), maxiter=1000, lambda_max=1e6)
+
+        # Checks.
+        self.assertEqual(x.tolist(), [[1.0], [0.0]])
+        self.assertEqual(iter_count.tolist(), [10, 1])
+        self.assertEqual(warning, ["Damping limit reached", None])
@@ -0,0 +1,167 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+
+# Python module imports.
+from numpy import float64, int32, isnan, ndarray
+from unittest import TestCase
+from xml.dom.minidom import Document
+import xml.dom.pulldom
+
+# relax module imports.
+from lib.compat import StringIO
+from lib.errors import RelaxError
+from lib.xml import Xml_element_stream, str_to_python, write_element_end, write_element_start, write_elements
+
+
+class Test_xml(TestCase):
+    """Unit tests for the functions of the 'lib.xml' module."""
+
+    def test_str_to_python_literals(self):
+        """Test the lib.xml.str_to_python() function for the Python literals."""
+
+        # Simple values.
+        self.assertEqual(str_to_python('None'), None)
+        self.assertEqual(str_to_python(' True\n'), True)
+        self.assertEqual(str_to_python('1'), 1)
+        self.assertEqual(str_to_python('-1.5e-05'), -1.5e-05)
+        self.assertEqual(str_to_python("'15N'"), '15N')
+        self.assertEqual(str_to_python('"it\'s"'), "it's")
+        self.assertEqual(str_to_python('-inf'), -float('inf'))
+        self.assert_(isnan(str_to_python('nan')))
+
+        # Containers.
+        self.assertEqual(str_to_python('[1.0, None, -2]'), [1.0, None, -2])
+        self.assertEqual(str_to_python("{'a': [0, 1], 'b': (1, 'x')}"), {'a': [0, 1], 'b': (1, 'x')})
+        self.assertEqual(str_to_python("{1: 'a\\nb'}"), {1: 'a\nb'})
+        self.assertEqual(str_to_python("[[0, 0, 0, 0, 0, 0, 240, 63]]"), [[0, 0, 0, 0, 0, 0, 240, 63]])
+
+
+    def test_str_to_python_numpy(self):
+        """Test the lib.xml.str_to_python() function for the numpy objects."""
+
+        # A float array.
+        value = str_to_python('array([[ 1.,  2.],\n       [ 3., nan]])')
+        self.assert_(isinstance(value, ndarray))
+        self.assertEqual(value.dtype, float64)
+        self.assertEqual(value[0].tolist(), [1.0, 2.0])
+        self.assert_(isnan(value[1, 1]))
+
+        # An integer array.
+        value = str_to_python('array([1, 2], dtype=int32)')
+        self.assertEqual(value.dtype, int32)
+        self.assertEqual(value.tolist(), [1, 2])
+
+        # Numpy scalars.
+        value = str_to_python('np.float64(0.5)')
+        self.assertEqual(type(value), float64)
+        self.assertEqual(value, 0.5)
+        self.assertEqual(str_to_python('numpy.float64(-inf)'), -float('inf'))
+
+
+    def test_str_to_python_unsafe(self):
+        """Test that the lib.xml.str_to_python() function rejects all non-literal Python code."""
+
+        # Code which eval() would execute.
+        for string in [
+            "__import__('os').system('ls')",
+            "open('/etc/passwd').read()",
+            "[].__class__",
+            "array.__globals__",
+            "numpy.load('x')",
+            "(lambda: 1)()",
+            "1 + 2",
+            "-'a'",
+            "[x for x in 'ab']",
+            "array([1"
+        ]:
+            self.assertRaises(RelaxError, str_to_python, string)
+
+
+    def test_write_element(self):
+        """Test that the lib.xml.write_element_start(), write_elements(), and write_element_end() functions match the minidom pretty printed output."""
+
+        # Create an element with attributes, a text element, and a nested element.
+        doc = Document()
+        elem = doc.createElement('mol')
+        elem.setAttribute('desc', 'A "molecule" & <more>')
+        elem.setAttribute('name', 'A')
+        text = doc.createElement('x')
+        text.appendChild(doc.createTextNode('[1, 2]'))
+        elem.appendChild(text)
+        res = doc.createElement('res')
+        res.appendChild(doc.createElement('spin'))
+        elem.appendChild(res)
+
+        # The minidom output.
+        file = StringIO()
+        elem.writexml(file, '    ', '    ', '\n')
+        expected = file.getvalue()
+
+        # Write out the element in parts.
+        file = StringIO()
+        res = elem.removeChild(res)
+        write_element_start(file, elem, indent='    ')
+        elem.appendChild(res)
+        write_elements(file, elem, indent='        ')
+        write_element_end(file, elem, indent='    ')
+
+        # Check the output, and that the written child nodes are freed.
+        self.assertEqual(file.getvalue(), expected)
+        self.assertEqual(len(elem.childNodes), 0)
+
+
+    def test_xml_element_stream(self):
+        """Test the lib.xml.Xml_element_stream class."""
+
+        # The XML document.
+        text = '<relax><pipe><global><x>1</x></global><mol><a>2</a><res n="1"><spin n="1"/><b/><spin n="2"/></res><res n="2"/></mol><mol/><structure/></pipe><gui/></relax>'
+        stream = Xml_element_stream(xml.dom.pulldom.parse(StringIO(text)))
+
+        # The top level elements.
+        self.assertEqual(stream.next_child().tagName, 'relax')
+        self.assertEqual(stream.next_child().tagName, 'pipe')
+
+        # Expand an element.
+        node = stream.next_child()
+        stream.expand(node)
+        self.assertEqual(node.toxml(), '<global><x>1</x></global>')
+
+        # Stream the molecules, residues, and spins.
+        self.assertEqual(stream.peek().tagName, 'mol')
+        spins = []
+        mols = 0
+        for mol in stream.children('mol'):
+            mols += 1
+            for res in stream.child_elements('res'):
+                for spin in stream.child_elements('spin', expand=True):
+                    spins.append([res.getAttribute('n'), spin.getAttribute('n')])
+        self.assertEqual(mols, 2)
+        self.assertEqual(spins, [['1', '1'], ['1', '2']])
+
+        # The remaining elements.
+        self.assertEqual([node.tagName for node in stream.children('structure', expand=True)], ['structure'])
+        self.assertEqual(stream.peek(), None)
+        self.assertEqual(stream.next_child(), None)
+        self.assertEqual(stream.next_child().tagName, 'gui')
+        self.assertEqual(stream.next_child(), None)
+        self.assertEqual(stream.next_child(), None)
+        self.assertEqual(stream.next_child(), None)
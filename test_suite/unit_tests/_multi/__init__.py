@@ -20,5 +20,7 @@
 ###############################################################################
 
 
-__all__ = ['test___init__'
+__all__ = ['test___init__',
+           'test_multi_processor_base',
+           'test_multiprocessing_processor'
 ]
@@ -0,0 +1,152 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from unittest import TestCase
+
+# relax module imports.
+from multi.multi_processor_base import Multi_processor
+from multi.result_commands import Null_result_command
+from multi.slave_commands import Slave_command
+
+
+class Timed_command(Slave_command):
+    """A slave command with a simulated run time."""
+
+    def __init__(self, name, time, cost=None):
+        super(Timed_command, self).__init__()
+        self.name = name
+        self.time = time
+        self.cost = cost
+
+
+
+class Simulated_processor(Multi_processor):
+    """A multi-processor fabric simulating the slaves with a virtual clock."""
+
+    def __init__(self, processor_size):
+        super(Simulated_processor, self).__init__(processor_size=processor_size, callback=None)
+
+        # Process the results immediately in this thread.
+        self.threaded_result_processing = False
+
+        # The simulation state.
+        self.clock = 0.0
+        self.running = {}
+        self.sent = []
+
+
+    def assert_on_master(self):
+        pass
+
+
+    def master_queue_command(self, command, dest):
+        # The job run time, with data transfers taking no time.
+        time = sum([getattr(cmd, 'time', 0.0) for cmd in command])
+
+        # Store the job.
+        self.running[dest] = self.clock + time
+        self.sent.append(([getattr(cmd, 'name', cmd.__class__.__name__) for cmd in command], dest, self.clock))
+
+
+    def master_receive_result(self):
+        # The first slave to finish.
+        dest = min(self.running, key=self.running.get)
+        self.clock = self.running.pop(dest)
+
+        # The result.
+        result = Null_result_command(processor=self)
+        result.rank = dest
+        return result
+
+
+    def rank(self):
+        return 0
+
+
+
+class Test_multi_processor_base(TestCase):
+    """Unit tests for the scheduling of the multi.multi_processor_base.Multi_processor class."""
+
+    def test_chunk_queue(self):
+        """Test the cost ordering of multi.multi_processor_base.Multi_processor.chunk_queue()."""
+
+        # The processor and commands.
+        processor = Simulated_processor(2)
+        queue = [Timed_command('a', 1.0, cost=1), Timed_command('b', 1.0), Timed_command('c', 1.0, cost=5), Timed_command('d', 1.0, cost=1)]
+
+        # Chunk the queue.
+        processor.chunk_size = 1
+        jobs = processor.chunk_queue(queue)
+        self.assertEqual([[cmd.name for cmd in job] for job in jobs], [['c'], ['a'], ['d'], ['b']])
+
+        # Larger chunks.
+        processor.chunk_size = 3
+        jobs = processor.chunk_queue(queue)
+        self.assertEqual([[cmd.name for cmd in job] for job in jobs], [['c', 'a', 'd'], ['b']])
+
+
+    def test_run_command_queue_dynamic(self):
+        """Test that multi.processor.Processor.run_command_queue() sends jobs to slaves as soon as they are idle."""
+
+        # One long job and many short jobs on 2 slaves.
+        processor = Simulated_processor(2)
+        processor.add_to_queue(Timed_command('long', 10.0, cost=10.0))
+        for i in range(10):
+            processor.add_to_queue(Timed_command('short%i' % i, 1.0, cost=1.0))
+
+        # Run the queue.
+        processor.run_queue()
+
+        # The long job must be sent first.
+        self.assertEqual(processor.sent[0][0], ['long'])
+        self.assertEqual(processor.sent[0][2], 0.0)
+
+        # All short jobs must be run on the other slave without waiting for the long job.
+        long_slave = processor.sent[0][1]
+        for names, dest, start in processor.sent[1:]:
+            self.assertNotEqual(dest, long_slave)
+
+        # The total run time is that of the long job.
+        self.assertEqual(len(processor.sent), 11)
+        self.assertEqual(processor.clock, 10.0)
+        self.assertEqual(processor.command_queue, [])
+
+
+    def test_send_data_to_slaves(self):
+        """Test that multi.processor.Processor.send_data_to_slaves() sends the data to each slave once, leaving the queue untouched."""
+
+        # Queued jobs on 3 slaves, with chunking.
+        processor = Simulated_processor(3)
+        processor.chunk_size = 2
+        for i in range(4):
+            processor.add_to_queue(Timed_command('job%i' % i, 1.0))
+
+        # Send the data.
+        processor.send_data_to_slaves(name='x', value=1)
+
+        # A single storage command per slave.
+        self.assertEqual(sorted([dest for names, dest, start in processor.sent]), [1, 2, 3])
+        for names, dest, start in processor.sent:
+            self.assertEqual(names, ['Slave_storage_command'])
+
+        # The queued jobs have not been run.
+        self.assertEqual([cmd.name for cmd in processor.command_queue], ['job0', 'job1', 'job2', 'job3'])
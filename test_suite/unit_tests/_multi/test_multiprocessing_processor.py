@@ -0,0 +1,257 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+import os
+import sys
+from unittest import TestCase
+
+# relax module imports.
+from lib.errors import RelaxError
+from multi import Application_callback, Memo, Processor_box, Result_command, Slave_command, fetch_data, load_multiprocessor, send_data_to_slaves
+from multi.misc import Capturing_exception
+
+
+class Square_memo(Memo):
+    """The memo for storing the squares on the master."""
+
+    def __init__(self, results, index):
+        self.results = results
+        self.index = index
+
+
+
+class Square_result_command(Result_command):
+    """The result command for storing a value in the memo on the master."""
+
+    def __init__(self, processor, value, memo_id=None, completed=True):
+        super(Square_result_command, self).__init__(processor=processor, completed=completed, memo_id=memo_id)
+        self.value = value
+
+
+    def run(self, processor, memo):
+        memo.results[memo.index] = self.value
+
+
+
+class Square_command(Slave_command):
+    """The slave command squaring a number, with an optional factor from the slave data store."""
+
+    def __init__(self, x, name=None):
+        super(Square_command, self).__init__()
+        self.x = x
+        self.name = name
+
+
+    def run(self, processor, completed):
+        # The factor.
+        factor = 1
+        if self.name:
+            factor = fetch_data(name=self.name)
+
+        # Return the result.
+        processor.return_object(Square_result_command(processor, factor * self.x**2, memo_id=self.memo_id, completed=completed))
+
+
+
+class Fail_command(Slave_command):
+    """The slave command raising a RelaxError."""
+
+    def run(self, processor, completed):
+        raise RelaxError("Slave failure.")
+
+
+
+class Unpicklable_command(Slave_command):
+    """The slave command which cannot be pickled."""
+
+    def __init__(self):
+        super(Unpicklable_command, self).__init__()
+        self.func = lambda x: x
+
+
+    def run(self, processor, completed):
+        processor.return_object(processor.NULL_RESULT)
+
+
+
+class Unpicklable_result_command(Slave_command):
+    """The slave command returning a result which cannot be pickled."""
+
+    def run(self, processor, completed):
+        result = Square_result_command(processor, lambda x: x, completed=completed)
+        processor.return_object(result)
+
+
+
+class Kill_command(Slave_command):
+    """The slave command terminating the slave process."""
+
+    def run(self, processor, completed):
+        os._exit(1)
+
+
+
+class Test_multiprocessing_processor(TestCase):
+    """Unit tests for the multi.multiprocessing_processor module, run via load_multiprocessor()."""
+
+    def setUp(self):
+        """Store the original processor and IO streams."""
+
+        self.processor_box = Processor_box()
+        self.orig_processor = getattr(self.processor_box, 'processor', None)
+        self.orig_stdout = sys.stdout
+        self.orig_stderr = sys.stderr
+
+
+    def tearDown(self):
+        """Restore the original processor and IO streams."""
+
+        self.processor_box.processor = self.orig_processor
+        sys.stdout = self.orig_stdout
+        sys.stderr = self.orig_stderr
+
+
+    def run_master(self, func):
+        """Run the function on the master of a 2 slave multiprocessing processor.
+
+        @param func:    The function to run on the master, with the processor as its argument.
+        @type func:     function
+        @return:        The return value of the function, and the exception raised within it.
+        @rtype:         anything, Exception instance or None
+        """
+
+        # Store the return value and exception.
+        store = {'value': None, 'exception': None}
+        def init_master(processor):
+            store['value'] = func(processor)
+        def handle_exception(processor, exception):
+            store['exception'] = exception
+
+        # The callback object.
+        callback = Application_callback(master=None)
+        callback.init_master = init_master
+        callback.handle_exception = handle_exception
+
+        # Load and run the processor, which exits at the end.
+        processor = load_multiprocessor('multiprocessing', callback, processor_size=2, verbosity=0)
+        self.assertRaises(SystemExit, processor.run)
+
+        # All slaves must be terminated.
+        self.assertEqual(processor._slaves, [])
+
+        # Return the results.
+        return store['value'], store['exception']
+
+
+    def test_exception(self):
+        """Check that a RelaxError raised on a slave is passed to the master."""
+
+        # Run a failing command amongst normal commands.
+        def func(processor):
+            results = {}
+            processor.add_to_queue(Square_command(2), Square_memo(results, 0))
+            processor.add_to_queue(Fail_command())
+            processor.run_queue()
+        value, exception = self.run_master(func)
+
+        # The captured slave exception.
+        self.assertTrue(isinstance(exception, Capturing_exception))
+        self.assertEqual(exception.exception_name, 'RelaxError')
+        self.assertTrue('Slave failure.' in exception.exception_string)
+
+
+    def test_queue(self):
+        """Check the running of a queue of commands with memos."""
+
+        # Run the queue.
+        def func(processor):
+            results = {}
+            for i in range(10):
+                processor.add_to_queue(Square_command(i), Square_memo(results, i))
+            processor.run_queue()
+            return results
+        value, exception = self.run_master(func)
+
+        # Check.
+        self.assertEqual(exception, None)
+        self.assertEqual(value, dict([(i, i**2) for i in range(10)]))
+
+
+    def test_send_data_to_slaves(self):
+        """Check the sending of data to the slave data stores, with pending commands on the queue."""
+
+        # Run the queue.
+        def func(processor):
+            results = {}
+            for i in range(4):
+                processor.add_to_queue(Square_command(i, name='factor'), Square_memo(results, i))
+            send_data_to_slaves(name='factor', value=3)
+            processor.run_queue()
+            return results
+        value, exception = self.run_master(func)
+
+        # Check.
+        self.assertEqual(exception, None)
+        self.assertEqual(value, {0: 0, 1: 3, 2: 12, 3: 27})
+
+
+    def test_unpicklable_command(self):
+        """Check that an unpicklable command raises a RelaxError on the master."""
+
+        # Run the command.
+        def func(processor):
+            processor.add_to_queue(Unpicklable_command())
+            processor.run_queue()
+        value, exception = self.run_master(func)
+
+        # Check.
+        self.assertTrue(isinstance(exception, RelaxError))
+        self.assertTrue('cannot be pickled' in str(exception))
+
+
+    def test_unpicklable_result(self):
+        """Check that an unpicklable result is replaced by an exception on the slave."""
+
+        # Run the command.
+        def func(processor):
+            processor.add_to_queue(Unpicklable_result_command())
+            processor.run_queue()
+        value, exception = self.run_master(func)
+
+        # Check.
+        self.assertTrue(isinstance(exception, Capturing_exception))
+        self.assertEqual(exception.exception_name, 'RelaxError')
+        self.assertTrue('cannot be returned to the master' in exception.exception_string)
+
+
+    def test_slave_termination(self):
+        """Check that the termination of a slave process raises a RelaxError on the master."""
+
+        # Run the command.
+        def func(processor):
+            processor.add_to_queue(Kill_command())
+            processor.run_queue()
+        value, exception = self.run_master(func)
+
+        # Check.
+        self.assertTrue(isinstance(exception, RelaxError))
+        self.assertTrue('terminated unexpectedly' in str(exception))
@@ -24,7 +24,7 @@
 from data_store import Relax_data_store; ds = Relax_data_store()
 from pipe_control import mol_res_spin, pipes
 from pipe_control.reset import reset
-from lib.errors import RelaxError, RelaxNoPipeError
+from lib.errors import RelaxError, RelaxMultiSpinIDError, RelaxNoPipeError
 from test_suite.unit_tests.base_classes import UnitTestCase
 
 
@@ -913,6 +913,67 @@ class Test_mol_res_spin(UnitTestCase):
         self.assertEqual(i, 4)
 
 
+    def test_compile_selection(self):
+        """Test the compilation and storage of the spin selection '@N5'.
+
+        The function tested is pipe_control.mol_res_spin.compile_selection().
+        """
+
+        # Compile the selection twice.
+        indices = mol_res_spin.compile_selection('@N5', pipe_cont=cdp)
+        self.assertEqual(indices, [(1, 0, 1), (1, 1, 1)])
+        self.assert_(mol_res_spin.compile_selection('@N5', pipe_cont=cdp) is indices)
+
+        # The unique spin IDs are generated only once.
+        ids = [spin_id for spin, spin_id in mol_res_spin.spin_loop('@N5', return_id=True)]
+        self.assertEqual(ids, ['#RNA:-5@N5', '#RNA:-4@N5'])
+        self.assertEqual(cdp.mol._spin_unique_id_lookup[(1, 1, 1)], '#RNA:-4@N5')
+
+        # Rename a spin, resetting the compiled selections.
+        mol_res_spin.name_spin(spin_id='#RNA:-4@N5', name='N6', force=True)
+        self.assertEqual(mol_res_spin.compile_selection('@N5', pipe_cont=cdp), [(1, 0, 1)])
+        self.assertEqual(len(list(mol_res_spin.spin_loop('@N6'))), 1)
+
+
+    def test_compile_selection_wildcard_names(self):
+        """Test the compilation of a unique spin ID selection when a spin name contains a wildcard.
+
+        The function tested is pipe_control.mol_res_spin.compile_selection().
+        """
+
+        # The unique spin ID selects a single spin.
+        self.assert_('#RNA:-5@C8' in cdp.mol._spin_id_lookup)
+        self.assertEqual(mol_res_spin.compile_selection('#RNA:-5@C8', pipe_cont=cdp), [(1, 0, 0)])
+
+        # Add a spin with a wildcard name, which matches the same selection.
+        cdp.mol[1].res[0].spin.add_item(spin_name='C*')
+        mol_res_spin.metadata_update()
+        self.assert_('#RNA:-5@C8' in cdp.mol._spin_id_lookup)
+        self.assertEqual(mol_res_spin.compile_selection('#RNA:-5@C8', pipe_cont=cdp), [(1, 0, 0), (1, 0, 2)])
+
+
+    def test_compile_selection_duplicate_names(self):
+        """Test the compilation of a unique spin ID selection when a second spin of the same name is added to the residue.
+
+        The function tested is pipe_control.mol_res_spin.compile_selection().
+        """
+
+        # Reset and create two spins named N in residue 5.
+        reset()
+        pipes.create('dup', 'mf')
+        mol_res_spin.create_spin(spin_num=1, spin_name='N', res_num=5)
+        self.assert_(':5@N' in cdp.mol._spin_id_lookup)
+        mol_res_spin.create_spin(spin_num=2, spin_name='N', res_num=5)
+        mol_res_spin.create_spin(spin_num=3, spin_name='H', res_num=5)
+
+        # Both spins are selected.
+        self.assertEqual(mol_res_spin.compile_selection(':5@N', pipe_cont=cdp), [(0, 0, 0), (0, 0, 1)])
+        self.assertEqual(mol_res_spin.compile_selection(':5@H', pipe_cont=cdp), [(0, 0, 2)])
+
+        # A single spin cannot be returned.
+        self.assertRaises(RelaxMultiSpinIDError, mol_res_spin.return_spin_from_selection, ':5@N')
+
+
     def test_boolean_and_selection(self):
         """Test boolean and in mol-res-spin selections."""
 
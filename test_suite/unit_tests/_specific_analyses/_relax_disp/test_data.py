@@ -28,7 +28,7 @@ from data_store import Relax_data_store; ds = Relax_data_store()
 from math import atan, pi
 from pipe_control import state
 from pipe_control.mol_res_spin import get_spin_ids, return_spin
-from specific_analyses.relax_disp.data import calc_rotating_frame_params, count_relax_times, find_intensity_keys, get_curve_type, has_exponential_exp_type, loop_exp_frq, loop_exp_frq_offset, loop_exp_frq_offset_point, loop_exp_frq_offset_point_time, loop_time, return_offset_data, return_spin_lock_nu1
+from specific_analyses.relax_disp.data import calc_rotating_frame_params, count_relax_times, find_intensity_keys, get_curve_type, has_exponential_exp_type, loop_exp_frq, loop_exp_frq_offset, loop_exp_frq_offset_point, loop_exp_frq_offset_point_time, loop_time, return_layout, return_offset_data, return_param_key_from_data, return_spin_lock_nu1
 from status import Status; status = Status()
 from test_suite.unit_tests.base_classes import UnitTestCase
 
@@ -679,6 +679,60 @@ class Test_data(UnitTestCase):
                 count += 1
 
 
+    def test_return_layout_cpmg(self):
+        """Unit test of the return_layout() function.
+
+        This uses the data of the saved state attached to U{bug #21665<https://web.archive.org/web/https://gna.org/bugs/?21665>}.
+        """
+
+        # Load the state.
+        statefile = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'bug_21665.bz2'
+        state.load_state(statefile, force=True)
+
+        # Compile the layout.
+        layout = return_layout()
+
+        # The point columns should follow the dispersion data loop.
+        col = 0
+        for exp_type, frq, offset, point, ei, mi, oi, di in loop_exp_frq_offset_point(return_indices=True):
+            self.assertEqual(layout.keys[col], return_param_key_from_data(exp_type=exp_type, frq=frq, offset=offset, point=point))
+            self.assertEqual(layout.key_index[layout.keys[col]], col)
+            self.assertEqual([layout.ei[col], layout.mi[col], layout.oi[col], layout.di[col]], [ei, mi, oi, di])
+            self.assertEqual(layout.points[ei][mi][oi][di], point)
+            self.assertEqual(layout.times[ei][mi][oi][di], list(loop_time(exp_type=exp_type, frq=frq, offset=offset, point=point)))
+            col += 1
+        self.assertEqual(len(layout.keys), col)
+
+        # The column ranges of the offsets.
+        self.assertEqual(layout.blocks, [[[(0, 17)], [(17, 34)]]])
+
+
+    def test_return_layout_recompile(self):
+        """Unit test of the recompilation of the layout of the return_layout() function.
+
+        This uses the data of the saved state attached to U{bug #21665<https://web.archive.org/web/https://gna.org/bugs/?21665>}.
+        """
+
+        # Load the state.
+        statefile = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'bug_21665.bz2'
+        state.load_state(statefile, force=True)
+
+        # The layout is compiled once.
+        layout = return_layout()
+        self.assertTrue(return_layout() is layout)
+
+        # Modify the relaxation time of a spectrum.
+        id = cdp.spectrum_ids[-1]
+        cdp.relax_times[id] = 0.1
+        cdp.relax_time_list.append(0.1)
+
+        # The layout must be recompiled.
+        new_layout = return_layout()
+        self.assertFalse(new_layout is layout)
+        self.assertEqual(new_layout.keys, layout.keys)
+        self.assertNotEqual(new_layout.times, layout.times)
+
+
     def test_return_offset_data(self):
         """Unit test of the return_offset_data() function for R1rho setup.
 
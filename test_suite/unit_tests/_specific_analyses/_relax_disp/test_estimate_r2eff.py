@@ -0,0 +1,166 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, exp, float64, linspace, ones, sqrt, zeros
+from os import sep
+from tempfile import mktemp
+from unittest import TestCase
+
+# relax module imports.
+from lib.dispersion.variables import MODEL_R2EFF
+from lib.statistics import multifit_covar
+from multi import Application_callback, Processor_box
+from multi.uni_processor import Uni_processor
+from pipe_control import state
+from pipe_control.mol_res_spin import spin_loop
+from specific_analyses.relax_disp.estimate_r2eff import Exp, Exp_batch, minimise_batch, minimise_batch_curves
+from specific_analyses.relax_disp.uf import model_setup
+from status import Status; status = Status()
+from test_suite.unit_tests.base_classes import UnitTestCase
+
+
+class Test_estimate_r2eff(TestCase):
+    """Unit tests for the batched curve fitting of the specific_analyses.relax_disp.estimate_r2eff module."""
+
+    def setUp(self):
+        """Set up three noise-free exponential curves with different numbers of time points."""
+
+        # The curve parameters [r2eff, i0] and time points.
+        self.params = array([[8.0, 100000.0], [15.0, 50000.0], [25.0, 120000.0]], float64)
+        self.curve_times = [linspace(0.0, 0.4, 5), linspace(0.0, 0.2, 8), array([0.0, 0.02, 0.05, 0.1])]
+
+        # The padded arrays.
+        self.times = zeros((3, 8), float64)
+        self.values = zeros((3, 8), float64)
+        self.errors = ones((3, 8), float64)
+        self.mask = zeros((3, 8), bool)
+        for i in range(3):
+            n = len(self.curve_times[i])
+            self.times[i, :n] = self.curve_times[i]
+            self.values[i, :n] = self.params[i, 1] * exp(-self.params[i, 0] * self.curve_times[i])
+            self.errors[i, :n] = 0.01 * self.params[i, 1]
+            self.mask[i, :n] = True
+
+
+    def test_estimate_x0_exp(self):
+        """Check the batched starting parameters against Exp.estimate_x0_exp() of the individual curves."""
+
+        # The batched estimates.
+        x0 = Exp_batch(times=self.times, values=self.values, errors=self.errors, mask=self.mask).estimate_x0_exp()
+
+        # Compare to the individual curves.
+        E = Exp(verbosity=0)
+        for i in range(3):
+            n = len(self.curve_times[i])
+            r2eff, i0 = E.estimate_x0_exp(times=self.times[i, :n], values=self.values[i, :n])
+            self.assertAlmostEqual(x0[i, 0], r2eff, 10)
+            self.assertAlmostEqual(x0[i, 1] / i0, 1.0, 10)
+
+
+    def test_minimise_batch(self):
+        """Check the batched Levenberg-Marquardt optimisation and covariance of perturbed curves."""
+
+        # Perturb the intensities, alternating in sign.
+        sign = ones(8, float64)
+        sign[1::2] = -1.0
+        values = self.values + sign * self.errors * self.mask
+
+        # Optimise.
+        E = Exp_batch(times=self.times, values=values, errors=self.errors, mask=self.mask)
+        param_vector, param_vector_error, chi2, iter_count, f_count, g_count, h_count, warning = minimise_batch(E=E)
+
+        # Compare each curve to the gradient and covariance of the individual curve.
+        for i in range(3):
+            n = len(self.curve_times[i])
+            self.assertEqual(warning[i], None)
+            self.assertAlmostEqual(param_vector[i, 0] / self.params[i, 0], 1.0, 1)
+
+            # The chi-squared gradient is zero at the minimum.
+            grad = Exp(verbosity=0).func_exp_chi2_grad(params=param_vector[i], times=self.times[i, :n], values=values[i, :n], errors=self.errors[i, :n])
+            self.assertAlmostEqual(grad[0] * param_vector[i, 0] / chi2[i], 0.0, 5)
+            self.assertAlmostEqual(grad[1] * param_vector[i, 1] / chi2[i], 0.0, 5)
+
+            # The errors.
+            jacobian = Exp(verbosity=0).func_exp_grad(params=param_vector[i], times=self.times[i, :n])
+            pcov = multifit_covar(J=jacobian, weights=1.0 / self.errors[i, :n]**2)
+            self.assertAlmostEqual(param_vector_error[i, 0] / sqrt(pcov[0, 0]), 1.0, 10)
+            self.assertAlmostEqual(param_vector_error[i, 1] / sqrt(pcov[1, 1]), 1.0, 10)
+
+
+
+class Test_estimate_r2eff_batch_curves(UnitTestCase):
+    """Unit tests for the batched curve fitting of the spins of the current data pipe."""
+
+    def setUp(self):
+        """Set up the uni-processor and the R1rho data of the saved state attached to U{bug #21344<https://web.archive.org/web/https://gna.org/bugs/?21344>}."""
+
+        # Replace the processor.
+        self.processor_box = Processor_box()
+        self.orig_processor = getattr(self.processor_box, 'processor', None)
+        self.processor_box.processor = Uni_processor(processor_size=1, callback=Application_callback(master=None))
+
+        # Load the state.
+        statefile = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'bug_21344_trunc.bz2'
+        state.load_state(statefile, force=True)
+
+        # The R2eff model, without the check for the relaxation curve-fitting C modules.
+        model_setup(MODEL_R2EFF, ['r2eff', 'i0'])
+
+        # Peak intensity errors of 1%.
+        for spin in spin_loop():
+            spin.peak_intensity_err = {}
+            for key in spin.peak_intensity:
+                spin.peak_intensity_err[key] = 0.01 * abs(spin.peak_intensity[key])
+
+
+    def tearDown(self):
+        """Restore the original processor and reset the relax data store."""
+
+        # Restore the processor.
+        self.processor_box.processor = self.orig_processor
+
+        # Reset the data store.
+        super(Test_estimate_r2eff_batch_curves, self).tearDown()
+
+
+    def test_minimise_batch_curves_save_state(self):
+        """Check that the results of minimise_batch_curves(), run via the processor, can be saved and reloaded."""
+
+        # Optimise.
+        minimise_batch_curves(verbosity=0)
+
+        # Python types for the statistics.
+        spins = [spin for spin in spin_loop()]
+        for spin in spins:
+            self.assertEqual(type(spin.f_count), int)
+
+        # Save the state.
+        self.tmpfile = mktemp()
+        state.save_state(state=self.tmpfile, compress_type=0, force=True)
+
+        # Reload the state and compare.
+        state.load_state(state=self.tmpfile, force=True)
+        for spin, orig_spin in zip(spin_loop(), spins):
+            self.assertEqual(spin.f_count, orig_spin.f_count)
+            self.assertAlmostEqual(spin.chi2, orig_spin.chi2)
+            for key in orig_spin.r2eff:
+                self.assertAlmostEqual(spin.r2eff[key], orig_spin.r2eff[key])
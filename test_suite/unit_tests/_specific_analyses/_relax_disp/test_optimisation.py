@@ -0,0 +1,97 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from os import sep
+
+# relax module imports.
+from data_store import Relax_data_store; ds = Relax_data_store()
+from multi import Application_callback, Processor_box, fetch_data
+from multi.uni_processor import Uni_processor
+from pipe_control import state
+from specific_analyses.relax_disp.optimisation import send_shared_data_to_slaves
+from status import Status; status = Status()
+from test_suite.unit_tests.base_classes import UnitTestCase
+
+
+class Counting_processor(Uni_processor):
+    """A uni-processor fabric counting the data transfers to the slaves."""
+
+    def __init__(self):
+        super(Counting_processor, self).__init__(processor_size=1, callback=Application_callback(master=None))
+
+        # The number of transfers.
+        self.transfers = 0
+
+
+    def run_command_on_each_slave(self, commands):
+        self.transfers += 1
+        super(Counting_processor, self).run_command_on_each_slave(commands)
+
+
+
+class Test_optimisation(UnitTestCase):
+    """Unit tests for the functions of the specific_analyses.relax_disp.optimisation module."""
+
+    def setUp(self):
+        """Set up a counting processor and the CPMG data of the saved state attached to U{bug #21665<https://web.archive.org/web/https://gna.org/bugs/?21665>}."""
+
+        # Replace the processor.
+        self.processor_box = Processor_box()
+        self.orig_processor = getattr(self.processor_box, 'processor', None)
+        self.processor_box.processor = Counting_processor()
+
+        # Load the state.
+        statefile = status.install_path + sep+'test_suite'+sep+'shared_data'+sep+'dispersion'+sep+'bug_21665.bz2'
+        state.load_state(statefile, force=True)
+
+
+    def tearDown(self):
+        """Restore the original processor and reset the relax data store."""
+
+        # Restore the processor.
+        self.processor_box.processor = self.orig_processor
+
+        # Reset the data store.
+        super(Test_optimisation, self).tearDown()
+
+
+    def test_send_shared_data_to_slaves(self):
+        """Check that send_shared_data_to_slaves() only sends the data to the slaves if it has changed."""
+
+        # The base optimisation and three Monte Carlo simulations.
+        for i in range(4):
+            send_shared_data_to_slaves()
+
+        # A single transfer.
+        self.assertEqual(self.processor_box.processor.transfers, 1)
+
+        # The data in the slave data store.
+        data = fetch_data(name='relax_disp_shared_data')
+        self.assertEqual(sorted(data.keys()), ['cpmg_frqs', 'relax_times', 'spin_lock_nu1'])
+        self.assertEqual(len(data['relax_times']), len(cdp.exp_type_list))
+
+        # Change the data, which must be sent again.
+        key = cdp.spectrum_ids[-1]
+        cdp.cpmg_frqs[key] = 2.0 * cdp.cpmg_frqs[key]
+        send_shared_data_to_slaves()
+        send_shared_data_to_slaves()
+        self.assertEqual(self.processor_box.processor.transfers, 2)
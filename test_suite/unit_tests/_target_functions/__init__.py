@@ -21,5 +21,8 @@
 
 
 __all__ = [
-    'test_relax_fit'
+    'test_mf',
+    'test_relax_fit',
+    'test_relax_fit_batch',
+    'test_relax_fit_wrapper'
 ]
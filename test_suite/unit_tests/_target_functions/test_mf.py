@@ -0,0 +1,287 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, concatenate, float64, zeros
+from numpy.linalg import norm
+from numpy.random import RandomState
+from unittest import TestCase
+
+# relax module imports.
+from lib.periodic_table import periodic_table
+from lib.physical_constants import h_bar, mu0
+from target_functions.mf import Mf
+
+
+class Test_mf(TestCase):
+    """Unit tests for the spin blocks of the target_functions.mf module."""
+
+    def setUp(self):
+        """Set up the data of six spins, two spins per model-free model."""
+
+        # The diffusion tensors.
+        self.diff_params = {
+            'sphere': [8e-9],
+            'spheroid': [8e-9, 2e7, 0.9, 2.1],
+            'ellipsoid': [8e-9, 2e7, 0.3, 0.5, 1.1, 2.7]
+        }
+
+        # The models, the second spin of the last model lacking the 500 MHz R1 data.
+        models = [
+            ('mf_orig', ['s2', 'te'], [0.75, 40e-12]),
+            ('mf_orig', ['s2', 'te', 'rex'], [0.7, 30e-12, 1.5e-19]),
+            ('mf_ext', ['s2f', 'tf', 's2', 'ts'], [0.85, 20e-12, 0.6, 1.0e-9]),
+            ('mf_orig', ['s2', 'te'], [0.8, 50e-12]),
+            ('mf_orig', ['s2', 'te', 'rex'], [0.72, 35e-12, 1.2e-19]),
+            ('mf_ext', ['s2f', 'tf', 's2', 'ts'], [0.8, 25e-12, 0.65, 1.2e-9])
+        ]
+        vectors = [[1.0, 0.2, 0.3], [0.1, -1.0, 0.5], [0.3, 0.4, 1.0], [-0.7, 0.2, 0.6], [0.5, 0.5, -0.2], [0.9, -0.1, 0.1]]
+        relax_data = [1.5, 10.0, 0.7, 1.8, 9.0, 0.6]
+
+        # The spin data.
+        self.spins = []
+        for i in range(len(models)):
+            ri_labels = ['R1', 'R2', 'NOE', 'R1', 'R2', 'NOE']
+            remap_table = [0, 0, 0, 1, 1, 1]
+            noe_r1_table = [None, None, 0, None, None, 3]
+            if i == 5:
+                ri_labels = ['R1', 'R2', 'NOE', 'R2', 'NOE']
+                remap_table = [0, 0, 0, 1, 1]
+                noe_r1_table = [None, None, 0, None, None]
+            num_ri = len(ri_labels)
+            self.spins.append({
+                'equations': models[i][0],
+                'param_types': models[i][1],
+                'param_values': array(models[i][2], float64),
+                'relax_data': array(relax_data[:num_ri], float64) * (1.0 + 0.02*i),
+                'errors': array([0.05, 0.3, 0.05, 0.05, 0.3, 0.05][:num_ri], float64),
+                'bond_length': 1.02e-10,
+                'csa': -172e-6,
+                'num_frq': 2,
+                'frq': [600e6, 500e6],
+                'num_ri': num_ri,
+                'remap_table': remap_table,
+                'noe_r1_table': noe_r1_table,
+                'ri_labels': ri_labels,
+                'gx': periodic_table.gyromagnetic_ratio('15N'),
+                'gh': periodic_table.gyromagnetic_ratio('1H'),
+                'num_params': len(models[i][1]),
+                'vectors': array(vectors[i], float64) / norm(vectors[i])
+            })
+
+
+    def create_target(self, model_type, diff_type, spins):
+        """Create the model-free target function class for the given spins.
+
+        @param model_type:  The model-free model type, either 'diff' or 'all'.
+        @type model_type:   str
+        @param diff_type:   The diffusion tensor type.
+        @type diff_type:    str
+        @param spins:       The data of the spins.
+        @type spins:        list of dict
+        @return:            The target function class and the parameter vector.
+        @rtype:             Mf instance, numpy rank-1 array
+        """
+
+        # The parameter vector.
+        params = list(self.diff_params[diff_type])
+        if model_type == 'all':
+            for spin in spins:
+                params = params + list(spin['param_values'])
+        params = array(params, float64)
+
+        # The spin specific arguments.
+        kwargs = {}
+        for name in spins[0]:
+            kwargs[name] = [spin[name] for spin in spins]
+        if model_type == 'all':
+            kwargs['param_values'] = None
+        if diff_type == 'sphere':
+            kwargs['vectors'] = [None] * len(spins)
+
+        # Initialise the target function class.
+        mf = Mf(init_params=params, model_type=model_type, diff_type=diff_type, diff_params=self.diff_params[diff_type], num_spins=len(spins), h_bar=h_bar, mu0=mu0, **kwargs)
+
+        # Return the class and parameters.
+        return mf, params
+
+
+    def check_blocks(self, model_type, diff_type):
+        """Check the spin blocks against the sum of the separately calculated spins.
+
+        @param model_type:  The model-free model type, either 'diff' or 'all'.
+        @type model_type:   str
+        @param diff_type:   The diffusion tensor type.
+        @type diff_type:    str
+        """
+
+        # The target function of all spins.
+        mf, params = self.create_target(model_type, diff_type, self.spins)
+        chi2 = mf.func(params)
+        dchi2 = mf.dfunc(params)
+        d2chi2 = mf.d2func(params)
+        dri = mf.lm_dri()
+
+        # The spins are grouped by their equations.
+        self.assertEqual(len(mf.blocks), 4)
+
+        # Sum the values of the separate spins.
+        num_diff = len(self.diff_params[diff_type])
+        total_chi2 = 0.0
+        total_dchi2 = zeros(len(params), float64)
+        total_d2chi2 = zeros((len(params), len(params)), float64)
+        total_dri = []
+        start = num_diff
+        for spin in self.spins:
+            # The target function of the spin.
+            spin_mf, spin_params = self.create_target(model_type, diff_type, [spin])
+            total_chi2 += spin_mf.func(spin_params)
+            spin_dchi2 = spin_mf.dfunc(spin_params)
+            spin_d2chi2 = spin_mf.d2func(spin_params)
+            spin_dri = spin_mf.lm_dri()
+
+            # The indices of the spin parameters within the global parameter vector.
+            index = list(range(num_diff))
+            if model_type == 'all':
+                index = index + list(range(start, start + spin['num_params']))
+                start = start + spin['num_params']
+
+            # Assemble.
+            total_dchi2[index] += spin_dchi2
+            total_d2chi2[array(index)[:, None], array(index)] += spin_d2chi2
+            spin_total_dri = zeros((spin['num_ri'], len(params)), float64)
+            spin_total_dri[:, index] = spin_dri
+            total_dri.append(spin_total_dri)
+        total_dri = concatenate(total_dri)
+
+        # Check the values.
+        self.assertAlmostEqual(chi2 / total_chi2, 1.0, 12)
+        for i in range(len(params)):
+            self.assertAlmostEqual(dchi2[i] / abs(total_dchi2).max(), total_dchi2[i] / abs(total_dchi2).max(), 12)
+            for j in range(len(params)):
+                self.assertAlmostEqual(d2chi2[i, j] / abs(total_d2chi2).max(), total_d2chi2[i, j] / abs(total_d2chi2).max(), 12)
+            for j in range(len(total_dri)):
+                self.assertAlmostEqual(dri[j, i] / abs(total_dri[:, i]).max(), total_dri[j, i] / abs(total_dri[:, i]).max(), 12)
+
+
+    def test_all_ellipsoid(self):
+        """Check the spin blocks of the 'all' model type for the ellipsoid."""
+
+        # Check.
+        self.check_blocks('all', 'ellipsoid')
+
+
+    def test_all_sphere(self):
+        """Check the spin blocks of the 'all' model type for the sphere."""
+
+        # Check.
+        self.check_blocks('all', 'sphere')
+
+
+    def test_all_spheroid(self):
+        """Check the spin blocks of the 'all' model type for the spheroid."""
+
+        # Check.
+        self.check_blocks('all', 'spheroid')
+
+
+    def test_diff_ellipsoid(self):
+        """Check the spin blocks of the 'diff' model type for the ellipsoid."""
+
+        # Check.
+        self.check_blocks('diff', 'ellipsoid')
+
+
+    def test_diff_sphere(self):
+        """Check the spin blocks of the 'diff' model type for the sphere."""
+
+        # Check.
+        self.check_blocks('diff', 'sphere')
+
+
+    def test_diff_spheroid(self):
+        """Check the spin blocks of the 'diff' model type for the spheroid."""
+
+        # Check.
+        self.check_blocks('diff', 'spheroid')
+
+
+    def check_batch(self, model_type, diff_type):
+        """Check the batched target function against the chi-squared values of the separate parameter vectors.
+
+        @param model_type:  The model-free model type, either 'mf' or 'local_tm'.
+        @type model_type:   str
+        @param diff_type:   The diffusion tensor type.
+        @type diff_type:    str
+        """
+
+        # Loop over the spins.
+        random = RandomState(5)
+        for spin in self.spins:
+            # The spin data, with the local tm parameter.
+            spin = dict(spin)
+            params = spin['param_values']
+            if model_type == 'local_tm':
+                spin['param_types'] = ['local_tm'] + spin['param_types']
+                spin['num_params'] += 1
+                params = concatenate([[7e-9], params])
+            if diff_type == 'sphere':
+                spin['vectors'] = None
+
+            # The target function class.
+            kwargs = {}
+            for name in spin:
+                kwargs[name] = [spin[name]]
+            mf = Mf(init_params=params, model_type=model_type, diff_type=diff_type, diff_params=self.diff_params[diff_type], num_spins=1, h_bar=h_bar, mu0=mu0, **kwargs)
+
+            # The parameter vectors, spread around the spin parameters.
+            vectors = params * random.uniform(0.7, 1.3, (30, len(params)))
+
+            # The chi-squared values of the separate vectors.
+            chi2 = [mf.func(vector) for vector in vectors]
+
+            # Check all vectors and a smaller second batch, reusing the spin block.
+            for num in [30, 11]:
+                chi2_batch = mf.func_batch(vectors[:num])
+                self.assertEqual(len(chi2_batch), num)
+                for i in range(num):
+                    self.assertAlmostEqual(chi2_batch[i] / chi2[i], 1.0, 12)
+
+
+    def test_func_batch_mf_ellipsoid(self):
+        """Check the batched target function of the 'mf' model type for the ellipsoid."""
+
+        # Check.
+        self.check_batch('mf', 'ellipsoid')
+
+
+    def test_func_batch_mf_sphere(self):
+        """Check the batched target function of the 'mf' model type for the sphere."""
+
+        # Check.
+        self.check_batch('mf', 'sphere')
+
+
+    def test_func_batch_local_tm(self):
+        """Check the batched target function of the 'local_tm' model type."""
+
+        # Check.
+        self.check_batch('local_tm', 'sphere')
@@ -21,7 +21,7 @@
 
 # Python module imports.
 from math import pi
-from numpy import array, float64, ones
+from numpy import array, float64, int32, nan, ones, zeros
 from unittest import TestCase
 
 # relax module imports.
@@ -143,4 +143,62 @@ class Test_n_state_model(TestCase):
             self.assertAlmostEqual(chi2, 0.0)
 
 
+    def setup_rdc_model(self, rdcs=None):
+        """Set up a 2-state population model with RDCs for a normal atom, a pseudo-atom, and missing data.
 
+        @keyword rdcs:  The RDCs of the single alignment.
+        @type rdcs:     list of float
+        @return:        The N-state model target function class instance and the parameters {Axx, Ayy, Axy, Axz, Ayz, p1}.
+        @rtype:         N_state_opt instance, numpy rank-1 array
+        """
+
+        # The unit vectors, the first dimension being the state and the second the pseudo-atom.
+        x = [1.0, 0.0, 0.0]
+        y = [0.0, 1.0, 0.0]
+        z = [0.0, 0.0, 1.0]
+        rdc_vect = [array([z, x], float64), array([[z, y], [x, x]], float64), array([x, y], float64)]
+
+        # The parameters, with Azz = -3 and populations of 0.4 and 0.6.
+        init_params = array([1.0, 2.0, 0.0, 0.0, 0.0, 0.4], float64)
+
+        # Set up the class.
+        model = N_state_opt(model='population', N=2, init_params=init_params, fixed_tensors=[False], rdcs=array([rdcs], float64), rdc_errors=ones((1, 3), float64), rdc_weights=ones((1, 3), float64), rdc_vect=rdc_vect, T_flags=zeros((1, 3), int32), rdc_pseudo_flags=array([0, 1, 0], int32), dip_const=[1.0, [1.0, 3.0], 1.0], absolute_rdc=zeros((1, 3), int32))
+
+        # Return the class instance and parameters.
+        return model, init_params
+
+
+    def test_func_standard_rdc(self):
+        """Unit test of the vectorised RDC back-calculation of the func_standard() method.
+
+        The first RDC is 0.4*-3 + 0.6*1 = -0.6.  The second is the average of the pseudo-atom RDCs of 1*(0.4*-3 + 0.6*1) = -0.6 and 3*(0.4*2 + 0.6*1) = 4.2, and the third RDC is missing.
+        """
+
+        # Set up the class.
+        model, params = self.setup_rdc_model(rdcs=[0.4, 1.8, nan])
+
+        # The chi-squared value.
+        self.assertAlmostEqual(model.func(params), 1.0)
+
+        # The back-calculated RDCs.
+        self.assertAlmostEqual(model.rdc_theta[0, 0], -0.6)
+        self.assertAlmostEqual(model.rdc_theta[0, 1], 1.8)
+        self.assertEqual(model.rdc_theta[0, 2], 0.0)
+
+
+    def test_dfunc_standard_rdc(self):
+        """Unit test of the alignment tensor elements of the vectorised dfunc_standard() gradient, compared to the numerical gradient."""
+
+        # Set up the class.
+        model, params = self.setup_rdc_model(rdcs=[0.4, 1.7, nan])
+
+        # The gradient.
+        model.func(params)
+        grad = model.dfunc(params)
+
+        # Compare the tensor elements to the central finite differences.
+        for i in range(5):
+            h = zeros(6, float64)
+            h[i] = 1e-6
+            num_grad = (model.func(params + h) - model.func(params - h)) / 2e-6
+            self.assertAlmostEqual(grad[i], num_grad, 5)
@@ -27,7 +27,7 @@ from unittest import TestCase
 from dep_check import C_module_exp_fn
 from status import Status; status = Status()
 if C_module_exp_fn:
-    from target_functions.relax_fit import setup, func_exp, dfunc_exp, d2func_exp, jacobian_exp, jacobian_chi2_exp
+    from target_functions.relax_fit import RelaxFit, setup, func_exp, dfunc_exp, d2func_exp, jacobian_exp, jacobian_chi2_exp, func_batch, dfunc_batch, d2func_batch
 
 
 class Test_relax_fit(TestCase):
@@ -69,6 +69,11 @@ class Test_relax_fit(TestCase):
         # The intensity errors.
         errors = [10.0, 10.0, 10.0, 10.0, 10.0]
 
+        # Store the data for the RelaxFit objects.
+        self.relax_times = relax_times
+        self.I = I
+        self.errors = errors
+
         # Setup the C module.
         setup(num_params=2, num_times=len(relax_times), values=I, sd=errors, relax_times=relax_times, scaling_matrix=self.scaling_list)
 
@@ -290,3 +295,103 @@ class Test_relax_fit(TestCase):
         for i in range(len(matrix)):
             for j in range(len(matrix[i])):
                 self.assertAlmostEqual(matrix[i, j], real[i, j], 3)
+
+
+    def test_RelaxFit_exp(self):
+        """Unit test for the target functions of the RelaxFit object, compared to the module level functions."""
+
+        # The off-minimum parameter values.
+        params = [2.0/self.scaling_list[0], 500.0/self.scaling_list[1]]
+
+        # Set up a RelaxFit object for the same data.
+        fit = RelaxFit(model='exp', num_params=2, values=self.I, sd=self.errors, relax_times=self.relax_times, scaling_matrix=self.scaling_list)
+
+        # Reset the module level data to something different, as this must not affect the object.
+        setup(num_params=2, num_times=2, values=[1.0, 2.0], sd=[1.0, 1.0], relax_times=[0.0, 1.0], scaling_matrix=[1.0, 1.0])
+        val = fit.func(params)
+        setup(num_params=2, num_times=len(self.relax_times), values=self.I, sd=self.errors, relax_times=self.relax_times, scaling_matrix=self.scaling_list)
+
+        # Check the values.
+        self.assertEqual(val, func_exp(params))
+        self.assertEqual(fit.dfunc(params), dfunc_exp(params))
+        self.assertEqual(fit.d2func(params), d2func_exp(params))
+        self.assertEqual(fit.jacobian(params), jacobian_exp(params))
+        self.assertEqual(fit.jacobian_chi2(params), jacobian_chi2_exp(params))
+
+
+    def test_RelaxFit_errors(self):
+        """Unit test for the checking of the RelaxFit object arguments."""
+
+        # An unknown model.
+        self.assertRaises(ValueError, RelaxFit, 'xxx', 2, self.I, self.errors, self.relax_times, self.scaling_list)
+
+        # The wrong number of parameters for the model.
+        self.assertRaises(ValueError, RelaxFit, 'exp', 3, self.I, self.errors, self.relax_times, self.scaling_list)
+
+        # Mismatched data lengths.
+        self.assertRaises(ValueError, RelaxFit, 'exp', 2, self.I, self.errors[:-1], self.relax_times, self.scaling_list)
+
+        # The wrong number of parameter values.
+        fit = RelaxFit('exp', 2, self.I, self.errors, self.relax_times, self.scaling_list)
+        self.assertRaises(ValueError, fit.func, [1.0])
+
+
+    def test_func_batch(self):
+        """Unit test for the chi-squared values returned by the func_batch() function for multiple spins."""
+
+        # Two curves, the second with double the errors.
+        fits = [
+            RelaxFit('exp', 2, self.I, self.errors, self.relax_times, self.scaling_list),
+            RelaxFit('exp', 2, self.I, [2.0*err for err in self.errors], self.relax_times, self.scaling_list)
+        ]
+
+        # The parameter values for each curve.
+        params = [self.params, [2.0/self.scaling_list[0], 500.0/self.scaling_list[1]]]
+
+        # The chi-squared values.
+        chi2 = func_batch(fits, params)
+
+        # Printout.
+        print("The batched chi-squared values are:\n%s" % chi2)
+
+        # Check the values.
+        self.assertEqual(len(chi2), 2)
+        self.assertAlmostEqual(chi2[0], 0.0)
+        self.assertEqual(chi2[0], fits[0].func(params[0]))
+        self.assertEqual(chi2[1], fits[1].func(params[1]))
+
+
+    def test_dfunc_batch(self):
+        """Unit test for the gradients returned by the dfunc_batch() function for multiple spins."""
+
+        # Two identical curves.
+        fits = [RelaxFit('exp', 2, self.I, self.errors, self.relax_times, self.scaling_list) for i in range(2)]
+
+        # The parameter values for each curve.
+        params = [self.params, [2.0/self.scaling_list[0], 500.0/self.scaling_list[1]]]
+
+        # The gradients.
+        grads = dfunc_batch(fits, params)
+
+        # Check the values.
+        self.assertEqual(grads[0], dfunc_exp(params[0]))
+        self.assertEqual(grads[1], dfunc_exp(params[1]))
+        self.assertAlmostEqual(grads[1][0], 456.36655522098829*self.scaling_list[0], 3)
+        self.assertAlmostEqual(grads[1][1], -10.8613338920982*self.scaling_list[1], 3)
+
+
+    def test_d2func_batch(self):
+        """Unit test for the Hessians returned by the d2func_batch() function for multiple spins."""
+
+        # Two identical curves.
+        fits = [RelaxFit('exp', 2, self.I, self.errors, self.relax_times, self.scaling_list) for i in range(2)]
+
+        # The parameter values for each curve.
+        params = [self.params, [2.0/self.scaling_list[0], 500.0/self.scaling_list[1]]]
+
+        # The Hessians.
+        hess = d2func_batch(fits, params)
+
+        # Check the values.
+        self.assertEqual(hess[0], d2func_exp(params[0]))
+        self.assertEqual(hess[1], d2func_exp(params[1]))
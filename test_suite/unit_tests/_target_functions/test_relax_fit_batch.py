@@ -0,0 +1,139 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, exp, float64, zeros
+from unittest import TestCase
+
+# relax module imports.
+from dep_check import C_module_exp_fn
+from target_functions.relax_fit_batch import Relax_fit_batch
+from status import Status; status = Status()
+
+
+class Test_relax_fit_batch(TestCase):
+    """Unit tests for the target_functions.relax_fit_batch module."""
+
+    def __init__(self, methodName='runTest'):
+        """Skip the tests if the C modules are non-functional.
+
+        @keyword methodName:    The name of the test.
+        @type methodName:       str
+        """
+
+        # Execute the base class method.
+        super(Test_relax_fit_batch, self).__init__(methodName)
+
+        # Missing module.
+        if not C_module_exp_fn:
+            # Store in the status object. 
+            status.skipped_tests.append([methodName, 'Relax curve-fitting C module', 'unit'])
+
+
+    def setUp(self):
+        """Set up the time points, errors and parameter values common to the tests."""
+
+        # The time points and errors.
+        self.relax_times = array([0.0, 0.5, 1.0, 2.0, 4.0])
+        self.errors = [10.0, 10.0, 20.0, 20.0, 30.0]
+
+        # The parameter scaling.
+        self.scaling = {'exp': [1.0, 1000.0], 'inv': [1.0, 1000.0, 1000.0], 'sat': [1.0, 1000.0]}
+
+        # The unscaled parameter values of two simulations.
+        self.params = {
+            'exp': array([[1.0, 1000.0], [1.2, 950.0]]),
+            'inv': array([[0.8, -900.0, 1000.0], [0.9, -950.0, 1050.0]]),
+            'sat': array([[1.5, 1000.0], [1.4, 1100.0]])
+        }
+
+
+    def back_calc(self, model, params):
+        """Back-calculate the intensities for one parameter vector.
+
+        @param model:   The exponential curve type.
+        @type model:    str
+        @param params:  The unscaled parameter vector.
+        @type params:   numpy rank-1 array
+        @return:        The intensities.
+        @rtype:         numpy rank-1 array
+        """
+
+        # The models.
+        if model == 'exp':
+            return params[1] * exp(-params[0] * self.relax_times)
+        elif model == 'inv':
+            return params[2] - (params[2] - params[1]) * exp(-params[0] * self.relax_times)
+        return params[1] * (1.0 - exp(-params[0] * self.relax_times))
+
+
+    def check_model(self, model):
+        """Check the target function, gradient and Hessian of the given model against the data of the first simulation.
+
+        @param model:   The exponential curve type.
+        @type model:    str
+        """
+
+        # The data of the first simulation, used for all simulations.
+        values = [self.back_calc(model, self.params[model][0])] * 2
+        target = Relax_fit_batch(model=model, num_params=len(self.scaling[model]), values=values, errors=self.errors, relax_times=self.relax_times, scaling_matrix=self.scaling[model])
+        params = self.params[model] / self.scaling[model]
+
+        # The chi-squared values.
+        chi2 = target.func(params)
+        self.assertAlmostEqual(chi2[0], 0.0)
+        resid = (values[1] - self.back_calc(model, self.params[model][1])) / self.errors
+        self.assertAlmostEqual(chi2[1], (resid**2).sum())
+
+        # Compare the gradients and Hessians to central finite differences.
+        grad = target.dfunc(params)
+        hess = target.d2func(params)
+        n = params.shape[1]
+        for i in range(n):
+            delta = zeros(params.shape, float64)
+            delta[:, i] = 1e-6
+            grad_num = (target.func(params + delta) - target.func(params - delta)) / 2e-6
+            hess_num = (target.dfunc(params + delta) - target.dfunc(params - delta)) / 2e-6
+            for s in range(2):
+                self.assertAlmostEqual(grad[s, i] / (abs(grad_num[s]) + 1.0), grad_num[s] / (abs(grad_num[s]) + 1.0), 4)
+                for j in range(n):
+                    self.assertAlmostEqual(hess[s, j, i] / (abs(hess_num[s, j]) + 1.0), hess_num[s, j] / (abs(hess_num[s, j]) + 1.0), 4)
+
+
+    def test_exp(self):
+        """Test the batched target functions of the two parameter exponential."""
+
+        # Check.
+        self.check_model('exp')
+
+
+    def test_inv(self):
+        """Test the batched target functions of the inversion recovery exponential."""
+
+        # Check.
+        self.check_model('inv')
+
+
+    def test_sat(self):
+        """Test the batched target functions of the saturation recovery exponential."""
+
+        # Check.
+        self.check_model('sat')
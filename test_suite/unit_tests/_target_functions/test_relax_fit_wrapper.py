@@ -0,0 +1,108 @@
+###############################################################################
+#                                                                             #
+# Copyright (C) 2018 Edward d'Auvergne                                        #
+#                                                                             #
+# This file is part of the program relax (http://www.nmr-relax.com).          #
+#                                                                             #
+# This program is free software: you can redistribute it and/or modify        #
+# it under the terms of the GNU General Public License as published by        #
+# the Free Software Foundation, either version 3 of the License, or           #
+# (at your option) any later version.                                         #
+#                                                                             #
+# This program is distributed in the hope that it will be useful,             #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of              #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the               #
+# GNU General Public License for more details.                                #
+#                                                                             #
+# You should have received a copy of the GNU General Public License           #
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.       #
+#                                                                             #
+###############################################################################
+
+# Python module imports.
+from numpy import array, float64
+from unittest import TestCase
+
+# relax module imports.
+from dep_check import C_module_exp_fn
+from status import Status; status = Status()
+from target_functions.relax_fit_wrapper import Relax_fit_opt, d2func_batch_opt, dfunc_batch_opt, func_batch_opt
+
+
+class Test_relax_fit_wrapper(TestCase):
+    """Unit tests for the target_functions.relax_fit_wrapper module."""
+
+    def __init__(self, methodName='runTest'):
+        """Skip the tests if the C modules are non-functional.
+
+        @keyword methodName:    The name of the test.
+        @type methodName:       str
+        """
+
+        # Execute the base class method.
+        super(Test_relax_fit_wrapper, self).__init__(methodName)
+
+        # Missing module.
+        if not C_module_exp_fn:
+            # Store in the status object. 
+            status.skipped_tests.append([methodName, 'Relax curve-fitting C module', 'unit'])
+
+
+    def setUp(self):
+        """Create the target functions of three curves."""
+
+        # The time points, errors, and scaling.
+        relax_times = [0.0, 1.0, 2.0, 3.0, 4.0]
+        errors = [10.0, 10.0, 20.0, 20.0, 30.0]
+
+        # The curves for I0 = 1000 and R = 1, the last with inverted intensities.
+        I = [1000.0, 367.879441171, 135.335283237, 49.7870683679, 18.3156388887]
+        self.targets = [
+            Relax_fit_opt(model='exp', num_params=2, values=I, errors=errors, relax_times=relax_times, scaling_matrix=[1.0, 1000.0]),
+            Relax_fit_opt(model='exp', num_params=2, values=I, errors=[2.0*err for err in errors], relax_times=relax_times, scaling_matrix=[1.0, 1000.0]),
+            Relax_fit_opt(model='sat', num_params=2, values=I[::-1], errors=errors, relax_times=relax_times, scaling_matrix=[1.0, 1000.0])
+        ]
+
+        # The parameter vectors, one per curve.
+        self.params = array([[1.0, 1.0], [2.0, 0.5], [0.5, 1.2]], float64)
+
+
+    def test_d2func_batch_opt(self):
+        """Unit test for the Hessians returned by the d2func_batch_opt() function."""
+
+        # The Hessians.
+        hess = d2func_batch_opt(targets=self.targets, params=self.params)
+
+        # Check against the single curve Hessians.
+        self.assertEqual(hess.shape, (3, 2, 2))
+        for i in range(3):
+            self.assertEqual(hess[i].tolist(), self.targets[i].d2func(self.params[i]).tolist())
+
+
+    def test_dfunc_batch_opt(self):
+        """Unit test for the gradients returned by the dfunc_batch_opt() function."""
+
+        # The gradients.
+        grad = dfunc_batch_opt(targets=self.targets, params=self.params)
+
+        # Check against the single curve gradients.
+        self.assertEqual(grad.shape, (3, 2))
+        for i in range(3):
+            self.assertEqual(grad[i].tolist(), self.targets[i].dfunc(self.params[i]).tolist())
+
+
+    def test_func_batch_opt(self):
+        """Unit test for the chi-squared values returned by the func_batch_opt() function."""
+
+        # The chi-squared values.
+        chi2 = func_batch_opt(targets=self.targets, params=self.params)
+
+        # Check against the single curve values.
+        self.assertEqual(chi2.shape, (3,))
+        self.assertAlmostEqual(chi2[0], 0.0)
+        for i in range(3):
+            self.assertEqual(chi2[i], self.targets[i].func(self.params[i]))
+
+        # The same curve for all parameter vectors.
+        chi2 = func_batch_opt(targets=[self.targets[1]]*3, params=self.params)
+        self.assertEqual(chi2.tolist(), self.targets[1].func_batch(self.params).tolist())
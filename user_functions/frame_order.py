@@ -549,6 +549,14 @@ uf.add_keyarg(
     desc = "The generation of the Sobol' sequence oversamples as N * Ov * 10**M, where N is the maximum number of points, Ov is the oversamling value, and M is the number of dimensions or torsion-tilt angles used in the system.",
     wiz_element_type = "spin"
 )
+uf.add_keyarg(
+    name = "cache_dir",
+    py_type = "str",
+    arg_type = "dir",
+    desc_short = "Sobol' cache directory",
+    desc = "The optional directory for the persistent on-disk cache of the Sobol' torsion-tilt angles and rotation matrices.",
+    can_be_none = True
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This allows the maximum number of integration points N used during the frame order target function optimisation to be specified.  This is used in the quasi-random Sobol' sequence for the numerical integration of the PCS.  The formula used to find the total number of Sobol' points is:")
@@ -564,6 +572,7 @@ uf.desc[-1].add_list_element("Generate the Sobol' sequence for the total number
 uf.desc[-1].add_list_element("Convert all points to the torsion-tilt angle system.")
 uf.desc[-1].add_list_element("Skip all Sobol' points with angles greater than the current parameter values.")
 uf.desc[-1].add_list_element("Terminate the loop over the Sobol' points once the maximum number of points has been reached.")
+uf.desc[-1].add_paragraph("As generating the Sobol' points and the rotation matrices for each point can take a long time, a cache directory can be specified.  The data for each frame order model, set of torsion-tilt angles, and total number of points will then be saved in this directory as numpy .npy files.  These are memory-mapped when loaded, so that all subsequent optimisations, multi-processor slaves and relax instances using the same directory share the data without regeneration.")
 uf.backend = sobol_setup
 uf.menu_text = "&sobol_setup"
 uf.gui_icon = "oxygen.actions.edit-rename"
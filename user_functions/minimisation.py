@@ -217,6 +217,13 @@ uf.add_keyarg(
     desc_short = "verbosity level",
     desc = "The amount of information to print to screen.  Zero corresponds to minimal output while higher values increase the amount of output.  The default value is 1."
 )
+uf.add_keyarg(
+    name = "mc_batch",
+    default = False,
+    py_type = "bool",
+    desc_short = "batched Monte Carlo simulation flag",
+    desc = "A flag which if True will cause all Monte Carlo simulations to be optimised simultaneously, rather than one simulation at a time.  This is only supported by some analysis types."
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This will perform an optimisation starting from the current parameter values.  This is only suitable for data pipe types which have target functions and hence support optimisation.")
@@ -224,6 +231,9 @@ uf.desc[-1].add_paragraph("This will perform an optimisation starting from the c
 uf.desc.append(Desc_container("Diagonal scaling"))
 uf.desc[-1].add_paragraph("Diagonal scaling is the transformation of parameter values such that each value has a similar order of magnitude.  Certain minimisation techniques, for example the trust region methods, perform extremely poorly with badly scaled problems.  In addition, methods which are insensitive to scaling such as Newton minimisation may still benefit due to the minimisation of round off errors.")
 uf.desc[-1].add_paragraph("In Model-free analysis for example, if S2 = 0.5, te = 200 ps, and Rex = 15 1/s at 600 MHz, the unscaled parameter vector would be [0.5, 2.0e-10, 1.055e-18].  Rex is divided by (2 * pi * 600,000,000)**2 to make it field strength independent.  The scaling vector for this model may be something like [1.0, 1e-9, 1/(2 * pi * 6e8)**2].  By dividing the unscaled parameter vector by the scaling vector the scaled parameter vector is [0.5, 0.2, 15.0].  To revert to the original unscaled parameter vector, the scaled parameter vector and scaling vector are multiplied.")
+# Batched Monte Carlo simulations.
+uf.desc.append(Desc_container("Batched Monte Carlo simulations"))
+uf.desc[-1].add_paragraph("For the analyses where the Monte Carlo simulations differ only in the simulated data, for example the exponential curve-fitting of the relaxation curve-fitting analysis, all simulations can be optimised simultaneously by setting the batched Monte Carlo simulation flag.  The target function then evaluates the parameter vectors of all simulations against the matrix of simulated data in single calls, and the simulations are optimised together by Newton optimisation with Levenberg-Marquardt damping.  The minimisation algorithm and sub-algorithms are ignored in this case, and constraints are enforced by rejecting the steps violating them.  The flag is only used when Monte Carlo simulations are active.")
 # Minimisation algorithms.
 uf.desc.append(Desc_container("Minimisation algorithms"))
 uf.desc[-1].add_paragraph("A minimisation function is selected if the minimisation algorithm matches a certain pattern.  Because the python regular expression 'match' statement is used, various strings can be supplied to select the same minimisation algorithm.  Below is a list of the minimisation algorithms available together with the corresponding patterns.")
@@ -86,6 +86,7 @@ uf.add_keyarg(
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This is able to handle uncompressed, bzip2 compressed files, or gzip compressed files automatically.  The full file name including extension can be supplied, however, if the file cannot be found the file with '.bz2' appended followed by the file name with '.gz' appended will be searched for.")
+uf.desc[-1].add_paragraph("Results written in the binary columnar format are also automatically detected, the file name then being the directory name.")
 uf.backend = results.read
 uf.menu_text = "&read"
 uf.gui_icon = "oxygen.actions.document-open"
@@ -142,6 +143,17 @@ uf.add_keyarg(
     desc_short = "force flag",
     desc = "A flag which if True will cause the results file to be overwritten."
 )
+uf.add_keyarg(
+    name = "format",
+    default = "xml",
+    py_type = "str",
+    desc_short = "results format",
+    desc = "The format of the results, either 'xml' for a single XML formatted file or 'binary' for the binary columnar format directory.",
+    wiz_element_type = "combo",
+    wiz_combo_choices = ["XML", "Binary columnar"],
+    wiz_combo_data = ["xml", "binary"],
+    wiz_read_only = True
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This will write the entire contents of the current data pipe into an XML formatted file.  This results file can then be read back into relax at a later point in time, or transfered to another machine.  This is in contrast to the state.save user function whereby the entire data store, including all data pipes, are saved into a similarly XML formatted file.")
@@ -150,7 +162,8 @@ uf.desc[-1].add_paragraph("The default behaviour of this function is to compress
 uf.desc[-1].add_item_list_element("0", "No compression (no file extension),")
 uf.desc[-1].add_item_list_element("1", "bzip2 compression ('.bz2' file extension),")
 uf.desc[-1].add_item_list_element("2", "gzip compression ('.gz' file extension).")
-uf.desc[-1].add_paragraph("The complementary read function will automatically handle the compressed files.")
+uf.desc[-1].add_paragraph("Alternatively the binary columnar format can be selected.  The file name is then the name of a directory in which the float data of the spin and interatomic containers is stored as numpy .npy column files and all remaining data as an XML file.  This is described in more detail in the state.save user function documentation.")
+uf.desc[-1].add_paragraph("The complementary read function will automatically handle the compressed files and the binary format.")
 uf.backend = results.write
 uf.menu_text = "&write"
 uf.gui_icon = "oxygen.actions.document-save"
@@ -38,7 +38,7 @@ from pipe_control import spectrum
 from user_functions.data import Uf_info; uf_info = Uf_info()
 from user_functions.data import Uf_tables; uf_tables = Uf_tables()
 from user_functions.objects import Desc_container
-from user_functions.wildcards import WILDCARD_SPECTRUM_PEAKLIST
+from user_functions.wildcards import WILDCARD_SPECTRUM_NMRPIPE, WILDCARD_SPECTRUM_PEAKLIST
 
 
 # The user function class.
@@ -75,9 +75,28 @@ uf.add_keyarg(
     desc = "The spin ID string.",
     can_be_none = True
 )
+uf.add_keyarg(
+    name = "file",
+    py_type = "str",
+    arg_type = "file sel",
+    desc_short = "NMRPipe spectrum file name",
+    desc = "The optional single plane NMRPipe spectrum from which the baseplane RMSD will be estimated.",
+    wiz_filesel_wildcard = WILDCARD_SPECTRUM_NMRPIPE,
+    wiz_filesel_style = FD_OPEN,
+    can_be_none = True
+)
+uf.add_keyarg(
+    name = "dir",
+    py_type = "str",
+    arg_type = "dir",
+    desc_short = "directory name",
+    desc = "The directory where the NMRPipe spectrum is located.",
+    can_be_none = True
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("The spectrum ID identifies the spectrum associated with the error and must correspond to a previously loaded set of intensities.  If the spin ID is unset, then the error value for all spins will be set to the supplied value.")
+uf.desc[-1].add_paragraph("Alternatively the baseplane RMSD can be estimated directly from NMRPipe .ft2 or .ft3 spectra, without the need for the NMRPipe showApod program.  The noise is estimated from the median absolute deviation of all points of the spectrum, replacing the supplied error value.")
 uf.backend = spectrum.baseplane_rmsd
 uf.menu_text = "&baseplane_rmsd"
 uf.gui_icon = "oxygen.actions.edit-rename"
@@ -358,6 +377,16 @@ uf.add_keyarg(
     desc = "The Bruker specific FID intensity scaling factor.",
     can_be_none = True
 )
+uf.add_keyarg(
+    name = "spectrum_file",
+    py_type = "str_or_str_list",
+    arg_type = "file sel multi",
+    desc_short = "NMRPipe spectrum file name(s)",
+    desc = "The optional NMRPipe spectrum or list of spectra, located in the same directory as the peak list, from which the intensities will be extracted at the peak positions of the peak list.",
+    wiz_filesel_wildcard = WILDCARD_SPECTRUM_NMRPIPE,
+    wiz_filesel_style = FD_OPEN,
+    can_be_none = True
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("The peak intensity can either be from peak heights or peak volumes.")
@@ -372,6 +401,7 @@ uf.desc[-1].add_paragraph("Sparky peak list:  The file should be a Sparky peak l
 uf.desc[-1].add_paragraph("XEasy peak list:  The file should be the saved XEasy text window output of the list peak entries command, 'tw' followed by 'le'.  As the columns are fixed, the peak intensity column is hardwired to number 10 (the 11th column) which contains either the peak height or peak volume data.  Because the columns are fixed, the integration column number will be ignored.")
 uf.desc[-1].add_paragraph("NMRView:  The file should be a NMRView peak list. The default is to use column 16 (which contains peak heights) for peak intensities. To use use peak volumes (or evolumes), int_col must be set to 15.")
 uf.desc[-1].add_paragraph("NMRPipe seriesTab:  The file should be a NMRPipe-format Spectral Series list.  If the spectrum_id='auto', the IDs are auto generated in form of Z_A{i}.")
+uf.desc[-1].add_paragraph("NMRPipe spectra:  If NMRPipe .ft2 or .ft3 spectra are supplied, the intensities are extracted directly from the spectral data at the chemical shifts of the peak list, with the last peak list dimension being the direct dimension.  The peak height of the closest point is used for the 'height' integration method, and the sum of the 3 by 3 point box around the peak for the 'point sum' method.  Each plane of the spectra is a separate spectrum, and a list of spectrum IDs matching all planes must be supplied.  If the spectrum_id='auto', the IDs are auto generated in form of Z_A{i}.")
 uf.desc[-1].add_paragraph("Generic intensity file:  This is a generic format which can be created by scripting to support non-supported peak lists.  It should contain in the first few columns enough information to identify the spin.  This can include columns for the molecule name, residue number, residue name, spin number, and spin name.  Alternatively a spin ID string column can be used. The peak intensities can be placed in another column specified by the integration column number.  Intensities from multiple spectra can be placed into different columns, and these can then be specified simultaneously by setting the integration column value to a list of columns.  This list must be matched by setting the spectrum ID to a list of the same length.  If columns are delimited by a character other than whitespace, this can be specified with the column separator.  The spin ID can be used to restrict the loading to specific spin subsets.")
 uf.desc.append(Desc_container("Multiple files"))
 uf.desc[-1].add_paragraph("The data from multiple files can be loaded simultaneously if a list of files is supplied.  In this case, a list of spectrum ID strings of equal length must be supplied.")
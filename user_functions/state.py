@@ -78,6 +78,7 @@ uf.add_keyarg(
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This is able to handle uncompressed, bzip2 compressed files, or gzip compressed files automatically.  The full file name including extension can be supplied, however, if the file cannot be found, this function will search for the file name with '.bz2' appended followed by the file name with '.gz' appended.")
 uf.desc[-1].add_paragraph("For more advanced users, file descriptor objects are supported.  If the force flag is set to True, then the relax data store will be reset prior to the loading of the saved state.")
+uf.desc[-1].add_paragraph("States saved in the binary columnar format are automatically detected, in which case the state name is the directory name.")
 # Prompt examples.
 uf.desc.append(Desc_container("Prompt examples"))
 uf.desc[-1].add_paragraph("The following commands will load the state saved in the file 'save'.")
@@ -134,6 +135,17 @@ uf.add_keyarg(
     desc_short = "force flag",
     desc = "A boolean flag which if set to True will cause the file to be overwritten."
 )
+uf.add_keyarg(
+    name = "format",
+    default = "xml",
+    py_type = "str",
+    desc_short = "state format",
+    desc = "The format of the saved state, either 'xml' for a single XML formatted file or 'binary' for the binary columnar format directory.",
+    wiz_element_type = "combo",
+    wiz_combo_choices = ["XML", "Binary columnar"],
+    wiz_combo_data = ["xml", "binary"],
+    wiz_read_only = True
+)
 # Description.
 uf.desc.append(Desc_container())
 uf.desc[-1].add_paragraph("This will place the program state - the relax data store - into a file for later reloading or reference.  The default format is an XML formatted file.")
@@ -141,6 +153,7 @@ uf.desc[-1].add_paragraph("The default behaviour of this function is to compress
 uf.desc[-1].add_item_list_element("0", "No compression (no file extension).")
 uf.desc[-1].add_item_list_element("1", "bzip2 compression ('.bz2' file extension).")
 uf.desc[-1].add_item_list_element("2", "gzip compression ('.gz' file extension).")
+uf.desc[-1].add_paragraph("For large data stores, the binary columnar format can be selected instead.  The state is then saved as a directory in which all float values, float lists, and float dictionaries of the spin and interatomic containers are stored as numpy .npy column files, one per data structure name, and all remaining data is stored in an XML file with the compression type above.  When loaded, the column files are memory mapped and the values are only attached to the containers when first accessed.  The format is automatically detected by the state.load user function.")
 # Prompt examples.
 uf.desc.append(Desc_container("Prompt examples"))
 uf.desc[-1].add_paragraph("The following commands will save the current program state, uncompressed, into the file 'save':")
@@ -154,6 +167,8 @@ uf.desc[-1].add_prompt("relax> state.save(state='save.bz2')")
 uf.desc[-1].add_paragraph("If the file 'save' already exists, the following commands will save the current program state by overwriting the file.")
 uf.desc[-1].add_prompt("relax> state.save('save', force=True)")
 uf.desc[-1].add_prompt("relax> state.save(state='save', force=True)")
+uf.desc[-1].add_paragraph("To save the current program state in the binary columnar format into the directory 'save_dir':")
+uf.desc[-1].add_prompt("relax> state.save('save_dir', format='binary')")
 uf.backend = save_state
 uf.menu_text = "&save"
 uf.gui_icon = "oxygen.actions.document-save"
@@ -47,6 +47,9 @@ WILDCARD_RELAX_SAVE = \
 WILDCARD_RELAX_SCRIPT = "relax scripts (*.py)|*.py;*.PY"
 
 # Spectral data.
+WILDCARD_SPECTRUM_NMRPIPE = \
+    "NMRPipe spectra (*.ft2, *.ft3)|*.ft2;*.FT2;*.ft3;*.FT3|"+\
+    "All files (*)|*"
 WILDCARD_SPECTRUM_PEAKLIST = \
     "Sparky peak lists (*.list)|*.list;*.LIST|"+\
     "XEasy peak lists (*.text)|*.text;*.TEXT|"+\